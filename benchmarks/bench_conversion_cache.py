@@ -0,0 +1,129 @@
+# coding: utf-8
+"""
+Benchmark of the conversion cache, which memoizes duplicate segments of an interchange.
+
+Parses every input with and without the conversion cache (interleaved, best of --repeat runs) and
+reports the parse time, the speedup and the hit rate per cached segment type. As the tokenizer takes
+the major part of a parse, the time of the converters of the cached segment types is reported as well
+(measured with the SegmentProfiler in a separate run per mode). The inputs are:
+
+- electricity: generated load profiles without status segments (STS), only the CCI and PIA segments
+  of the messages repeat
+- gas: generated profiles with a status segment in every interval, as in gas quality data
+- any real interchange given with --input, whose messages (UNH...UNT) are repeated --copies times,
+  e.g. tests/samples/mscons-message-example.txt
+
+Usage:
+    PYTHONPATH=src python benchmarks/bench_conversion_cache.py [--messages 200] [--repeat 3]
+        [--input tests/samples/mscons-message-example.txt --copies 2000] [--segment-types CCI,PIA,STS]
+        [--cache-size 1024]
+"""
+import argparse
+import gc
+import os
+import time
+from typing import Optional
+
+from msconsparser.libs.edifactmsconsparser.edifact_mscons_parser import EdifactMSCONSParser
+from msconsparser.libs.edifactmsconsparser.generators import MSCONSGeneratorSettings, MSCONSInterchangeGenerator
+from msconsparser.libs.edifactmsconsparser.wrappers import ConversionCache, ParseStatistics, SegmentProfiler
+
+
+def generate_interchange(messages: int, status_rate: float, seed: int) -> str:
+    """
+    Generates an interchange with one day of 15 minute intervals per message.
+    """
+    settings = MSCONSGeneratorSettings(seed=seed, messages=messages, status_rate=status_rate)
+    return "".join(MSCONSInterchangeGenerator(settings).iter_segments())
+
+
+def repeat_messages(edifact_text: str, copies: int) -> str:
+    """
+    Repeats the messages (from the first UNH up to the UNZ segment) of a real interchange.
+    """
+    start = edifact_text.find("UNH")
+    end = edifact_text.rfind("UNZ")
+    if start < 0 or end < start:
+        raise ValueError("The interchange has no messages framed by UNH and UNZ")
+    return edifact_text[:start] + edifact_text[start:end] * copies + edifact_text[end:]
+
+
+def parse_seconds(parser: EdifactMSCONSParser, edifact_text: str) -> tuple[float, ParseStatistics]:
+    """
+    Parses the interchange once and returns the duration and the statistics of the parse.
+    """
+    statistics = ParseStatistics()
+    gc.collect()
+    start = time.perf_counter()
+    parser.parse(edifact_text, statistics=statistics)
+    return time.perf_counter() - start, statistics
+
+
+def run_input(label: str, edifact_text: str, repeat: int, cache_size: int, segment_types: Optional[list[str]]) -> None:
+    """
+    Measures one input with and without the conversion cache and prints the results.
+    """
+    parsers = {
+        "uncached": EdifactMSCONSParser(conversion_cache_size=0),
+        "cached": EdifactMSCONSParser(conversion_cache_size=cache_size, cached_segment_types=segment_types),
+    }
+    best = dict.fromkeys(parsers, float("inf"))
+    statistics = None
+    # The modes are interleaved per run, so that a changing machine load affects both alike
+    for _ in range(repeat):
+        for mode, parser in parsers.items():
+            seconds, run_statistics = parse_seconds(parser, edifact_text)
+            best[mode] = min(best[mode], seconds)
+            if mode == "cached":
+                statistics = run_statistics
+
+    converter_seconds = {}
+    for mode, parser in parsers.items():
+        profiler = SegmentProfiler()
+        parser.parse(edifact_text, profiler=profiler)
+        converter_seconds[mode] = {
+            segment_type: profiler.get_entry(segment_type, SegmentProfiler.CONVERTER).total_time
+            for segment_type in statistics.conversion_cache
+        }
+
+    segments = statistics.segment_count
+    print(f"{label}: {segments:,} segments, {len(edifact_text) / 1024 ** 2:.1f} MB")
+    for mode, seconds in best.items():
+        print(f"  {mode:<9} {seconds:8.3f} s {segments / seconds:>14,.0f} segments/s")
+    print(f"  speedup   {best['uncached'] / best['cached']:8.2f}x")
+    for segment_type, counts in statistics.conversion_cache.items():
+        uncached, cached = converter_seconds["uncached"][segment_type], converter_seconds["cached"][segment_type]
+        print(f"  {segment_type:<9} hit rate {counts['hit_rate']:7.2%} ({counts['hits']:,} hits, "
+              f"{counts['misses']:,} misses), converter {uncached * 1000:.1f} ms -> {cached * 1000:.1f} ms "
+              f"({uncached / cached:.1f}x)")
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    argument_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    argument_parser.add_argument("--messages", type=int, default=200, help="Messages of the generated interchanges")
+    argument_parser.add_argument("--seed", type=int, default=42, help="Seed of the generated interchanges")
+    argument_parser.add_argument("--input", action="append", default=[], help="Real interchange (repeatable)")
+    argument_parser.add_argument("--copies", type=int, default=2000, help="Copies of the messages of the inputs")
+    argument_parser.add_argument("--repeat", type=int, default=3, help="Runs per mode (best is reported)")
+    argument_parser.add_argument("--cache-size", type=int, default=ConversionCache.DEFAULT_MAX_SIZE,
+                                 help="Maximum number of cached segments")
+    argument_parser.add_argument("--segment-types", help="Comma separated cached segment types, e.g. CCI,PIA,STS")
+    args = argument_parser.parse_args(argv)
+
+    segment_types = [segment_type.strip() for segment_type in args.segment_types.split(",")] \
+        if args.segment_types else None
+    inputs = [
+        ("electricity", generate_interchange(args.messages, 0.0, args.seed)),
+        ("gas", generate_interchange(args.messages, 1.0, args.seed)),
+    ]
+    for path in args.input:
+        with open(path, encoding="utf-8") as file:
+            inputs.append((os.path.basename(path), repeat_messages(file.read(), args.copies)))
+
+    for label, edifact_text in inputs:
+        run_input(label, edifact_text, args.repeat, args.cache_size, segment_types)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
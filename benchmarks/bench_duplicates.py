@@ -0,0 +1,68 @@
+# coding: utf-8
+"""
+Benchmark of the duplicate detection.
+
+Parses a generated interchange once against an empty duplicate index and then again as resent duplicate, once with
+the same interchange reference (a duplicate interchange, all messages are skipped after the UNB segment) and once
+with a new interchange reference (every message is a duplicate, skipped after its BGM segment). Reports the
+duration of the parses, the measured time saved compared to the first parse and the time saved estimated by the
+duplicate check.
+
+Usage:
+    PYTHONPATH=src python benchmarks/bench_duplicates.py [--messages 200] [--repeat 3]
+"""
+import argparse
+import re
+import time
+
+from msconsparser.libs.edifactmsconsparser.edifact_mscons_parser import EdifactMSCONSParser
+from msconsparser.libs.edifactmsconsparser.generators import MSCONSGeneratorSettings, MSCONSInterchangeGenerator
+from msconsparser.libs.edifactmsconsparser.wrappers import DuplicateCheck, DuplicateIndex
+
+
+def parse_seconds(edifact_text: str, index: DuplicateIndex, repeat: int) -> tuple[float, DuplicateCheck]:
+    """
+    Returns the best duration of a compact parse checked against the index and the check of the last parse.
+    """
+    best = float("inf")
+    check = None
+    for _ in range(repeat):
+        check = DuplicateCheck(index)
+        start = time.perf_counter()
+        EdifactMSCONSParser().parse(edifact_text, compact=True, duplicate_check=check)
+        best = min(best, time.perf_counter() - start)
+    return best, check
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--messages", type=int, default=200, help="The number of messages of the interchange")
+    parser.add_argument("--repeat", type=int, default=3, help="The number of runs per measurement")
+    arguments = parser.parse_args()
+
+    settings = MSCONSGeneratorSettings(seed=42, messages=arguments.messages)
+    edifact_text = "".join(MSCONSInterchangeGenerator(settings).iter_segments())
+    interchange_reference = re.search(r"^UNB\+(?:[^+']*\+){4}([^+']*)", edifact_text, flags=re.M).group(1)
+    resent_text = edifact_text.replace(interchange_reference, interchange_reference + "R")
+
+    # The first parse is repeated against a new index each time, the keys are only committed afterwards
+    first_seconds = float("inf")
+    index = DuplicateIndex()
+    for _ in range(arguments.repeat):
+        index = DuplicateIndex()
+        seconds, check = parse_seconds(edifact_text, index, 1)
+        first_seconds = min(first_seconds, seconds)
+    check.commit()
+    print(f"interchange: {len(edifact_text) / 1e6:.1f} MB, {arguments.messages} messages, "
+          f"first parse {first_seconds:.3f} s")
+
+    for label, text in (("duplicate interchange", edifact_text), ("duplicate messages", resent_text)):
+        seconds, check = parse_seconds(text, index, arguments.repeat)
+        skipped = sum(duplicate.skipped_segments for duplicate in check.duplicates)
+        estimated = sum(duplicate.seconds_saved or 0.0 for duplicate in check.duplicates)
+        print(f"{label}: {len(check.duplicates)} duplicates, {skipped} segments skipped, parse {seconds:.3f} s, "
+              f"saved {first_seconds - seconds:.3f} s measured, {estimated:.3f} s estimated")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+# coding: utf-8
+"""
+Benchmark of the logging pipeline on the parse hot path.
+
+Parses a dirty interchange (no UNA, invalid segment prefixes and unknown segment types), which raises
+several warnings per segment group (the removed prefixes are only counted), and compares:
+
+- per-record: every warning is formatted eagerly and logged as its own record (the former behavior)
+- aggregated: the warnings are counted per parse and logged as one summary record
+
+each with a synchronous StreamHandler and with the QueueListenerHandler, both writing to os.devnull
+(or the given log file). The queue handler pays off when writing the records is slow (e.g. a blocking
+pipe or a network file system); with os.devnull it only adds the thread hand-over.
+
+Usage:
+    PYTHONPATH=src python benchmarks/bench_logging.py [--segments 100000] [--repeat 3] [--log-file PATH]
+"""
+import argparse
+import logging
+import os
+import time
+from contextlib import contextmanager
+from unittest.mock import patch
+
+from msconsparser.infrastructure.logging_handlers import QueueListenerHandler
+from msconsparser.libs.edifactmsconsparser.edifact_mscons_parser import EdifactMSCONSParser
+from msconsparser.libs.edifactmsconsparser.wrappers import ParseWarnings
+
+HEADER = (
+    "UNB+UNOC:3+4012345678901:14+4012345678901:14+200426:1151+ABC4711++TL++++1'"
+    "UNH+1+MSCONS:D:04B:UN:2.4c+UNB_DE0020_nr_1+1:C'"
+    "BGM+7+MSI5422+9'"
+    "DTM+137:202106011315?+00:303'"
+    "UNS+D'"
+    "NAD+DP'"
+    "LOC+237+11XUENBSOLS----X+11XVNBSOLS-----X'"
+)
+DIRTY_BLOCK = (
+    "LIN+1'"
+    "[${test(TEST_DATA)}]:QTY+220:4250.465:D54'"  # invalid prefix and decimal mark without UNA
+    "DTM+163:202101012300?+00:303'"
+    "DTM+164:202101312315?+00:303'"
+    "FOO+1'"  # unknown segment type
+)
+SEGMENTS_PER_BLOCK = 5
+TRAILER = "UNT+2+1'UNZ+1+ABC4711'"
+
+LOG_FORMAT = "%(asctime)s %(levelname)s %(name)s %(module)s %(lineno)s %(message)s"
+
+
+def build_dirty_interchange(segments: int) -> str:
+    """
+    Builds a dirty interchange with roughly the given number of segments.
+    """
+    return HEADER + DIRTY_BLOCK * max(1, segments // SEGMENTS_PER_BLOCK) + TRAILER
+
+
+class CountingFilter(logging.Filter):
+    """
+    Counts the records passing the handler.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.count = 0
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        self.count += 1
+        return True
+
+
+@contextmanager
+def logging_pipeline(use_queue: bool, log_file: str):
+    """
+    Installs a root handler writing to the log file, either synchronously or through the queue handler.
+    """
+    stream = open(log_file, "w")
+    stream_handler = logging.StreamHandler(stream)
+    stream_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+    counter = CountingFilter()
+    stream_handler.addFilter(counter)
+    handler = QueueListenerHandler([stream_handler]) if use_queue else stream_handler
+
+    root = logging.getLogger()
+    previous_handlers, previous_level = root.handlers[:], root.level
+    root.handlers = [handler]
+    root.setLevel(logging.DEBUG)
+    try:
+        yield counter
+    finally:
+        if use_queue:
+            handler.stop()
+        root.handlers = previous_handlers
+        root.setLevel(previous_level)
+        stream.close()
+
+
+def per_record_add(self, template, *args):
+    """
+    Emulates the former hot-path logging: format eagerly and log every occurrence.
+    """
+    logging.getLogger("msconsparser.hotpath").warning(template % args)
+
+
+@contextmanager
+def warning_mode(mode: str):
+    """
+    Switches between the per-record logging and the aggregated warnings.
+    """
+    if mode == "per-record":
+        with patch.object(ParseWarnings, "add", per_record_add):
+            yield
+    else:
+        yield
+
+
+def run(edifact_text: str, mode: str, use_queue: bool, repeat: int, log_file: str) -> tuple[float, float, int]:
+    """
+    Parses the interchange `repeat` times and returns the best parse time, the time until all
+    records were written and the number of written records per parse.
+    """
+    parser = EdifactMSCONSParser()
+    best_parse = best_total = float("inf")
+    records = 0
+    for _ in range(repeat):
+        with warning_mode(mode):
+            with logging_pipeline(use_queue, log_file) as counter:
+                start = time.perf_counter()
+                parser.parse(edifact_text)
+                parse_time = time.perf_counter() - start
+            # Leaving the pipeline stops the queue listener, i.e. all pending records are written
+            total_time = time.perf_counter() - start
+        best_parse = min(best_parse, parse_time)
+        best_total = min(best_total, total_time)
+        records = counter.count
+    return best_parse, best_total, records
+
+
+def main() -> None:
+    argument_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    argument_parser.add_argument("--segments", type=int, default=100_000, help="Approximate number of segments")
+    argument_parser.add_argument("--repeat", type=int, default=3, help="Number of runs per variant (best is reported)")
+    argument_parser.add_argument("--log-file", default=os.devnull, help="File the log records are written to")
+    args = argument_parser.parse_args()
+
+    edifact_text = build_dirty_interchange(args.segments)
+    print(f"Dirty interchange: {edifact_text.count(chr(39))} segments, {len(edifact_text)} characters")
+    print(f"{'warnings':<12} {'handler':<8} {'parse [s]':>10} {'written [s]':>12} {'records':>9}")
+    for mode in ("per-record", "aggregated"):
+        for use_queue in (False, True):
+            parse_time, total_time, records = run(edifact_text, mode, use_queue, args.repeat, args.log_file)
+            handler = "queue" if use_queue else "sync"
+            print(f"{mode:<12} {handler:<8} {parse_time:>10.3f} {total_time:>12.3f} {records:>9}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+# coding: utf-8
+"""
+Benchmark of the SQLite measurement store.
+
+Parses a generated interchange once and stores it per batch size into a new database file. The batches are
+flushed after a location object (SG6), so that a batch holds at least the intervals of one location object.
+As baseline, the stored measurement rows are inserted again row by row with one execute per row, once in one
+transaction and once committed per row, the baselines exclude the extraction of the rows from the interchange.
+Reports the stored measurements (intervals) per second and the duration of a query of one location and OBIS
+code within a time range.
+
+Usage:
+    PYTHONPATH=src python benchmarks/bench_measurement_store.py [--messages 100] [--batch-sizes 100,1000,10000]
+        [--repeat 3]
+"""
+import argparse
+import contextlib
+import os
+import sqlite3
+import tempfile
+import time
+from datetime import datetime, timezone
+
+from msconsparser.adapters.outbound.sqlite import SQLiteMeasurementStore
+from msconsparser.libs.edifactmsconsparser.edifact_mscons_parser import EdifactMSCONSParser
+from msconsparser.libs.edifactmsconsparser.generators import MSCONSGeneratorSettings, MSCONSInterchangeGenerator
+
+
+def store_seconds(interchange: dict, batch_size: int, repeat: int) -> tuple[float, dict]:
+    """
+    Returns the best duration of storing the interchange into a new database and the summary of the store.
+    """
+    best = float("inf")
+    summary = {}
+    for _ in range(repeat):
+        with tempfile.TemporaryDirectory() as directory:
+            store = SQLiteMeasurementStore(os.path.join(directory, "measurements.db"), batch_size=batch_size)
+            try:
+                start = time.perf_counter()
+                summary = store.store_interchange(interchange)
+                best = min(best, time.perf_counter() - start)
+            finally:
+                store.close()
+    return best, summary
+
+
+def row_by_row_seconds(interchange: dict, commit_per_row: bool) -> tuple[float, int]:
+    """
+    Returns the duration of inserting the measurement rows of the interchange with one execute per row.
+    """
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "measurements.db")
+        store = SQLiteMeasurementStore(path)
+        store.store_interchange(interchange)
+        store.close()
+        with contextlib.closing(sqlite3.connect(path, isolation_level=None)) as connection:
+            connection.execute("PRAGMA synchronous=NORMAL")
+            rows = connection.execute("SELECT * FROM measurements").fetchall()
+            connection.execute("DELETE FROM measurements")
+            insert = f"INSERT INTO measurements VALUES ({', '.join('?' * len(rows[0]))})"
+            start = time.perf_counter()
+            if not commit_per_row:
+                connection.execute("BEGIN")
+            for row in rows:
+                connection.execute(insert, row)
+            if not commit_per_row:
+                connection.execute("COMMIT")
+            return time.perf_counter() - start, len(rows)
+
+
+def query_seconds(interchange: dict, location: str, repeat: int) -> tuple[float, int]:
+    """
+    Returns the best duration of a query of one location, OBIS code and day and the number of found measurements.
+    """
+    with tempfile.TemporaryDirectory() as directory:
+        store = SQLiteMeasurementStore(os.path.join(directory, "measurements.db"))
+        try:
+            store.store_interchange(interchange)
+            best = float("inf")
+            measurements = []
+            for _ in range(repeat):
+                start = time.perf_counter()
+                measurements = store.find_measurements(
+                    location=location, obis="1-1:1.29.1", start=datetime(2024, 1, 1, tzinfo=timezone.utc),
+                    end=datetime(2024, 1, 2, tzinfo=timezone.utc), limit=100000
+                )
+                best = min(best, time.perf_counter() - start)
+        finally:
+            store.close()
+    return best, len(measurements)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--messages", type=int, default=100, help="The number of messages of the interchange")
+    parser.add_argument("--batch-sizes", default="100,1000,10000", help="The batch sizes, separated by commas")
+    parser.add_argument("--repeat", type=int, default=3, help="The number of runs per measurement")
+    arguments = parser.parse_args()
+
+    settings = MSCONSGeneratorSettings(seed=42, messages=arguments.messages)
+    generator = MSCONSInterchangeGenerator(settings)
+    edifact_text = "".join(generator.iter_segments())
+    start = time.perf_counter()
+    interchange = EdifactMSCONSParser().parse(edifact_text, compact=True).model_dump(mode="json")
+    parse_seconds = time.perf_counter() - start
+    location = interchange["unh_unt_nachrichten"][0]["sg5_liefer_bzw_bezugsorte"][0][
+        "sg6_wert_und_erfassungsangaben_zum_objekt"][0]["loc_identifikationsangabe"]["ortsangabe"]["ortsangabe_code"]
+
+    print(f"interchange: {len(edifact_text) / 1e6:.1f} MB, {arguments.messages} messages, "
+          f"parse and dump {parse_seconds:.2f} s")
+    for batch_size in (int(value) for value in arguments.batch_sizes.split(",")):
+        seconds, summary = store_seconds(interchange, batch_size, arguments.repeat)
+        rows = summary["message_count"] + summary["location_count"] + summary["measurement_count"]
+        print(f"batch size {batch_size:>6}: {summary['measurement_count']} measurements in {seconds:.3f} s, "
+              f"{summary['measurement_count'] / seconds:,.0f} measurements/s, {rows / seconds:,.0f} rows/s")
+    for commit_per_row in (False, True):
+        seconds, count = row_by_row_seconds(interchange, commit_per_row)
+        label = "row by row, commit per row" if commit_per_row else "row by row, one transaction"
+        print(f"{label}: {count} measurements in {seconds:.3f} s, {count / seconds:,.0f} measurements/s")
+    seconds, count = query_seconds(interchange, location, arguments.repeat)
+    print(f"query of a location, OBIS code and day: {count} measurements in {seconds * 1000:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+# coding: utf-8
+"""
+Memory benchmark of the parse tree: resident memory per interval (SG10) for the node types of the tree.
+
+Generates a synthetic interchange with the given number of 15 minute intervals (SG10 segment groups,
+96 per message) and parses it once per mode, each in a fresh subprocess:
+
+- models: the parse tree consists of the public pydantic models (EdifactMSCONSParser.parse default)
+- compact: the parse tree consists of the compact slotted nodes (parse(..., compact=True), as used by
+  the REST adapter)
+
+The resident set size (RSS) is read before and after the parse, while the parse tree is kept alive.
+The difference divided by the number of intervals is reported as the memory per SG10, which includes
+the SG9 to SG10 segments (QTY, DTM and STS) and a share of the enclosing segment groups.
+
+Usage:
+    PYTHONPATH=src python benchmarks/bench_memory.py [--intervals 1000000] [--modes models,compact]
+        [--status-rate 0.0]
+
+The default of one million intervals needs about 3 GB of memory in the models mode.
+"""
+import argparse
+import gc
+import json
+import os
+import subprocess
+import sys
+from typing import Optional
+
+from msconsparser.libs.edifactmsconsparser.edifact_mscons_parser import EdifactMSCONSParser
+from msconsparser.libs.edifactmsconsparser.generators import MSCONSGeneratorSettings, MSCONSInterchangeGenerator
+
+INTERVALS_PER_MESSAGE = 96
+MODES = ("models", "compact")
+
+
+def get_rss_bytes() -> int:
+    """
+    Returns the current resident set size of the process, or its peak if the current one is not available.
+    """
+    try:
+        with open("/proc/self/statm") as file:
+            return int(file.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except OSError:
+        import resource
+
+        # ru_maxrss is given in bytes on macOS and in kilobytes elsewhere
+        max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return max_rss if sys.platform == "darwin" else max_rss * 1024
+
+
+def generate_interchange(intervals: int, seed: int, status_rate: float) -> str:
+    """
+    Generates an interchange with (at least) the given number of intervals, 96 per message.
+    """
+    messages = max(1, -(-intervals // INTERVALS_PER_MESSAGE))
+    settings = MSCONSGeneratorSettings(
+        seed=seed, messages=messages, intervals_per_position=min(intervals, INTERVALS_PER_MESSAGE),
+        status_rate=status_rate,
+    )
+    return "".join(MSCONSInterchangeGenerator(settings).iter_segments())
+
+
+def measure_mode(mode: str, intervals: int, seed: int, status_rate: float) -> dict:
+    """
+    Parses the interchange in the given mode and returns the resident memory of the parse tree.
+    """
+    edifact_text = generate_interchange(intervals, seed, status_rate)
+    sg10_count = edifact_text.count("\nQTY+")
+    gc.collect()
+    rss_before = get_rss_bytes()
+
+    interchange = EdifactMSCONSParser().parse(edifact_text, compact=(mode == "compact"))
+    gc.collect()
+    rss_after = get_rss_bytes()
+
+    tree_bytes = rss_after - rss_before
+    result = {
+        "mode": mode,
+        "sg10_count": sg10_count,
+        "input_mb": len(edifact_text) / 1024 ** 2,
+        "rss_before_mb": rss_before / 1024 ** 2,
+        "rss_after_mb": rss_after / 1024 ** 2,
+        "tree_mb": tree_bytes / 1024 ** 2,
+        "bytes_per_sg10": tree_bytes / sg10_count,
+    }
+    del interchange
+    return result
+
+
+def run_in_subprocess(mode: str, intervals: int, seed: int, status_rate: float) -> dict:
+    """
+    Runs the measurement of one mode in a fresh interpreter, so that the modes do not share freed memory.
+    """
+    output = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), "--intervals", str(intervals), "--seed", str(seed),
+         "--status-rate", str(status_rate), "--measure", mode],
+        check=True, stdout=subprocess.PIPE, env=os.environ,
+    ).stdout
+    return json.loads(output)
+
+
+def create_argument_parser() -> argparse.ArgumentParser:
+    argument_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    argument_parser.add_argument("--intervals", type=int, default=1_000_000, help="Number of intervals (SG10)")
+    argument_parser.add_argument("--modes", default=",".join(MODES), help="Comma separated modes to measure")
+    argument_parser.add_argument("--seed", type=int, default=42, help="Seed of the generated interchange")
+    argument_parser.add_argument("--status-rate", type=float, default=0.0, help="Share of intervals with a STS segment")
+    argument_parser.add_argument("--measure", choices=MODES, help=argparse.SUPPRESS)
+    return argument_parser
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    args = create_argument_parser().parse_args(argv)
+    if args.measure:
+        print(json.dumps(measure_mode(args.measure, args.intervals, args.seed, args.status_rate)))
+        return 0
+
+    modes = [mode.strip() for mode in args.modes.split(",") if mode.strip()]
+    unknown = [mode for mode in modes if mode not in MODES]
+    if unknown:
+        print(f"Unknown modes: {', '.join(unknown)}, expected {', '.join(MODES)}", file=sys.stderr)
+        return 2
+
+    print(f"{'mode':<8} {'SG10':>10} {'input [MB]':>11} {'RSS before [MB]':>16} {'RSS after [MB]':>15}"
+          f" {'tree [MB]':>10} {'per SG10 [B]':>13}")
+    results = {}
+    for mode in modes:
+        result = results[mode] = run_in_subprocess(mode, args.intervals, args.seed, args.status_rate)
+        print(f"{mode:<8} {result['sg10_count']:>10,} {result['input_mb']:>11.1f} {result['rss_before_mb']:>16.1f}"
+              f" {result['rss_after_mb']:>15.1f} {result['tree_mb']:>10.1f} {result['bytes_per_sg10']:>13,.0f}")
+    if "models" in results and "compact" in results:
+        saved = 1 - results["compact"]["bytes_per_sg10"] / results["models"]["bytes_per_sg10"]
+        print(f"The compact nodes need {saved:.0%} less memory per SG10 than the pydantic models.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
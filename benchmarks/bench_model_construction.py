@@ -0,0 +1,105 @@
+# coding: utf-8
+"""
+Micro-benchmark of the segment model construction per segment type.
+
+Converts a typical segment of every segment type with its converter once, records the models created
+by the converter (the segment model and its nested models) and replays their construction. The
+created segment objects per second are reported for the construction modes:
+
+- trusted: the models are created from the converted values without validation (default)
+- strict: the models are validated in pydantic's strict mode (STRICT_MODEL_VALIDATION=true)
+- constructor: the models are created with the validating pydantic constructor (the former behavior)
+
+Only the construction is measured, as the splitting of the segments takes the major part of a conversion.
+
+Usage:
+    PYTHONPATH=src python benchmarks/bench_model_construction.py [--number 100000] [--repeat 5]
+"""
+import argparse
+import timeit
+from unittest.mock import patch
+
+from msconsparser.libs.edifactmsconsparser import converters
+from msconsparser.libs.edifactmsconsparser.wrappers import context as parsing_context
+from msconsparser.libs.edifactmsconsparser.utils import EdifactSyntaxHelper
+from msconsparser.libs.edifactmsconsparser.wrappers import ParsingContext
+from msconsparser.libs.edifactmsconsparser.wrappers.segments import (
+    SegmentGroup, construct_model, construct_strict, construct_trusted
+)
+
+SEGMENTS = [
+    ("UNA", converters.UNASegmentConverter, "UNA:+.? '", None),
+    ("UNB", converters.UNBSegmentConverter,
+     "UNB+UNOC:3+4012345678901:14+4012345678901:14+200426:1151+ABC4711++TL++++1", None),
+    ("UNH", converters.UNHSegmentConverter, "UNH+1+MSCONS:D:04B:UN:2.4c+UNB_DE0020_nr_1+1:C", None),
+    ("BGM", converters.BGMSegmentConverter, "BGM+7+MSI5422+9", None),
+    ("DTM", converters.DTMSegmentConverter, "DTM+163:202101012300?+00:303", SegmentGroup.SG10),
+    ("RFF", converters.RFFSegmentConverter, "RFF+Z13:13025", SegmentGroup.SG1),
+    ("NAD", converters.NADSegmentConverter, "NAD+MS+9900259000002::293", SegmentGroup.SG2),
+    ("CTA", converters.CTASegmentConverter, "CTA+IC+:Kontakt", SegmentGroup.SG4),
+    ("COM", converters.COMSegmentConverter, "COM+no-reply@example.com:EM", SegmentGroup.SG4),
+    ("UNS", converters.UNSSegmentConverter, "UNS+D", None),
+    ("LOC", converters.LOCSegmentConverter, "LOC+172+DE00056366947AN00000000000052308", SegmentGroup.SG6),
+    ("CCI", converters.CCISegmentConverter, "CCI+15++Z21", SegmentGroup.SG8),
+    ("LIN", converters.LINSegmentConverter, "LIN+1", SegmentGroup.SG9),
+    ("PIA", converters.PIASegmentConverter, "PIA+5+1-1?:1.29.1:SRW", SegmentGroup.SG9),
+    ("QTY", converters.QTYSegmentConverter, "QTY+220:4250.465:KWH", SegmentGroup.SG10),
+    ("STS", converters.STSSegmentConverter, "STS+Z31++Z91", SegmentGroup.SG10),
+    ("UNT", converters.UNTSegmentConverter, "UNT+26+1", None),
+    ("UNZ", converters.UNZSegmentConverter, "UNZ+2+ABC4711", None),
+]
+
+CONSTRUCTORS = {
+    "trusted": construct_trusted,
+    "strict": construct_strict,
+    "constructor": lambda model_class, values: model_class(**values),
+}
+
+
+def record_constructions(converter, element_components: list[str], segment_group) -> list[tuple[type, dict]]:
+    """
+    Converts the segment once and returns the model classes and values in the order of their creation.
+    """
+    constructions = []
+
+    def record(model_class, values, strict=False):
+        constructions.append((model_class, dict(values)))
+        return construct_model(model_class, values, strict)
+
+    with patch.object(parsing_context, "construct_model", record):
+        converter.convert(1, element_components, None, segment_group, ParsingContext())
+    return constructions
+
+
+def main() -> None:
+    argument_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    argument_parser.add_argument("--number", type=int, default=100_000, help="Number of constructions per run")
+    argument_parser.add_argument("--repeat", type=int, default=5, help="Number of runs per mode (best is reported)")
+    args = argument_parser.parse_args()
+
+    syntax_helper = EdifactSyntaxHelper()
+    print(f"{'segment':<8} {'models':>6}" + "".join(f"{mode + ' [obj/s]':>22}" for mode in CONSTRUCTORS)
+          + f"{'speedup':>10}")
+    for segment_type, converter_class, segment, segment_group in SEGMENTS:
+        converter = converter_class(syntax_parser=syntax_helper)
+        element_components = [segment] if segment_type == "UNA" else syntax_helper.split_elements(segment)
+        constructions = record_constructions(converter, element_components, segment_group)
+
+        def replay(construct):
+            # The trusted construction takes over the dictionary, like the keyword arguments of the converters
+            for model_class, values in constructions:
+                construct(model_class, dict(values))
+
+        # The modes are interleaved per run, so that a changing machine load affects all modes alike
+        best = dict.fromkeys(CONSTRUCTORS, float("inf"))
+        for _ in range(args.repeat):
+            for mode, construct in CONSTRUCTORS.items():
+                best[mode] = min(best[mode], timeit.timeit(lambda: replay(construct), number=args.number))
+        objects_per_second = {mode: args.number / seconds for mode, seconds in best.items()}
+        speedup = objects_per_second["trusted"] / objects_per_second["constructor"]
+        print(f"{segment_type:<8} {len(constructions):>6}"
+              + "".join(f"{objects_per_second[mode]:>22,.0f}" for mode in CONSTRUCTORS) + f"{speedup:>9.2f}x")
+
+
+if __name__ == "__main__":
+    main()
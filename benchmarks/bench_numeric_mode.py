@@ -0,0 +1,127 @@
+# coding: utf-8
+"""
+Benchmark of the numeric modes of the converted quantities (float, decimal and milli).
+
+Measures for the dot and the comma as decimal mark:
+
+- per-value: the conversion of single quantities as done by the QTY converter, compared with the former
+  path, which looked up the decimal mark of the UNA segment (with try/except) and replaced it in every value
+- parse: the parse of a generated interchange per numeric mode
+
+The candidates of a measurement run interleaved and the best of --repeat runs is reported.
+
+Usage:
+    PYTHONPATH=src python benchmarks/bench_numeric_mode.py [--values 200000] [--messages 100] [--repeat 10]
+"""
+import argparse
+import gc
+import random
+import time
+from typing import Callable, Optional
+
+from msconsparser.libs.edifactmsconsparser.edifact_mscons_parser import EdifactMSCONSParser
+from msconsparser.libs.edifactmsconsparser.generators import MSCONSGeneratorSettings, MSCONSInterchangeGenerator
+from msconsparser.libs.edifactmsconsparser.wrappers import NumericMode, ParsingContext
+from msconsparser.libs.edifactmsconsparser.wrappers.segments import SegmentUNA
+
+
+def create_context(decimal_mark: str, mode: NumericMode) -> ParsingContext:
+    """
+    Creates a parsing context with an UNA segment of the given decimal mark.
+    """
+    context = ParsingContext()
+    context.interchange.una_service_string_advice = SegmentUNA(
+        component_separator=":", element_separator="+", decimal_mark=decimal_mark,
+        release_character="?", reserved=" ", segment_terminator="'"
+    )
+    context.use_numeric_mode(mode)
+    return context
+
+
+def convert_legacy(string_number: str, context: ParsingContext) -> float:
+    """
+    The former per-value conversion of SegmentConverter._convert_decimal.
+    """
+    try:
+        decimal_mark = context.interchange.una_service_string_advice.decimal_mark
+        if decimal_mark is None or decimal_mark == "":
+            raise AttributeError("UNA decimal_mark is None or empty.")
+    except AttributeError:
+        decimal_mark = "."
+    return float(string_number.replace(decimal_mark, "."))
+
+
+def best_seconds(functions: dict[str, Callable[[], object]], repeat: int) -> dict[str, float]:
+    """
+    Returns the best duration of several calls per function, the functions are called interleaved per run,
+    so that a changing machine load affects all of them alike.
+    """
+    best = dict.fromkeys(functions, float("inf"))
+    for _ in range(repeat):
+        for label, function in functions.items():
+            gc.collect()
+            start = time.perf_counter()
+            function()
+            best[label] = min(best[label], time.perf_counter() - start)
+    return best
+
+
+def print_result(label: str, seconds: float, count: int, reference: Optional[float] = None) -> None:
+    speedup = f" {reference / seconds:6.2f}x" if reference is not None else ""
+    print(f"  {label:<22} {seconds * 1000:9.1f} ms {seconds / count * 1e9:8.1f} ns/value{speedup}")
+
+
+def run_values(values: list[str], decimal_mark: str, repeat: int) -> None:
+    """
+    Measures the per-value conversion of the values written with the decimal mark.
+    """
+    values = [value.replace(".", decimal_mark) for value in values]
+    print(f"decimal mark '{decimal_mark}', {len(values):,} values")
+
+    legacy_context = create_context(decimal_mark, NumericMode.FLOAT)
+    functions = {"per-value legacy float": lambda: [convert_legacy(value, legacy_context) for value in values]}
+    for mode in NumericMode:
+        convert_number = create_context(decimal_mark, mode).convert_number
+        functions[f"per-value {mode.value}"] = lambda convert=convert_number: [convert(value) for value in values]
+
+    results = best_seconds(functions, repeat)
+    legacy = results["per-value legacy float"]
+    for label, seconds in results.items():
+        print_result(label, seconds, len(values), legacy if label != "per-value legacy float" else None)
+
+
+def run_parse(messages: int, repeat: int) -> None:
+    """
+    Measures the parse of a generated interchange per numeric mode.
+    """
+    settings = MSCONSGeneratorSettings(seed=42, messages=messages)
+    edifact_text = "".join(MSCONSInterchangeGenerator(settings).iter_segments())
+    print(f"parse, {messages} messages, {len(edifact_text) / 1024 ** 2:.1f} MB")
+    parsers = {mode.value: EdifactMSCONSParser(numeric_mode=mode) for mode in NumericMode}
+    results = best_seconds(
+        {label: lambda parser=parser: parser.parse(edifact_text) for label, parser in parsers.items()}, repeat
+    )
+    reference = results[NumericMode.FLOAT.value]
+    for label, seconds in results.items():
+        print(f"  {label:<22} {seconds * 1000:9.1f} ms {reference / seconds:6.2f}x")
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    argument_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    argument_parser.add_argument("--values", type=int, default=200_000, help="Number of converted values")
+    argument_parser.add_argument("--messages", type=int, default=100, help="Messages of the parsed interchange")
+    argument_parser.add_argument("--repeat", type=int, default=10, help="Runs per measurement (best is reported)")
+    argument_parser.add_argument("--seed", type=int, default=42, help="Seed of the generated values")
+    args = argument_parser.parse_args(argv)
+
+    # Quantities with 3 decimal places as in load profiles, some of them negative
+    generator = random.Random(args.seed)
+    values = [f"{generator.uniform(-50.0, 5000.0):.3f}" for _ in range(args.values)]
+    for decimal_mark in (".", ","):
+        run_values(values, decimal_mark, args.repeat)
+    run_parse(args.messages, args.repeat)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,337 @@
+# coding: utf-8
+"""
+Benchmark suite of the MSCONS parser with scaling curves and a regression gate.
+
+Generates synthetic interchanges (see MSCONSInterchangeGenerator) of the given sizes and measures,
+for every size:
+
+- end_to_end: parse, model_dump and JSON encoding as done by the REST adapter
+- parse: EdifactMSCONSParser.parse only
+- tokenize: splitting the interchange into segments, elements and components, incl. prefix removal
+- segment_group: EdifactMSCONSParser.get_segment_group for every segment
+- convert.<TYPE>: the segment converter of every segment type (measured with the SegmentProfiler within
+  a parse, i.e. including the small overhead of the profiler), its segments/s relative to the segments
+  of that type and without MB/s
+- model_dump: dumping the parsed interchange into plain python objects
+- json_encode: encoding the dumped interchange as JSON
+
+The throughput is reported in segments/s and MB/s (relative to the size of the interchange) and the
+peak memory of the end-to-end run is measured with tracemalloc in a separate run.
+
+The results can be written as JSON (--output) and compared with a stored baseline (--baseline).
+If any phase (or the peak memory) regresses more than --max-regression percent, the script exits
+with status 1, e.g. to be used as a CI gate:
+
+    PYTHONPATH=src python benchmarks/bench_parser.py --sizes 1KB,1MB,10MB --output baseline.json
+    ... optimize ...
+    PYTHONPATH=src python benchmarks/bench_parser.py --sizes 1KB,1MB,10MB --baseline baseline.json
+
+Usage:
+    PYTHONPATH=src python benchmarks/bench_parser.py [--sizes 1KB,100KB,1MB,10MB] [--repeat 3]
+        [--output PATH] [--baseline PATH] [--max-regression 10] [--min-seconds 0.001] [--skip-memory]
+
+Sizes up to 500MB are supported (e.g. --sizes 100MB,500MB --repeat 1), but need several GB of memory.
+"""
+import argparse
+import gc
+import json
+import platform
+import re
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from typing import Callable, Optional
+
+from msconsparser.libs.edifactmsconsparser.edifact_mscons_parser import EdifactMSCONSParser
+from msconsparser.libs.edifactmsconsparser.generators import MSCONSGeneratorSettings, MSCONSInterchangeGenerator
+from msconsparser.libs.edifactmsconsparser.handlers import SegmentHandlerFactory
+from msconsparser.libs.edifactmsconsparser.utils import EdifactSyntaxHelper, SegmentTagMatcher
+from msconsparser.libs.edifactmsconsparser.wrappers import ParsingContext, SegmentProfiler
+from msconsparser.libs.edifactmsconsparser.wrappers.segments import SegmentType
+
+DEFAULT_SIZES = "1KB,100KB,1MB,10MB"
+SIZE_UNITS = {"B": 1, "KB": 1024, "MB": 1024 ** 2, "GB": 1024 ** 3}
+MB = 1024 ** 2
+
+END_TO_END = "end_to_end"
+PEAK_MEMORY = "peak_memory_mb"
+
+
+def parse_size(size: str) -> int:
+    """
+    Parses a size like "500KB" or "10MB" into bytes.
+    """
+    match = re.fullmatch(r"\s*(\d+(?:\.\d+)?)\s*([KMG]?B)\s*", size.upper())
+    if not match:
+        raise argparse.ArgumentTypeError(f"Invalid size '{size}', expected e.g. 1KB, 10MB or 1GB")
+    return int(float(match.group(1)) * SIZE_UNITS[match.group(2)])
+
+
+def generate_interchange(target_bytes: int, seed: int) -> str:
+    """
+    Generates an interchange of roughly the target size.
+
+    Small interchanges consist of one message with as many intervals as fit, larger ones of several
+    messages with one day of 15 minute intervals each.
+    """
+    def generate(messages: int, intervals: int) -> str:
+        settings = MSCONSGeneratorSettings(seed=seed, messages=messages, intervals_per_position=intervals)
+        return "".join(MSCONSInterchangeGenerator(settings).iter_segments())
+
+    day = generate(1, 96)
+    if target_bytes <= len(day):
+        frame = len(generate(1, 1))
+        interval = (len(day) - frame) / 95
+        return generate(1, max(1, round((target_bytes - frame) / interval) + 1))
+
+    message = len(generate(2, 96)) - len(day)
+    return generate(max(1, round((target_bytes - len(day)) / message) + 1), 96)
+
+
+def best_of(repeat: int, function: Callable[[], object]) -> float:
+    """
+    Runs the function `repeat` times and returns the best wall-clock duration in seconds.
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def encode_json(content: dict) -> bytes:
+    """
+    Encodes the content like the JSONResponse of the REST adapter (starlette) does.
+    """
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")).encode("utf-8")
+
+
+def tokenize(edifact_text: str) -> list[str]:
+    """
+    Splits the interchange into segments, elements and components the way the parser does and returns
+    the segment types.
+    """
+    syntax_helper = EdifactSyntaxHelper()
+    context = ParsingContext()
+    if edifact_text.startswith(SegmentType.UNA):
+        SegmentHandlerFactory(syntax_helper).get_handler(SegmentType.UNA).handle(
+            line_number=1, element_components=[edifact_text[:9]], last_segment_type=None,
+            current_segment_group=None, context=context,
+        )
+    segment_tag_matcher = SegmentTagMatcher.default()
+
+    types = []
+    for segment in syntax_helper.split_segments(string_content=edifact_text, context=context):
+        segment_line = segment.strip()
+        if not segment_line or segment_line.startswith(SegmentType.UNA):
+            continue
+        segment_line = syntax_helper.remove_invalid_prefix_from_segment_data(
+            string_content=segment_line, segment_types=segment_tag_matcher, context=context,
+        )
+        element_components = syntax_helper.split_elements(string_content=segment_line, context=context)
+        if element_components:
+            components = syntax_helper.split_components(string_content=element_components[0], context=context)
+            if components:
+                types.append(components[0])
+    return types
+
+
+def assign_segment_groups(segment_types: list[str]) -> None:
+    """
+    Determines the segment group of every segment like the parser does.
+    """
+    current_segment_group = None
+    for segment_type in segment_types:
+        current_segment_group = EdifactMSCONSParser.get_segment_group(segment_type, current_segment_group)
+
+
+def measure_peak_memory(edifact_text: str) -> float:
+    """
+    Returns the peak memory in MB allocated while parsing, dumping and encoding the interchange.
+    """
+    gc.collect()
+    tracemalloc.start()
+    try:
+        encode_json(EdifactMSCONSParser().parse(edifact_text).model_dump())
+        return tracemalloc.get_traced_memory()[1] / MB
+    finally:
+        tracemalloc.stop()
+
+
+def phase_result(seconds: float, segments: int, size_bytes: Optional[int]) -> dict:
+    """
+    Returns the duration and the throughput of a phase, without MB/s if the phase has no size of its own.
+    """
+    return {
+        "seconds": round(seconds, 6),
+        "segments_per_s": round(segments / seconds, 1) if seconds > 0 else None,
+        "mb_per_s": round(size_bytes / MB / seconds, 3) if seconds > 0 and size_bytes is not None else None,
+    }
+
+
+def run_size(label: str, target_bytes: int, seed: int, repeat: int, skip_memory: bool) -> dict:
+    """
+    Runs all phases for an interchange of the given size and returns the results.
+    """
+    edifact_text = generate_interchange(target_bytes, seed)
+    size_bytes = len(edifact_text.encode("utf-8"))
+    parser = EdifactMSCONSParser()
+
+    segment_types = tokenize(edifact_text)
+    segments = len(segment_types) + (1 if edifact_text.startswith(SegmentType.UNA) else 0)
+    interchange = parser.parse(edifact_text)
+    content = interchange.model_dump()
+
+    durations = {
+        END_TO_END: best_of(repeat, lambda: encode_json(parser.parse(edifact_text).model_dump())),
+        "parse": best_of(repeat, lambda: parser.parse(edifact_text)),
+        "tokenize": best_of(repeat, lambda: tokenize(edifact_text)),
+        "segment_group": best_of(repeat, lambda: assign_segment_groups(segment_types)),
+    }
+
+    # The converters are measured within a parse, the best cumulative time per segment type is taken
+    converter_durations: dict[str, float] = {}
+    converter_calls: dict[str, int] = {}
+    for _ in range(repeat):
+        # By default the profiler counts no allocated memory blocks, which would distort the timings
+        profiler = SegmentProfiler()
+        parser.parse(edifact_text, profiler=profiler)
+        for segment_type in profiler.report()["segment_types"]:
+            entry = profiler.get_entry(segment_type, SegmentProfiler.CONVERTER)
+            if entry is not None:
+                # The UNA segment is recorded with its service characters, e.g. "UNA:+.? '"
+                name = segment_type[:3]
+                seconds = entry.total_time
+                converter_durations[name] = min(converter_durations.get(name, seconds), seconds)
+                converter_calls[name] = entry.calls
+    for segment_type in sorted(converter_durations):
+        durations[f"convert.{segment_type}"] = converter_durations[segment_type]
+    # The throughput of a converter is relative to its own segments, not to all segments of the interchange,
+    # whose bytes it does not process either
+    phase_segments = {f"convert.{segment_type}": calls for segment_type, calls in converter_calls.items()}
+
+    durations["model_dump"] = best_of(repeat, interchange.model_dump)
+    durations["json_encode"] = best_of(repeat, lambda: encode_json(content))
+
+    result = {
+        "bytes": size_bytes,
+        "segments": segments,
+        "messages": len(interchange.unh_unt_nachrichten),
+        "phases": {
+            phase: phase_result(seconds, phase_segments[phase], None) if phase in phase_segments
+            else phase_result(seconds, segments, size_bytes)
+            for phase, seconds in durations.items()
+        },
+    }
+    if not skip_memory:
+        result[PEAK_MEMORY] = round(measure_peak_memory(edifact_text), 3)
+    print_size_result(label, result)
+    return result
+
+
+def print_size_result(label: str, result: dict) -> None:
+    """
+    Prints the results of one size as a table.
+    """
+    memory = f", peak memory {result[PEAK_MEMORY]:.1f} MB" if PEAK_MEMORY in result else ""
+    print(f"\n{label}: {result['bytes']} bytes, {result['segments']} segments, "
+          f"{result['messages']} messages{memory}")
+    print(f"  {'phase':<22} {'seconds':>10} {'segments/s':>14} {'MB/s':>10}")
+    for phase, figures in result["phases"].items():
+        segments_per_s = figures["segments_per_s"] or 0.0
+        mb_per_s = "-" if figures["mb_per_s"] is None else f"{figures['mb_per_s']:.2f}"
+        print(f"  {phase:<22} {figures['seconds']:>10.4f} {segments_per_s:>14.0f} {mb_per_s:>10}")
+
+
+def compare_with_baseline(results: dict, baseline: dict, max_regression: float, min_seconds: float) -> list[str]:
+    """
+    Compares the results with the baseline and returns the regressions exceeding the given percentage.
+
+    Phases faster than `min_seconds` in the baseline are skipped, as their timings are dominated by noise.
+    Sizes and phases missing in either of the runs are skipped as well.
+    """
+    regressions = []
+    print(f"\nComparison with baseline (max. regression {max_regression:.1f} %):")
+    for label, result in results["sizes"].items():
+        baseline_result = baseline.get("sizes", {}).get(label)
+        if baseline_result is None:
+            print(f"  {label}: not in baseline, skipped")
+            continue
+
+        figures = [
+            (phase, baseline_result["phases"][phase]["seconds"], values["seconds"], "s")
+            for phase, values in result["phases"].items()
+            if phase in baseline_result["phases"] and baseline_result["phases"][phase]["seconds"] >= min_seconds
+        ]
+        if PEAK_MEMORY in result and PEAK_MEMORY in baseline_result:
+            figures.append((PEAK_MEMORY, baseline_result[PEAK_MEMORY], result[PEAK_MEMORY], "MB"))
+
+        for name, before, after, unit in figures:
+            change = (after - before) / before * 100 if before else 0.0
+            regressed = change > max_regression
+            marker = "REGRESSION" if regressed else ""
+            print(f"  {label:<8} {name:<22} {before:>10.4f} {unit:<2} -> {after:>10.4f} {unit:<2} "
+                  f"{change:>+8.1f} % {marker}")
+            if regressed:
+                regressions.append(f"{label} {name}: {before:.4f} {unit} -> {after:.4f} {unit} ({change:+.1f} %)")
+    return regressions
+
+
+def create_argument_parser() -> argparse.ArgumentParser:
+    argument_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    argument_parser.add_argument("--sizes", default=DEFAULT_SIZES,
+                                 help=f"Comma separated sizes of the generated interchanges (default {DEFAULT_SIZES})")
+    argument_parser.add_argument("--repeat", type=int, default=3, help="Number of runs per phase (best is reported)")
+    argument_parser.add_argument("--seed", type=int, default=1, help="Seed of the generated interchanges")
+    argument_parser.add_argument("--output", help="File the results are written to as JSON")
+    argument_parser.add_argument("--baseline", help="JSON results of a former run to compare with")
+    argument_parser.add_argument("--max-regression", type=float, default=10.0,
+                                 help="Maximum allowed regression in percent per phase (default 10)")
+    argument_parser.add_argument("--min-seconds", type=float, default=0.001,
+                                 help="Phases faster than this in the baseline are not compared (default 0.001)")
+    argument_parser.add_argument("--skip-memory", action="store_true", help="Do not measure the peak memory")
+    return argument_parser
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    args = create_argument_parser().parse_args(argv)
+    sizes = {label.strip().upper(): parse_size(label) for label in args.sizes.split(",") if label.strip()}
+
+    results = {
+        "meta": {
+            "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "platform": platform.platform(),
+            "repeat": args.repeat,
+            "seed": args.seed,
+        },
+        "sizes": {},
+    }
+    for label, target_bytes in sizes.items():
+        results["sizes"][label] = run_size(label, target_bytes, args.seed, args.repeat, args.skip_memory)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(results, file, indent=2)
+        print(f"\nResults written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as file:
+            baseline = json.load(file)
+        regressions = compare_with_baseline(results, baseline, args.max_regression, args.min_seconds)
+        if regressions:
+            sys.stdout.flush()
+            print(f"\n{len(regressions)} regression(s) above {args.max_regression:.1f} %:", file=sys.stderr)
+            for regression in regressions:
+                print(f"  {regression}", file=sys.stderr)
+            return 1
+        print("\nNo regressions.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,4 @@
+# coding: utf-8
+"""
+Package for the command line interface of the batch parse.
+"""
@@ -0,0 +1,9 @@
+# coding: utf-8
+
+import sys
+
+from msconsparser.adapters.inbound.cli.parse_cli import main
+
+if __name__ == "__main__":
+    # The guard keeps the worker processes, which import the main module when spawned, from running the batch
+    sys.exit(main())
@@ -0,0 +1,202 @@
+# coding: utf-8
+
+import csv
+import io
+import json
+import os
+from abc import ABC, abstractmethod
+from typing import BinaryIO, Iterable, Iterator, Optional
+
+from msconsparser.application.services.batch_parse_service import STATUS_OK
+
+FORMAT_NDJSON = "ndjson"
+FORMAT_JSON = "json"
+FORMAT_CSV = "csv"
+OUTPUT_FORMATS = (FORMAT_NDJSON, FORMAT_JSON, FORMAT_CSV)
+
+# The columns of the CSV output, one row per interval (SG10) of the parsed interchanges
+CSV_COLUMNS = (
+    "file_name", "message", "location", "product_code", "quantity_qualifier", "quantity", "unit", "start", "end",
+)
+
+# The qualifiers of the DTM segments of the start and the end of an interval
+_START_QUALIFIER = "163"
+_END_QUALIFIER = "164"
+
+_MESSAGES_KEY = "unh_unt_nachrichten"
+# The separators of the JSON output, as used by the JSON responses of the parse endpoints
+_JSON_SEPARATORS = (",", ":")
+
+
+def _get(node: Optional[dict], *keys: str):
+    for key in keys:
+        if node is None:
+            return None
+        node = node.get(key)
+    return node
+
+
+def _find_date(dates: list, qualifier: str) -> Optional[str]:
+    for date in dates or ():
+        if date.get("datums_oder_uhrzeits_oder_zeitspannen_funktion_qualifier") == qualifier:
+            return date.get("datum_oder_uhrzeit_oder_zeitspanne_wert")
+    return None
+
+
+def iter_interval_rows(file_name: str, interchange: dict) -> Iterator[dict]:
+    """
+    Flattens the intervals (SG10) of a parsed interchange into the rows of the CSV output.
+
+    Args:
+        file_name: The name of the file of the interchange
+        interchange: The parsed interchange as dumped to JSON
+
+    Yields:
+        dict: One row per interval with the values of CSV_COLUMNS
+    """
+    for message in interchange.get(_MESSAGES_KEY) or ():
+        message_reference = _get(message, "unh_nachrichtenkopfsegment", "nachrichten_referenznummer")
+        for delivery_location in message.get("sg5_liefer_bzw_bezugsorte") or ():
+            for location_object in delivery_location.get("sg6_wert_und_erfassungsangaben_zum_objekt") or ():
+                location = _get(location_object, "loc_identifikationsangabe", "ortsangabe", "ortsangabe_code")
+                for position in location_object.get("sg9_positionsdaten") or ():
+                    product_code = _get(position, "pia_produktidentifikation",
+                                        "waren_leistungsnummer_identifikation", "produkt_leistungsnummer")
+                    for interval in position.get("sg10_mengen_und_statusangaben") or ():
+                        quantity = interval.get("qty_mengenangaben") or {}
+                        yield {
+                            "file_name": file_name,
+                            "message": message_reference,
+                            "location": location,
+                            "product_code": product_code,
+                            "quantity_qualifier": quantity.get("menge_qualifier"),
+                            "quantity": quantity.get("menge"),
+                            "unit": quantity.get("masseinheit_code"),
+                            "start": _find_date(interval.get("dtm_zeitangaben"), _START_QUALIFIER),
+                            "end": _find_date(interval.get("dtm_zeitangaben"), _END_QUALIFIER),
+                        }
+
+
+def _format_csv_rows(rows: Iterable[dict], with_header: bool = False) -> bytes:
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=CSV_COLUMNS, lineterminator="\n")
+    if with_header:
+        writer.writeheader()
+    writer.writerows(rows)
+    return buffer.getvalue().encode("utf-8")
+
+
+def _dump_json(value) -> str:
+    return json.dumps(value, ensure_ascii=False, separators=_JSON_SEPARATORS)
+
+
+def get_output_file_name(file_name: str, output_format: str) -> str:
+    """
+    Derives the relative path of the output file of a parsed file, which stays within the output directory.
+
+    Args:
+        file_name: The name of the parsed file, e.g. the path of an input or of a member of an archive
+        output_format: The output format, which gives the extension
+
+    Returns:
+        str: The relative path of the output file
+    """
+    parts = [part for part in file_name.replace("\\", "/").split("/")
+             if part not in ("", ".", "..") and not part.endswith(":")]
+    return os.path.join(*(parts or ["stdin"])) + "." + output_format
+
+
+class RecordWriter(ABC):
+    """
+    Writer of the records of a batch parse (see BatchParseService), which arrive in the order of the files.
+    """
+
+    @abstractmethod
+    def write(self, record: dict, line: bytes) -> None:
+        """
+        Writes a record.
+
+        Args:
+            record (dict): The record
+            line (bytes): The record as JSON line, as returned by the batch parse
+        """
+        pass
+
+    def close(self) -> None:
+        """
+        Completes the output.
+        """
+        pass
+
+
+class StreamRecordWriter(RecordWriter):
+    """
+    Writer of all records to a single stream, e.g. stdout: NDJSON as returned by the batch parse, a JSON array of
+    the records or CSV rows of the intervals of all files. Files with errors have no CSV rows.
+    """
+
+    def __init__(self, stream: BinaryIO, output_format: str = FORMAT_NDJSON):
+        """
+        Initialize the writer.
+
+        Args:
+            stream (BinaryIO): The binary stream to write to
+            output_format (str): One of OUTPUT_FORMATS
+        """
+        self.__stream = stream
+        self.__output_format = output_format
+        self.__record_count = 0
+
+    def write(self, record: dict, line: bytes) -> None:
+        if self.__output_format == FORMAT_NDJSON:
+            self.__stream.write(line)
+        elif self.__output_format == FORMAT_JSON:
+            self.__stream.write(b"[\n" if self.__record_count == 0 else b",\n")
+            self.__stream.write(line.rstrip(b"\n"))
+        else:
+            rows = iter_interval_rows(record["file_name"], record["result"]) if record["status"] == STATUS_OK else ()
+            self.__stream.write(_format_csv_rows(rows, with_header=self.__record_count == 0))
+        self.__record_count += 1
+
+    def close(self) -> None:
+        if self.__output_format == FORMAT_JSON:
+            self.__stream.write(b"[" if self.__record_count == 0 else b"\n")
+            self.__stream.write(b"]\n")
+        elif self.__output_format == FORMAT_CSV and self.__record_count == 0:
+            self.__stream.write(_format_csv_rows((), with_header=True))
+        self.__stream.flush()
+
+
+class DirectoryRecordWriter(RecordWriter):
+    """
+    Writer of one output file per parsed file to a directory, named after the file (see get_output_file_name):
+    the NDJSON record of the file, the parsed interchange as JSON or the CSV rows of its intervals. A file with an
+    error has no JSON or CSV output, an output of a previous run is removed, so that only complete files remain.
+    """
+
+    def __init__(self, output_dir: str, output_format: str = FORMAT_NDJSON):
+        """
+        Initialize the writer.
+
+        Args:
+            output_dir (str): The directory to write to, which is created if needed
+            output_format (str): One of OUTPUT_FORMATS
+        """
+        self.__output_dir = output_dir
+        self.__output_format = output_format
+
+    def write(self, record: dict, line: bytes) -> None:
+        path = os.path.join(self.__output_dir, get_output_file_name(record["file_name"], self.__output_format))
+        if self.__output_format == FORMAT_NDJSON:
+            content = line
+        elif record["status"] != STATUS_OK:
+            if os.path.exists(path):
+                os.remove(path)
+            return
+        elif self.__output_format == FORMAT_CSV:
+            content = _format_csv_rows(iter_interval_rows(record["file_name"], record["result"]), with_header=True)
+        else:
+            content = (_dump_json(record["result"]) + "\n").encode("utf-8")
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "wb") as file:
+            file.write(content)
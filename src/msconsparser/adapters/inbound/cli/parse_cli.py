@@ -0,0 +1,349 @@
+# coding: utf-8
+"""
+Command line interface of the batch parse, e.g. for backfills of archived MSCONS files.
+
+Example:
+    mscons-parse 'archive/2024/**/*.edi' monthly.tar.gz --format csv --output-dir parsed/ \
+        --workers 8 --manifest parsed/manifest.jsonl
+"""
+import argparse
+import glob
+import json
+import os
+import sys
+import time
+from collections import deque
+from contextlib import nullcontext
+from typing import BinaryIO, Callable, Iterator, Optional, Sequence, TextIO
+
+from msconsparser.adapters.inbound.cli.output_writers import (
+    FORMAT_NDJSON, OUTPUT_FORMATS, DirectoryRecordWriter, RecordWriter, StreamRecordWriter
+)
+from msconsparser.adapters.inbound.cli.parse_manifest import ParseManifest, hash_content
+from msconsparser.application.services import BatchParseService
+from msconsparser.application.services.batch_parse_service import STATUS_OK, BatchFileContent
+from msconsparser.libs.edifactmsconsparser.edifact_mscons_parser import DEFAULT_CHUNK_SIZE
+from msconsparser.libs.edifactmsconsparser.utils import iter_archive_members
+
+STDIN = "-"
+STDIN_NAME = "stdin"
+
+# The minimum number of seconds between two progress reports
+PROGRESS_INTERVAL_SECONDS = 0.5
+
+_GLOB_CHARACTERS = frozenset("*?[")
+
+
+def create_argument_parser() -> argparse.ArgumentParser:
+    """
+    Creates the argument parser of the batch parse command line interface.
+
+    Returns:
+        argparse.ArgumentParser: The argument parser
+    """
+    parser = argparse.ArgumentParser(
+        prog="mscons-parse",
+        description="Parses MSCONS files in parallel in a pool of worker processes. Zip, tar and tar.gz archives "
+                    "and gzip compressed files are read member by member.",
+    )
+    parser.add_argument("inputs", nargs="*", default=[STDIN],
+                        help="Files, directories (read recursively) or glob patterns ('**' matches directories), "
+                             "'-' or none for stdin")
+    parser.add_argument("--format", choices=OUTPUT_FORMATS, default=FORMAT_NDJSON,
+                        help="ndjson: one record per file, json: a JSON array of the records, "
+                             "or one parsed interchange per file with --output-dir, csv: one row per interval")
+    parser.add_argument("--output-dir", default=None,
+                        help="Directory to write one output file per parsed file to, instead of stdout")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Number of worker processes (default: PARSE_BATCH_WORKERS or the number of CPUs)")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE,
+                        help="Minimum number of characters of a chunk of messages parsed by one worker")
+    parser.add_argument("--manifest", default=None,
+                        help="File recording the content hashes of the parsed inputs, inputs parsed without errors "
+                             "by a previous run are skipped")
+    parser.add_argument("--progress", action=argparse.BooleanOptionalAction, default=None,
+                        help="Report the progress on stderr (default: if stderr is a terminal)")
+    parser.add_argument("--quiet", action="store_true", help="Report neither the progress nor the throughput")
+    return parser
+
+
+def iter_input_paths(inputs: Sequence[str], excluded_paths: Sequence[str] = ()) -> Iterator[str]:
+    """
+    Resolves the inputs of the command line into the paths of the files to parse.
+
+    Args:
+        inputs: Files, directories, glob patterns or STDIN
+        excluded_paths: Files or directories which are not parsed, e.g. the manifest and the output directory
+
+    Yields:
+        str: The path of each file, directories are read recursively in sorted order. An input which neither
+            exists nor matches any file is returned as is, so that it results in an error record.
+    """
+    excluded = tuple(os.path.realpath(path) for path in excluded_paths)
+    for path in _iter_paths(inputs):
+        real_path = os.path.realpath(path)
+        if path == STDIN or not any(real_path == excluded_path or real_path.startswith(excluded_path + os.sep)
+                                    for excluded_path in excluded):
+            yield path
+
+
+def _iter_paths(inputs: Sequence[str]) -> Iterator[str]:
+    for input_path in inputs:
+        if input_path == STDIN or os.path.isfile(input_path):
+            yield input_path
+        elif os.path.isdir(input_path):
+            for directory, directory_names, file_names in os.walk(input_path):
+                directory_names.sort()
+                for file_name in sorted(file_names):
+                    yield os.path.join(directory, file_name)
+        elif _GLOB_CHARACTERS.intersection(input_path):
+            matches = sorted(path for path in glob.glob(input_path, recursive=True) if os.path.isfile(path))
+            yield from matches if matches else (input_path,)
+        else:
+            yield input_path
+
+
+def get_member_name(input_name: str, member_name: str) -> str:
+    """
+    Names a file of an input: a file which is no archive keeps the name of the input, a member of an archive is
+    named by the path of the archive and the path of the member.
+
+    Args:
+        input_name: The name of the input
+        member_name: The name of the file as returned by iter_archive_members
+
+    Returns:
+        str: The name of the file in the records
+    """
+    if member_name == input_name or (input_name.lower().endswith(".gz") and member_name == input_name[:-3]):
+        return member_name
+    return f"{input_name}/{member_name}"
+
+
+class BatchInput:
+    """
+    An input of the command line, whose files are parsed as consecutive files of the batch.
+    """
+
+    def __init__(self, name: str, first_index: int, content_hash: Optional[str] = None, size: int = 0):
+        """
+        Initialize the input.
+
+        Args:
+            name (str): The path of the input
+            first_index (int): The index of the first file of the input in the batch
+            content_hash (Optional[str]): The content hash of the input, if it is recorded in a manifest
+            size (int): The size of the input in bytes, if known
+        """
+        self.name = name
+        self.first_index = first_index
+        self.content_hash = content_hash
+        self.size = size
+        self.is_ok = True
+
+
+class BatchProgress:
+    """
+    Counters of a batch parse, which are reported as progress and throughput on stderr.
+    """
+
+    def __init__(self, stream: TextIO, show_progress: bool, clock: Callable[[], float] = time.perf_counter):
+        """
+        Initialize the counters.
+
+        Args:
+            stream (TextIO): The stream to report to, e.g. stderr
+            show_progress (bool): True if the progress is reported while the batch is parsed
+            clock (Callable[[], float]): The source of the elapsed time in seconds
+        """
+        self.__stream = stream
+        self.__show_progress = show_progress
+        self.__clock = clock
+        self.__start = clock()
+        self.__last_report = self.__start
+        self.file_count = 0
+        self.error_count = 0
+        self.skipped_count = 0
+        self.byte_count = 0
+
+    def add_record(self, record: dict) -> None:
+        """
+        Counts a record and reports the progress at most every PROGRESS_INTERVAL_SECONDS.
+
+        Args:
+            record (dict): The record of a file
+        """
+        self.file_count += 1
+        if record["status"] != STATUS_OK:
+            self.error_count += 1
+        if self.__show_progress and self.__clock() - self.__last_report >= PROGRESS_INTERVAL_SECONDS:
+            self.__last_report = self.__clock()
+            self.__stream.write(f"\r{self.format()}")
+            self.__stream.flush()
+
+    def format(self) -> str:
+        """
+        Formats the counters and the throughput.
+
+        Returns:
+            str: The report
+        """
+        seconds = max(self.__clock() - self.__start, 1e-9)
+        megabytes = self.byte_count / (1024 * 1024)
+        return (f"Parsed {self.file_count} files ({self.error_count} errors, "
+                f"{self.skipped_count} skipped) with {megabytes:.1f} MB in {seconds:.2f} s: "
+                f"{self.file_count / seconds:.1f} files/s, {megabytes / seconds:.2f} MB/s")
+
+    def report(self) -> None:
+        """
+        Reports the final counters and the throughput.
+        """
+        prefix = "\r" if self.__show_progress else ""
+        self.__stream.write(f"{prefix}{self.format()}\n")
+        self.__stream.flush()
+
+
+def iter_batch_files(
+        paths: Iterator[str],
+        started_inputs: deque,
+        manifest: Optional[ParseManifest] = None,
+        progress: Optional[BatchProgress] = None,
+        stdin: Optional[BinaryIO] = None,
+) -> Iterator[tuple[str, BatchFileContent]]:
+    """
+    Opens the inputs one at a time and returns their files as streams, archives are read member by member.
+
+    Args:
+        paths: The paths of the inputs (see iter_input_paths)
+        started_inputs: The queue to append each input to, before its first file is returned
+        manifest: The manifest of the inputs parsed by previous runs, which are skipped like the inputs with the
+            content of an input of this run
+        progress: The counters of the skipped inputs
+        stdin: The binary stream of STDIN, defaults to sys.stdin
+
+    Yields:
+        tuple[str, BatchFileContent]: The name and the stream of each file, or the exception raised while reading it
+    """
+    index = 0
+    content_hashes = set()
+    for path in paths:
+        try:
+            fileobj = (stdin or sys.stdin.buffer) if path == STDIN else open(path, "rb")
+        except OSError as ex:
+            started_inputs.append(BatchInput(path, index))
+            yield path, ex
+            index += 1
+            continue
+        input_name = STDIN_NAME if path == STDIN else path
+        # STDIN stays open
+        with nullcontext(fileobj) if path == STDIN else fileobj:
+            content_hash = None
+            size = 0
+            if path != STDIN:
+                size = os.fstat(fileobj.fileno()).st_size
+                if manifest is not None:
+                    content_hash = hash_content(fileobj)
+                    if manifest.is_parsed(content_hash) or content_hash in content_hashes:
+                        if progress is not None:
+                            progress.skipped_count += 1
+                        continue
+                    content_hashes.add(content_hash)
+            started_inputs.append(BatchInput(input_name, index, content_hash, size))
+            try:
+                for member_name, content in iter_archive_members(fileobj, input_name):
+                    yield get_member_name(input_name, member_name), content
+                    index += 1
+            except Exception as ex:
+                yield input_name, ex
+                index += 1
+
+
+def run_batch(
+        service: BatchParseService,
+        paths: Iterator[str],
+        writer: RecordWriter,
+        progress: BatchProgress,
+        manifest: Optional[ParseManifest] = None,
+        stdin: Optional[BinaryIO] = None,
+) -> None:
+    """
+    Parses the inputs and writes their records in the order of the inputs, the inputs are recorded in the
+    manifest as soon as all their records are written.
+
+    Args:
+        service: The batch parse service
+        paths: The paths of the inputs
+        writer: The writer of the records
+        progress: The counters of the batch
+        manifest: The manifest of the parsed inputs, if any
+        stdin: The binary stream of STDIN, defaults to sys.stdin
+    """
+    started_inputs: deque[BatchInput] = deque()
+    current_input: Optional[BatchInput] = None
+
+    def finish(batch_input: Optional[BatchInput]) -> None:
+        if batch_input is None:
+            return
+        progress.byte_count += batch_input.size
+        if manifest is not None and batch_input.content_hash is not None:
+            manifest.record(batch_input.content_hash, batch_input.name, batch_input.is_ok)
+
+    files = iter_batch_files(paths, started_inputs, manifest=manifest, progress=progress, stdin=stdin)
+    for line in service.iter_records(files):
+        record = json.loads(line)
+        # The records arrive in the order of the files, so an input is complete once a record of a later input
+        # arrives. An input without files is complete as soon as the next input starts.
+        while started_inputs and started_inputs[0].first_index <= record["index"]:
+            finish(current_input)
+            current_input = started_inputs.popleft()
+        current_input.is_ok = current_input.is_ok and record["status"] == STATUS_OK
+        writer.write(record, line)
+        progress.add_record(record)
+    finish(current_input)
+    while started_inputs:
+        finish(started_inputs.popleft())
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """
+    Runs the batch parse command line interface.
+
+    Args:
+        argv: The command line arguments, defaults to sys.argv
+
+    Returns:
+        int: The exit code, 1 if any file could not be parsed
+    """
+    parser = create_argument_parser()
+    args = parser.parse_args(argv)
+    if args.workers is not None and args.workers <= 0:
+        parser.error(f"Expected a positive number of workers, but got {args.workers}")
+    if args.chunk_size <= 0:
+        parser.error(f"Expected a positive chunk size, but got {args.chunk_size}")
+
+    show_progress = not args.quiet and (sys.stderr.isatty() if args.progress is None else args.progress)
+    progress = BatchProgress(sys.stderr, show_progress)
+    if args.output_dir is not None:
+        os.makedirs(args.output_dir, exist_ok=True)
+        writer = DirectoryRecordWriter(args.output_dir, args.format)
+    else:
+        writer = StreamRecordWriter(sys.stdout.buffer, args.format)
+    manifest = ParseManifest(args.manifest) if args.manifest is not None else None
+    service = BatchParseService(max_workers=args.workers, chunk_size=args.chunk_size)
+
+    try:
+        excluded_paths = [path for path in (args.manifest, args.output_dir) if path is not None]
+        run_batch(service, iter_input_paths(args.inputs, excluded_paths), writer, progress, manifest=manifest)
+    except KeyboardInterrupt:
+        # The manifest keeps the inputs completed so far, so that the batch can be resumed
+        print("\nInterrupted", file=sys.stderr)
+        return 130
+    finally:
+        writer.close()
+        service.shutdown()
+        if manifest is not None:
+            manifest.close()
+
+    if not args.quiet:
+        progress.report()
+    return 1 if progress.error_count else 0
@@ -0,0 +1,113 @@
+# coding: utf-8
+
+import hashlib
+import json
+import os
+from datetime import datetime, timezone
+from typing import BinaryIO, Optional, TextIO
+
+STATUS_OK = "ok"
+STATUS_ERROR = "error"
+
+# The number of bytes read at a time while hashing a file
+HASH_BLOCK_SIZE = 1024 * 1024
+
+
+def hash_content(fileobj: BinaryIO) -> str:
+    """
+    Computes the content hash of a file, which identifies the file in the manifest regardless of its name.
+
+    Args:
+        fileobj: The seekable binary stream of the file, which is read from its current position and reset to it
+
+    Returns:
+        str: The SHA-256 hex digest of the content
+    """
+    start = fileobj.tell()
+    digest = hashlib.sha256()
+    for block in iter(lambda: fileobj.read(HASH_BLOCK_SIZE), b""):
+        digest.update(block)
+    fileobj.seek(start)
+    return digest.hexdigest()
+
+
+class ParseManifest:
+    """
+    Manifest of the files already parsed, so that a backfill can be resumed without parsing them again.
+
+    The manifest is a file of JSON lines, one per parsed input: {"sha256", "input", "status", "parsed_at"}. A line
+    is appended as soon as all records of an input are written, so that an interrupted run keeps its progress.
+    An input is skipped if its content hash is recorded with the status "ok", inputs with errors are parsed again.
+    """
+
+    def __init__(self, path: str):
+        """
+        Initialize the manifest and load the inputs recorded so far.
+
+        Args:
+            path (str): The path of the manifest file, which is created on the first recorded input
+        """
+        self.__path = path
+        self.__parsed_hashes: set[str] = set()
+        self.__file: Optional[TextIO] = None
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as file:
+                for line in file:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        # A line truncated by an interrupted run
+                        continue
+                    if entry.get("status") == STATUS_OK:
+                        self.__parsed_hashes.add(entry.get("sha256"))
+
+    @property
+    def path(self) -> str:
+        return self.__path
+
+    def is_parsed(self, content_hash: str) -> bool:
+        """
+        Checks if an input was parsed without errors by a previous run.
+
+        Args:
+            content_hash (str): The content hash of the input
+
+        Returns:
+            bool: True if the input can be skipped
+        """
+        return content_hash in self.__parsed_hashes
+
+    def record(self, content_hash: str, input_name: str, is_ok: bool) -> None:
+        """
+        Records a parsed input.
+
+        Args:
+            content_hash (str): The content hash of the input
+            input_name (str): The path of the input
+            is_ok (bool): True if all files of the input were parsed without errors
+        """
+        if self.__file is None:
+            directory = os.path.dirname(os.path.abspath(self.__path))
+            os.makedirs(directory, exist_ok=True)
+            self.__file = open(self.__path, "a", encoding="utf-8")
+        entry = {
+            "sha256": content_hash,
+            "input": input_name,
+            "status": STATUS_OK if is_ok else STATUS_ERROR,
+            "parsed_at": datetime.now(timezone.utc).isoformat(),
+        }
+        self.__file.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        self.__file.flush()
+        if is_ok:
+            self.__parsed_hashes.add(content_hash)
+
+    def close(self) -> None:
+        """
+        Closes the manifest file.
+        """
+        if self.__file is not None:
+            self.__file.close()
+            self.__file = None
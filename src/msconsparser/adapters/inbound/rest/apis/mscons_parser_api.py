@@ -25,6 +25,9 @@ from fastapi import (  # noqa: F401
 )
 
 from msconsparser.adapters.inbound.rest.models.extra_models import TokenModel  # noqa: F401
+from msconsparser.libs.edifactmsconsparser.interchange_pages import (
+    DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, PAGE_BY_MESSAGES, PAGE_BY_VALUES
+)
 from pydantic import Field, StrictBool, StrictBytes, StrictStr
 from typing_extensions import Annotated
 
@@ -35,16 +38,52 @@ ns_pkg = msconsparser.adapters.inbound.rest.impl
 for _, name, _ in pkgutil.iter_modules(ns_pkg.__path__, ns_pkg.__name__ + "."):
     importlib.import_module(name)
 
+# The message selection and page request of the parse endpoints are read from the query parameters by the
+# message_selection_middleware (see parse_mscons_routers), they are declared here for the OpenAPI only
+MESSAGE_SELECTION_PARAMETERS = [
+    {"name": "message_index", "in": "query", "required": False, "schema": {"type": "integer", "minimum": 0},
+     "description": "The position of the single message to return, starting at 0. "
+                    "Must not be combined with offset or limit."},
+    {"name": "offset", "in": "query", "required": False, "schema": {"type": "integer", "minimum": 0, "default": 0},
+     "description": "The position of the first message to return, starting at 0."},
+    {"name": "limit", "in": "query", "required": False, "schema": {"type": "integer", "minimum": 0},
+     "description": "The number of messages to return at most, defaults to all messages from the offset on."},
+    {"name": "page_by", "in": "query", "required": False,
+     "schema": {"type": "string", "enum": list(PAGE_BY_VALUES), "default": PAGE_BY_MESSAGES},
+     "description": "Returns a page of the messages or of the measurements. "
+                    "Must not be combined with message_index, offset or limit."},
+    {"name": "page_size", "in": "query", "required": False,
+     "schema": {"type": "integer", "minimum": 1, "maximum": MAX_PAGE_SIZE, "default": DEFAULT_PAGE_SIZE},
+     "description": "The number of messages or measurements of the page at most."},
+    {"name": "cursor", "in": "query", "required": False, "schema": {"type": "string"},
+     "description": "The cursor of the page, as returned in the X-Next-Cursor header of the previous page."},
+    {"name": "location", "in": "query", "required": False, "schema": {"type": "string"},
+     "description": "Returns only the messages or location objects (SG6) with the location ID of a page."},
+    {"name": "from", "in": "query", "required": False, "schema": {"type": "string", "format": "date-time"},
+     "description": "Returns only the intervals ending after the timestamp of a measurement page."},
+    {"name": "to", "in": "query", "required": False, "schema": {"type": "string", "format": "date-time"},
+     "description": "Returns only the intervals starting before the timestamp of a measurement page."},
+]
+MESSAGE_SELECTION_HEADERS = {
+    "X-Message-Count": {"description": "The number of messages of the interchange, if messages or a page "
+                                       "are selected.", "schema": {"type": "integer"}},
+    "X-Next-Cursor": {"description": "The cursor of the next page, if a page is requested and further messages "
+                                     "or measurements follow.", "schema": {"type": "string"}},
+}
+
 
 @router.post(
     "/download-parsed-raw-format",
     responses={
-        201: {"model": object, "description": "Created"},
+        201: {"model": object, "description": "Created", "headers": MESSAGE_SELECTION_HEADERS},
         400: {"description": "Bad request"},
+        413: {"description": "Payload too large (parse budget exceeded, i.e. more than 2442 lines in the limit mode or more than the configured PARSE_BUDGET_<ENDPOINT>_MAX_SEGMENTS, _MAX_BYTES or _MAX_SECONDS)"},
+        503: {"description": "Service unavailable (parse cancelled)"},
         401: {"description": "Unauthorized"},
         403: {"description": "Forbidden"},
     },
     tags=["MSCONS Parser"],
+    openapi_extra={"parameters": MESSAGE_SELECTION_PARAMETERS},
     summary="Trigger the process to parse the provided mscons messages as string format and download the result as a JSON file.",
     response_model_by_alias=True,
 )
@@ -101,17 +140,20 @@ UNZ+1+ABC4711'"""
 @router.post(
     "/parse-raw-file",
     responses={
-        200: {"model": object, "description": "OK"},
+        200: {"model": object, "description": "OK", "headers": MESSAGE_SELECTION_HEADERS},
         400: {"description": "Bad request"},
+        413: {"description": "Payload too large (parse budget exceeded, i.e. more than 2442 lines in the limit mode or more than the configured PARSE_BUDGET_<ENDPOINT>_MAX_SEGMENTS, _MAX_BYTES or _MAX_SECONDS)"},
+        503: {"description": "Service unavailable (parse cancelled)"},
         401: {"description": "Unauthorized"},
         403: {"description": "Forbidden"},
     },
     tags=["MSCONS Parser"],
+    openapi_extra={"parameters": MESSAGE_SELECTION_PARAMETERS},
     summary="Trigger the process to parse the provided mscons messages from a text file.",
     response_model_by_alias=True,
 )
 async def parse_mscons_file(
-    limit_mode: Annotated[StrictBool, Field(description="If true, enables the parsing limit for max number of lines, as per default it is maximum 2442 lines.")] = Query(True, description="If true, enables the parsing limit for max number of lines, as per default it is maximum 2442 lines.", alias="limit_mode"),
+    limit_mode: Annotated[StrictBool, Field(description="If true, enables the parsing limit for max number of lines, as per default it is maximum 2442 lines. A message exceeding the limit is answered with status 413. The bytes are only limited if PARSE_BUDGET_<ENDPOINT>_MAX_BYTES is configured.")] = Query(True, description="If true, enables the parsing limit for max number of lines, as per default it is maximum 2442 lines. A message exceeding the limit is answered with status 413. The bytes are only limited if PARSE_BUDGET_<ENDPOINT>_MAX_BYTES is configured.", alias="limit_mode"),
     body: Annotated[Union[StrictBytes, StrictStr, Tuple[StrictStr, StrictBytes]], Field(description="The raw MSCONS message as a file.")] = Body(None, description="The raw MSCONS message as a file.", media_type="application/octet-stream"),
 ) -> object:
     if not BaseMSCONSParserApi.subclasses:
@@ -123,17 +165,20 @@ async def parse_mscons_file(
 @router.post(
     "/parse-raw-format",
     responses={
-        200: {"model": object, "description": "OK"},
+        200: {"model": object, "description": "OK", "headers": MESSAGE_SELECTION_HEADERS},
         400: {"description": "Bad request"},
+        413: {"description": "Payload too large (parse budget exceeded, i.e. more than 2442 lines in the limit mode or more than the configured PARSE_BUDGET_<ENDPOINT>_MAX_SEGMENTS, _MAX_BYTES or _MAX_SECONDS)"},
+        503: {"description": "Service unavailable (parse cancelled)"},
         401: {"description": "Unauthorized"},
         403: {"description": "Forbidden"},
     },
     tags=["MSCONS Parser"],
+    openapi_extra={"parameters": MESSAGE_SELECTION_PARAMETERS},
     summary="Trigger the process to parse the provided mscons messages as string format.",
     response_model_by_alias=True,
 )
 async def parse_mscons_raw_format(
-    limit_mode: Annotated[StrictBool, Field(description="If true, enables the parsing limit for max number of lines, as per default it is maximum 2442 lines.")] = Query(True, description="If true, enables the parsing limit for max number of lines, as per default it is maximum 2442 lines.", alias="limit_mode"),
+    limit_mode: Annotated[StrictBool, Field(description="If true, enables the parsing limit for max number of lines, as per default it is maximum 2442 lines. A message exceeding the limit is answered with status 413. The bytes are only limited if PARSE_BUDGET_<ENDPOINT>_MAX_BYTES is configured.")] = Query(True, description="If true, enables the parsing limit for max number of lines, as per default it is maximum 2442 lines. A message exceeding the limit is answered with status 413. The bytes are only limited if PARSE_BUDGET_<ENDPOINT>_MAX_BYTES is configured.", alias="limit_mode"),
     body: Annotated[
         StrictStr,
         Field(description="The raw MSCONS message as plain text.")] = Body(
@@ -186,12 +231,15 @@ UNZ+1+ABC4711'"""
 @router.post(
     "/download-parsed-raw-file",
     responses={
-        201: {"model": object, "description": "Created"},
+        201: {"model": object, "description": "Created", "headers": MESSAGE_SELECTION_HEADERS},
         400: {"description": "Bad request"},
+        413: {"description": "Payload too large (parse budget exceeded, i.e. more than 2442 lines in the limit mode or more than the configured PARSE_BUDGET_<ENDPOINT>_MAX_SEGMENTS, _MAX_BYTES or _MAX_SECONDS)"},
+        503: {"description": "Service unavailable (parse cancelled)"},
         401: {"description": "Unauthorized"},
         403: {"description": "Forbidden"},
     },
     tags=["MSCONS Parser"],
+    openapi_extra={"parameters": MESSAGE_SELECTION_PARAMETERS},
     summary="Trigger the process to parse the provided mscons messages as file and download the result as a JSON file.",
     response_model_by_alias=True,
 )
@@ -0,0 +1,80 @@
+# coding: utf-8
+
+from typing import ClassVar, Dict, List, Tuple  # noqa: F401
+
+from datetime import datetime
+from pydantic import Field, StrictBool, StrictBytes, StrictStr, field_validator
+from typing import Any, Dict, Optional, Tuple, Union
+from typing_extensions import Annotated
+
+
+class BaseMSCONSParserApi:
+    subclasses: ClassVar[Tuple] = ()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        BaseMSCONSParserApi.subclasses = BaseMSCONSParserApi.subclasses + (cls,)
+    async def download_parsed_file_result(
+        self,
+        body: Annotated[Union[StrictBytes, StrictStr, Tuple[StrictStr, StrictBytes]], Field(description="The raw MSCONS message as a file.")],
+        message_index: Annotated[Optional[Annotated[int, Field(strict=True, ge=0)]], Field(description="The position of the single message to return, starting at 0. Must not be combined with offset or limit.")],
+        offset: Annotated[Optional[Annotated[int, Field(strict=True, ge=0)]], Field(description="The position of the first message to return, starting at 0.")],
+        limit: Annotated[Optional[Annotated[int, Field(strict=True, ge=0)]], Field(description="The number of messages to return at most, defaults to all messages from the offset on.")],
+        page_by: Annotated[Optional[StrictStr], Field(description="Returns a page of the messages or of the measurements. Must not be combined with message_index, offset or limit.")],
+        page_size: Annotated[Optional[Annotated[int, Field(le=10000, strict=True, ge=1)]], Field(description="The number of messages or measurements of the page at most.")],
+        cursor: Annotated[Optional[StrictStr], Field(description="The cursor of the page, as returned in the X-Next-Cursor header of the previous page.")],
+        location: Annotated[Optional[StrictStr], Field(description="Returns only the messages or location objects (SG6) with the location ID of a page.")],
+        var_from: Annotated[Optional[datetime], Field(description="Returns only the intervals ending after the timestamp of a measurement page.")],
+        to: Annotated[Optional[datetime], Field(description="Returns only the intervals starting before the timestamp of a measurement page.")],
+    ) -> object:
+        ...
+
+
+    async def download_parsed_result(
+        self,
+        body: Annotated[StrictStr, Field(description="The raw MSCONS message as plain text.")],
+        message_index: Annotated[Optional[Annotated[int, Field(strict=True, ge=0)]], Field(description="The position of the single message to return, starting at 0. Must not be combined with offset or limit.")],
+        offset: Annotated[Optional[Annotated[int, Field(strict=True, ge=0)]], Field(description="The position of the first message to return, starting at 0.")],
+        limit: Annotated[Optional[Annotated[int, Field(strict=True, ge=0)]], Field(description="The number of messages to return at most, defaults to all messages from the offset on.")],
+        page_by: Annotated[Optional[StrictStr], Field(description="Returns a page of the messages or of the measurements. Must not be combined with message_index, offset or limit.")],
+        page_size: Annotated[Optional[Annotated[int, Field(le=10000, strict=True, ge=1)]], Field(description="The number of messages or measurements of the page at most.")],
+        cursor: Annotated[Optional[StrictStr], Field(description="The cursor of the page, as returned in the X-Next-Cursor header of the previous page.")],
+        location: Annotated[Optional[StrictStr], Field(description="Returns only the messages or location objects (SG6) with the location ID of a page.")],
+        var_from: Annotated[Optional[datetime], Field(description="Returns only the intervals ending after the timestamp of a measurement page.")],
+        to: Annotated[Optional[datetime], Field(description="Returns only the intervals starting before the timestamp of a measurement page.")],
+    ) -> object:
+        ...
+
+
+    async def parse_mscons_file(
+        self,
+        limit_mode: Annotated[StrictBool, Field(description="If true, enables the parsing limit for max number of lines, as per default it is maximum 2442 lines and 1 MiB. A message exceeding the limit is answered with status 413.")],
+        body: Annotated[Union[StrictBytes, StrictStr, Tuple[StrictStr, StrictBytes]], Field(description="The raw MSCONS message as a file.")],
+        message_index: Annotated[Optional[Annotated[int, Field(strict=True, ge=0)]], Field(description="The position of the single message to return, starting at 0. Must not be combined with offset or limit.")],
+        offset: Annotated[Optional[Annotated[int, Field(strict=True, ge=0)]], Field(description="The position of the first message to return, starting at 0.")],
+        limit: Annotated[Optional[Annotated[int, Field(strict=True, ge=0)]], Field(description="The number of messages to return at most, defaults to all messages from the offset on.")],
+        page_by: Annotated[Optional[StrictStr], Field(description="Returns a page of the messages or of the measurements. Must not be combined with message_index, offset or limit.")],
+        page_size: Annotated[Optional[Annotated[int, Field(le=10000, strict=True, ge=1)]], Field(description="The number of messages or measurements of the page at most.")],
+        cursor: Annotated[Optional[StrictStr], Field(description="The cursor of the page, as returned in the X-Next-Cursor header of the previous page.")],
+        location: Annotated[Optional[StrictStr], Field(description="Returns only the messages or location objects (SG6) with the location ID of a page.")],
+        var_from: Annotated[Optional[datetime], Field(description="Returns only the intervals ending after the timestamp of a measurement page.")],
+        to: Annotated[Optional[datetime], Field(description="Returns only the intervals starting before the timestamp of a measurement page.")],
+    ) -> object:
+        ...
+
+
+    async def parse_mscons_raw_format(
+        self,
+        limit_mode: Annotated[StrictBool, Field(description="If true, enables the parsing limit for max number of lines, as per default it is maximum 2442 lines and 1 MiB. A message exceeding the limit is answered with status 413.")],
+        body: Annotated[StrictStr, Field(description="The raw MSCONS message as plain text.")],
+        message_index: Annotated[Optional[Annotated[int, Field(strict=True, ge=0)]], Field(description="The position of the single message to return, starting at 0. Must not be combined with offset or limit.")],
+        offset: Annotated[Optional[Annotated[int, Field(strict=True, ge=0)]], Field(description="The position of the first message to return, starting at 0.")],
+        limit: Annotated[Optional[Annotated[int, Field(strict=True, ge=0)]], Field(description="The number of messages to return at most, defaults to all messages from the offset on.")],
+        page_by: Annotated[Optional[StrictStr], Field(description="Returns a page of the messages or of the measurements. Must not be combined with message_index, offset or limit.")],
+        page_size: Annotated[Optional[Annotated[int, Field(le=10000, strict=True, ge=1)]], Field(description="The number of messages or measurements of the page at most.")],
+        cursor: Annotated[Optional[StrictStr], Field(description="The cursor of the page, as returned in the X-Next-Cursor header of the previous page.")],
+        location: Annotated[Optional[StrictStr], Field(description="Returns only the messages or location objects (SG6) with the location ID of a page.")],
+        var_from: Annotated[Optional[datetime], Field(description="Returns only the intervals ending after the timestamp of a measurement page.")],
+        to: Annotated[Optional[datetime], Field(description="Returns only the intervals starting before the timestamp of a measurement page.")],
+    ) -> object:
+        ...
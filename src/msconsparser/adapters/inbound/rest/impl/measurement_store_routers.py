@@ -0,0 +1,225 @@
+# coding: utf-8
+
+import functools
+import logging
+import threading
+from datetime import datetime
+from typing import Optional
+
+from fastapi import APIRouter, Query, Request, status
+from starlette.concurrency import run_in_threadpool
+from starlette.responses import JSONResponse
+from typing_extensions import Annotated
+
+from msconsparser.adapters.inbound.rest.impl.parse_cancellation_routers import (
+    get_request_cancel_token, record_cancelled_parse
+)
+from msconsparser.adapters.inbound.rest.impl.parse_mscons_routers import (
+    HTTP_413_CONTENT_TOO_LARGE, SERVER_TIMING_HEADER
+)
+from msconsparser.adapters.outbound.sqlite import SQLiteMeasurementStore
+from msconsparser.application.services import MeasurementStoreService
+from msconsparser.application.services.measurement_store_service import (
+    get_measurement_store_dedup_mode, get_measurement_store_dedup_path, get_measurement_store_path
+)
+from msconsparser.libs.edifactmsconsparser.exceptions import (
+    DuplicateInterchangeException, ParseBudgetExceededException, ParseCancelledException
+)
+from msconsparser.libs.edifactmsconsparser.utils import decode_edifact_bytes
+from msconsparser.libs.edifactmsconsparser.wrappers import DuplicateIndex, ParseBudget, ParsePhase, ParseStatistics
+
+logger = logging.getLogger(__name__)
+
+MEASUREMENT_STORE_INTERCHANGES_PATH = "/measurement-store/interchanges"
+MEASUREMENT_STORE_MEASUREMENTS_PATH = "/measurement-store/measurements"
+# The environment variables PARSE_BUDGET_MEASUREMENT_STORE_MAX_SEGMENTS, _MAX_BYTES and _MAX_SECONDS limit the parse
+MEASUREMENT_STORE_BUDGET_PREFIX = "PARSE_BUDGET_MEASUREMENT_STORE"
+MAX_INTERCHANGES_LIMIT = 1000
+MAX_MEASUREMENTS_LIMIT = 100000
+
+router = APIRouter()
+
+_measurement_store_service: Optional[MeasurementStoreService] = None
+_measurement_store_service_lock = threading.Lock()
+
+
+def get_measurement_store_service() -> Optional[MeasurementStoreService]:
+    """
+    Returns the measurement store service of this process, which is created on first use. Resent interchanges
+    and messages are detected if MEASUREMENT_STORE_DEDUP is set, their keys are persisted to
+    MEASUREMENT_STORE_DEDUP_PATH, if set.
+
+    Returns:
+        Optional[MeasurementStoreService]: The shared service, or None if no database is configured via the
+            environment variable MEASUREMENT_STORE_PATH
+    """
+    global _measurement_store_service
+    with _measurement_store_service_lock:
+        if _measurement_store_service is None:
+            path = get_measurement_store_path()
+            if path is not None:
+                dedup_mode = get_measurement_store_dedup_mode()
+                if dedup_mode is None:
+                    _measurement_store_service = MeasurementStoreService(SQLiteMeasurementStore(path))
+                else:
+                    _measurement_store_service = MeasurementStoreService(
+                        SQLiteMeasurementStore(path),
+                        duplicate_index=DuplicateIndex(get_measurement_store_dedup_path()),
+                        duplicate_mode=dedup_mode,
+                    )
+        return _measurement_store_service
+
+
+def shutdown_measurement_store_service() -> None:
+    """
+    Closes the database of the measurement store, if the service was used.
+    """
+    global _measurement_store_service
+    with _measurement_store_service_lock:
+        service, _measurement_store_service = _measurement_store_service, None
+    if service is not None:
+        service.close()
+
+
+def _error_response(status_code: int, error_message: str) -> JSONResponse:
+    return JSONResponse(status_code=status_code, content={"error_message": error_message})
+
+
+def _store_not_configured() -> JSONResponse:
+    return _error_response(status.HTTP_404_NOT_FOUND,
+                           "Measurement store not configured, set MEASUREMENT_STORE_PATH to enable it")
+
+
+def _decode_and_store(service: MeasurementStoreService, body: bytes, source: Optional[str],
+                      statistics: ParseStatistics, budget: ParseBudget, cancel_token) -> dict:
+    with statistics.measure(ParsePhase.DECODE):
+        message_content = decode_edifact_bytes(body)
+    return service.store_message(
+        message_content,
+        source=source,
+        statistics=statistics,
+        budget=None if budget.is_unlimited else budget,
+        cancel_token=cancel_token,
+    )
+
+
+@router.post(
+    MEASUREMENT_STORE_INTERCHANGES_PATH,
+    responses={
+        201: {"description": "Created"},
+        400: {"description": "Bad request"},
+        404: {"description": "Measurement store not configured"},
+        409: {"description": "Duplicate interchange or message"},
+        413: {"description": "Payload too large"},
+        503: {"description": "Parse cancelled"},
+    },
+    tags=["Measurement Store"],
+    summary="Parses a raw MSCONS message and stores its measurements",
+    response_model_by_alias=True,
+)
+async def store_interchange(
+        request: Request,
+        source: Annotated[Optional[str], Query(description="The origin of the interchange, e.g. its file name")] = None,
+) -> JSONResponse:
+    """
+    Parses the raw MSCONS message of the request body and stores the interchange with its messages, location
+    objects and intervals in the measurement store in one transaction. Returns the ID of the stored interchange
+    and the number of stored messages, locations and measurements.
+
+    If duplicates are detected (MEASUREMENT_STORE_DEDUP), a rejected duplicate is answered with status 409, flagged
+    duplicate messages are not stored and listed in 'duplicates' with the estimated seconds saved, and a flagged
+    duplicate interchange is not stored at all and answered with status 200.
+    """
+    service = get_measurement_store_service()
+    if service is None:
+        return _store_not_configured()
+
+    statistics = ParseStatistics()
+    budget = ParseBudget.from_environment(MEASUREMENT_STORE_BUDGET_PREFIX)
+    cancel_token = get_request_cancel_token()
+    body = await request.body()
+    statistics.byte_count = len(body)
+    if not body:
+        return _error_response(status.HTTP_400_BAD_REQUEST, "No message provided")
+    try:
+        budget.check_bytes(statistics.byte_count)
+        # The database is written outside of the event loop
+        summary = await run_in_threadpool(
+            functools.partial(_decode_and_store, service, body, source, statistics, budget, cancel_token)
+        )
+    except ParseBudgetExceededException as ex:
+        return _error_response(HTTP_413_CONTENT_TOO_LARGE, str(ex))
+    except ParseCancelledException as ex:
+        record_cancelled_parse(ex)
+        return _error_response(status.HTTP_503_SERVICE_UNAVAILABLE, str(ex))
+    except DuplicateInterchangeException as ex:
+        return JSONResponse(status_code=status.HTTP_409_CONFLICT,
+                            content={"error_message": str(ex), "duplicate": ex.duplicate.as_dict()})
+    except Exception as ex:
+        # An invalid interchange (CONTRLException, MSCONSParserException) is a bad request like any other error
+        return _error_response(status.HTTP_400_BAD_REQUEST, str(ex))
+
+    stored = summary["interchange_id"] is not None
+    response = JSONResponse(status_code=status.HTTP_201_CREATED if stored else status.HTTP_200_OK, content=summary)
+    response.headers[SERVER_TIMING_HEADER] = statistics.to_server_timing()
+    logger.info("Stored MSCONS interchange", extra={"parse_stats": statistics.as_dict(), **summary})
+    return response
+
+
+@router.get(
+    MEASUREMENT_STORE_INTERCHANGES_PATH,
+    responses={
+        200: {"description": "OK"},
+        404: {"description": "Measurement store not configured"},
+    },
+    tags=["Measurement Store"],
+    summary="Lists the stored interchanges",
+    response_model_by_alias=True,
+)
+async def get_interchanges(
+        limit: Annotated[int, Query(ge=1, le=MAX_INTERCHANGES_LIMIT)] = 100,
+        offset: Annotated[int, Query(ge=0)] = 0,
+) -> JSONResponse:
+    """
+    Returns {"interchanges": [...]} with the stored interchanges, the most recently stored first.
+    """
+    service = get_measurement_store_service()
+    if service is None:
+        return _store_not_configured()
+    interchanges = await run_in_threadpool(service.find_interchanges, limit=limit, offset=offset)
+    return JSONResponse(status_code=status.HTTP_200_OK, content={"interchanges": interchanges})
+
+
+@router.get(
+    MEASUREMENT_STORE_MEASUREMENTS_PATH,
+    responses={
+        200: {"description": "OK"},
+        404: {"description": "Measurement store not configured"},
+    },
+    tags=["Measurement Store"],
+    summary="Finds the stored measurements of a location, OBIS code and time range",
+    response_model_by_alias=True,
+)
+async def get_measurements(
+        location: Annotated[Optional[str], Query(description="The location ID (LOC), e.g. a MaLo or MeLo ID")] = None,
+        obis: Annotated[Optional[str], Query(description="The OBIS code of the positions (PIA)")] = None,
+        start: Annotated[Optional[datetime], Query(
+            alias="from", description="The earliest interval start (ISO 8601), inclusive, UTC if without offset"
+        )] = None,
+        end: Annotated[Optional[datetime], Query(
+            alias="to", description="The latest interval start (ISO 8601), exclusive, UTC if without offset"
+        )] = None,
+        limit: Annotated[int, Query(ge=1, le=MAX_MEASUREMENTS_LIMIT)] = 1000,
+        offset: Annotated[int, Query(ge=0)] = 0,
+) -> JSONResponse:
+    """
+    Returns {"measurements": [...]} with the stored measurements ordered by location, OBIS code and interval
+    start, which is the order of their index. The interval start and end are returned in UTC.
+    """
+    service = get_measurement_store_service()
+    if service is None:
+        return _store_not_configured()
+    measurements = await run_in_threadpool(
+        service.find_measurements, location=location, obis=obis, start=start, end=end, limit=limit, offset=offset
+    )
+    return JSONResponse(status_code=status.HTTP_200_OK, content={"measurements": measurements})
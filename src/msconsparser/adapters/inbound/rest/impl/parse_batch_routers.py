@@ -0,0 +1,339 @@
+# coding: utf-8
+
+import logging
+import os
+import tempfile
+import threading
+from typing import BinaryIO, Iterable, Iterator, Optional
+
+from fastapi import APIRouter, Request, status
+from starlette.background import BackgroundTask
+from starlette.datastructures import UploadFile
+from starlette.responses import JSONResponse, StreamingResponse
+
+from msconsparser.adapters.inbound.rest.impl.parse_mscons_routers import (
+    HTTP_413_CONTENT_TOO_LARGE, REQUEST_BUDGET_ENDPOINTS
+)
+from msconsparser.application.services import BatchParseService
+from msconsparser.application.services.batch_parse_service import BatchFileContent
+from msconsparser.libs.edifactmsconsparser.exceptions import ArchiveReadException, ParseBudgetExceededException
+from msconsparser.libs.edifactmsconsparser.utils import (
+    count_archive_members, detect_archive_format, iter_archive_members
+)
+from msconsparser.libs.edifactmsconsparser.wrappers import ParseBudget
+
+logger = logging.getLogger(__name__)
+
+PARSE_BATCH_PATH = "/parse-raw-batch"
+# The environment variables PARSE_BUDGET_PARSE_BATCH_MAX_SEGMENTS, _MAX_BYTES and _MAX_SECONDS limit each file
+PARSE_BATCH_BUDGET_PREFIX = "PARSE_BUDGET_PARSE_BATCH"
+DEFAULT_MAX_FILES = 10000
+# The default limits of the size of the request body, of each decompressed file and of all decompressed files of a
+# batch, so that neither a large upload nor a highly compressed archive (zip bomb) exhausts the disk or the workers
+DEFAULT_MAX_ARCHIVE_BYTES = 1024 * 1024 * 1024
+DEFAULT_MAX_FILE_BYTES = 256 * 1024 * 1024
+DEFAULT_MAX_TOTAL_BYTES = 4 * 1024 * 1024 * 1024
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+ARCHIVE_MEDIA_TYPES = frozenset({
+    "application/zip", "application/x-zip-compressed", "application/x-tar", "application/x-gtar",
+    "application/gzip", "application/x-gzip", "application/x-compressed-tar",
+})
+ARCHIVE_EXTENSIONS = (".zip", ".tar", ".tar.gz", ".tgz", ".gz")
+# The size up to which an archive sent as request body is spooled in memory instead of a temporary file
+SPOOL_MAX_MEMORY_SIZE = 16 * 1024 * 1024
+
+BatchFiles = Iterator[tuple[str, BatchFileContent]]
+
+router = APIRouter()
+
+_batch_parse_service: Optional[BatchParseService] = None
+_batch_parse_service_lock = threading.Lock()
+
+
+def _read_positive_int(name: str, default: int) -> int:
+    value = os.getenv(name)
+    if value is None or value == "":
+        return default
+    try:
+        number = int(value)
+    except ValueError:
+        number = 0
+    if number <= 0:
+        logger.warning("Invalid %s '%s', using %d", name, value, default)
+        return default
+    return number
+
+
+def get_parse_batch_max_files() -> int:
+    """
+    Gets the maximum number of files of a batch from the environment variable PARSE_BATCH_MAX_FILES.
+
+    Returns:
+        int: The configured number, or DEFAULT_MAX_FILES if the variable is not set or invalid
+    """
+    return _read_positive_int("PARSE_BATCH_MAX_FILES", DEFAULT_MAX_FILES)
+
+
+def get_parse_batch_max_archive_bytes() -> int:
+    """
+    Gets the maximum size of the request body of a batch, i.e. of the multipart upload or of the archive, from the
+    environment variable PARSE_BATCH_MAX_ARCHIVE_BYTES.
+
+    Returns:
+        int: The configured bytes, or DEFAULT_MAX_ARCHIVE_BYTES if the variable is not set or invalid
+    """
+    return _read_positive_int("PARSE_BATCH_MAX_ARCHIVE_BYTES", DEFAULT_MAX_ARCHIVE_BYTES)
+
+
+def get_parse_batch_max_total_bytes() -> int:
+    """
+    Gets the maximum size of all files of a batch after decompression from the environment variable
+    PARSE_BATCH_MAX_TOTAL_BYTES.
+
+    Returns:
+        int: The configured bytes, or DEFAULT_MAX_TOTAL_BYTES if the variable is not set or invalid
+    """
+    return _read_positive_int("PARSE_BATCH_MAX_TOTAL_BYTES", DEFAULT_MAX_TOTAL_BYTES)
+
+
+def get_parse_batch_budget() -> ParseBudget:
+    """
+    Gets the budget of the parse of each file of a batch from the environment variables
+    PARSE_BUDGET_PARSE_BATCH_MAX_SEGMENTS, _MAX_BYTES and _MAX_SECONDS. The bytes of a file after decompression
+    are limited to DEFAULT_MAX_FILE_BYTES unless configured otherwise.
+
+    Returns:
+        ParseBudget: The budget of each file
+    """
+    budget = ParseBudget.from_environment(PARSE_BATCH_BUDGET_PREFIX)
+    if budget.max_bytes is None:
+        budget = budget.limited_to(ParseBudget(max_bytes=DEFAULT_MAX_FILE_BYTES))
+    return budget
+
+
+def get_parse_batch_request_budget() -> ParseBudget:
+    """
+    Gets the byte budget of the request body of a batch, which the ParseBudgetMiddleware checks against the
+    Content-Length header.
+
+    Returns:
+        ParseBudget: The budget limiting the bytes to PARSE_BATCH_MAX_ARCHIVE_BYTES
+    """
+    return ParseBudget(max_bytes=get_parse_batch_max_archive_bytes())
+
+
+def get_batch_parse_service() -> BatchParseService:
+    """
+    Returns the batch parse service of this process, which is created on first use.
+
+    Returns:
+        BatchParseService: The shared service, its worker processes parse the files of all batches
+    """
+    global _batch_parse_service
+    with _batch_parse_service_lock:
+        if _batch_parse_service is None:
+            _batch_parse_service = BatchParseService(budget=get_parse_batch_budget())
+        return _batch_parse_service
+
+
+def shutdown_batch_parse_service() -> None:
+    """
+    Stops the worker processes of the batch parse, if the service was used.
+    """
+    global _batch_parse_service
+    with _batch_parse_service_lock:
+        service, _batch_parse_service = _batch_parse_service, None
+    if service is not None:
+        service.shutdown()
+
+
+def is_archive_file(file_name: Optional[str], content_type: Optional[str]) -> bool:
+    """
+    Checks if a file is declared as a zip, tar or gzip archive of interchanges.
+
+    Args:
+        file_name: The name of the file, if any
+        content_type: The media type of the file, if any
+
+    Returns:
+        bool: True if the media type or the extension of the file denotes an archive
+    """
+    media_type = (content_type or "").split(";")[0].strip().lower()
+    return media_type in ARCHIVE_MEDIA_TYPES or (file_name or "").lower().endswith(ARCHIVE_EXTENSIONS)
+
+
+class _TotalBytesReader:
+    """
+    Binary stream of a file of a batch, which adds the bytes read to the bytes read from all files of the batch and
+    raises a ParseBudgetExceededException once they exceed the byte budget of the batch.
+    """
+
+    def __init__(self, stream: BinaryIO, total_bytes: list[int], budget: ParseBudget):
+        self.__stream = stream
+        # The bytes read from all files of the batch, shared by the readers of its files
+        self.__total_bytes = total_bytes
+        self.__budget = budget
+
+    def read(self, size: int = -1) -> bytes:
+        data = self.__stream.read(size)
+        self.__total_bytes[0] += len(data)
+        self.__budget.check_bytes(self.__total_bytes[0])
+        return data
+
+
+def iter_batch_files(
+        uploads: Iterable[tuple[str, BinaryIO]],
+        max_files: int,
+        max_total_bytes: Optional[int] = None,
+) -> BatchFiles:
+    """
+    Reads the files of a batch one at a time, archives are expanded into their members, which are read as streams.
+
+    Args:
+        uploads: The names and the streams of the uploaded files or archives
+        max_files: The maximum number of files, the members of a tar archive are only counted while it is read,
+            so that a file beyond the maximum results in an error record, which ends the batch
+        max_total_bytes: The maximum size of all files after decompression, if any. The file exceeding it results
+            in an error record, which ends the batch.
+
+    Yields:
+        tuple[str, BatchFileContent]: The name and the stream of each file, or the exception raised while reading it
+    """
+    budget = None if max_total_bytes is None else ParseBudget(max_bytes=max_total_bytes)
+    total_bytes = [0]
+    file_count = 0
+    for upload_name, upload_file in uploads:
+        try:
+            for file_name, content in iter_archive_members(upload_file, upload_name):
+                if budget is not None and total_bytes[0] > max_total_bytes:
+                    # The previous file exceeded the budget and resulted in an error record
+                    return
+                file_count += 1
+                if file_count > max_files:
+                    yield file_name, ArchiveReadException(f"Too many files (max {max_files})")
+                    return
+                if budget is not None and not isinstance(content, Exception):
+                    content = _TotalBytesReader(content, total_bytes, budget)
+                yield file_name, content
+        except ArchiveReadException as ex:
+            yield upload_name, ex
+
+
+def _count_files(upload_files: Iterable[BinaryIO]) -> tuple[int, bool]:
+    file_count = 0
+    is_complete = True
+    for upload_file in upload_files:
+        try:
+            member_count = count_archive_members(upload_file)
+        except ArchiveReadException:
+            # A corrupt zip archive results in one error record
+            member_count = 1
+        if member_count is None:
+            is_complete = False
+        else:
+            file_count += member_count
+    return file_count, is_complete
+
+
+def _error_response(status_code: int, error_message: str) -> JSONResponse:
+    return JSONResponse(status_code=status_code, content={"error_message": error_message})
+
+
+def _with_body_budget(request: Request, budget: ParseBudget) -> Request:
+    # The body is checked while it is received, so that a body without Content-Length is not spooled beyond the
+    # budget either
+    received_bytes = 0
+
+    async def receive():
+        nonlocal received_bytes
+        message = await request.receive()
+        if message["type"] == "http.request":
+            received_bytes += len(message.get("body", b""))
+            budget.check_bytes(received_bytes)
+        return message
+
+    return Request(request.scope, receive)
+
+
+@router.post(
+    PARSE_BATCH_PATH,
+    responses={
+        200: {"description": "OK, one NDJSON record per file"},
+        400: {"description": "Bad request"},
+        413: {"description": "Too many files or payload too large"},
+        415: {"description": "Unsupported media type"},
+    },
+    tags=["MSCONS Parser"],
+    summary="Parses many raw MSCONS messages in parallel and streams one NDJSON record per file",
+    response_model_by_alias=True,
+)
+async def parse_mscons_batch(request: Request):
+    """
+    Parses the raw MSCONS messages of a multipart upload (one file per message, archives are expanded) or of
+    a zip, tar or tar.gz archive sent as request body (e.g. Content-Type application/zip or application/gzip) in
+    parallel in a pool of worker processes. The members of an archive are read one at a time without extracting
+    the archive, large members are split into chunks of messages, which are parsed by several workers.
+
+    The response streams one JSON line per file in the order of the files: {"index", "file_name", "status": "ok",
+    "result"} with the parsed interchange, or {"index", "file_name", "status": "error", "error_message"}, so that
+    a bad file does not fail the batch. The chunks of messages of a member are merged into the record of the member.
+
+    The request body is limited to PARSE_BATCH_MAX_ARCHIVE_BYTES (default 1 GiB, status 413), each file after
+    decompression to PARSE_BUDGET_PARSE_BATCH_MAX_BYTES (default 256 MiB) and all files of the batch after
+    decompression to PARSE_BATCH_MAX_TOTAL_BYTES (default 4 GiB). A file exceeding its budget results in an error
+    record, the file exceeding the budget of the batch in an error record which ends the batch.
+    """
+    max_files = get_parse_batch_max_files()
+    content_type = request.headers.get("content-type", "")
+    request = _with_body_budget(request, get_parse_batch_request_budget())
+
+    if content_type.startswith("multipart/form-data"):
+        try:
+            form = await request.form(max_files=max_files, max_fields=max_files)
+        except ParseBudgetExceededException as ex:
+            return _error_response(HTTP_413_CONTENT_TOO_LARGE, str(ex))
+        except Exception as ex:
+            return _error_response(status.HTTP_400_BAD_REQUEST, str(ex))
+        background = BackgroundTask(form.close)
+        uploads = [(value.filename or "", value.file) for _, value in form.multi_items()
+                   if isinstance(value, UploadFile)]
+    elif is_archive_file(None, content_type):
+        body = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_MEMORY_SIZE)
+        background = BackgroundTask(body.close)
+        try:
+            async for data in request.stream():
+                body.write(data)
+        except ParseBudgetExceededException as ex:
+            await background()
+            return _error_response(HTTP_413_CONTENT_TOO_LARGE, str(ex))
+        body.seek(0)
+        try:
+            if detect_archive_format(body) is None:
+                raise ArchiveReadException("unknown format")
+            count_archive_members(body)
+        except ArchiveReadException as ex:
+            await background()
+            return _error_response(status.HTTP_400_BAD_REQUEST, str(ex))
+        uploads = [("", body)]
+    else:
+        return _error_response(status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+                               "Expected a multipart upload of files or a zip, tar or tar.gz archive")
+
+    for _, upload_file in uploads:
+        upload_file.seek(0)
+    file_count, is_complete = _count_files(upload_file for _, upload_file in uploads)
+    if file_count == 0 and is_complete:
+        await background()
+        return _error_response(status.HTTP_400_BAD_REQUEST, "No file provided")
+    if file_count > max_files:
+        await background()
+        return _error_response(HTTP_413_CONTENT_TOO_LARGE, f"Too many files (max {max_files}: {file_count})")
+
+    logger.info("Parsing MSCONS batch", extra={"file_count": file_count if is_complete else None})
+    files = iter_batch_files(uploads, max_files, get_parse_batch_max_total_bytes())
+    return StreamingResponse(get_batch_parse_service().aiter_records(files), media_type=NDJSON_MEDIA_TYPE,
+                             background=background)
+
+
+# The request body of a batch is checked against its Content-Length by the ParseBudgetMiddleware
+REQUEST_BUDGET_ENDPOINTS[PARSE_BATCH_PATH] = get_parse_batch_request_budget
@@ -0,0 +1,210 @@
+# coding: utf-8
+
+import asyncio
+import logging
+import os
+import threading
+from contextvars import ContextVar
+from typing import Iterable, Optional
+
+from fastapi import APIRouter, status
+from starlette.datastructures import Headers
+from starlette.responses import JSONResponse, Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from msconsparser.libs.edifactmsconsparser.exceptions import ParseCancelledException
+from msconsparser.libs.edifactmsconsparser.wrappers import CancelToken
+
+logger = logging.getLogger(__name__)
+
+REQUEST_TIMEOUT_HEADER = "X-Request-Timeout"
+
+# Set per request by the ParseCancellationMiddleware
+_request_cancel_token: ContextVar[Optional[CancelToken]] = ContextVar("request_cancel_token", default=None)
+
+router = APIRouter()
+
+
+class CancellationMetrics:
+    """
+    Thread-safe counters of the cancelled parses and the CPU seconds they spent in vain.
+    """
+
+    def __init__(self):
+        self.__lock = threading.Lock()
+        self.__cancelled_parses: dict[str, int] = {}
+        self.__wasted_cpu_seconds = 0.0
+
+    def record(self, exception: ParseCancelledException) -> None:
+        """
+        Counts a cancelled parse.
+
+        Args:
+            exception (ParseCancelledException): The exception of the cancelled parse
+        """
+        with self.__lock:
+            self.__cancelled_parses[exception.reason] = self.__cancelled_parses.get(exception.reason, 0) + 1
+            self.__wasted_cpu_seconds += exception.cpu_seconds
+
+    def report(self) -> dict:
+        """
+        Returns the counters.
+
+        Returns:
+            dict: The cancelled parses per reason, their total and the CPU seconds spent on them
+        """
+        with self.__lock:
+            return {
+                "cancelled_parses": dict(self.__cancelled_parses),
+                "total": sum(self.__cancelled_parses.values()),
+                "wasted_cpu_seconds": round(self.__wasted_cpu_seconds, 6),
+            }
+
+    def reset(self) -> None:
+        """
+        Resets the counters.
+        """
+        with self.__lock:
+            self.__cancelled_parses.clear()
+            self.__wasted_cpu_seconds = 0.0
+
+
+# Cancelled parses of all requests of this process
+cancellation_metrics = CancellationMetrics()
+
+
+def get_request_timeout(headers: Headers) -> Optional[float]:
+    """
+    Gets the seconds a request may take from the header X-Request-Timeout and the environment variable
+    PARSE_REQUEST_TIMEOUT_SECONDS. The header may only shorten the timeout of the environment variable, so the
+    smaller of both applies if both are set.
+
+    Args:
+        headers (Headers): The headers of the request
+
+    Returns:
+        Optional[float]: The timeout in seconds, None if neither is set to a positive number
+    """
+    timeouts = []
+    for value in (headers.get(REQUEST_TIMEOUT_HEADER), os.getenv("PARSE_REQUEST_TIMEOUT_SECONDS")):
+        if value:
+            try:
+                timeout = float(value)
+            except ValueError:
+                logger.warning("Invalid request timeout '%s' ignored", value)
+                continue
+            if timeout > 0:
+                timeouts.append(timeout)
+    return min(timeouts, default=None)
+
+
+def get_request_cancel_token() -> Optional[CancelToken]:
+    """
+    Returns the cancel token of the current request.
+
+    Returns:
+        Optional[CancelToken]: The token, None outside of a request handled by the ParseCancellationMiddleware
+    """
+    return _request_cancel_token.get()
+
+
+def record_cancelled_parse(exception: ParseCancelledException) -> None:
+    """
+    Counts the cancelled parse in the cancellation metrics and logs it.
+
+    Args:
+        exception (ParseCancelledException): The exception of the cancelled parse
+    """
+    cancellation_metrics.record(exception)
+    logger.warning("Parse cancelled", extra={"reason": exception.reason, "cpu_seconds": exception.cpu_seconds})
+
+
+class ParseCancellationMiddleware:
+    """
+    ASGI middleware providing a cancel token to the requests of the parse endpoints (see get_request_cancel_token).
+
+    The token is tripped if the client disconnects or the request timeout passes. Once the request body is
+    received, the only message left for the request is the disconnect of the client, which is awaited by a
+    watcher task meanwhile. As the event loop must be free to run the watcher, the parse runs in a worker thread.
+    """
+
+    def __init__(self, app: ASGIApp, paths: Iterable[str]):
+        """
+        Initialize the middleware.
+
+        Args:
+            app (ASGIApp): The wrapped application
+            paths (Iterable[str]): The paths of the parse endpoints
+        """
+        self.app = app
+        self.paths = frozenset(paths)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["path"] not in self.paths:
+            await self.app(scope, receive, send)
+            return
+
+        cancel_token = CancelToken.with_timeout(get_request_timeout(Headers(scope=scope)))
+        watcher: Optional[asyncio.Future] = None
+
+        async def watch_disconnect() -> Message:
+            message = await receive()
+            while message["type"] != "http.disconnect":
+                message = await receive()
+            cancel_token.cancel(CancelToken.CLIENT_DISCONNECTED)
+            return message
+
+        async def receive_request() -> Message:
+            nonlocal watcher
+            if watcher is not None:
+                return await asyncio.shield(watcher)
+            message = await receive()
+            if message["type"] == "http.disconnect":
+                cancel_token.cancel(CancelToken.CLIENT_DISCONNECTED)
+            elif not message.get("more_body", False):
+                watcher = asyncio.ensure_future(watch_disconnect())
+            return message
+
+        token = _request_cancel_token.set(cancel_token)
+        try:
+            await self.app(scope, receive_request, send)
+        finally:
+            _request_cancel_token.reset(token)
+            if watcher is not None:
+                watcher.cancel()
+
+
+@router.get(
+    "/admin/parse-cancellations",
+    responses={
+        200: {"description": "OK"},
+    },
+    tags=["Admin"],
+    summary="Returns the cancelled parses and the CPU seconds spent on them",
+    response_model_by_alias=True,
+    include_in_schema=False,
+)
+async def get_parse_cancellations() -> JSONResponse:
+    """
+    Returns the cancelled parses per reason (client disconnected, deadline exceeded) and the CPU seconds
+    they spent in vain since the start of the process or the last reset.
+    """
+    return JSONResponse(status_code=status.HTTP_200_OK, content=cancellation_metrics.report())
+
+
+@router.delete(
+    "/admin/parse-cancellations",
+    responses={
+        204: {"description": "No content"},
+    },
+    tags=["Admin"],
+    summary="Resets the cancelled parses",
+    response_model_by_alias=True,
+    include_in_schema=False,
+)
+async def reset_parse_cancellations() -> Response:
+    """
+    Resets the counters of the cancelled parses.
+    """
+    cancellation_metrics.reset()
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
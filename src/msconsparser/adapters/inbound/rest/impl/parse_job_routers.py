@@ -0,0 +1,197 @@
+# coding: utf-8
+
+import logging
+import threading
+from typing import Optional
+
+from fastapi import APIRouter, Query, Request, status
+from starlette.concurrency import run_in_threadpool
+from starlette.responses import JSONResponse, StreamingResponse
+from typing_extensions import Annotated, Literal
+
+from msconsparser.adapters.inbound.rest.impl.parse_mscons_routers import (
+    HTTP_413_CONTENT_TOO_LARGE, MESSAGE_COUNT_HEADER, NEXT_CURSOR_HEADER
+)
+from msconsparser.application.services import ParseJobQueueFullException, ParseJobService
+from msconsparser.domain.models import ParseJobStatus
+from msconsparser.libs.edifactmsconsparser.exceptions import ParseBudgetExceededException
+from msconsparser.libs.edifactmsconsparser.interchange_pages import PageRequest
+from msconsparser.libs.edifactmsconsparser.wrappers import ParseBudget
+
+logger = logging.getLogger(__name__)
+
+JOBS_PATH = "/jobs"
+# The environment variable PARSE_BUDGET_PARSE_JOB_MAX_BYTES limits the size of the uploads
+PARSE_JOB_BUDGET_PREFIX = "PARSE_BUDGET_PARSE_JOB"
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+RETRY_AFTER_SECONDS = "10"
+
+router = APIRouter()
+
+_parse_job_service: Optional[ParseJobService] = None
+_parse_job_service_lock = threading.Lock()
+
+
+def get_parse_job_service() -> ParseJobService:
+    """
+    Returns the parse job service of this process, which is created on first use.
+
+    Returns:
+        ParseJobService: The shared service
+    """
+    global _parse_job_service
+    with _parse_job_service_lock:
+        if _parse_job_service is None:
+            _parse_job_service = ParseJobService()
+        return _parse_job_service
+
+
+async def shutdown_parse_job_service() -> None:
+    """
+    Cancels the running parse jobs and stops the worker pool, if the service was used. The service is stopped in
+    a worker thread, so that the event loop is not blocked while the running jobs stop.
+    """
+    global _parse_job_service
+    with _parse_job_service_lock:
+        service, _parse_job_service = _parse_job_service, None
+    if service is not None:
+        await run_in_threadpool(service.shutdown)
+
+
+def _job_not_found(job_id: str) -> JSONResponse:
+    return JSONResponse(status_code=status.HTTP_404_NOT_FOUND,
+                        content={"error_message": f"Parse job '{job_id}' not found"})
+
+
+@router.post(
+    JOBS_PATH,
+    responses={
+        202: {"description": "Accepted"},
+        413: {"description": "Payload too large"},
+        503: {"description": "Too many pending jobs"},
+    },
+    tags=["Jobs"],
+    summary="Uploads a raw MSCONS message to be parsed in the background",
+    response_model_by_alias=True,
+)
+async def create_parse_job(request: Request) -> JSONResponse:
+    """
+    Streams the raw MSCONS message of the request body to the spool directory and queues its parse.
+    The status of the job is polled via GET /jobs/{job_id}, its result is downloaded via GET /jobs/{job_id}/result.
+    """
+    budget = ParseBudget.from_environment(PARSE_JOB_BUDGET_PREFIX)
+    content_length = request.headers.get("content-length")
+    try:
+        budget.check_bytes(int(content_length) if content_length and content_length.isdigit() else None)
+        service = get_parse_job_service()
+        job = service.create_job()
+    except ParseBudgetExceededException as ex:
+        return JSONResponse(status_code=HTTP_413_CONTENT_TOO_LARGE, content={"error_message": str(ex)})
+    except ParseJobQueueFullException as ex:
+        return JSONResponse(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, content={"error_message": str(ex)},
+                            headers={"Retry-After": RETRY_AFTER_SECONDS})
+
+    try:
+        # The file is written outside of the event loop, so that a slow disk does not block other requests
+        upload_file = await run_in_threadpool(open, service.get_upload_path(job), "wb")
+        try:
+            async for chunk in request.stream():
+                job.total_bytes += len(chunk)
+                # A body without Content-Length is checked while it is received
+                budget.check_bytes(job.total_bytes)
+                await run_in_threadpool(upload_file.write, chunk)
+        finally:
+            await run_in_threadpool(upload_file.close)
+    except ParseBudgetExceededException as ex:
+        service.discard_job(job)
+        return JSONResponse(status_code=HTTP_413_CONTENT_TOO_LARGE, content={"error_message": str(ex)})
+    except BaseException:
+        service.discard_job(job)
+        raise
+
+    if job.total_bytes == 0:
+        service.discard_job(job)
+        return JSONResponse(status_code=status.HTTP_400_BAD_REQUEST, content={"error_message": "No message provided"})
+
+    service.submit_job(job)
+    return JSONResponse(status_code=status.HTTP_202_ACCEPTED, content=job.as_dict(),
+                        headers={"Location": f"{JOBS_PATH}/{job.job_id}"})
+
+
+@router.get(
+    JOBS_PATH + "/{job_id}",
+    responses={
+        200: {"description": "OK"},
+        404: {"description": "Not found"},
+    },
+    tags=["Jobs"],
+    summary="Returns the status and the progress of a parse job",
+    response_model_by_alias=True,
+)
+async def get_parse_job(job_id: str) -> JSONResponse:
+    """
+    Returns the status of the parse job (receiving, queued, running, succeeded or failed) and its progress
+    in bytes and messages.
+    """
+    job = get_parse_job_service().get_job(job_id)
+    if job is None:
+        return _job_not_found(job_id)
+    return JSONResponse(status_code=status.HTTP_200_OK, content=job.as_dict())
+
+
+@router.get(
+    JOBS_PATH + "/{job_id}/result",
+    responses={
+        200: {"description": "OK"},
+        400: {"description": "Invalid page request"},
+        404: {"description": "Not found"},
+        409: {"description": "The job has not succeeded"},
+    },
+    tags=["Jobs"],
+    summary="Streams the result of a succeeded parse job",
+    response_model_by_alias=True,
+)
+async def get_parse_job_result(
+        request: Request,
+        job_id: str,
+        result_format: Annotated[Literal["json", "ndjson"], Query(
+            alias="format",
+            description="json: the parsed interchange as one JSON document, as returned by the parse endpoints. "
+                        "ndjson: one JSON line for the header (UNA, UNB), per message and for the trailer (UNZ).")]
+        = "json",
+):
+    """
+    Streams the parsed interchange of a succeeded parse job.
+
+    A page of its messages or measurements is requested via the query parameters page_by, page_size, cursor,
+    location, from and to (see PageRequest), which is returned as JSON together with the number of messages in
+    the X-Message-Count header and the cursor of the next page in the X-Next-Cursor header.
+    """
+    try:
+        page_request = PageRequest.from_query_params(request.query_params)
+    except ValueError as ex:
+        return JSONResponse(status_code=status.HTTP_400_BAD_REQUEST, content={"error_message": str(ex)})
+
+    service = get_parse_job_service()
+    job = service.get_job(job_id)
+    if job is None:
+        return _job_not_found(job_id)
+    if job.status != ParseJobStatus.SUCCEEDED:
+        return JSONResponse(status_code=status.HTTP_409_CONFLICT, content={
+            "error_message": f"Parse job '{job_id}' is {job.status.value}", "job": job.as_dict()
+        })
+
+    if page_request is not None:
+        page = service.get_result_page(job, page_request)
+        headers = {MESSAGE_COUNT_HEADER: str(page.message_count)}
+        if page.next_cursor is not None:
+            headers[NEXT_CURSOR_HEADER] = page.next_cursor.encode()
+        return JSONResponse(status_code=status.HTTP_200_OK, content=page.model_dump(mode="json"), headers=headers)
+
+    if result_format == "ndjson":
+        content, media_type = service.iter_result_lines(job), NDJSON_MEDIA_TYPE
+    else:
+        content, media_type = service.iter_result_json(job), "application/json"
+    return StreamingResponse(content, media_type=media_type, headers={
+        "Content-Disposition": f"attachment; filename=mscons_parsed_{job_id}.{result_format}"
+    })
@@ -1,16 +1,34 @@
 # coding: utf-8
 
+import functools
 import logging
+import os
 import time
-from typing import Union, Tuple
+from contextvars import ContextVar
+from typing import Callable, Optional, Union, Tuple
 from typing_extensions import Annotated
 
-from fastapi import status
+from fastapi import Request, status
 from pydantic import StrictStr, Field, StrictBool, StrictBytes
+from starlette.concurrency import run_in_threadpool
 from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 from msconsparser.adapters.inbound.rest.apis.mscons_parser_api_base import BaseMSCONSParserApi
-from msconsparser.libs.edifactmsconsparser.exceptions import CONTRLException, MSCONSParserException
+from msconsparser.libs.edifactmsconsparser.exceptions import (
+    CONTRLException, MSCONSParserException, ParseBudgetExceededException, ParseCancelledException
+)
+from msconsparser.libs.edifactmsconsparser.interchange_pages import (
+    InterchangePage, PageRequest, get_interchange_page
+)
+from msconsparser.libs.edifactmsconsparser.utils import decode_edifact_bytes
+from msconsparser.libs.edifactmsconsparser.wrappers import ParseBudget, ParsePhase, ParseStatistics, SegmentProfiler
+from msconsparser.adapters.inbound.rest.impl.parse_cancellation_routers import (
+    get_request_cancel_token, record_cancelled_parse
+)
+from msconsparser.adapters.inbound.rest.impl.segment_profiling_routers import (
+    create_request_profiler, segment_profile
+)
 from msconsparser.application.services import ParserService
 
 logger = logging.getLogger(__name__)
@@ -18,6 +36,267 @@ logger = logging.getLogger(__name__)
 MAX_LINES_TO_PARSE = 2442
 UNLIMITED_LINES_TO_PARSE_INDICATOR = -1
 
+PARSE_RAW_FORMAT_PATH = "/parse-raw-format"
+PARSE_RAW_FILE_PATH = "/parse-raw-file"
+DOWNLOAD_PARSED_RAW_FORMAT_PATH = "/download-parsed-raw-format"
+DOWNLOAD_PARSED_RAW_FILE_PATH = "/download-parsed-raw-file"
+# The endpoint part of the environment variables of the parse budgets per endpoint path
+PARSE_BUDGET_ENDPOINTS = {
+    PARSE_RAW_FORMAT_PATH: "PARSE_RAW_FORMAT",
+    PARSE_RAW_FILE_PATH: "PARSE_RAW_FILE",
+    DOWNLOAD_PARSED_RAW_FORMAT_PATH: "DOWNLOAD_PARSED_RAW_FORMAT",
+    DOWNLOAD_PARSED_RAW_FILE_PATH: "DOWNLOAD_PARSED_RAW_FILE",
+}
+# The byte budgets of the request bodies of further endpoints by path, e.g. of the archives of the batch parse,
+# which the ParseBudgetMiddleware checks like the budgets of the parse endpoints
+REQUEST_BUDGET_ENDPOINTS: dict[str, Callable[[], ParseBudget]] = {}
+# The endpoints with the limit_mode query parameter, which is enabled by default
+LIMIT_MODE_PATHS = frozenset({PARSE_RAW_FORMAT_PATH, PARSE_RAW_FILE_PATH})
+LIMIT_MODE_BUDGET = ParseBudget(max_segments=MAX_LINES_TO_PARSE)
+
+# Starlette renamed HTTP_413_REQUEST_ENTITY_TOO_LARGE, which is deprecated meanwhile, to HTTP_413_CONTENT_TOO_LARGE
+HTTP_413_CONTENT_TOO_LARGE = 413
+
+SERVER_TIMING_HEADER = "Server-Timing"
+PARSE_STATS_HEADER = "X-Parse-Stats"
+MESSAGE_COUNT_HEADER = "X-Message-Count"
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+# The query parameters selecting the messages of the response
+MESSAGE_INDEX_PARAMETER = "message_index"
+OFFSET_PARAMETER = "offset"
+LIMIT_PARAMETER = "limit"
+
+
+def is_parse_stats_header_enabled() -> bool:
+    """
+    Checks if the X-Parse-Stats response header is enabled via the environment variable EXPOSE_PARSE_STATS_HEADER.
+
+    Returns:
+        bool: True if the environment variable is set to 'true' (case-insensitive), False otherwise
+    """
+    return os.getenv("EXPOSE_PARSE_STATS_HEADER", "false").lower() == "true"
+
+
+def get_parse_budget(path: str, limit_mode: bool) -> ParseBudget:
+    """
+    Gets the parse budget of an endpoint from the environment variables PARSE_BUDGET_<ENDPOINT>_MAX_SEGMENTS,
+    PARSE_BUDGET_<ENDPOINT>_MAX_BYTES and PARSE_BUDGET_<ENDPOINT>_MAX_SECONDS, e.g.
+    PARSE_BUDGET_PARSE_RAW_FILE_MAX_BYTES=10485760. In the limit mode, the budget is limited further to
+    MAX_LINES_TO_PARSE segments.
+
+    Args:
+        path (str): The path of the endpoint, e.g. '/parse-raw-file'
+        limit_mode (bool): If true, the limits of the limit mode apply
+
+    Returns:
+        ParseBudget: The budget of the endpoint, without limits if neither configured nor in limit mode
+    """
+    endpoint = PARSE_BUDGET_ENDPOINTS.get(path)
+    budget = ParseBudget.from_environment(f"PARSE_BUDGET_{endpoint}") if endpoint is not None else ParseBudget()
+    return budget.limited_to(LIMIT_MODE_BUDGET) if limit_mode else budget
+
+
+def is_limit_mode_requested(request: Request) -> bool:
+    """
+    Checks if a request is parsed in the limit mode, i.e. it is sent to an endpoint with the limit_mode
+    query parameter, which is not disabled.
+
+    Args:
+        request (Request): The request
+
+    Returns:
+        bool: True if the limit mode applies to the request
+    """
+    if request.url.path not in LIMIT_MODE_PATHS:
+        return False
+    return request.query_params.get("limit_mode", "true").lower() not in ("false", "0", "off", "no", "f", "n")
+
+
+class ParseBudgetMiddleware:
+    """
+    ASGI middleware that rejects a request to a parse endpoint, or to an endpoint of REQUEST_BUDGET_ENDPOINTS, with
+    status 413 (Payload too large) if its Content-Length header exceeds the byte budget of the endpoint, before the
+    body is read.
+
+    The body of a request to a parse endpoint without Content-Length (e.g. chunked) is counted while the endpoint
+    receives it. Once it exceeds the byte budget, the endpoint receives no further part of the body and the request
+    is answered with status 413 instead of the response of the endpoint. The bodies of the other endpoints without
+    Content-Length are checked by their routers while reading them.
+    """
+
+    def __init__(self, app: ASGIApp):
+        """
+        Initialize the middleware.
+
+        Args:
+            app (ASGIApp): The wrapped application
+        """
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        path = scope["path"] if scope["type"] == "http" else None
+        if path not in PARSE_BUDGET_ENDPOINTS and path not in REQUEST_BUDGET_ENDPOINTS:
+            await self.app(scope, receive, send)
+            return
+
+        request = Request(scope)
+        if path in PARSE_BUDGET_ENDPOINTS:
+            budget = get_parse_budget(path, is_limit_mode_requested(request))
+        else:
+            budget = REQUEST_BUDGET_ENDPOINTS[path]()
+        content_length = request.headers.get("content-length", "")
+        try:
+            if content_length.isdigit():
+                budget.check_bytes(int(content_length))
+        except ParseBudgetExceededException as ex:
+            await _payload_too_large(ex)(scope, receive, send)
+            return
+        if content_length.isdigit() or path not in PARSE_BUDGET_ENDPOINTS or budget.max_bytes is None:
+            await self.app(scope, receive, send)
+            return
+
+        byte_count = 0
+        exceeded: Optional[ParseBudgetExceededException] = None
+        response_started = False
+
+        async def receive_within_budget() -> Message:
+            nonlocal byte_count, exceeded
+            if exceeded is not None:
+                raise exceeded
+            message = await receive()
+            if message["type"] == "http.request":
+                byte_count += len(message.get("body", b""))
+                try:
+                    budget.check_bytes(byte_count)
+                except ParseBudgetExceededException as ex:
+                    exceeded = ex
+                    raise
+            return message
+
+        async def send_unless_exceeded(message: Message) -> None:
+            nonlocal response_started
+            # The response of the endpoint to a body beyond the budget (e.g. a body error) is replaced by status 413
+            if exceeded is None:
+                response_started = True
+                await send(message)
+
+        try:
+            await self.app(scope, receive_within_budget, send_unless_exceeded)
+        except Exception:
+            if exceeded is None:
+                raise
+        if exceeded is not None and not response_started:
+            await _payload_too_large(exceeded)(scope, receive, send)
+
+
+def _payload_too_large(ex: ParseBudgetExceededException) -> JSONResponse:
+    return JSONResponse(status_code=HTTP_413_CONTENT_TOO_LARGE, content={"error_message": str(ex)})
+
+
+class MessageSelection:
+    """
+    The range of the messages of an interchange to return, selected via the query parameters message_index, or
+    offset and limit, of a parse endpoint.
+    """
+
+    def __init__(self, offset: int = 0, limit: Optional[int] = None, message_index: Optional[int] = None):
+        """
+        Initialize the selection.
+
+        Args:
+            offset (int): The position of the first selected message, starting at 0
+            limit (Optional[int]): The number of selected messages at most, defaults to all messages from the offset on
+            message_index (Optional[int]): The position of a single selected message, which must exist. If given,
+                it overrides the offset and the limit.
+        """
+        self.message_index = message_index
+        self.offset = offset if message_index is None else message_index
+        self.limit = limit if message_index is None else 1
+
+    @classmethod
+    def from_query_params(cls, query_params) -> Optional["MessageSelection"]:
+        """
+        Reads the selection from the query parameters of a request.
+
+        Args:
+            query_params: The query parameters of the request
+
+        Returns:
+            Optional[MessageSelection]: The selection, or None if no message is selected, i.e. all messages
+                are returned
+
+        Raises:
+            ValueError: If a parameter is no non-negative integer, or message_index is combined with offset or limit
+        """
+        values = {}
+        for name in (MESSAGE_INDEX_PARAMETER, OFFSET_PARAMETER, LIMIT_PARAMETER):
+            value = query_params.get(name)
+            if value is None:
+                continue
+            if not value.isdigit():
+                raise ValueError(f"Query parameter '{name}' must be a non-negative integer, got '{value}'")
+            values[name] = int(value)
+        if not values:
+            return None
+        if MESSAGE_INDEX_PARAMETER in values and len(values) > 1:
+            raise ValueError(f"Query parameter '{MESSAGE_INDEX_PARAMETER}' must not be combined with "
+                             f"'{OFFSET_PARAMETER}' or '{LIMIT_PARAMETER}'")
+        return cls(
+            offset=values.get(OFFSET_PARAMETER, 0),
+            limit=values.get(LIMIT_PARAMETER),
+            message_index=values.get(MESSAGE_INDEX_PARAMETER),
+        )
+
+
+# Set per request by the message_selection_middleware
+_message_selection: ContextVar[Optional[MessageSelection]] = ContextVar("message_selection", default=None)
+_page_request: ContextVar[Optional[PageRequest]] = ContextVar("page_request", default=None)
+
+
+def get_message_selection() -> Optional[MessageSelection]:
+    """
+    Gets the messages selected by the query parameters of the current request.
+
+    Returns:
+        Optional[MessageSelection]: The selection, or None if all messages are requested
+    """
+    return _message_selection.get()
+
+
+def get_page_request() -> Optional[PageRequest]:
+    """
+    Gets the page of messages or measurements requested by the query parameters of the current request.
+
+    Returns:
+        Optional[PageRequest]: The page request, or None if no page is requested
+    """
+    return _page_request.get()
+
+
+async def message_selection_middleware(request: Request, call_next):
+    """
+    Middleware that reads the message selection of a request to a parse endpoint from the query parameters
+    message_index, or offset and limit, or its page request from the query parameters page_by, page_size, cursor,
+    location, from and to (see PageRequest). An invalid selection is answered with status 400 (Bad request).
+    """
+    if request.url.path not in PARSE_BUDGET_ENDPOINTS:
+        return await call_next(request)
+    try:
+        selection = MessageSelection.from_query_params(request.query_params)
+        page_request = PageRequest.from_query_params(request.query_params)
+        if selection is not None and page_request is not None:
+            raise ValueError("A page request must not be combined with a message selection")
+    except ValueError as ex:
+        return JSONResponse(status_code=status.HTTP_400_BAD_REQUEST, content={"error_message": str(ex)})
+    selection_token = _message_selection.set(selection)
+    page_request_token = _page_request.set(page_request)
+    try:
+        return await call_next(request)
+    finally:
+        _page_request.reset(page_request_token)
+        _message_selection.reset(selection_token)
+
 
 class ParseMSCONSRouter(BaseMSCONSParserApi):
     """
@@ -27,11 +306,34 @@ class ParseMSCONSRouter(BaseMSCONSParserApi):
     providing an HTTP interface to the parsing functionality. It supports
     parsing raw MSCONS messages as text or from uploaded files, with options
     to limit the number of lines parsed and to download the results as JSON files.
+
+    Every successful response carries the durations of the processing phases (decode, UNA detection,
+    tokenize, convert, serialize and encode) in the `Server-Timing` header and, if enabled, the
+    segment count, message count and payload size in the `X-Parse-Stats` header.
+
+    If the segment profiling is requested (see segment_profiling_routers), the segment handler and
+    converter calls of the parse are added to the aggregated segment profile of the process.
+
+    Every parse is bounded by the parse budget of its endpoint (see get_parse_budget). A request exceeding
+    the segments, bytes or seconds of the budget is answered with status 413 (Payload too large).
+
+    If the request has a cancel token (see parse_cancellation_routers), the parse runs in a worker thread and
+    is cancelled as soon as the client disconnects or the request timeout passes, which is answered with
+    status 503 (Service unavailable).
+
+    If messages are selected (see MessageSelection), only the envelope and the selected messages are parsed and
+    returned (see LazyEdifactInterchange), together with the number of messages of the interchange in the
+    `X-Message-Count` header. The segment budget then applies to the parsed segments only. A message_index
+    beyond the last message is answered with status 400 (Bad request).
+
+    If a page is requested (see PageRequest), the page of messages or measurements is returned together with the
+    cursor of the next page in the `X-Next-Cursor` header, only the messages of the page are parsed.
     """
 
     def __init__(
             self,
             parser_service: ParserService = None,
+            expose_parse_stats: Optional[bool] = None,
     ):
         """
         Initialize the ParseMSCONSRouter with a parser service.
@@ -39,13 +341,18 @@ class ParseMSCONSRouter(BaseMSCONSParserApi):
         Args:
             parser_service (ParserService): The parser service to use.
                 If None, a new ParserService instance will be created.
+            expose_parse_stats (Optional[bool]): If true, the X-Parse-Stats header is added to the responses.
+                If None, the environment variable EXPOSE_PARSE_STATS_HEADER decides.
         """
         self.__parser_service = parser_service or ParserService()
+        self.__expose_parse_stats = is_parse_stats_header_enabled() if expose_parse_stats is None \
+            else expose_parse_stats
 
     async def parse_mscons_raw_format(
             self,
             limit_mode: Annotated[StrictBool, Field(
-                description="If true, enables the parsing limit for max number of lines, as per default it is maximum 2442 lines.")],
+                description="If true, enables the parsing limit for max number of lines, as per default it is maximum "
+                            "2442 lines and 1 MiB. A message exceeding the limit is answered with status 413.")],
             body: Annotated[StrictStr, Field(description="The raw MSCONS message as plain text.")],
     ) -> JSONResponse:
         """
@@ -55,29 +362,38 @@ class ParseMSCONSRouter(BaseMSCONSParserApi):
         the parsed data in a structured JSON format.
 
         Args:
-            limit_mode (bool): If true, limits parsing to a maximum of 2442 lines;
+            limit_mode (bool): If true, limits parsing to a maximum of 2442 lines and 1 MiB;
                 if false, parses the entire message regardless of size
             body (str): The raw MSCONS message to parse
 
         Returns:
             JSONResponse: A JSON response containing either the parsed data (status 200 - Success)
-                or an error message (status 400 - Bad request)
+                or an error message (status 400 - Bad request, 413 - Payload too large,
+                503 - Parse cancelled)
         """
+        statistics = ParseStatistics()
         try:
-            parsed_mscons_obj = await self.__get_parsed_result(body, limit_mode)
+            parsed_mscons_obj = await self.__get_parsed_result(body, limit_mode, statistics, PARSE_RAW_FORMAT_PATH)
         except CONTRLException as ex:
             return JSONResponse(status_code=status.HTTP_400_BAD_REQUEST, content={"error_message": str(ex)})
+        except ParseBudgetExceededException as ex:
+            return JSONResponse(status_code=HTTP_413_CONTENT_TOO_LARGE,
+                                content={"error_message": str(ex)})
+        except ParseCancelledException as ex:
+            record_cancelled_parse(ex)
+            return JSONResponse(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, content={"error_message": str(ex)})
         except MSCONSParserException as ex:
             return JSONResponse(status_code=status.HTTP_400_BAD_REQUEST, content={"error_message": str(ex)})
         except Exception as ex:
             return JSONResponse(status_code=status.HTTP_400_BAD_REQUEST, content={"error_message": str(ex)})
 
-        return JSONResponse(status_code=status.HTTP_200_OK, content=parsed_mscons_obj.model_dump())
+        return self.__create_response(parsed_mscons_obj, statistics, status.HTTP_200_OK)
 
     async def parse_mscons_file(
             self,
             limit_mode: Annotated[StrictBool, Field(
-                description="If true, enables the parsing limit for max number of lines, as per default it is maximum 2442 lines.")],
+                description="If true, enables the parsing limit for max number of lines, as per default it is maximum "
+                            "2442 lines and 1 MiB. A message exceeding the limit is answered with status 413.")],
             body: Annotated[Union[StrictBytes, StrictStr, Tuple[StrictStr, StrictBytes]], Field(
                 description="The raw MSCONS message as a file.")],
     ) -> JSONResponse:
@@ -90,30 +406,41 @@ class ParseMSCONSRouter(BaseMSCONSParserApi):
         decoding first and falling back to ISO-8859-1 if UTF-8 decoding fails.
 
         Args:
-            limit_mode (bool): If true, limits parsing to a maximum of 2442 lines;
+            limit_mode (bool): If true, limits parsing to a maximum of 2442 lines and 1 MiB;
                 if false, parses the entire message regardless of size
             body (str | dict[str, bytes]): The uploaded file containing the raw MSCONS message,
                 which may be a tuple or direct file content in various formats
 
         Returns:
             JSONResponse: A JSON response containing either the parsed data (status 200 - Success)
-                or an error message (status 400 - Bad request)
+                or an error message (status 400 - Bad request, 413 - Payload too large,
+                503 - Parse cancelled)
         """
         if not body:
             return JSONResponse(status_code=status.HTTP_400_BAD_REQUEST, content={"error_message": "No file provided"})
 
-        file_content = await self.__get_file_content(body)
-
+        statistics = ParseStatistics()
         try:
-            parsed_mscons_obj = await self.__get_parsed_result(file_content, limit_mode)
+            file_content = await self.__get_file_content(
+                body, statistics, get_parse_budget(PARSE_RAW_FILE_PATH, limit_mode)
+            )
+            parsed_mscons_obj = await self.__get_parsed_result(
+                file_content, limit_mode, statistics, PARSE_RAW_FILE_PATH
+            )
         except CONTRLException as ex:
             return JSONResponse(status_code=status.HTTP_400_BAD_REQUEST, content={"error_message": str(ex)})
+        except ParseBudgetExceededException as ex:
+            return JSONResponse(status_code=HTTP_413_CONTENT_TOO_LARGE,
+                                content={"error_message": str(ex)})
+        except ParseCancelledException as ex:
+            record_cancelled_parse(ex)
+            return JSONResponse(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, content={"error_message": str(ex)})
         except MSCONSParserException as ex:
             return JSONResponse(status_code=status.HTTP_400_BAD_REQUEST, content={"error_message": str(ex)})
         except Exception as ex:
             return JSONResponse(status_code=status.HTTP_400_BAD_REQUEST, content={"error_message": str(ex)})
 
-        return JSONResponse(status_code=status.HTTP_200_OK, content=parsed_mscons_obj.model_dump())
+        return self.__create_response(parsed_mscons_obj, statistics, status.HTTP_200_OK)
 
     async def download_parsed_result(
             self,
@@ -132,22 +459,32 @@ class ParseMSCONSRouter(BaseMSCONSParserApi):
 
         Returns:
             JSONResponse: A JSON response containing either the parsed data (status 201 - Created)
-                or an error message (status 400 - Bad request), with headers set for file download
-                including a timestamp in the filename
+                or an error message (status 400 - Bad request, 413 - Payload too large,
+                503 - Parse cancelled), with headers set for file download including a timestamp in the filename
         """
+        statistics = ParseStatistics()
         try:
-            parsed_mscons_obj = await self.__get_parsed_result(body, False)
+            parsed_mscons_obj = await self.__get_parsed_result(
+                body, False, statistics, DOWNLOAD_PARSED_RAW_FORMAT_PATH
+            )
         except CONTRLException as ex:
             return JSONResponse(status_code=status.HTTP_400_BAD_REQUEST, content={"error_message": str(ex)})
+        except ParseBudgetExceededException as ex:
+            return JSONResponse(status_code=HTTP_413_CONTENT_TOO_LARGE,
+                                content={"error_message": str(ex)})
+        except ParseCancelledException as ex:
+            record_cancelled_parse(ex)
+            return JSONResponse(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, content={"error_message": str(ex)})
         except MSCONSParserException as ex:
             return JSONResponse(status_code=status.HTTP_400_BAD_REQUEST, content={"error_message": str(ex)})
         except Exception as ex:
             return JSONResponse(status_code=status.HTTP_400_BAD_REQUEST, content={"error_message": str(ex)})
 
         timestamp = time.strftime("%Y%m%d_%H%M%S")
-        return JSONResponse(
-            status_code=status.HTTP_201_CREATED,
-            content=parsed_mscons_obj.model_dump(),
+        return self.__create_response(
+            parsed_mscons_obj,
+            statistics,
+            status.HTTP_201_CREATED,
             headers={"Content-Disposition": f"attachment; filename=mscons_parsed_{timestamp}.json"}
         )
 
@@ -171,49 +508,153 @@ class ParseMSCONSRouter(BaseMSCONSParserApi):
 
         Returns:
             JSONResponse: A JSON response containing either the parsed data (status 201 - Created)
-                or an error message (status 400 - Bad request), with headers set for file download
-                including a timestamp in the filename
+                or an error message (status 400 - Bad request, 413 - Payload too large,
+                503 - Parse cancelled), with headers set for file download including a timestamp in the filename
         """
         if not body:
             return JSONResponse(status_code=status.HTTP_400_BAD_REQUEST, content={"error_message": "No file provided"})
 
-        file_content = await self.__get_file_content(body)
-
+        statistics = ParseStatistics()
         try:
-            parsed_mscons_obj = await self.__get_parsed_result(file_content, False)
+            file_content = await self.__get_file_content(
+                body, statistics, get_parse_budget(DOWNLOAD_PARSED_RAW_FILE_PATH, False)
+            )
+            parsed_mscons_obj = await self.__get_parsed_result(
+                file_content, False, statistics, DOWNLOAD_PARSED_RAW_FILE_PATH
+            )
         except CONTRLException as ex:
             return JSONResponse(status_code=status.HTTP_400_BAD_REQUEST, content={"error_message": str(ex)})
+        except ParseBudgetExceededException as ex:
+            return JSONResponse(status_code=HTTP_413_CONTENT_TOO_LARGE,
+                                content={"error_message": str(ex)})
+        except ParseCancelledException as ex:
+            record_cancelled_parse(ex)
+            return JSONResponse(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, content={"error_message": str(ex)})
         except MSCONSParserException as ex:
             return JSONResponse(status_code=status.HTTP_400_BAD_REQUEST, content={"error_message": str(ex)})
         except Exception as ex:
             return JSONResponse(status_code=status.HTTP_400_BAD_REQUEST, content={"error_message": str(ex)})
 
         timestamp = time.strftime("%Y%m%d_%H%M%S")
-        return JSONResponse(
-            status_code=status.HTTP_201_CREATED,
-            content=parsed_mscons_obj.model_dump(),
+        return self.__create_response(
+            parsed_mscons_obj,
+            statistics,
+            status.HTTP_201_CREATED,
             headers={"Content-Disposition": f"attachment; filename=mscons_parsed_{timestamp}.json"}
         )
 
-    async def __get_parsed_result(self, body, limit_mode):
+    async def __get_parsed_result(self, body, limit_mode, statistics: ParseStatistics, path: str):
         max_lines_to_parse = MAX_LINES_TO_PARSE if limit_mode else UNLIMITED_LINES_TO_PARSE_INDICATOR
-        t1 = time.perf_counter()
-        parsed_mscons_obj = self.__parser_service.parse_message(
+        budget = get_parse_budget(path, limit_mode)
+        cancel_token = get_request_cancel_token()
+        profiler = create_request_profiler()
+        selection = get_message_selection()
+        page_request = get_page_request()
+        if page_request is not None:
+            parse = functools.partial(
+                self.__parse_page,
+                body=body,
+                page_request=page_request,
+                statistics=statistics,
+                profiler=profiler,
+                budget=budget,
+                cancel_token=cancel_token,
+            )
+        elif selection is not None:
+            parse = functools.partial(
+                self.__parse_selected_messages,
+                body=body,
+                selection=selection,
+                statistics=statistics,
+                profiler=profiler,
+                budget=budget,
+                cancel_token=cancel_token,
+            )
+        else:
+            parse = functools.partial(
+                self.__parser_service.parse_message,
+                message_content=body,
+                max_lines_to_parse=max_lines_to_parse,
+                statistics=statistics,
+                profiler=profiler,
+                # The parse tree is only dumped into the response, so it is built of the compact nodes
+                compact=True,
+                budget=None if budget.is_unlimited else budget,
+                cancel_token=cancel_token,
+            )
+        try:
+            if cancel_token is None:
+                return parse()
+            # The event loop stays free to notice the disconnect of the client while the parse is running
+            return await run_in_threadpool(parse)
+        finally:
+            if profiler is not None:
+                segment_profile.merge(profiler)
+
+    def __parse_selected_messages(self, body, selection: MessageSelection, statistics: ParseStatistics,
+                                  profiler: Optional[SegmentProfiler], budget: ParseBudget, cancel_token):
+        interchange = self.__parser_service.parse_message_lazily(
+            message_content=body,
+            statistics=statistics,
+            profiler=profiler,
+            compact=True,
+            budget=None if budget.is_unlimited else budget,
+            cancel_token=cancel_token,
+        )
+        with statistics.measure(ParsePhase.CONVERT):
+            if selection.message_index is not None:
+                # An absent message is an error, unlike an empty range of messages
+                interchange.get_message(selection.message_index)
+            # The selected messages are parsed here, so that their errors are answered like the ones of a whole parse
+            for _ in interchange.iter_messages(selection.offset, selection.limit):
+                pass
+        return interchange
+
+    def __parse_page(self, body, page_request: PageRequest, statistics: ParseStatistics,
+                     profiler: Optional[SegmentProfiler], budget: ParseBudget, cancel_token) -> InterchangePage:
+        interchange = self.__parser_service.parse_message_lazily(
             message_content=body,
-            max_lines_to_parse=max_lines_to_parse
+            statistics=statistics,
+            profiler=profiler,
+            compact=True,
+            budget=None if budget.is_unlimited else budget,
+            cancel_token=cancel_token,
         )
-        t2 = time.perf_counter()
-        logger.info(f"SPEED-TEST: Parsing took {(t2 - t1):2.2f}s")
-        return parsed_mscons_obj
+        with statistics.measure(ParsePhase.CONVERT):
+            return get_interchange_page(interchange, page_request)
+
+    def __create_response(self, parsed_mscons_obj, statistics: ParseStatistics, status_code: int,
+                          headers: Optional[dict] = None) -> JSONResponse:
+        selection = get_message_selection()
+        with statistics.measure(ParsePhase.SERIALIZE):
+            if selection is None or isinstance(parsed_mscons_obj, InterchangePage):
+                content = parsed_mscons_obj.model_dump(mode="json")
+            else:
+                content = parsed_mscons_obj.model_dump(mode="json", offset=selection.offset, limit=selection.limit)
+        with statistics.measure(ParsePhase.ENCODE):
+            # The JSON encoding takes place while rendering the response body
+            response = JSONResponse(status_code=status_code, content=content, headers=headers)
+
+        response.headers[SERVER_TIMING_HEADER] = statistics.to_server_timing()
+        if selection is not None or isinstance(parsed_mscons_obj, InterchangePage):
+            response.headers[MESSAGE_COUNT_HEADER] = str(parsed_mscons_obj.message_count)
+        if isinstance(parsed_mscons_obj, InterchangePage) and parsed_mscons_obj.next_cursor is not None:
+            response.headers[NEXT_CURSOR_HEADER] = parsed_mscons_obj.next_cursor.encode()
+        if self.__expose_parse_stats:
+            response.headers[PARSE_STATS_HEADER] = statistics.to_stats_header()
+        logger.info("Parsed MSCONS interchange", extra={"parse_stats": statistics.as_dict()})
+        return response
 
     @staticmethod
-    async def __get_file_content(body):
+    async def __get_file_content(body, statistics: ParseStatistics, budget: ParseBudget):
         file_content = body
+        if isinstance(file_content, tuple):
+            # Uploaded files may be given as a tuple of file name and file content
+            file_content = file_content[1]
         if isinstance(file_content, bytes):
-            try:
-                file_content = file_content.decode('utf-8')
-            except UnicodeDecodeError:
-                # Fall back to ISO-8859-1 (Latin-1) which is a common encoding for EDIFACT files
-                # and can handle all byte values from 0x00 to 0xFF
-                file_content = file_content.decode('iso-8859-1')
+            statistics.byte_count = len(file_content)
+            # Reject an oversized file before decoding it
+            budget.check_bytes(statistics.byte_count)
+            with statistics.measure(ParsePhase.DECODE):
+                file_content = decode_edifact_bytes(file_content)
         return file_content
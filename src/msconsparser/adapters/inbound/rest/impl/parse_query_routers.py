@@ -0,0 +1,124 @@
+# coding: utf-8
+
+import functools
+import logging
+from typing import Optional
+
+from fastapi import APIRouter, Query, Request, status
+from starlette.concurrency import run_in_threadpool
+from starlette.responses import JSONResponse
+from typing_extensions import Annotated
+
+from msconsparser.adapters.inbound.rest.impl.parse_cancellation_routers import (
+    get_request_cancel_token, record_cancelled_parse
+)
+from msconsparser.adapters.inbound.rest.impl.parse_mscons_routers import (
+    HTTP_413_CONTENT_TOO_LARGE, SERVER_TIMING_HEADER
+)
+from msconsparser.adapters.inbound.rest.impl.segment_profiling_routers import (
+    create_request_profiler, segment_profile
+)
+from msconsparser.application.services import ParserService
+from msconsparser.libs.edifactmsconsparser.exceptions import ParseBudgetExceededException, ParseCancelledException
+from msconsparser.libs.edifactmsconsparser.utils import decode_edifact_bytes
+from msconsparser.libs.edifactmsconsparser.wrappers import (
+    InterchangeQueryIndex, ParseBudget, ParsePhase, ParseStatistics, SegmentProfiler
+)
+
+logger = logging.getLogger(__name__)
+
+PARSE_QUERY_PATH = "/parse-raw-query"
+# The environment variables PARSE_BUDGET_PARSE_RAW_QUERY_MAX_SEGMENTS, _MAX_BYTES and _MAX_SECONDS limit the parse
+PARSE_QUERY_BUDGET_PREFIX = "PARSE_BUDGET_PARSE_RAW_QUERY"
+MATCH_COUNT_HEADER = "X-Match-Count"
+
+router = APIRouter()
+
+
+def _error_response(status_code: int, error_message: str) -> JSONResponse:
+    return JSONResponse(status_code=status_code, content={"error_message": error_message})
+
+
+def _parse_indexed(body: bytes, statistics: ParseStatistics, profiler: Optional[SegmentProfiler],
+                   budget: ParseBudget, cancel_token) -> InterchangeQueryIndex:
+    with statistics.measure(ParsePhase.DECODE):
+        message_content = decode_edifact_bytes(body)
+    query_index = InterchangeQueryIndex()
+    # A parser is not thread-safe, the parse of every request thus gets its own parser
+    ParserService().parse_message(
+        message_content=message_content,
+        statistics=statistics,
+        profiler=profiler,
+        # The parse tree is only queried, so it is built of the compact nodes
+        compact=True,
+        budget=None if budget.is_unlimited else budget,
+        cancel_token=cancel_token,
+        query_index=query_index,
+    )
+    return query_index
+
+
+@router.post(
+    PARSE_QUERY_PATH,
+    responses={
+        200: {"description": "OK"},
+        400: {"description": "Bad request"},
+        413: {"description": "Payload too large"},
+        503: {"description": "Parse cancelled"},
+    },
+    tags=["MSCONS Parser"],
+    summary="Parses a raw MSCONS message and returns only the location objects or positions matching a query",
+    response_model_by_alias=True,
+)
+async def parse_mscons_query(
+        request: Request,
+        location: Annotated[Optional[str], Query(description="The location ID (LOC), e.g. a MaLo or MeLo ID")] = None,
+        obis: Annotated[Optional[str], Query(description="The OBIS code of the positions (PIA)")] = None,
+        device_number: Annotated[Optional[str], Query(description="The device number (RFF+MG)")] = None,
+        time_series_type: Annotated[Optional[str], Query(description="The time series type (CCI)")] = None,
+) -> JSONResponse:
+    """
+    Parses the raw MSCONS message of the request body into query indexes (see InterchangeQueryIndex) and returns
+    {"matches": [...]} with the location objects (SG6) matching all given values, or their positions (SG9) if an
+    OBIS code is given, together with their message index, message reference and location ID. Only the matching
+    subtrees are serialized, the number of matches is returned in the `X-Match-Count` header.
+    """
+    if location is None and obis is None and device_number is None and time_series_type is None:
+        return _error_response(status.HTTP_400_BAD_REQUEST,
+                               "At least one of location, obis, device_number or time_series_type is required")
+
+    statistics = ParseStatistics()
+    budget = ParseBudget.from_environment(PARSE_QUERY_BUDGET_PREFIX)
+    cancel_token = get_request_cancel_token()
+    profiler = create_request_profiler()
+    body = await request.body()
+    statistics.byte_count = len(body)
+    parse = functools.partial(_parse_indexed, body, statistics, profiler, budget, cancel_token)
+    try:
+        budget.check_bytes(statistics.byte_count)
+        # The event loop stays free to notice the disconnect of the client while the parse is running
+        query_index = parse() if cancel_token is None else await run_in_threadpool(parse)
+    except ParseBudgetExceededException as ex:
+        return _error_response(HTTP_413_CONTENT_TOO_LARGE, str(ex))
+    except ParseCancelledException as ex:
+        record_cancelled_parse(ex)
+        return _error_response(status.HTTP_503_SERVICE_UNAVAILABLE, str(ex))
+    except Exception as ex:
+        # An invalid interchange (CONTRLException, MSCONSParserException) is a bad request like any other error
+        return _error_response(status.HTTP_400_BAD_REQUEST, str(ex))
+    finally:
+        if profiler is not None:
+            segment_profile.merge(profiler)
+
+    with statistics.measure(ParsePhase.SERIALIZE):
+        matches = query_index.query(
+            location=location, obis=obis, device_number=device_number, time_series_type=time_series_type
+        )
+        content = {"matches": [match.model_dump(mode="json") for match in matches]}
+    with statistics.measure(ParsePhase.ENCODE):
+        response = JSONResponse(status_code=status.HTTP_200_OK, content=content)
+    response.headers[SERVER_TIMING_HEADER] = statistics.to_server_timing()
+    response.headers[MATCH_COUNT_HEADER] = str(len(matches))
+    logger.info("Queried MSCONS interchange", extra={"parse_stats": statistics.as_dict(),
+                                                     "match_count": len(matches)})
+    return response
@@ -0,0 +1,113 @@
+# coding: utf-8
+
+import os
+from contextvars import ContextVar
+from typing import Optional
+
+from fastapi import APIRouter, Request, status
+from starlette.responses import JSONResponse, Response
+
+from msconsparser.libs.edifactmsconsparser.wrappers import SegmentProfiler
+
+SEGMENT_PROFILING_HEADER = "X-Profile-Segments"
+
+# Aggregated segment handler and converter counters of all profiled parse requests of this process
+segment_profile = SegmentProfiler()
+
+# Set per request by the segment_profiling_middleware
+_segment_profiling_requested: ContextVar[bool] = ContextVar("segment_profiling_requested", default=False)
+
+router = APIRouter()
+
+
+def is_segment_profiling_enabled() -> bool:
+    """
+    Checks if the segment profiling is enabled for all requests via the environment variable ENABLE_SEGMENT_PROFILING.
+
+    Returns:
+        bool: True if the environment variable is set to 'true' (case-insensitive), False otherwise
+    """
+    return os.getenv("ENABLE_SEGMENT_PROFILING", "false").lower() == "true"
+
+
+def is_segment_profiling_requested() -> bool:
+    """
+    Checks if the segment handlers and converters should be profiled for the current request.
+
+    Returns:
+        bool: True if the profiling is enabled for all requests or requested by the X-Profile-Segments header
+    """
+    return _segment_profiling_requested.get() or is_segment_profiling_enabled()
+
+
+def is_segment_allocation_tracking_enabled() -> bool:
+    """
+    Checks if the profiled parse requests count the allocated memory blocks via the environment variable
+    SEGMENT_PROFILING_TRACK_ALLOCATIONS.
+
+    Returns:
+        bool: True if the environment variable is set to 'true' (case-insensitive), False otherwise
+    """
+    return os.getenv("SEGMENT_PROFILING_TRACK_ALLOCATIONS", "false").lower() == "true"
+
+
+def create_request_profiler() -> Optional[SegmentProfiler]:
+    """
+    Creates the segment profiler of the current request, if its profiling is requested.
+
+    Returns:
+        Optional[SegmentProfiler]: The profiler, counting the allocated memory blocks only if enabled via
+            SEGMENT_PROFILING_TRACK_ALLOCATIONS, or None if the request is not profiled
+    """
+    if not is_segment_profiling_requested():
+        return None
+    return SegmentProfiler(track_allocations=is_segment_allocation_tracking_enabled())
+
+
+async def segment_profiling_middleware(request: Request, call_next):
+    """
+    Middleware that enables the segment profiling for a request sending the header `X-Profile-Segments: true`.
+    """
+    token = _segment_profiling_requested.set(
+        request.headers.get(SEGMENT_PROFILING_HEADER, "false").lower() == "true"
+    )
+    try:
+        return await call_next(request)
+    finally:
+        _segment_profiling_requested.reset(token)
+
+
+@router.get(
+    "/admin/segment-profile",
+    responses={
+        200: {"description": "OK"},
+    },
+    tags=["Admin"],
+    summary="Returns the aggregated segment handler and converter profile",
+    response_model_by_alias=True,
+    include_in_schema=False,
+)
+async def get_segment_profile() -> JSONResponse:
+    """
+    Returns the call counts, cumulative times and allocated memory blocks per segment type
+    of all profiled parse requests since the start of the process or the last reset.
+    """
+    return JSONResponse(status_code=status.HTTP_200_OK, content=segment_profile.report())
+
+
+@router.delete(
+    "/admin/segment-profile",
+    responses={
+        204: {"description": "No content"},
+    },
+    tags=["Admin"],
+    summary="Resets the aggregated segment handler and converter profile",
+    response_model_by_alias=True,
+    include_in_schema=False,
+)
+async def reset_segment_profile() -> Response:
+    """
+    Resets the aggregated segment profile.
+    """
+    segment_profile.reset()
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
@@ -0,0 +1,25 @@
+# coding: utf-8
+
+"""
+    MSCONSRestify - a Rest-API for parsing EDIFACT MSCONS messages
+
+    This [OpenAPI-Spezifikation](https://www.openapis.org/) describes the Rest-API of MSCONSRestify, a REST API application that uses the EDIFACT MSCONS Parser library for parsing EDIFACT MSCONS messages (energy sector, DE/AT/CH) based on version [2.4c](https://bdew-mako.de/linkPdf/9645). 
+
+    The version of the OpenAPI document: 1.204c.4
+    Generated by OpenAPI Generator (https://openapi-generator.tech)
+
+    Do not edit the class manually.
+"""  # noqa: E501
+
+
+from fastapi import FastAPI
+
+from msconsparser.adapters.inbound.rest.apis.mscons_parser_api import router as MSCONSParserApiRouter
+
+app = FastAPI(
+    title="MSCONSRestify - a Rest-API for parsing EDIFACT MSCONS messages",
+    description="This [OpenAPI-Spezifikation](https://www.openapis.org/) describes the Rest-API of MSCONSRestify, a REST API application that uses the EDIFACT MSCONS Parser library for parsing EDIFACT MSCONS messages (energy sector, DE/AT/CH) based on version [2.4c](https://bdew-mako.de/linkPdf/9645). ",
+    version="1.204c.4",
+)
+
+app.include_router(MSCONSParserApiRouter)
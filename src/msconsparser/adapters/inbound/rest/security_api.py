@@ -0,0 +1,20 @@
+# coding: utf-8
+
+from typing import List
+
+from fastapi import Depends, Security  # noqa: F401
+from fastapi.openapi.models import OAuthFlowImplicit, OAuthFlows  # noqa: F401
+from fastapi.security import (  # noqa: F401
+    HTTPAuthorizationCredentials,
+    HTTPBasic,
+    HTTPBasicCredentials,
+    HTTPBearer,
+    OAuth2,
+    OAuth2AuthorizationCodeBearer,
+    OAuth2PasswordBearer,
+    SecurityScopes,
+)
+from fastapi.security.api_key import APIKeyCookie, APIKeyHeader, APIKeyQuery  # noqa: F401
+
+from msconsparser.adapters.inbound.rest.models.extra_models import TokenModel
+
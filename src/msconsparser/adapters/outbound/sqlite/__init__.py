@@ -0,0 +1,8 @@
+# coding: utf-8
+"""
+Package for the measurement store in a SQLite database.
+"""
+
+from msconsparser.adapters.outbound.sqlite.sqlite_measurement_store import SQLiteMeasurementStore
+
+__all__ = ["SQLiteMeasurementStore"]
@@ -0,0 +1,324 @@
+# coding: utf-8
+
+import functools
+import sqlite3
+import threading
+from datetime import datetime, timezone
+from typing import Any, Iterator, Optional
+
+from msconsparser.domain.ports.outbound import MeasurementStorePort
+from msconsparser.libs.edifactmsconsparser.interchange_pages import parse_dtm_value
+
+# The number of measurements inserted per executemany call
+DEFAULT_BATCH_SIZE = 10000
+
+# The qualifiers of the DTM segments of the start and the end of an interval
+_START_QUALIFIER = "163"
+_END_QUALIFIER = "164"
+# The reference qualifier of the device number (Gerätenummer) in SG7
+_DEVICE_NUMBER_QUALIFIER = "MG"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS interchanges (
+    id INTEGER PRIMARY KEY,
+    source TEXT,
+    sender TEXT,
+    recipient TEXT,
+    interchange_reference TEXT,
+    stored_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS messages (
+    id INTEGER PRIMARY KEY,
+    interchange_id INTEGER NOT NULL REFERENCES interchanges (id),
+    message_index INTEGER NOT NULL,
+    message_reference TEXT,
+    document_number TEXT
+);
+CREATE TABLE IF NOT EXISTS locations (
+    id INTEGER PRIMARY KEY,
+    message_id INTEGER NOT NULL REFERENCES messages (id),
+    location TEXT,
+    device_number TEXT,
+    time_series_type TEXT
+);
+CREATE TABLE IF NOT EXISTS measurements (
+    location_id INTEGER NOT NULL REFERENCES locations (id),
+    location TEXT,
+    obis TEXT,
+    quantity_qualifier TEXT,
+    quantity,
+    unit TEXT,
+    interval_start TEXT,
+    interval_end TEXT
+);
+CREATE INDEX IF NOT EXISTS messages_interchange_id ON messages (interchange_id);
+CREATE INDEX IF NOT EXISTS measurements_location_obis_interval_start ON measurements (location, obis, interval_start);
+"""
+
+_INSERT_INTERCHANGE = (
+    "INSERT INTO interchanges (source, sender, recipient, interchange_reference, stored_at) VALUES (?, ?, ?, ?, ?)"
+)
+_INSERT_MESSAGE = (
+    "INSERT INTO messages (id, interchange_id, message_index, message_reference, document_number) "
+    "VALUES (?, ?, ?, ?, ?)"
+)
+_INSERT_LOCATION = (
+    "INSERT INTO locations (id, message_id, location, device_number, time_series_type) VALUES (?, ?, ?, ?, ?)"
+)
+_INSERT_MEASUREMENT = (
+    "INSERT INTO measurements (location_id, location, obis, quantity_qualifier, quantity, unit, interval_start, "
+    "interval_end) VALUES (?, ?, ?, ?, ?, ?, ?, ?)"
+)
+
+
+def _get(node: Optional[dict], *keys: str):
+    for key in keys:
+        if node is None:
+            return None
+        node = node.get(key)
+    return node
+
+
+def _format_timestamp(timestamp: datetime) -> str:
+    # The timestamps are stored in UTC in the same format, so that they are ordered and compared as text
+    if timestamp.tzinfo is None:
+        timestamp = timestamp.replace(tzinfo=timezone.utc)
+    return timestamp.astimezone(timezone.utc).isoformat()
+
+
+@functools.lru_cache(maxsize=4096)
+def _convert_dtm_value(value: Optional[str], format_code: Optional[str]) -> Optional[str]:
+    # The locations of an interchange usually share their intervals, so that the timestamps repeat
+    timestamp = parse_dtm_value(value, format_code)
+    return None if timestamp is None else _format_timestamp(timestamp)
+
+
+def _find_timestamp(dates: Optional[list], qualifier: str) -> Optional[str]:
+    for date in dates or ():
+        if date.get("datums_oder_uhrzeits_oder_zeitspannen_funktion_qualifier") == qualifier:
+            return _convert_dtm_value(date.get("datum_oder_uhrzeit_oder_zeitspanne_wert"),
+                                      date.get("datums_oder_uhrzeit_oder_zeitspannen_format_code"))
+    return None
+
+
+def _to_quantity(menge: Any) -> Optional[float]:
+    # The quantities of the decimal numeric mode are dumped as JSON strings, they are stored as numbers like the
+    # quantities of the other modes (menge is in the unit in every mode)
+    return float(menge) if isinstance(menge, str) else menge
+
+
+def _find_device_number(location_object: dict) -> Optional[str]:
+    for reference in location_object.get("sg7_referenzangaben") or ():
+        if _get(reference, "rff_referenzangabe", "referenz_qualifier") == _DEVICE_NUMBER_QUALIFIER:
+            return _get(reference, "rff_referenzangabe", "referenz_identifikation")
+    return None
+
+
+def _find_time_series_type(location_object: dict) -> Optional[str]:
+    for time_series_type in location_object.get("sg8_zeitreihentypen") or ():
+        return _get(time_series_type, "cci_zeitreihentyp", "merkmalsbeschreibung", "merkmal_code")
+    return None
+
+
+def _iter_measurement_rows(location_id: int, location: Optional[str], location_object: dict) -> Iterator[tuple]:
+    for position in location_object.get("sg9_positionsdaten") or ():
+        obis = _get(position, "pia_produktidentifikation", "waren_leistungsnummer_identifikation",
+                    "produkt_leistungsnummer")
+        for interval in position.get("sg10_mengen_und_statusangaben") or ():
+            quantity = interval.get("qty_mengenangaben") or {}
+            dates = interval.get("dtm_zeitangaben")
+            yield (
+                location_id, location, obis, quantity.get("menge_qualifier"), _to_quantity(quantity.get("menge")),
+                quantity.get("masseinheit_code"), _find_timestamp(dates, _START_QUALIFIER),
+                _find_timestamp(dates, _END_QUALIFIER),
+            )
+
+
+class SQLiteMeasurementStore(MeasurementStorePort):
+    """
+    Measurement store in a local SQLite database.
+
+    The database is opened in WAL mode, so that readers of other connections are not blocked while an interchange
+    is stored. An interchange is stored in one transaction: its messages, locations and intervals are inserted with
+    executemany in batches, their IDs are assigned by the store up front instead of being read back row by row.
+    The measurements are indexed by location, OBIS code and interval start, the timestamps are stored as ISO 8601
+    text in UTC.
+
+    A store is shared by the threads of a process, its connection is used by one thread at a time.
+    """
+
+    def __init__(self, path: str, batch_size: int = DEFAULT_BATCH_SIZE):
+        """
+        Initialize the store and create the tables and indexes, if missing.
+
+        Args:
+            path (str): The path of the database file, or ':memory:' for an in-memory database (e.g. for tests)
+            batch_size (int): The number of measurements inserted per executemany call
+        """
+        if batch_size <= 0:
+            raise ValueError(f"Batch size must be greater than 0, got {batch_size}")
+        self.__batch_size = batch_size
+        self.__lock = threading.Lock()
+        # The transactions are started explicitly, see store_interchange
+        self.__connection = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self.__connection.row_factory = sqlite3.Row
+        self.__connection.execute("PRAGMA journal_mode=WAL")
+        # In WAL mode, a commit is durable as of the next checkpoint, which is safe against corruption
+        self.__connection.execute("PRAGMA synchronous=NORMAL")
+        self.__connection.executescript(_SCHEMA)
+
+    @property
+    def journal_mode(self) -> str:
+        """
+        The journal mode of the database, 'wal' for a database file.
+        """
+        with self.__lock:
+            return self.__connection.execute("PRAGMA journal_mode").fetchone()[0]
+
+    def store_interchange(self, interchange: dict[str, Any], source: Optional[str] = None) -> dict[str, Any]:
+        """
+        Stores a parsed interchange with its messages, location objects and intervals in one transaction.
+
+        Args:
+            interchange (dict[str, Any]): The parsed interchange as dumped to JSON (model_dump(mode="json"))
+            source (Optional[str]): The origin of the interchange, e.g. its file name
+
+        Returns:
+            dict[str, Any]: The ID of the stored interchange ('interchange_id') and the number of stored
+                messages, locations and measurements ('message_count', 'location_count', 'measurement_count')
+        """
+        unb = interchange.get("unb_nutzdaten_kopfsegment") or {}
+        with self.__lock:
+            cursor = self.__connection.cursor()
+            cursor.execute("BEGIN IMMEDIATE")
+            try:
+                cursor.execute(_INSERT_INTERCHANGE, (
+                    source,
+                    _get(unb, "absender_der_uebertragungsdatei", "marktpartneridentifikationsnummer"),
+                    _get(unb, "empfaenger_der_uebertragungsdatei", "marktpartneridentifikationsnummer"),
+                    unb.get("datenaustauschreferenz"),
+                    _format_timestamp(datetime.now(timezone.utc)),
+                ))
+                counts = self.__insert_messages(cursor, cursor.lastrowid, interchange.get("unh_unt_nachrichten") or ())
+                cursor.execute("COMMIT")
+            except BaseException:
+                cursor.execute("ROLLBACK")
+                raise
+        return counts
+
+    def __insert_messages(self, cursor: sqlite3.Cursor, interchange_id: int, messages) -> dict[str, Any]:
+        # The writer holds the database lock, so that the IDs following the highest ones are free
+        message_id = cursor.execute("SELECT coalesce(max(id), 0) FROM messages").fetchone()[0]
+        location_id = cursor.execute("SELECT coalesce(max(id), 0) FROM locations").fetchone()[0]
+        message_rows: list[tuple] = []
+        location_rows: list[tuple] = []
+        measurement_rows: list[tuple] = []
+        counts = {"interchange_id": interchange_id, "message_count": 0, "location_count": 0, "measurement_count": 0}
+
+        def flush() -> None:
+            # The parents are inserted before their children
+            cursor.executemany(_INSERT_MESSAGE, message_rows)
+            cursor.executemany(_INSERT_LOCATION, location_rows)
+            cursor.executemany(_INSERT_MEASUREMENT, measurement_rows)
+            counts["message_count"] += len(message_rows)
+            counts["location_count"] += len(location_rows)
+            counts["measurement_count"] += len(measurement_rows)
+            message_rows.clear()
+            location_rows.clear()
+            measurement_rows.clear()
+
+        for message_index, message in enumerate(messages):
+            message_id += 1
+            message_rows.append((
+                message_id, interchange_id, message_index,
+                _get(message, "unh_nachrichtenkopfsegment", "nachrichten_referenznummer"),
+                _get(message, "bgm_beginn_der_nachricht", "dokumenten_nachrichten_identifikation", "dokumentennummer"),
+            ))
+            for delivery_location in message.get("sg5_liefer_bzw_bezugsorte") or ():
+                for location_object in delivery_location.get("sg6_wert_und_erfassungsangaben_zum_objekt") or ():
+                    location_id += 1
+                    location = _get(location_object, "loc_identifikationsangabe", "ortsangabe", "ortsangabe_code")
+                    location_rows.append((
+                        location_id, message_id, location, _find_device_number(location_object),
+                        _find_time_series_type(location_object),
+                    ))
+                    measurement_rows.extend(_iter_measurement_rows(location_id, location, location_object))
+                    if len(measurement_rows) >= self.__batch_size:
+                        flush()
+        flush()
+        return counts
+
+    def find_interchanges(self, limit: int = 100, offset: int = 0) -> list[dict[str, Any]]:
+        """
+        Lists the stored interchanges, the most recently stored first.
+
+        Args:
+            limit (int): The number of interchanges at most
+            offset (int): The number of interchanges to skip
+
+        Returns:
+            list[dict[str, Any]]: The ID, source, sender, recipient, reference and storage time of each
+                interchange together with its number of messages
+        """
+        with self.__lock:
+            rows = self.__connection.execute(
+                "SELECT i.id AS interchange_id, i.source, i.sender, i.recipient, i.interchange_reference, "
+                "i.stored_at, (SELECT count(*) FROM messages m WHERE m.interchange_id = i.id) AS message_count "
+                "FROM interchanges i ORDER BY i.id DESC LIMIT ? OFFSET ?",
+                (limit, offset),
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def find_measurements(
+            self,
+            location: Optional[str] = None,
+            obis: Optional[str] = None,
+            start: Optional[datetime] = None,
+            end: Optional[datetime] = None,
+            limit: int = 1000,
+            offset: int = 0,
+    ) -> list[dict[str, Any]]:
+        """
+        Finds the stored measurements ordered by location, OBIS code and interval start, which is the order of
+        their index.
+
+        Args:
+            location (Optional[str]): The location ID (LOC) of the measurements, e.g. a MaLo or MeLo ID
+            obis (Optional[str]): The OBIS code (PIA) of the measurements
+            start (Optional[datetime]): The earliest interval start, inclusive, a naive timestamp is taken as UTC
+            end (Optional[datetime]): The latest interval start, exclusive, a naive timestamp is taken as UTC
+            limit (int): The number of measurements at most
+            offset (int): The number of measurements to skip
+
+        Returns:
+            list[dict[str, Any]]: The measurements with their interchange ID, message reference, location, OBIS
+                code, quantity qualifier, quantity, unit and interval start and end (ISO 8601 in UTC)
+        """
+        conditions = []
+        parameters: list[Any] = []
+        for condition, value in (
+                ("ms.location = ?", location),
+                ("ms.obis = ?", obis),
+                ("ms.interval_start >= ?", None if start is None else _format_timestamp(start)),
+                ("ms.interval_start < ?", None if end is None else _format_timestamp(end)),
+        ):
+            if value is not None:
+                conditions.append(condition)
+                parameters.append(value)
+        where = f"WHERE {' AND '.join(conditions)} " if conditions else ""
+        with self.__lock:
+            rows = self.__connection.execute(
+                "SELECT m.interchange_id, m.message_reference, ms.location, ms.obis, ms.quantity_qualifier, "
+                "ms.quantity, ms.unit, ms.interval_start, ms.interval_end "
+                "FROM measurements ms JOIN locations l ON l.id = ms.location_id JOIN messages m ON m.id = l.message_id "
+                f"{where}ORDER BY ms.location, ms.obis, ms.interval_start LIMIT ? OFFSET ?",
+                (*parameters, limit, offset),
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def close(self) -> None:
+        """
+        Closes the database connection.
+        """
+        with self.__lock:
+            self.__connection.close()
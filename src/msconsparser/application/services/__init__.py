@@ -3,6 +3,11 @@
 Package of the services.
 """
 
+from msconsparser.application.services.batch_parse_service import BatchParseService
+from msconsparser.application.services.measurement_store_service import MeasurementStoreService
 from msconsparser.application.services.parser_service import ParserService
+from msconsparser.application.services.parse_job_service import ParseJobQueueFullException, ParseJobService
 
-__all__ = ["ParserService"]
+__all__ = [
+    "BatchParseService", "MeasurementStoreService", "ParseJobQueueFullException", "ParseJobService", "ParserService"
+]
@@ -0,0 +1,380 @@
+# coding: utf-8
+
+import asyncio
+import json
+import logging
+import os
+import threading
+from collections import deque
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from typing import AsyncIterator, BinaryIO, Iterable, Iterator, Optional, Union
+
+from msconsparser.libs.edifactmsconsparser.edifact_mscons_parser import DEFAULT_CHUNK_SIZE, EdifactMSCONSParser
+from msconsparser.libs.edifactmsconsparser.utils import decode_edifact_bytes, iter_decoded_text
+from msconsparser.libs.edifactmsconsparser.wrappers import ParseBudget
+
+logger = logging.getLogger(__name__)
+
+# Number of files, or chunks of files, submitted per worker ahead of the record streamed next
+FILES_IN_FLIGHT_PER_WORKER = 4
+
+STATUS_OK = "ok"
+STATUS_ERROR = "error"
+
+# The content of a file of a batch: its bytes, its binary stream, e.g. a member of an archive, which is split into
+# chunks of messages, or the exception raised while reading it
+BatchFileContent = Union[bytes, BinaryIO, Exception]
+
+# The error message of a chunk of messages of a file, or None, and the JSON of its header (UNA, UNB) as object
+# members, of its messages as array elements and of its trailer (UNZ), see parse_chunk_parts
+ChunkParts = tuple[Optional[str], bytes, bytes, bytes]
+
+# The separators of the JSON lines, as used by the JSON responses of the parse endpoints
+_JSON_SEPARATORS = (",", ":")
+_MESSAGES_KEY = "unh_unt_nachrichten"
+_TRAILER_KEY = "unz_nutzdaten_endsegment"
+
+# The parser of a worker, which is created once and reused for all files of the worker. A parser is not
+# thread-safe, so that every thread of an executor running the parses gets its own parser.
+_worker = threading.local()
+
+
+def get_parse_batch_workers() -> int:
+    """
+    Gets the number of worker processes of the batch parse from the environment variable PARSE_BATCH_WORKERS.
+
+    Returns:
+        int: The configured number, or the number of CPUs if the variable is not set or invalid
+    """
+    default = os.cpu_count() or 1
+    value = os.getenv("PARSE_BATCH_WORKERS")
+    if value is None or value == "":
+        return default
+    try:
+        workers = int(value)
+    except ValueError:
+        workers = 0
+    if workers <= 0:
+        logger.warning("Invalid PARSE_BATCH_WORKERS '%s', using %d", value, default)
+        return default
+    return workers
+
+
+def _get_worker_parser() -> EdifactMSCONSParser:
+    parser = getattr(_worker, "parser", None)
+    if parser is None:
+        parser = _worker.parser = EdifactMSCONSParser()
+    return parser
+
+
+def create_record(
+        index: int,
+        file_name: str,
+        error_message: Optional[str] = None,
+        result: Optional[dict] = None,
+) -> bytes:
+    """
+    Creates the NDJSON record of a file of a batch.
+
+    Args:
+        index: The position of the file in the batch, starting at 0
+        file_name: The name of the file
+        error_message: The reason why the file was not parsed, if any
+        result: The parsed interchange, if the file was parsed
+
+    Returns:
+        bytes: The JSON line of the record including the line break
+    """
+    record = {"index": index, "file_name": file_name}
+    if error_message is None:
+        record.update(status=STATUS_OK, result=result)
+    else:
+        record.update(status=STATUS_ERROR, error_message=error_message)
+    return _dump_json(record) + b"\n"
+
+
+def create_chunked_record(index: int, file_name: str, chunk_parts: list[ChunkParts]) -> bytes:
+    """
+    Creates the NDJSON record of a file of a batch from the JSON parts of its chunks of messages, the record
+    equals the record of the file parsed as a whole.
+
+    Args:
+        index: The position of the file in the batch, starting at 0
+        file_name: The name of the file
+        chunk_parts: The parts of the chunks in the order of the file (see parse_chunk_parts)
+
+    Returns:
+        bytes: The JSON line of the record including the line break, an error of any chunk is the error of the file
+    """
+    for error_message, _, _, _ in chunk_parts:
+        if error_message is not None:
+            return create_record(index, file_name, error_message=error_message)
+    if not chunk_parts:
+        return create_record(index, file_name, error_message="No message provided")
+
+    # Every chunk repeats the header (UNA, UNB), only the last one has the trailer (UNZ)
+    header = chunk_parts[0][1]
+    messages = b",".join(messages for _, _, messages, _ in chunk_parts if messages)
+    trailer = chunk_parts[-1][3]
+    return b"".join((
+        _dump_json({"index": index, "file_name": file_name, "status": STATUS_OK})[:-1],
+        b',"result":{', header, b"," if header else b"", b'"', _MESSAGES_KEY.encode("utf-8"), b'":[', messages,
+        b'],"', _TRAILER_KEY.encode("utf-8"), b'":', trailer, b"}}\n",
+    ))
+
+
+def parse_file_record(index: int, file_name: str, content: bytes, budget: Optional[ParseBudget] = None) -> bytes:
+    """
+    Parses a file of a batch into its NDJSON record, an error of the file is part of the record.
+
+    It runs in the worker processes, which reuse their parser for all files. The record is returned as JSON,
+    so that only bytes are passed back to the calling process.
+
+    Args:
+        index: The position of the file in the batch
+        file_name: The name of the file
+        content: The raw MSCONS message of the file
+        budget: The budget of the parse of the file, if any
+
+    Returns:
+        bytes: The JSON line of the record including the line break
+    """
+    try:
+        if budget is not None:
+            budget.check_bytes(len(content))
+        edifact_text = decode_edifact_bytes(content)
+        if not edifact_text.strip():
+            return create_record(index, file_name, error_message="No message provided")
+        # The parse tree is only dumped into the record, so it is built of the compact nodes
+        interchange = _get_worker_parser().parse(edifact_text, compact=True, budget=budget)
+        return create_record(index, file_name, result=interchange.model_dump(mode="json"))
+    except Exception as ex:
+        return create_record(index, file_name, error_message=str(ex))
+
+
+def parse_chunk_parts(edifact_text: str, budget: Optional[ParseBudget] = None) -> ChunkParts:
+    """
+    Parses a chunk of messages of a file into the JSON parts of the record of the file (see create_chunked_record).
+
+    It runs in the worker processes like parse_file_record, so that only bytes are passed back to the calling
+    process, which merges the parts of all chunks of the file.
+
+    Args:
+        edifact_text: The raw MSCONS message of the chunk, which is an interchange of its own (see
+            iter_message_texts)
+        budget: The budget of the parse of the chunk, if any
+
+    Returns:
+        ChunkParts: The error message of the chunk, or None, and the JSON of the header as object members, of the
+            messages as array elements and of the trailer
+    """
+    try:
+        if not edifact_text.strip():
+            return "No message provided", b"", b"", b""
+        interchange = _get_worker_parser().parse(edifact_text, compact=True, budget=budget)
+        result = interchange.model_dump(mode="json")
+    except Exception as ex:
+        return str(ex), b"", b"", b""
+    messages = result.pop(_MESSAGES_KEY)
+    trailer = result.pop(_TRAILER_KEY)
+    return (None, _dump_json(result)[1:-1], b",".join(_dump_json(message) for message in messages),
+            _dump_json(trailer))
+
+
+def _dump_json(value) -> bytes:
+    return json.dumps(value, ensure_ascii=False, separators=_JSON_SEPARATORS).encode("utf-8")
+
+
+def _completed(result) -> Future:
+    future = Future()
+    future.set_result(result)
+    return future
+
+
+class _EndOfStream:
+    """
+    The result following the chunks of a file given as stream, which completes the record of the file.
+    """
+
+    def __init__(self, index: int, file_name: str, error_message: Optional[str] = None):
+        self.index = index
+        self.file_name = file_name
+        self.error_message = error_message
+
+
+class _RecordMerger:
+    """
+    Merges the results of the parses, which arrive in the order of the files, into one record per file.
+    """
+
+    def __init__(self):
+        self.__chunk_parts: list[ChunkParts] = []
+
+    def add(self, result: Union[bytes, ChunkParts, _EndOfStream]) -> Optional[bytes]:
+        """
+        Adds the result of a parse.
+
+        Args:
+            result (Union[bytes, ChunkParts, _EndOfStream]): The record of a file, the parts of a chunk of a file
+                given as stream or the end of that stream
+
+        Returns:
+            Optional[bytes]: The record of a file once it is complete, else None
+        """
+        if isinstance(result, bytes):
+            return result
+        if not isinstance(result, _EndOfStream):
+            self.__chunk_parts.append(result)
+            return None
+        chunk_parts, self.__chunk_parts = self.__chunk_parts, []
+        if result.error_message is not None:
+            return create_record(result.index, result.file_name, error_message=result.error_message)
+        return create_chunked_record(result.index, result.file_name, chunk_parts)
+
+
+class BatchParseService:
+    """
+    Service parsing many interchanges in parallel in a pool of worker processes.
+
+    Every file of a batch results in one NDJSON record, which contains either the parsed interchange or the error
+    of the file, so that a bad file does not fail the batch. A file given as stream, e.g. a member of an archive,
+    is read and split into chunks of whole messages by the calling process while the workers parse the previous
+    chunks, so that a large file is neither read into memory at once nor parsed by a single worker. The JSON of its
+    chunks is merged into the record of the file. The records are returned in the order of the files. The number
+    of files and chunks in flight is bounded, so that a large batch is not held in memory at once.
+    """
+
+    def __init__(
+            self,
+            max_workers: Optional[int] = None,
+            budget: Optional[ParseBudget] = None,
+            executor: Optional[Executor] = None,
+            chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ):
+        """
+        Initialize the service, the worker processes are started on first use.
+
+        Args:
+            max_workers (Optional[int]): The number of worker processes. If None, the environment variable
+                PARSE_BATCH_WORKERS decides (default: the number of CPUs).
+            budget (Optional[ParseBudget]): The budget of the parse of each file, if any. Its byte limit applies
+                to a whole file, its segment and time limits to each chunk of a file given as stream.
+            executor (Optional[Executor]): The executor running the parses, defaults to a ProcessPoolExecutor
+            chunk_size (int): The minimum number of characters of a chunk of a file given as stream
+        """
+        self.__max_workers = max_workers or get_parse_batch_workers()
+        self.__budget = None if budget is None or budget.is_unlimited else budget
+        self.__executor = executor or ProcessPoolExecutor(max_workers=self.__max_workers)
+        self.__files_in_flight = self.__max_workers * FILES_IN_FLIGHT_PER_WORKER
+        self.__chunk_size = chunk_size
+
+    def submit(self, index: int, file_name: str, content: Union[bytes, Exception]) -> Future:
+        """
+        Submits a file to the worker pool.
+
+        Args:
+            index (int): The position of the file in the batch
+            file_name (str): The name of the file
+            content (Union[bytes, Exception]): The raw MSCONS message of the file, or the exception raised while
+                reading the file, which results in an error record
+
+        Returns:
+            Future: The future of the NDJSON record of the file
+        """
+        if isinstance(content, Exception):
+            return _completed(create_record(index, file_name, error_message=str(content)))
+        return self.__executor.submit(parse_file_record, index, file_name, content, self.__budget)
+
+    def iter_records(self, files: Iterable[tuple[str, BatchFileContent]]) -> Iterator[bytes]:
+        """
+        Parses the files in parallel and returns their records in the order of the files.
+
+        Args:
+            files (Iterable[tuple[str, BatchFileContent]]): The names and the contents of the files
+
+        Yields:
+            bytes: The NDJSON record per file
+        """
+        merger = _RecordMerger()
+        pending: deque[Future] = deque()
+        try:
+            for future in self.__iter_futures(files):
+                pending.append(future)
+                if len(pending) >= self.__files_in_flight:
+                    record = merger.add(pending.popleft().result())
+                    if record is not None:
+                        yield record
+            while pending:
+                record = merger.add(pending.popleft().result())
+                if record is not None:
+                    yield record
+        finally:
+            for future in pending:
+                future.cancel()
+
+    async def aiter_records(self, files: Iterable[tuple[str, BatchFileContent]]) -> AsyncIterator[bytes]:
+        """
+        Parses the files in parallel and returns their records in the order of the files, without blocking
+        the event loop while the files are read and parsed.
+
+        Args:
+            files (Iterable[tuple[str, BatchFileContent]]): The names and the contents of the files
+
+        Yields:
+            bytes: The NDJSON record per file
+        """
+        merger = _RecordMerger()
+        loop = asyncio.get_running_loop()
+        futures = self.__iter_futures(files)
+        pending: deque[asyncio.Future] = deque()
+        try:
+            while True:
+                # Reading the files, e.g. decompressing the members of an archive, blocks, so it runs in a thread
+                future = await loop.run_in_executor(None, next, futures, None)
+                if future is None:
+                    break
+                pending.append(asyncio.wrap_future(future))
+                if len(pending) >= self.__files_in_flight:
+                    record = merger.add(await pending.popleft())
+                    if record is not None:
+                        yield record
+            while pending:
+                record = merger.add(await pending.popleft())
+                if record is not None:
+                    yield record
+        finally:
+            # The files of a cancelled batch, e.g. after the client disconnected, are not parsed anymore
+            for future in pending:
+                future.cancel()
+            try:
+                futures.close()
+            except ValueError:
+                # The thread reading the next file of a cancelled batch still runs, the files are not read any further
+                pass
+
+    def shutdown(self) -> None:
+        """
+        Stops the worker pool, the files not started yet are not parsed anymore.
+        """
+        self.__executor.shutdown(wait=True, cancel_futures=True)
+
+    def __iter_futures(self, files: Iterable[tuple[str, BatchFileContent]]) -> Iterator[Future]:
+        for index, (file_name, content) in enumerate(files):
+            if isinstance(content, (bytes, Exception)):
+                yield self.submit(index, file_name, content)
+            else:
+                yield from self.__iter_stream_futures(index, file_name, content)
+
+    def __iter_stream_futures(self, index: int, file_name: str, stream: BinaryIO) -> Iterator[Future]:
+        # The stream is read as the futures are requested, the futures of its chunks are followed by the end of
+        # the stream, which carries the error raised while reading it, if any
+        error_message = None
+        try:
+            edifact_texts = iter_decoded_text(stream, budget=self.__budget)
+            # The chunks are split by a parser of their own, since the streams of a batch may be read by several
+            # threads of the calling process
+            for _, chunk_text in EdifactMSCONSParser().iter_message_texts(edifact_texts, self.__chunk_size):
+                yield self.__executor.submit(parse_chunk_parts, chunk_text, self.__budget)
+        except Exception as ex:
+            error_message = str(ex)
+        yield _completed(_EndOfStream(index, file_name, error_message))
@@ -0,0 +1,197 @@
+# coding: utf-8
+
+import logging
+import os
+from datetime import datetime
+from typing import Any, Optional
+
+from msconsparser.application.services.parser_service import ParserService
+from msconsparser.domain.ports.outbound import MeasurementStorePort
+from msconsparser.libs.edifactmsconsparser.wrappers import (
+    CancelToken, DuplicateCheck, DuplicateIndex, DuplicateMode, ParseBudget, ParsePhase, ParseStatistics
+)
+
+logger = logging.getLogger(__name__)
+
+
+def get_measurement_store_path() -> Optional[str]:
+    """
+    Gets the path of the SQLite database of the measurement store from the environment variable
+    MEASUREMENT_STORE_PATH.
+
+    Returns:
+        Optional[str]: The configured path, or None if the measurement store is disabled
+    """
+    return os.getenv("MEASUREMENT_STORE_PATH") or None
+
+
+def get_measurement_store_dedup_mode() -> Optional[str]:
+    """
+    Gets how resent interchanges and messages are handled by the measurement store from the environment variable
+    MEASUREMENT_STORE_DEDUP, see DuplicateMode.
+
+    Returns:
+        Optional[str]: The configured mode ('flag' or 'reject'), or None if duplicates are not detected, which is
+            the default and the fallback for an invalid value
+    """
+    value = os.getenv("MEASUREMENT_STORE_DEDUP")
+    if value is None or value == "":
+        return None
+    mode = value.strip().lower()
+    if mode not in DuplicateMode.ALL:
+        logger.warning("Invalid MEASUREMENT_STORE_DEDUP '%s', duplicates are not detected", value)
+        return None
+    return mode
+
+
+def get_measurement_store_dedup_path() -> Optional[str]:
+    """
+    Gets the file the keys of the duplicate detection are persisted to from the environment variable
+    MEASUREMENT_STORE_DEDUP_PATH.
+
+    Returns:
+        Optional[str]: The configured path, or None if the keys are only kept in memory
+    """
+    return os.getenv("MEASUREMENT_STORE_DEDUP_PATH") or None
+
+
+class MeasurementStoreService:
+    """
+    Service for storing parsed EDIFACT MSCONS interchanges and querying their measurements.
+
+    The interchanges are parsed into compact nodes, dumped to JSON compatible objects and written to the
+    measurement store, see MeasurementStorePort. With a duplicate index, resent interchanges and messages are
+    detected during the parse, before their detail section is converted (see DuplicateCheck).
+    """
+
+    def __init__(
+            self,
+            store: MeasurementStorePort,
+            parser_service: Optional[ParserService] = None,
+            duplicate_index: Optional[DuplicateIndex] = None,
+            duplicate_mode: str = DuplicateMode.FLAG,
+    ) -> None:
+        """
+        Initializes a new instance of the MeasurementStoreService class.
+
+        Args:
+            store (MeasurementStorePort): The store of the interchanges and their measurements
+            parser_service (Optional[ParserService]): The service to parse the interchanges with, defaults to a new
+                service per parse, since a parser is not thread-safe
+            duplicate_index (Optional[DuplicateIndex]): The keys of the interchanges and messages stored so far,
+                if duplicates are to be detected
+            duplicate_mode (str): How a duplicate is handled, see DuplicateMode
+        """
+        self.__store = store
+        self.__parser_service = parser_service
+        self.__duplicate_index = duplicate_index
+        self.__duplicate_mode = duplicate_mode
+
+    def store_message(
+            self,
+            message_content: str,
+            source: Optional[str] = None,
+            statistics: Optional[ParseStatistics] = None,
+            budget: Optional[ParseBudget] = None,
+            cancel_token: Optional[CancelToken] = None,
+    ) -> dict[str, Any]:
+        """
+        Parses an EDIFACT MSCONS interchange and stores it with its measurements.
+
+        If duplicates are detected, a flagged duplicate message is not stored and a flagged duplicate interchange
+        is not stored at all, the duplicates are listed in the returned summary. The keys of the interchange and
+        its messages are reserved in the duplicate index while the interchange is parsed, so that a copy stored at the
+        same time is taken as duplicate, and added to it once the interchange is stored.
+
+        Args:
+            message_content (str): The EDIFACT MSCONS interchange to parse
+            source (Optional[str]): The origin of the interchange, e.g. its file name
+            statistics (Optional[ParseStatistics]): The statistics to fill with the parse and store timings, if any
+            budget (Optional[ParseBudget]): The limits of the segments, bytes and seconds of the parse, if any
+            cancel_token (Optional[CancelToken]): The token to cancel the parse with, if any
+
+        Returns:
+            dict[str, Any]: The ID of the stored interchange (None for a duplicate interchange), the number of
+                stored messages, locations and measurements and, if duplicates are detected, the duplicates with
+                the estimated seconds saved by not converting them ('duplicates')
+
+        Raises:
+            DuplicateInterchangeException: If the interchange or one of its messages is a duplicate and duplicates
+                are rejected
+        """
+        statistics = statistics or ParseStatistics()
+        parser_service = self.__parser_service or ParserService()
+        duplicate_check = None if self.__duplicate_index is None \
+            else DuplicateCheck(self.__duplicate_index, self.__duplicate_mode)
+        try:
+            interchange = parser_service.parse_message(
+                message_content=message_content,
+                statistics=statistics,
+                # The parse tree is only dumped, so it is built of the compact nodes
+                compact=True,
+                budget=budget,
+                cancel_token=cancel_token,
+                duplicate_check=duplicate_check,
+            )
+            if duplicate_check is not None and duplicate_check.is_duplicate_interchange:
+                summary = {"interchange_id": None, "message_count": 0, "location_count": 0, "measurement_count": 0}
+            else:
+                with statistics.measure(ParsePhase.SERIALIZE):
+                    content = interchange.model_dump(mode="json")
+                with statistics.measure(ParsePhase.STORE):
+                    summary = self.__store.store_interchange(content, source)
+        except BaseException:
+            # The keys of an interchange which was rejected or not stored are not taken as seen
+            if duplicate_check is not None:
+                duplicate_check.rollback()
+            raise
+        if duplicate_check is not None:
+            duplicate_check.commit()
+            summary["duplicates"] = [duplicate.as_dict() for duplicate in duplicate_check.duplicates]
+        return summary
+
+    def find_interchanges(self, limit: int = 100, offset: int = 0) -> list[dict[str, Any]]:
+        """
+        Lists the stored interchanges, the most recently stored first.
+
+        Args:
+            limit (int): The number of interchanges at most
+            offset (int): The number of interchanges to skip
+
+        Returns:
+            list[dict[str, Any]]: The stored interchanges together with their number of messages
+        """
+        return self.__store.find_interchanges(limit=limit, offset=offset)
+
+    def find_measurements(
+            self,
+            location: Optional[str] = None,
+            obis: Optional[str] = None,
+            start: Optional[datetime] = None,
+            end: Optional[datetime] = None,
+            limit: int = 1000,
+            offset: int = 0,
+    ) -> list[dict[str, Any]]:
+        """
+        Finds the stored measurements ordered by location, OBIS code and interval start.
+
+        Args:
+            location (Optional[str]): The location ID (LOC) of the measurements
+            obis (Optional[str]): The OBIS code (PIA) of the measurements
+            start (Optional[datetime]): The earliest interval start, inclusive
+            end (Optional[datetime]): The latest interval start, exclusive
+            limit (int): The number of measurements at most
+            offset (int): The number of measurements to skip
+
+        Returns:
+            list[dict[str, Any]]: The matching measurements
+        """
+        return self.__store.find_measurements(
+            location=location, obis=obis, start=start, end=end, limit=limit, offset=offset
+        )
+
+    def close(self) -> None:
+        """
+        Closes the measurement store.
+        """
+        self.__store.close()
@@ -0,0 +1,486 @@
+# coding: utf-8
+
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+import uuid
+from array import array
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Iterator, Optional
+
+from msconsparser.application.services.parser_service import ParserService
+from msconsparser.domain.models import ParseJob, ParseJobStatus
+from msconsparser.libs.edifactmsconsparser.interchange_pages import (
+    PAGE_BY_MESSAGES, InterchangePage, MessageHandle, PageRequest, get_page
+)
+from msconsparser.libs.edifactmsconsparser.utils import iter_decoded_text
+from msconsparser.libs.edifactmsconsparser.wrappers import CancelToken
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_WORKERS = 2
+DEFAULT_MAX_PENDING_JOBS = 16
+DEFAULT_RESULT_TTL_SECONDS = 3600.0
+# The longest interval of the sweeps of the expired jobs, shorter TTLs are swept at the interval of the TTL
+MAX_SWEEP_INTERVAL_SECONDS = 60.0
+
+UPLOAD_SUFFIX = ".edi"
+RESULT_SUFFIX = ".ndjson"
+
+# The separators of the JSON lines, as used by the JSON responses of the parse endpoints
+_JSON_SEPARATORS = (",", ":")
+_MESSAGES_KEY = "unh_unt_nachrichten"
+_TRAILER_KEY = "unz_nutzdaten_endsegment"
+
+
+def get_parse_job_spool_dir() -> str:
+    """
+    Gets the directory of the uploads and the results of the parse jobs from the environment variable
+    PARSE_JOB_SPOOL_DIR.
+
+    Returns:
+        str: The configured directory, or the directory mscons-parse-jobs in the temporary directory
+    """
+    return os.getenv("PARSE_JOB_SPOOL_DIR") or os.path.join(tempfile.gettempdir(), "mscons-parse-jobs")
+
+
+def _read_positive_number(name: str, default: float, number_type: type) -> float:
+    value = os.getenv(name)
+    if value is None or value == "":
+        return default
+    try:
+        number = number_type(value)
+    except ValueError:
+        number = None
+    if number is None or number <= 0:
+        logger.warning("Invalid %s '%s', using %s", name, value, default)
+        return default
+    return number
+
+
+def get_parse_job_workers() -> int:
+    """
+    Gets the number of jobs parsed in parallel from the environment variable PARSE_JOB_WORKERS.
+
+    Returns:
+        int: The configured number, or DEFAULT_MAX_WORKERS if the variable is not set or invalid
+    """
+    return _read_positive_number("PARSE_JOB_WORKERS", DEFAULT_MAX_WORKERS, int)
+
+
+def get_parse_job_max_pending() -> int:
+    """
+    Gets the number of jobs receiving, queued or running at once from the environment variable
+    PARSE_JOB_MAX_PENDING.
+
+    Returns:
+        int: The configured number, or DEFAULT_MAX_PENDING_JOBS if the variable is not set or invalid
+    """
+    return _read_positive_number("PARSE_JOB_MAX_PENDING", DEFAULT_MAX_PENDING_JOBS, int)
+
+
+def get_parse_job_result_ttl() -> float:
+    """
+    Gets the seconds a finished job and its result are kept from the environment variable
+    PARSE_JOB_RESULT_TTL_SECONDS.
+
+    Returns:
+        float: The configured seconds, or DEFAULT_RESULT_TTL_SECONDS if the variable is not set or invalid
+    """
+    return _read_positive_number("PARSE_JOB_RESULT_TTL_SECONDS", DEFAULT_RESULT_TTL_SECONDS, float)
+
+
+class ParseJobQueueFullException(Exception):
+    """
+    Raised if a job is created while the maximum number of pending jobs is reached.
+    """
+    pass
+
+
+class ParseJobService:
+    """
+    Service parsing uploaded interchanges in the background, for interchanges too large to be parsed within a
+    request.
+
+    The upload of a job is spooled to a file in the spool directory and parsed by a bounded pool of worker
+    threads, a chunk of messages at a time (see ParserService.parse_message_incrementally). The file is decoded
+    and split block by block (see iter_decoded_text), the result is written as JSON lines to the spool directory:
+    the header of the interchange (UNA and UNB), one line per message and the trailer (UNZ). Thus, only the text
+    and the parse tree of one chunk are held in memory, no matter how many messages the interchange has. Finished
+    jobs are evicted together with their files once their TTL has passed, by a sweeper thread and whenever a job
+    is created or looked up. The files of a previous process left in the spool directory are removed at start once
+    they are older than the TTL.
+
+    The byte offsets of the lines of a result are kept in memory (8 bytes per message), so that a page of the
+    result (see get_result_page) is read from the file without reading the lines before it.
+
+    The jobs live in the memory of the process, so that no external queue or store is needed.
+    """
+
+    def __init__(
+            self,
+            parser_service: Optional[ParserService] = None,
+            spool_dir: Optional[str] = None,
+            max_workers: Optional[int] = None,
+            max_pending_jobs: Optional[int] = None,
+            result_ttl_seconds: Optional[float] = None,
+            clock: Callable[[], float] = time.time,
+            sweep_interval_seconds: Optional[float] = None,
+    ):
+        """
+        Initialize the service, create the spool directory, remove its stale files and start the sweeper of the
+        expired jobs.
+
+        Args:
+            parser_service (Optional[ParserService]): The parser service, defaults to a new ParserService
+            spool_dir (Optional[str]): The directory of the uploads and the results. If None, the environment
+                variable PARSE_JOB_SPOOL_DIR decides.
+            max_workers (Optional[int]): The number of jobs parsed in parallel. If None, the environment variable
+                PARSE_JOB_WORKERS decides (default 2).
+            max_pending_jobs (Optional[int]): The number of jobs receiving, queued or running at once. If None,
+                the environment variable PARSE_JOB_MAX_PENDING decides (default 16).
+            result_ttl_seconds (Optional[float]): The seconds a finished job is kept. If None, the environment
+                variable PARSE_JOB_RESULT_TTL_SECONDS decides (default 3600).
+            clock (Callable[[], float]): The source of the current time, defaults to time.time
+            sweep_interval_seconds (Optional[float]): The seconds between the sweeps of the expired jobs, defaults
+                to the TTL, at most MAX_SWEEP_INTERVAL_SECONDS
+        """
+        self.__parser_service = parser_service or ParserService()
+        self.__spool_dir = spool_dir or get_parse_job_spool_dir()
+        os.makedirs(self.__spool_dir, exist_ok=True)
+        self.__max_pending_jobs = max_pending_jobs or get_parse_job_max_pending()
+        self.__result_ttl_seconds = result_ttl_seconds or get_parse_job_result_ttl()
+        self.__clock = clock
+        self.__executor = ThreadPoolExecutor(
+            max_workers=max_workers or get_parse_job_workers(), thread_name_prefix="parse-job"
+        )
+        self.__lock = threading.Lock()
+        self.__jobs: dict[str, ParseJob] = {}
+        self.__cancel_tokens: dict[str, CancelToken] = {}
+        # The offsets of the lines of the results and of their ends by job ID
+        self.__result_line_offsets: dict[str, array] = {}
+        self.remove_stale_files()
+        self.__sweep_interval_seconds = sweep_interval_seconds or min(
+            self.__result_ttl_seconds, MAX_SWEEP_INTERVAL_SECONDS
+        )
+        self.__stopped = threading.Event()
+        self.__sweeper = threading.Thread(target=self.__sweep, name="parse-job-sweeper", daemon=True)
+        self.__sweeper.start()
+
+    def create_job(self) -> ParseJob:
+        """
+        Creates a job receiving its upload, which is written to the file given by get_upload_path and submitted
+        afterwards.
+
+        Returns:
+            ParseJob: The new job
+
+        Raises:
+            ParseJobQueueFullException: If the maximum number of pending jobs is reached
+        """
+        self.evict_expired_jobs()
+        with self.__lock:
+            if sum(job.is_pending for job in self.__jobs.values()) >= self.__max_pending_jobs:
+                raise ParseJobQueueFullException(
+                    f"Maximum number of pending parse jobs reached ({self.__max_pending_jobs})"
+                )
+            job = ParseJob(uuid.uuid4().hex, self.__clock())
+            self.__jobs[job.job_id] = job
+        return job
+
+    def get_job(self, job_id: str) -> Optional[ParseJob]:
+        """
+        Returns the job with the given ID.
+
+        Args:
+            job_id (str): The ID of the job
+
+        Returns:
+            Optional[ParseJob]: The job, None if it is unknown or evicted
+        """
+        self.evict_expired_jobs()
+        with self.__lock:
+            return self.__jobs.get(job_id)
+
+    def get_upload_path(self, job: ParseJob) -> str:
+        """
+        Returns the file of the upload of the job in the spool directory.
+
+        Args:
+            job (ParseJob): The job
+
+        Returns:
+            str: The path of the file
+        """
+        return os.path.join(self.__spool_dir, job.job_id + UPLOAD_SUFFIX)
+
+    def get_result_path(self, job: ParseJob) -> str:
+        """
+        Returns the file of the result of the job in the spool directory.
+
+        Args:
+            job (ParseJob): The job
+
+        Returns:
+            str: The path of the file
+        """
+        return os.path.join(self.__spool_dir, job.job_id + RESULT_SUFFIX)
+
+    def submit_job(self, job: ParseJob) -> None:
+        """
+        Queues the job, after its upload was written completely, for the worker pool.
+
+        Args:
+            job (ParseJob): The job
+        """
+        cancel_token = CancelToken()
+        with self.__lock:
+            job.status = ParseJobStatus.QUEUED
+            self.__cancel_tokens[job.job_id] = cancel_token
+        self.__executor.submit(self.__run_job, job, cancel_token)
+
+    def discard_job(self, job: ParseJob) -> None:
+        """
+        Removes the job and its files, e.g. if its upload failed.
+
+        Args:
+            job (ParseJob): The job
+        """
+        with self.__lock:
+            self.__jobs.pop(job.job_id, None)
+            cancel_token = self.__cancel_tokens.pop(job.job_id, None)
+        if cancel_token is not None:
+            cancel_token.cancel()
+        self.__remove_files(job)
+
+    def iter_result_lines(self, job: ParseJob) -> Iterator[bytes]:
+        """
+        Reads the result of a succeeded job as JSON lines: the header of the interchange (UNA and UNB), one line
+        per message and the trailer (UNZ).
+
+        The result file is opened at once, so that the iteration is not broken by a later eviction of the job.
+
+        Args:
+            job (ParseJob): The succeeded job
+
+        Returns:
+            Iterator[bytes]: The lines of the result including their line breaks
+        """
+        return self.__iter_lines(open(self.get_result_path(job), "rb"))
+
+    def iter_result_json(self, job: ParseJob) -> Iterator[bytes]:
+        """
+        Reads the result of a succeeded job as a single JSON document, which equals the result of the parse
+        endpoints. The document is assembled from the JSON lines on the fly.
+
+        Args:
+            job (ParseJob): The succeeded job
+
+        Returns:
+            Iterator[bytes]: The parts of the JSON document
+        """
+        return self.__assemble_json(self.iter_result_lines(job))
+
+    def get_result_page(self, job: ParseJob, page_request: PageRequest) -> InterchangePage:
+        """
+        Reads a page of the messages or measurements of the result of a succeeded job. Only the lines of the
+        messages from the cursor on are read, the messages without the requested location ID are skipped without
+        decoding their JSON.
+
+        Args:
+            job (ParseJob): The succeeded job
+            page_request (PageRequest): The page request
+
+        Returns:
+            InterchangePage: The page
+        """
+        with self.__lock:
+            line_offsets = self.__result_line_offsets[job.job_id]
+        # The lines are the header, the messages and the trailer
+        message_count = len(line_offsets) - 3
+        location = None if page_request.location is None else json.dumps(
+            page_request.location, ensure_ascii=False).encode("utf-8")
+
+        with open(self.get_result_path(job), "rb") as result_file:
+            def read_line(line_index: int) -> bytes:
+                result_file.seek(line_offsets[line_index])
+                return result_file.read(line_offsets[line_index + 1] - line_offsets[line_index])
+
+            def iter_handles() -> Iterator[MessageHandle]:
+                for message_index in range(page_request.cursor.message_index, message_count):
+                    line = read_line(message_index + 1)
+                    if location is None or location in line:
+                        yield message_index, lambda message_line=line: json.loads(message_line)
+
+            envelope = None
+            if page_request.page_by == PAGE_BY_MESSAGES:
+                envelope = json.loads(read_line(0))
+                envelope[_MESSAGES_KEY] = []
+                envelope.update(json.loads(read_line(message_count + 1)))
+            return get_page(iter_handles(), page_request, message_count, envelope)
+
+    def evict_expired_jobs(self) -> int:
+        """
+        Removes the finished jobs whose TTL has passed together with their files.
+
+        Returns:
+            int: The number of evicted jobs
+        """
+        now = self.__clock()
+        with self.__lock:
+            expired_jobs = [
+                job for job in self.__jobs.values() if job.expires_at is not None and job.expires_at <= now
+            ]
+            for job in expired_jobs:
+                del self.__jobs[job.job_id]
+        for job in expired_jobs:
+            self.__remove_files(job)
+        return len(expired_jobs)
+
+    def remove_stale_files(self) -> int:
+        """
+        Removes the uploads and results in the spool directory which are older than the TTL and belong to no job
+        of this service, e.g. the files left by a process that was killed. Younger files are kept, as they may
+        belong to another process sharing the spool directory.
+
+        Returns:
+            int: The number of removed files
+        """
+        stale_before = self.__clock() - self.__result_ttl_seconds
+        with self.__lock:
+            job_ids = set(self.__jobs)
+        removed_files = 0
+        with os.scandir(self.__spool_dir) as entries:
+            for entry in entries:
+                job_id, suffix = os.path.splitext(entry.name)
+                if suffix not in (UPLOAD_SUFFIX, RESULT_SUFFIX) or job_id in job_ids or not entry.is_file():
+                    continue
+                try:
+                    if entry.stat().st_mtime > stale_before:
+                        continue
+                    os.remove(entry.path)
+                except OSError:
+                    continue
+                removed_files += 1
+        if removed_files:
+            logger.info("Removed %d stale files of parse jobs from %s", removed_files, self.__spool_dir)
+        return removed_files
+
+    def shutdown(self) -> None:
+        """
+        Stops the sweeper, cancels the running jobs and stops the worker pool. Blocks until the running jobs have
+        stopped.
+        """
+        self.__stopped.set()
+        with self.__lock:
+            cancel_tokens = list(self.__cancel_tokens.values())
+        for cancel_token in cancel_tokens:
+            cancel_token.cancel()
+        self.__executor.shutdown(wait=True, cancel_futures=True)
+        self.__sweeper.join()
+
+    def __sweep(self) -> None:
+        while not self.__stopped.wait(self.__sweep_interval_seconds):
+            try:
+                self.evict_expired_jobs()
+            except Exception as ex:
+                logger.error("Sweep of the expired parse jobs failed: %s", ex)
+
+    def __run_job(self, job: ParseJob, cancel_token: CancelToken) -> None:
+        job.status = ParseJobStatus.RUNNING
+        job.started_at = self.__clock()
+        try:
+            self.__parse_job(job, cancel_token)
+            status = ParseJobStatus.SUCCEEDED
+        except Exception as ex:
+            logger.error("Parse job %s failed: %s", job.job_id, ex)
+            job.error_message = str(ex)
+            status = ParseJobStatus.FAILED
+            self.__remove_file(self.get_result_path(job))
+        # The upload is not needed anymore
+        self.__remove_file(self.get_upload_path(job))
+        with self.__lock:
+            self.__cancel_tokens.pop(job.job_id, None)
+        job.finished_at = self.__clock()
+        job.expires_at = job.finished_at + self.__result_ttl_seconds
+        # The status is set last, so that a finished job is complete
+        job.status = status
+
+    def __parse_job(self, job: ParseJob, cancel_token: CancelToken) -> None:
+        upload_path = self.get_upload_path(job)
+        job.total_bytes = os.path.getsize(upload_path)
+        # The upload is decoded and split block by block, so that only the text of the current chunk is in memory
+        with open(upload_path, "rb") as upload_file:
+            chunks = self.__parser_service.parse_message_incrementally(
+                message_content=iter_decoded_text(upload_file),
+                # The chunks are only dumped into the result, so they are built of the compact nodes
+                compact=True,
+                cancel_token=cancel_token,
+            )
+            self.__write_result(job, chunks, upload_file)
+
+    def __write_result(self, job: ParseJob, chunks: Iterator[tuple[int, Any]], upload_file) -> None:
+        line_offsets = array("Q")
+        with open(self.get_result_path(job), "wb") as result_file:
+            trailer = None
+            for _, chunk in chunks:
+                dump = chunk.model_dump(mode="json")
+                messages = dump.pop(_MESSAGES_KEY)
+                chunk_trailer = {_TRAILER_KEY: dump.pop(_TRAILER_KEY)}
+                # Every chunk repeats the header, only the last one has the trailer
+                if trailer is None:
+                    line_offsets.append(result_file.tell())
+                    self.__write_line(result_file, dump)
+                trailer = chunk_trailer
+                for message in messages:
+                    line_offsets.append(result_file.tell())
+                    self.__write_line(result_file, message)
+                job.processed_messages += len(messages)
+                # The bytes read so far, the upload is read at most one block ahead of the parsed chunks
+                job.processed_bytes = min(upload_file.tell(), job.total_bytes)
+            line_offsets.append(result_file.tell())
+            self.__write_line(result_file, trailer)
+            line_offsets.append(result_file.tell())
+        with self.__lock:
+            self.__result_line_offsets[job.job_id] = line_offsets
+
+    @staticmethod
+    def __iter_lines(result_file) -> Iterator[bytes]:
+        with result_file:
+            yield from result_file
+
+    @staticmethod
+    def __assemble_json(lines: Iterator[bytes]) -> Iterator[bytes]:
+        header = next(lines).rstrip(b"\n")
+        # The header object is continued with the messages and the fields of the trailer object
+        yield header[:-1] + b',"' + _MESSAGES_KEY.encode() + b'":['
+        previous_line = next(lines).rstrip(b"\n")
+        first_message = True
+        for line in lines:
+            if not first_message:
+                yield b","
+            yield previous_line
+            first_message = False
+            previous_line = line.rstrip(b"\n")
+        yield b"]," + previous_line[1:]
+
+    @staticmethod
+    def __write_line(result_file, value) -> None:
+        result_file.write(json.dumps(value, ensure_ascii=False, separators=_JSON_SEPARATORS).encode("utf-8"))
+        result_file.write(b"\n")
+
+    def __remove_files(self, job: ParseJob) -> None:
+        with self.__lock:
+            self.__result_line_offsets.pop(job.job_id, None)
+        self.__remove_file(self.get_upload_path(job))
+        self.__remove_file(self.get_result_path(job))
+
+    @staticmethod
+    def __remove_file(path: str) -> None:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
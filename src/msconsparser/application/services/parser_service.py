@@ -1,8 +1,11 @@
 # coding: utf-8
 
-from typing import Any
+from typing import Any, Iterable, Iterator, Optional, Union
 
 from msconsparser.application.usecases.parse_message_usecase import ParseMessageUseCase
+from msconsparser.libs.edifactmsconsparser.wrappers import (
+    CancelToken, DuplicateCheck, InterchangeQueryIndex, ParseBudget, ParseStatistics, SegmentProfiler
+)
 
 
 class ParserService:
@@ -26,7 +29,18 @@ class ParserService:
         """
         self.__parse_message_usecase = parse_message_usecase or ParseMessageUseCase()
 
-    def parse_message(self, message_content: str, max_lines_to_parse: int = -1) -> Any:
+    def parse_message(
+            self,
+            message_content: str,
+            max_lines_to_parse: int = -1,
+            statistics: Optional[ParseStatistics] = None,
+            profiler: Optional[SegmentProfiler] = None,
+            compact: bool = False,
+            budget: Optional[ParseBudget] = None,
+            cancel_token: Optional[CancelToken] = None,
+            query_index: Optional[InterchangeQueryIndex] = None,
+            duplicate_check: Optional[DuplicateCheck] = None,
+    ) -> Any:
         """
         Parses an EDIFACT MSCONS message content into a structured format.
         
@@ -35,11 +49,88 @@ class ParserService:
         Args:
             message_content (str): The EDIFACT MSCONS message content to parse
             max_lines_to_parse (int): The maximum number of lines to parse, defaults to -1 which means no parsing limit
+            statistics (Optional[ParseStatistics]): The statistics to fill with the parse timings and counts, if any
+            profiler (Optional[SegmentProfiler]): The profiler to record the segment handler and converter calls, if any
+            compact (bool): If true, the parse tree is built of compact nodes instead of pydantic models,
+                which can be dumped directly (model_dump) or converted into the pydantic models (to_model)
+            budget (Optional[ParseBudget]): The limits of the segments, bytes and seconds of the parse, if any
+            cancel_token (Optional[CancelToken]): The token to cancel the parse with, if any
+            query_index (Optional[InterchangeQueryIndex]): The index to fill with the location objects and positions
+                of the interchange, if any
+            duplicate_check (Optional[DuplicateCheck]): The check of the interchange and its messages against the
+                interchanges and messages seen so far, if any
             
         Returns:
             Any: The parsed message in a structured format (EdifactInterchange)
         """
         return self.__parse_message_usecase.execute(
             edifact_mscons_message_content=message_content,
-            max_lines_to_parse=max_lines_to_parse
+            max_lines_to_parse=max_lines_to_parse,
+            statistics=statistics,
+            profiler=profiler,
+            compact=compact,
+            budget=budget,
+            cancel_token=cancel_token,
+            query_index=query_index,
+            duplicate_check=duplicate_check,
+        )
+
+    def parse_message_incrementally(
+            self,
+            message_content: Union[str, Iterable[str]],
+            compact: bool = False,
+            cancel_token: Optional[CancelToken] = None,
+    ) -> Iterator[tuple[int, Any]]:
+        """
+        Parses an EDIFACT MSCONS message content incrementally, a chunk of whole messages at a time, so that
+        the messages of a large interchange need not be held in memory at once.
+
+        Args:
+            message_content (Union[str, Iterable[str]]): The EDIFACT MSCONS message content to parse,
+                or its consecutive parts, e.g. the decoded blocks of a file
+            compact (bool): If true, the chunks are built of compact nodes instead of pydantic models
+            cancel_token (Optional[CancelToken]): The token to cancel the parse with, if any
+
+        Returns:
+            Iterator[tuple[int, Any]]: The number of characters parsed so far and the parsed chunk
+                (EdifactInterchange), per chunk
+        """
+        return self.__parse_message_usecase.execute_incrementally(
+            edifact_mscons_message_content=message_content,
+            compact=compact,
+            cancel_token=cancel_token,
+        )
+
+    def parse_message_lazily(
+            self,
+            message_content: str,
+            statistics: Optional[ParseStatistics] = None,
+            profiler: Optional[SegmentProfiler] = None,
+            compact: bool = False,
+            budget: Optional[ParseBudget] = None,
+            cancel_token: Optional[CancelToken] = None,
+    ) -> Any:
+        """
+        Indexes an EDIFACT MSCONS message content and parses only its envelope, so that a few of its messages can
+        be selected without parsing the others.
+
+        Args:
+            message_content (str): The EDIFACT MSCONS message content to parse
+            statistics (Optional[ParseStatistics]): The statistics to fill with the timings and counts, if any
+            profiler (Optional[SegmentProfiler]): The profiler to record the segment handler and converter calls, if any
+            compact (bool): If true, the envelope and the messages are built of compact nodes
+            budget (Optional[ParseBudget]): The limits of the bytes of the content and of the segments and seconds
+                of the parsed messages, if any
+            cancel_token (Optional[CancelToken]): The token to cancel the parses with, if any
+
+        Returns:
+            Any: The interchange whose messages are parsed on access (LazyEdifactInterchange)
+        """
+        return self.__parse_message_usecase.execute_lazily(
+            edifact_mscons_message_content=message_content,
+            statistics=statistics,
+            profiler=profiler,
+            compact=compact,
+            budget=budget,
+            cancel_token=cancel_token,
         )
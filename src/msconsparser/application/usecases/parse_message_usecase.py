@@ -1,9 +1,13 @@
 # coding: utf-8
 
-from typing import Any
+from typing import Any, Iterable, Iterator, Optional, Union
 
 from msconsparser.domain.ports.inbound import MessageParserPort
 from msconsparser.libs.edifactmsconsparser.edifact_mscons_parser import EdifactMSCONSParser
+from msconsparser.libs.edifactmsconsparser.lazy_edifact_interchange import LazyEdifactInterchange
+from msconsparser.libs.edifactmsconsparser.wrappers import (
+    CancelToken, DuplicateCheck, InterchangeQueryIndex, ParseBudget, ParseStatistics, SegmentProfiler
+)
 
 
 class ParseMessageUseCase(MessageParserPort):
@@ -28,18 +32,105 @@ class ParseMessageUseCase(MessageParserPort):
         """
         self.__parser = parser or EdifactMSCONSParser()
 
-    def execute(self, edifact_mscons_message_content: str, max_lines_to_parse: int = -1) -> Any:
+    def execute(
+            self,
+            edifact_mscons_message_content: str,
+            max_lines_to_parse: int = -1,
+            statistics: Optional[ParseStatistics] = None,
+            profiler: Optional[SegmentProfiler] = None,
+            compact: bool = False,
+            budget: Optional[ParseBudget] = None,
+            cancel_token: Optional[CancelToken] = None,
+            query_index: Optional[InterchangeQueryIndex] = None,
+            duplicate_check: Optional[DuplicateCheck] = None,
+    ) -> Any:
         """
         Parses an EDIFACT MSCONS message content into a structured format.
         
         Args:
             edifact_mscons_message_content (str): The EDIFACT MSCONS message content to parse
             max_lines_to_parse (int): The maximum number of lines to parse, defaults to -1 which means no parsing limit
+            statistics (Optional[ParseStatistics]): The statistics to fill with the parse timings and counts, if any
+            profiler (Optional[SegmentProfiler]): The profiler to record the segment handler and converter calls, if any
+            compact (bool): If true, the parse tree is built of compact nodes instead of pydantic models,
+                which can be dumped directly (model_dump) or converted into the pydantic models (to_model)
+            budget (Optional[ParseBudget]): The limits of the segments, bytes and seconds of the parse, if any
+            cancel_token (Optional[CancelToken]): The token to cancel the parse with, if any
+            query_index (Optional[InterchangeQueryIndex]): The index to fill with the location objects and positions
+                of the interchange, if any
+            duplicate_check (Optional[DuplicateCheck]): The check of the interchange and its messages against the
+                interchanges and messages seen so far, if any
             
         Returns:
             Any: The parsed message in a structured format (EdifactInterchange)
         """
         return self.__parser.parse(
             edifact_text=edifact_mscons_message_content,
-            max_lines_to_parse=max_lines_to_parse
+            max_lines_to_parse=max_lines_to_parse,
+            statistics=statistics,
+            profiler=profiler,
+            compact=compact,
+            budget=budget,
+            cancel_token=cancel_token,
+            query_index=query_index,
+            duplicate_check=duplicate_check,
+        )
+
+    def execute_incrementally(
+            self,
+            edifact_mscons_message_content: Union[str, Iterable[str]],
+            compact: bool = False,
+            cancel_token: Optional[CancelToken] = None,
+    ) -> Iterator[tuple[int, Any]]:
+        """
+        Parses an EDIFACT MSCONS message content incrementally, a chunk of whole messages at a time.
+
+        Args:
+            edifact_mscons_message_content (Union[str, Iterable[str]]): The EDIFACT MSCONS message content to parse,
+                or its consecutive parts, e.g. the decoded blocks of a file
+            compact (bool): If true, the chunks are built of compact nodes instead of pydantic models
+            cancel_token (Optional[CancelToken]): The token to cancel the parse with, if any
+
+        Returns:
+            Iterator[tuple[int, Any]]: The number of characters parsed so far and the parsed chunk
+                (EdifactInterchange with the header, the messages of the chunk and, for the last chunk, the trailer)
+        """
+        return self.__parser.iter_messages(
+            edifact_text=edifact_mscons_message_content,
+            compact=compact,
+            cancel_token=cancel_token,
+        )
+
+    def execute_lazily(
+            self,
+            edifact_mscons_message_content: str,
+            statistics: Optional[ParseStatistics] = None,
+            profiler: Optional[SegmentProfiler] = None,
+            compact: bool = False,
+            budget: Optional[ParseBudget] = None,
+            cancel_token: Optional[CancelToken] = None,
+    ) -> LazyEdifactInterchange:
+        """
+        Indexes an EDIFACT MSCONS message content and parses its envelope, its messages are parsed on access.
+
+        Args:
+            edifact_mscons_message_content (str): The EDIFACT MSCONS message content to parse
+            statistics (Optional[ParseStatistics]): The statistics to fill with the timings and counts, if any
+            profiler (Optional[SegmentProfiler]): The profiler to record the segment handler and converter calls, if any
+            compact (bool): If true, the envelope and the messages are built of compact nodes
+            budget (Optional[ParseBudget]): The limits of the bytes of the content and of the segments and seconds
+                of the parsed messages, if any
+            cancel_token (Optional[CancelToken]): The token to cancel the parses with, if any
+
+        Returns:
+            LazyEdifactInterchange: The interchange whose messages are parsed on access
+        """
+        return LazyEdifactInterchange(
+            edifact_mscons_message_content,
+            parser=self.__parser,
+            compact=compact,
+            statistics=statistics,
+            profiler=profiler,
+            budget=budget,
+            cancel_token=cancel_token,
         )
@@ -1,4 +1,8 @@
 # coding: utf-8
 """
 Package for the domain models.
-"""
\ No newline at end of file
+"""
+
+from msconsparser.domain.models.parse_job import ParseJob, ParseJobStatus
+
+__all__ = ["ParseJob", "ParseJobStatus"]
@@ -0,0 +1,103 @@
+# coding: utf-8
+
+from datetime import datetime, timezone
+from typing import Optional
+
+from msconsparser.libs.edifactmsconsparser.wrappers.segments.constants import StrEnum
+
+
+class ParseJobStatus(StrEnum):
+    """
+    Status of a parse job.
+    """
+    RECEIVING = "receiving"  # The upload is written to the spool directory
+    QUEUED = "queued"  # The job waits for a free worker
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"  # The result can be downloaded until the job expires
+    FAILED = "failed"
+
+
+def _isoformat(timestamp: Optional[float]) -> Optional[str]:
+    return None if timestamp is None else datetime.fromtimestamp(timestamp, timezone.utc).isoformat()
+
+
+class ParseJob:
+    """
+    Parse of an uploaded interchange in the background and its progress.
+
+    Attributes:
+        job_id (str): The ID of the job
+        status (ParseJobStatus): The status of the job
+        total_bytes (int): The size of the upload in bytes, growing while it is received
+        processed_bytes (int): The bytes of the upload parsed so far
+        processed_messages (int): The messages (UNH to UNT) parsed so far
+        error_message (Optional[str]): The reason of a failed job
+        created_at (float): The time the job was created (time.time)
+        started_at (Optional[float]): The time the parse started
+        finished_at (Optional[float]): The time the parse succeeded or failed
+        expires_at (Optional[float]): The time after which the finished job and its result are evicted
+    """
+
+    def __init__(self, job_id: str, created_at: float):
+        """
+        Initialize a job, which receives its upload.
+
+        Args:
+            job_id: The ID of the job
+            created_at: The time the job was created (time.time)
+        """
+        self.job_id = job_id
+        self.status = ParseJobStatus.RECEIVING
+        self.total_bytes = 0
+        self.processed_bytes = 0
+        self.processed_messages = 0
+        self.error_message: Optional[str] = None
+        self.created_at = created_at
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.expires_at: Optional[float] = None
+
+    @property
+    def is_pending(self) -> bool:
+        """
+        Checks if the job is still receiving, queued or running.
+
+        Returns:
+            bool: True if the job has neither succeeded nor failed yet
+        """
+        return self.status not in (ParseJobStatus.SUCCEEDED, ParseJobStatus.FAILED)
+
+    @property
+    def progress(self) -> float:
+        """
+        Returns the share of the upload parsed so far.
+
+        Returns:
+            float: The processed bytes in relation to the total bytes, between 0.0 and 1.0
+        """
+        if self.status == ParseJobStatus.SUCCEEDED:
+            return 1.0
+        if self.total_bytes <= 0:
+            return 0.0
+        return min(1.0, self.processed_bytes / self.total_bytes)
+
+    def as_dict(self) -> dict:
+        """
+        Returns the status and the progress of the job as dictionary.
+
+        Returns:
+            dict: The job, the times are given in ISO 8601 format (UTC)
+        """
+        return {
+            "job_id": self.job_id,
+            "status": self.status.value,
+            "total_bytes": self.total_bytes,
+            "processed_bytes": self.processed_bytes,
+            "processed_messages": self.processed_messages,
+            "progress": round(self.progress, 4),
+            "error_message": self.error_message,
+            "created_at": _isoformat(self.created_at),
+            "started_at": _isoformat(self.started_at),
+            "finished_at": _isoformat(self.finished_at),
+            "expires_at": _isoformat(self.expires_at),
+        }
@@ -4,5 +4,6 @@ Package for the ports.
 """
 
 from msconsparser.domain.ports.inbound import MessageParserPort
+from msconsparser.domain.ports.outbound import MeasurementStorePort
 
-__all__ = ["MessageParserPort"]
+__all__ = ["MeasurementStorePort", "MessageParserPort"]
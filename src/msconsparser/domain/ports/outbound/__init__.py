@@ -0,0 +1,8 @@
+# coding: utf-8
+"""
+Package for the outbound ports.
+"""
+
+from msconsparser.domain.ports.outbound.measurement_store_port import MeasurementStorePort
+
+__all__ = ["MeasurementStorePort"]
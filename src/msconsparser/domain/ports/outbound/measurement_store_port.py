@@ -0,0 +1,79 @@
+# coding: utf-8
+
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import Any, Optional
+
+
+class MeasurementStorePort(ABC):
+    """
+    Abstract port interface for storing parsed interchanges and their measurements.
+
+    The store keeps the interchanges, their messages, the location objects (SG6) of the messages and their
+    intervals (SG10), so that the measurements of a location can be queried without parsing the interchanges again.
+    """
+
+    @abstractmethod
+    def store_interchange(self, interchange: dict[str, Any], source: Optional[str] = None) -> dict[str, Any]:
+        """
+        Stores a parsed interchange with its messages, location objects and intervals, either completely or not
+        at all.
+
+        Args:
+            interchange (dict[str, Any]): The parsed interchange as dumped to JSON (model_dump(mode="json"))
+            source (Optional[str]): The origin of the interchange, e.g. its file name
+
+        Returns:
+            dict[str, Any]: The ID of the stored interchange and the number of stored messages, locations and
+                measurements
+        """
+        pass
+
+    @abstractmethod
+    def find_interchanges(self, limit: int = 100, offset: int = 0) -> list[dict[str, Any]]:
+        """
+        Lists the stored interchanges, the most recently stored first.
+
+        Args:
+            limit (int): The number of interchanges at most
+            offset (int): The number of interchanges to skip
+
+        Returns:
+            list[dict[str, Any]]: The ID, source, sender, recipient, reference and storage time of each
+                interchange together with its number of messages
+        """
+        pass
+
+    @abstractmethod
+    def find_measurements(
+            self,
+            location: Optional[str] = None,
+            obis: Optional[str] = None,
+            start: Optional[datetime] = None,
+            end: Optional[datetime] = None,
+            limit: int = 1000,
+            offset: int = 0,
+    ) -> list[dict[str, Any]]:
+        """
+        Finds the stored measurements (intervals) ordered by location, OBIS code and interval start.
+
+        Args:
+            location (Optional[str]): The location ID (LOC) of the measurements, e.g. a MaLo or MeLo ID
+            obis (Optional[str]): The OBIS code (PIA) of the measurements
+            start (Optional[datetime]): The earliest interval start, inclusive
+            end (Optional[datetime]): The latest interval start, exclusive
+            limit (int): The number of measurements at most
+            offset (int): The number of measurements to skip
+
+        Returns:
+            list[dict[str, Any]]: The measurements with their interchange, message, location, OBIS code,
+                quantity qualifier, quantity, unit and interval
+        """
+        pass
+
+    @abstractmethod
+    def close(self) -> None:
+        """
+        Releases the resources of the store, e.g. its database connection.
+        """
+        pass
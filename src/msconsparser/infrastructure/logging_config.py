@@ -3,6 +3,7 @@
 import os
 
 from msconsparser.adapters.inbound.rest.impl.health_check_filters import HealthEndpointsFilter
+from msconsparser.infrastructure.logging_handlers import QueueListenerHandler
 
 LOGGING_CONFIG = {
     "version": 1,
@@ -21,12 +22,17 @@ LOGGING_CONFIG = {
             "formatter": "json",
             "level": "DEBUG",
             "filters": ["health_endpoints_filter"],
-        }
+        },
+        # Formatting and writing the records takes place in a background thread, off the parse hot path
+        "queue": {
+            "()": QueueListenerHandler,
+            "handlers": ["cfg://handlers.console"],
+        },
     },
     "loggers": {
-        "root": {"level": "DEBUG", "handlers": ["console"]},
-        "numba": {"level": "INFO", "handlers": ["console"]},
-        "httpcore.http11": {"level": "INFO", "handlers": ["console"]},
+        "root": {"level": "DEBUG", "handlers": ["queue"]},
+        "numba": {"level": "INFO", "handlers": ["queue"]},
+        "httpcore.http11": {"level": "INFO", "handlers": ["queue"]},
     },
 }
 
@@ -45,12 +51,17 @@ LOGGING_CONFIG_LOCAL = {
             "formatter": "plain",
             "level": "DEBUG",
             "filters": ["health_endpoints_filter"],
-        }
+        },
+        # Formatting and writing the records takes place in a background thread, off the parse hot path
+        "queue": {
+            "()": QueueListenerHandler,
+            "handlers": ["cfg://handlers.console"],
+        },
     },
     "loggers": {
-        "root": {"level": "DEBUG", "handlers": ["console"]},
-        "numba": {"level": "INFO", "handlers": ["console"]},
-        "httpcore.http11": {"level": "INFO", "handlers": ["console"]},
+        "root": {"level": "DEBUG", "handlers": ["queue"]},
+        "numba": {"level": "INFO", "handlers": ["queue"]},
+        "httpcore.http11": {"level": "INFO", "handlers": ["queue"]},
     },
 }
 
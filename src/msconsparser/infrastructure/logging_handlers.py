@@ -0,0 +1,51 @@
+# coding: utf-8
+
+import atexit
+import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener
+
+
+class QueueListenerHandler(QueueHandler):
+    """
+    A logging handler that hands the log records over to a queue and emits them in a background thread.
+
+    The calling thread (e.g. the request handling the parse) only puts the record into an unbounded queue,
+    while the formatting (e.g. JSON) and the I/O of the wrapped handlers take place in the thread of a
+    QueueListener. The listener is started on creation and stopped at interpreter exit, flushing all
+    pending records.
+
+    Usable in a dictConfig as:
+        "queue": {"()": QueueListenerHandler, "handlers": ["cfg://handlers.console"]}
+    """
+
+    def __init__(self, handlers: list[logging.Handler], respect_handler_level: bool = True):
+        """
+        Initialize the handler and start the queue listener.
+
+        Args:
+            handlers (list[logging.Handler]): The handlers emitting the queued log records
+            respect_handler_level (bool): If true, the level of each handler is respected by the listener
+        """
+        super().__init__(queue.SimpleQueue())
+        # The dictConfig resolves the "cfg://" references of a list on item access only, not on iteration
+        handlers = [handlers[index] for index in range(len(handlers))]
+        self.listener = QueueListener(self.queue, *handlers, respect_handler_level=respect_handler_level)
+        self.listener.start()
+        self.__stopped = False
+        atexit.register(self.stop)
+
+    def stop(self) -> None:
+        """
+        Stops the queue listener after all pending log records are emitted.
+        """
+        if not self.__stopped:
+            self.__stopped = True
+            self.listener.stop()
+
+    def close(self) -> None:
+        """
+        Stops the queue listener and closes the handler.
+        """
+        self.stop()
+        super().close()
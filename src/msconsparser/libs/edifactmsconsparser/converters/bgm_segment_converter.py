@@ -56,11 +56,14 @@ class BGMSegmentConverter(SegmentConverter[SegmentBGM]):
         dokumentennummer = element_components[2]
         nachrichtenfunktion_code = element_components[3] if len(element_components) > 3 else None
 
-        return SegmentBGM(
-            dokumenten_nachrichtenname=DokumentenNachrichtenname(
+        return self._create_model(
+            SegmentBGM, context,
+            dokumenten_nachrichtenname=self._create_model(
+                DokumentenNachrichtenname, context,
                 dokumentenname_code=dokumentenname_code
             ),
-            dokumenten_nachrichten_identifikation=DokumentenNachrichtenIdentifikation(
+            dokumenten_nachrichten_identifikation=self._create_model(
+                DokumentenNachrichtenIdentifikation, context,
                 dokumentennummer=dokumentennummer
             ),
             nachrichtenfunktion_code=nachrichtenfunktion_code
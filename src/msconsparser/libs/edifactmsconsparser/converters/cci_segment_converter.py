@@ -57,9 +57,11 @@ class CCISegmentConverter(SegmentConverter[SegmentCCI]):
             2] != "" else None
         merkmal_code = element_components[3] if len(element_components) > 3 else None
 
-        return SegmentCCI(
+        return self._create_model(
+            SegmentCCI, context,
             klassentyp_code=klassentyp_code,
-            merkmalsbeschreibung=Merkmalsbeschreibung(
+            merkmalsbeschreibung=self._create_model(
+                Merkmalsbeschreibung, context,
                 merkmal_code=merkmal_code
             ) if merkmal_code else None
         )
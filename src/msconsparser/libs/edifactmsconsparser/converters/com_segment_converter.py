@@ -55,8 +55,10 @@ class COMSegmentConverter(SegmentConverter[SegmentCOM]):
         """
         kommunikationsverbindung = self._syntax_parser.split_components(string_content=element_components[1])
 
-        return SegmentCOM(
-            kommunikationsverbindung=Kommunikationsverbindung(
+        return self._create_model(
+            SegmentCOM, context,
+            kommunikationsverbindung=self._create_model(
+                Kommunikationsverbindung, context,
                 kommunikationsadresse_identifikation=kommunikationsverbindung[0],
                 kommunikationsadresse_qualifier=kommunikationsverbindung[1] if len(
                     kommunikationsverbindung) > 1 else None
@@ -56,9 +56,11 @@ class CTASegmentConverter(SegmentConverter[SegmentCTA]):
         abteilung_oder_bearbeiter = self._syntax_parser.split_components(element_components[2]) \
             if len(element_components) > 2 else None
 
-        return SegmentCTA(
+        return self._create_model(
+            SegmentCTA, context,
             funktion_des_ansprechpartners_code=funktion_des_ansprechpartners_code,
-            abteilung_oder_bearbeiter=AbteilungOderBearbeiter(
+            abteilung_oder_bearbeiter=self._create_model(
+                AbteilungOderBearbeiter, context,
                 abteilung_oder_bearbeiter=abteilung_oder_bearbeiter[1]
             ) if abteilung_oder_bearbeiter is not None and len(abteilung_oder_bearbeiter) > 1 else None
         )
@@ -50,6 +50,7 @@ class LINSegmentConverter(SegmentConverter[SegmentLIN]):
         Example:
         LIN+1'
         """
-        return SegmentLIN(
+        return self._create_model(
+            SegmentLIN, context,
             positionsnummer=element_components[1]
         )
@@ -60,12 +60,15 @@ class LOCSegmentConverter(SegmentConverter[SegmentLOC]):
         ortsangabe_code = element_components[2] if len(element_components) > 2 else None
         erster_zugehoeriger_platz_ort_code = element_components[3] if len(element_components) > 3 else None
 
-        return SegmentLOC(
+        return self._create_model(
+            SegmentLOC, context,
             ortsangabe_qualifier=ortsangabe_qualifier,
-            ortsangabe=Ortsangabe(
+            ortsangabe=self._create_model(
+                Ortsangabe, context,
                 ortsangabe_code=ortsangabe_code
             ) if ortsangabe_code else None,
-            zugehoeriger_ort_1_identifikation=ZugehoerigerOrt1Identifikation(
+            zugehoeriger_ort_1_identifikation=self._create_model(
+                ZugehoerigerOrt1Identifikation, context,
                 erster_zugehoeriger_platz_ort_code=erster_zugehoeriger_platz_ort_code
             ) if erster_zugehoeriger_platz_ort_code else None,
         )
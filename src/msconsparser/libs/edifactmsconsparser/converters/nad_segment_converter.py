@@ -6,7 +6,7 @@ from msconsparser.libs.edifactmsconsparser.converters import SegmentConverter
 from msconsparser.libs.edifactmsconsparser.utils import EdifactSyntaxHelper
 from msconsparser.libs.edifactmsconsparser.wrappers import ParsingContext
 from msconsparser.libs.edifactmsconsparser.wrappers.segments import (
-    SegmentGroup, SegmentNAD, IdentifikationDesBeteiligten
+    SegmentGroup, SegmentType, SegmentNAD, IdentifikationDesBeteiligten
 )
 
 
@@ -58,42 +58,15 @@ class NADSegmentConverter(SegmentConverter[SegmentNAD]):
         identifikation_des_beteiligten = self._syntax_parser.split_components(element_components[2]) \
             if len(element_components) > 2 else None
 
-        return SegmentNAD(
+        return self._create_model(
+            SegmentNAD, context,
             bezeichner=self._get_identifier_name(
-                qualifier_code=beteiligter_qualifier,
-                current_segment_group=current_segment_group
+                SegmentType.NAD, beteiligter_qualifier, current_segment_group, context
             ),
             beteiligter_qualifier=beteiligter_qualifier,
-            identifikation_des_beteiligten=IdentifikationDesBeteiligten(
+            identifikation_des_beteiligten=self._create_model(
+                IdentifikationDesBeteiligten, context,
                 beteiligter_identifikation=identifikation_des_beteiligten[0],
                 verantwortliche_stelle_fuer_die_codepflege_code=identifikation_des_beteiligten[2]
             ) if identifikation_des_beteiligten and len(identifikation_des_beteiligten) > 2 else None
         )
-
-    def _get_identifier_name(
-            self,
-            qualifier_code: Optional[str],
-            current_segment_group: Optional[SegmentGroup]
-    ) -> Optional[str]:
-        """
-        Maps NAD qualifier codes to human-readable identifier names.
-
-        This method provides specific mappings for NAD party qualifier codes to meaningful
-        names that describe the role of the party in the message.
-
-        Args:
-            qualifier_code: The party qualifier code from the NAD segment
-            current_segment_group: The current segment group being processed
-
-        Returns:
-            A human-readable identifier name for the party role, or None if no mapping exists
-        """
-        if not qualifier_code:
-            return None
-        if qualifier_code in ["DP", "DED", "Z15"]:
-            return "Name und Adresse"
-        if qualifier_code == "MR":
-            return "MP-ID Empfänger"
-        if qualifier_code == "MS":
-            return "MP-ID Absender"
-        return None
@@ -79,9 +79,11 @@ class PIASegmentConverter(SegmentConverter[SegmentPIA]):
                 produkt_leistungsnummer = element_components[2]
                 art_der_produkt_leistungsnummer_code = None
 
-        return SegmentPIA(
+        return self._create_model(
+            SegmentPIA, context,
             produkt_erzeugnisnummer_qualifier=produkt_erzeugnisnummer_qualifier,
-            waren_leistungsnummer_identifikation=WarenLeistungsnummerIdentifikation(
+            waren_leistungsnummer_identifikation=self._create_model(
+                WarenLeistungsnummerIdentifikation, context,
                 produkt_leistungsnummer=produkt_leistungsnummer if produkt_leistungsnummer else None,
                 art_der_produkt_leistungsnummer_code=art_der_produkt_leistungsnummer_code if art_der_produkt_leistungsnummer_code else None
             ) if waren_leistungsnummer_identifikation else None
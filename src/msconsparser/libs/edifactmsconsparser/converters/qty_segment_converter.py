@@ -5,8 +5,9 @@ from typing import Optional
 
 from msconsparser.libs.edifactmsconsparser.converters import SegmentConverter
 from msconsparser.libs.edifactmsconsparser.utils import EdifactSyntaxHelper
-from msconsparser.libs.edifactmsconsparser.wrappers import ParsingContext
-from msconsparser.libs.edifactmsconsparser.wrappers.segments import SegmentGroup, SegmentQTY
+from msconsparser.libs.edifactmsconsparser.wrappers import NumericMode, ParsingContext
+from msconsparser.libs.edifactmsconsparser.wrappers.numeric_mode import MILLI_FACTOR
+from msconsparser.libs.edifactmsconsparser.wrappers.segments import SegmentGroup, SegmentQTY, SegmentQTYMilli
 
 logger = logging.getLogger(__name__)
 
@@ -48,7 +49,8 @@ class QTYSegmentConverter(SegmentConverter[SegmentQTY]):
             context: The context to use for the converter.
 
         Returns:
-            SegmentQTY object with quantity qualifier, the quantity and unit measurement code
+            SegmentQTY object with quantity qualifier, the quantity and unit measurement code, in the milli numeric
+            mode a SegmentQTYMilli object with the quantity in thousandths, too
 
         Examples:
         QTY+220:4250.465:D54'
@@ -58,11 +60,22 @@ class QTYSegmentConverter(SegmentConverter[SegmentQTY]):
         QTY+79:-4.987:KWH' - Example of a quantity and status specification as a summed energy quantity (total value, balance sheet total) as a negative value with 3 decimal places and the unit of measurement kilowatt hours
         """
         details = self._syntax_parser.split_components(element_components[1])
-        menge_qualifier = details[0]
+        # The qualifier and unit are repeated in every interval, so they share one string object per interchange
+        menge_qualifier = context.intern(details[0])
         menge = self._convert_decimal(details[1], context) if len(details) > 1 else None
-        masseinheit_code = details[2] if len(details) > 2 else None
+        masseinheit_code = context.intern(details[2]) if len(details) > 2 else None
+        if context.numeric_mode is NumericMode.MILLI:
+            # The quantity stays in the unit, so that it means the same in every numeric mode
+            return self._create_model(
+                SegmentQTYMilli, context,
+                menge_qualifier=menge_qualifier,
+                menge=menge / MILLI_FACTOR if menge is not None else None,
+                masseinheit_code=masseinheit_code,
+                menge_milli=menge
+            )
 
-        return SegmentQTY(
+        return self._create_model(
+            SegmentQTY, context,
             menge_qualifier=menge_qualifier,
             menge=menge,
             masseinheit_code=masseinheit_code
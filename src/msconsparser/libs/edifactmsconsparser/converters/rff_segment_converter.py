@@ -5,7 +5,7 @@ from typing import Optional
 from msconsparser.libs.edifactmsconsparser.converters import SegmentConverter
 from msconsparser.libs.edifactmsconsparser.utils import EdifactSyntaxHelper
 from msconsparser.libs.edifactmsconsparser.wrappers import ParsingContext
-from msconsparser.libs.edifactmsconsparser.wrappers.segments import SegmentGroup, SegmentRFF
+from msconsparser.libs.edifactmsconsparser.wrappers.segments import SegmentGroup, SegmentType, SegmentRFF
 
 
 class RFFSegmentConverter(SegmentConverter[SegmentRFF]):
@@ -56,43 +56,11 @@ class RFFSegmentConverter(SegmentConverter[SegmentRFF]):
         qualifier = details[0]
         identification = details[1]
 
-        return SegmentRFF(
+        return self._create_model(
+            SegmentRFF, context,
             bezeichner=self._get_identifier_name(
-                qualifier_code=qualifier,
-                current_segment_group=current_segment_group
+                SegmentType.RFF, qualifier, current_segment_group, context
             ),
             referenz_qualifier=qualifier,
             referenz_identifikation=identification
         )
-
-    def _get_identifier_name(
-            self,
-            qualifier_code: Optional[str],
-            current_segment_group: Optional[SegmentGroup]
-    ) -> Optional[str]:
-        """
-        Maps RFF qualifier codes to human-readable identifier names.
-
-        This method provides specific mappings for reference qualifier codes to meaningful
-        names that describe the purpose of the reference in the message.
-
-        Args:
-            qualifier_code: The reference qualifier code from the RFF segment
-            current_segment_group: The current segment group being processed
-
-        Returns:
-            A human-readable identifier name for the reference, or None if no mapping exists
-        """
-        if not qualifier_code:
-            return None
-        if qualifier_code in ["ACW", "AGI"]:
-            return "Referenzangaben"
-        if qualifier_code == "AGK":
-            return "Konfigurations-ID"
-        if qualifier_code == "MG":
-            return "Gerätenummer"
-        if qualifier_code == "Z13":
-            return "Prüfidentifikator"
-        if qualifier_code == "Z30":
-            return "Referenz auf vorherige Stammdatenmeldung des MSB"
-        return None
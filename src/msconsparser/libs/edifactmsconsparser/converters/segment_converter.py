@@ -2,17 +2,18 @@
 
 import logging
 from abc import ABC, abstractmethod
-from typing import Optional, TypeVar, Generic
+from typing import Any, Hashable, Optional, TypeVar, Generic
 
 from msconsparser.libs.edifactmsconsparser.exceptions import CONTRLException
 from msconsparser.libs.edifactmsconsparser.utils import EdifactSyntaxHelper
-from msconsparser.libs.edifactmsconsparser.wrappers import ParsingContext
+from msconsparser.libs.edifactmsconsparser.wrappers import ParsingContext, SegmentProfiler
+from msconsparser.libs.edifactmsconsparser.wrappers.numeric_mode import Number
 from msconsparser.libs.edifactmsconsparser.wrappers.segments import SegmentGroup
-from msconsparser.libs.edifactmsconsparser.wrappers.segments.constants import EdifactConstants
 
 logger = logging.getLogger(__name__)
 
 T = TypeVar('T')
+M = TypeVar('M')
 
 
 class SegmentConverter(ABC, Generic[T]):
@@ -53,6 +54,9 @@ class SegmentConverter(ABC, Generic[T]):
         This method wraps the internal conversion logic with exception handling.
         If an exception occurs during conversion, it's caught, logged, and wrapped
         in a CONTRLException with detailed error information.
+        If a profiler is set in the context, the conversion is recorded for the segment type.
+        If a conversion cache is set in the context and the segment type is cacheable, duplicate segments
+        (same elements, segment group and dialect) are converted once and share the converted segment.
 
         Args:
             line_number: The line number in the EDI file where this segment appears
@@ -67,12 +71,28 @@ class SegmentConverter(ABC, Generic[T]):
         Raises:
             CONTRLException: If any error occurs during the conversion process
         """
+        profiler = context.profiler
+        start = profiler.start() if profiler is not None else None
+        cache = context.conversion_cache
+        cache_key = None
+        if cache is not None and element_components[0] in cache.segment_types:
+            cache_key = (tuple(element_components), current_segment_group, context.conversion_dialect)
+            segment = cache.get(element_components[0], cache_key)
+            if segment is not None:
+                if profiler is not None:
+                    profiler.record(SegmentProfiler.CONVERTER, element_components[0], start)
+                return segment
         try:
-            return self._convert_internal(element_components, last_segment_type, current_segment_group, context)
+            segment = self._convert_internal(element_components, last_segment_type, current_segment_group, context)
         except Exception as ex:
             error_message = f"CONTRL -> L{line_number} -> {element_components} -> {ex}"
             logger.error(error_message)
-            raise CONTRLException(message=error_message)
+            raise CONTRLException(message=error_message, line_number=line_number)
+        if cache_key is not None:
+            cache.put(cache_key, segment)
+        if profiler is not None:
+            profiler.record(SegmentProfiler.CONVERTER, element_components[0], start)
+        return segment
 
     @abstractmethod
     def _convert_internal(
@@ -99,55 +119,91 @@ class SegmentConverter(ABC, Generic[T]):
         """
         pass
 
+    @staticmethod
     def _get_identifier_name(
-            self,
+            segment_type: str,
             qualifier_code: Optional[str],
-            current_segment_group: Optional[SegmentGroup]
+            current_segment_group: Optional[SegmentGroup],
+            context: ParsingContext
     ) -> Optional[str]:
         """
         Helper method to get a human-readable identifier name based on qualifier code.
 
-        This method can be overridden by subclasses to provide specific mappings
-        from qualifier codes to human-readable names, often depending on the
-        current segment group context.
+        The name is looked up in the code lists of the parsing context (see CodeListRegistry), which
+        map the qualifier codes per segment type and segment group to their names.
 
         Args:
+            segment_type: The segment type, e.g. 'DTM'
             qualifier_code: The qualifier code from the segment
             current_segment_group: The current segment group being processed
+            context: The context to use for the converter.
 
         Returns:
-            A human-readable identifier name, or None if no mapping exists
+            A human-readable identifier name, or None if no mapping exists or the label resolution is disabled
         """
-        pass
+        code_labels = context.code_labels
+        if code_labels is None:
+            return None
+        return code_labels.get((segment_type, qualifier_code, current_segment_group))
 
     @staticmethod
-    def _convert_decimal(string_number: str, context: ParsingContext) -> float:
+    def _create_model(model_class: type[M], context: ParsingContext, **values: Any) -> M:
         """
-        Converts a string representation of a number to a float using the appropriate decimal mark.
+        Creates a segment model (or one of its nested models) from the converted values.
 
-        This method determines the decimal mark from the UNA service string advice in the parsing context.
-        If the decimal mark is not available, it falls back to using a dot as the default decimal mark.
+        The values are typed by the parser itself, so the model is created on the trusted path without
+        validation, unless the strict model validation is enabled in the parsing context for debugging.
+        If the context builds a compact parse tree, a compact node of the model is created instead.
+        The values should be given in the declaration order of the model fields, which is the fastest path.
+
+        Args:
+            model_class: The model class to create an instance of
+            context: The parsing context deciding how the model is created
+            **values: The field values by field name
+
+        Returns:
+            The model instance or its compact node
+        """
+        return context.create_model(model_class, **values)
+
+    @staticmethod
+    def _create_shared_model(
+            model_class: type[M], context: ParsingContext, key: Optional[Hashable] = None, /, **values: Any
+    ) -> M:
+        """
+        Creates a segment model (or one of its nested models) that is shared by all equal models of the interchange.
+
+        Meant for small models repeated in many segment groups, e.g. the status objects of the STS segments. Only
+        the compact nodes are shared, the pydantic models of a public parse tree are created per segment.
+
+        Args:
+            model_class: The model class to create an instance of
+            context: The parsing context holding the shared models of the interchange
+            key: The key identifying equal models, defaults to the field values
+            **values: The field values by field name
+
+        Returns:
+            The shared compact node, or a new model instance
+        """
+        return context.create_shared_model(model_class, key, **values)
+
+    @staticmethod
+    def _convert_decimal(string_number: str, context: ParsingContext) -> Number:
+        """
+        Converts a string representation of a number using the decimal mark of the interchange.
+
+        The number is converted to a float, a Decimal or an integer in thousandths depending on the numeric
+        mode of the parsing context. If the UNA service string advice has no decimal mark, the dot is used
+        as the default decimal mark and a warning is added to the aggregated warnings of the parsing context.
 
         Args:
             string_number: The string representation of the number to convert
-            context: The parsing context containing the UNA service string advice with decimal mark information
+            context: The parsing context containing the numeric mode and the UNA service string advice
 
         Returns:
-            The converted floating-point number
+            The converted number
 
         Raises:
-            AttributeError: If the UNA decimal mark is None or empty (caught internally)
+            ValueError: If the string is no number of the numeric mode
         """
-        try:
-            decimal_mark = context.interchange.una_service_string_advice.decimal_mark
-            if decimal_mark is None or decimal_mark == "":
-                raise AttributeError(f"UNA decimal_mark is None or empty.")
-        except AttributeError as ex:
-            decimal_mark = EdifactConstants.DOT_DECIMAL
-            logger.warning(
-                f"Decimal mark not found in UNA service string advice."
-                f" Using '{EdifactConstants.DOT_DECIMAL}' as default value."
-                f" Original error: '{ex}'"
-            )
-        number = string_number.replace(decimal_mark, EdifactConstants.DOT_DECIMAL)
-        return float(number)
+        return context.convert_number(string_number)
@@ -6,7 +6,7 @@ from msconsparser.libs.edifactmsconsparser.converters import SegmentConverter
 from msconsparser.libs.edifactmsconsparser.utils import EdifactSyntaxHelper
 from msconsparser.libs.edifactmsconsparser.wrappers import ParsingContext
 from msconsparser.libs.edifactmsconsparser.wrappers.segments import (
-    SegmentGroup, SegmentSTS, Statusanlass, Status, Statuskategorie
+    SegmentGroup, SegmentType, SegmentSTS, Statusanlass, Status, Statuskategorie
 )
 
 
@@ -59,53 +59,23 @@ class STSSegmentConverter(SegmentConverter[SegmentSTS]):
         statuskategorie_code = element_components[1]
         status_code = element_components[2] if len(element_components) > 2 else None
         statusanlass_code = element_components[3] if len(element_components) > 3 else None
-
-        return SegmentSTS(
-            bezeichner=self._get_identifier_name(
-                qualifier_code=element_components[1],
-                current_segment_group=current_segment_group
-            ),
-            statuskategorie=Statuskategorie(
+        bezeichner = self._get_identifier_name(SegmentType.STS, statuskategorie_code, current_segment_group, context)
+
+        # Only a few combinations of status codes occur, so equal STS segments and their status objects
+        # are shared within the interchange (in a compact parse tree)
+        return self._create_shared_model(
+            SegmentSTS, context, (SegmentSTS, bezeichner, statuskategorie_code, status_code, statusanlass_code),
+            bezeichner=bezeichner,
+            statuskategorie=self._create_shared_model(
+                Statuskategorie, context,
                 statuskategorie_code=statuskategorie_code
             ) if statuskategorie_code else None,
-            status=Status(
+            status=self._create_shared_model(
+                Status, context,
                 status_code=status_code
             ) if status_code else None,
-            statusanlass=Statusanlass(
+            statusanlass=self._create_shared_model(
+                Statusanlass, context,
                 statusanlass_code=statusanlass_code
             ) if statusanlass_code else None
         )
-
-    def _get_identifier_name(
-            self,
-            qualifier_code: Optional[str],
-            current_segment_group: Optional[SegmentGroup]
-    ) -> Optional[str]:
-        """
-        Maps STS status category codes to human-readable identifier names.
-
-        This method provides specific mappings for status category codes to meaningful
-        names that describe the type of status information being provided.
-
-        Args:
-            qualifier_code: The status category code from the STS segment
-            current_segment_group: The current segment group being processed
-
-        Returns:
-            A human-readable identifier name for the status category, or None if no mapping exists
-        """
-        if not qualifier_code:
-            return None
-        if qualifier_code == "10":
-            return "Grundlage der Energiemenge"
-        if qualifier_code == "Z31":
-            return "Gasqualität"
-        if qualifier_code == "Z32":
-            return "Ersatzwertbildungsverfahren"
-        if qualifier_code == "Z33":
-            return "Plausibilisierungshinweis"
-        if qualifier_code == "Z34":
-            return "Korrekturgrund"
-        if qualifier_code == "Z40":
-            return "Grund der Ersatzwertbildung"
-        return None
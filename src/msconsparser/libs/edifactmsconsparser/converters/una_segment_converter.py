@@ -67,7 +67,8 @@ class UNASegmentConverter(SegmentConverter[SegmentUNA]):
         reserved = una_segment[7]
         segment_terminator = una_segment[8]
 
-        return SegmentUNA(
+        return self._create_model(
+            SegmentUNA, context,
             component_separator=component_separator,
             element_separator=element_separator,
             decimal_mark=decimal_mark,
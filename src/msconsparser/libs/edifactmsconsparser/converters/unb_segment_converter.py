@@ -83,20 +83,25 @@ class UNBSegmentConverter(SegmentConverter[SegmentUNB]):
             string_content=element_components[11]
         )[0] if len(element_components) > 11 else None
 
-        return SegmentUNB(
-            syntax_bezeichner=SyntaxBezeichner(
+        return self._create_model(
+            SegmentUNB, context,
+            syntax_bezeichner=self._create_model(
+                SyntaxBezeichner, context,
                 syntax_kennung=syntax_info[0],
                 syntax_versionsnummer=(syntax_info[1] if len(syntax_info) > 1 else None)
             ),
-            absender_der_uebertragungsdatei=Marktpartner(
+            absender_der_uebertragungsdatei=self._create_model(
+                Marktpartner, context,
                 marktpartneridentifikationsnummer=absender_info[0],
                 teilnehmerbezeichnung_qualifier=absender_info[1]
             ),
-            empfaenger_der_uebertragungsdatei=Marktpartner(
+            empfaenger_der_uebertragungsdatei=self._create_model(
+                Marktpartner, context,
                 marktpartneridentifikationsnummer=empfaenger_info[0],
                 teilnehmerbezeichnung_qualifier=empfaenger_info[1]
             ),
-            datum_uhrzeit_der_erstellung=DatumUhrzeit(
+            datum_uhrzeit_der_erstellung=self._create_model(
+                DatumUhrzeit, context,
                 datum=erstellung_info[0],
                 uhrzeit=erstellung_info[1]
             ),
@@ -62,9 +62,11 @@ class UNHSegmentConverter(SegmentConverter[SegmentUNH]):
         status_der_uebermittlung_details = self._syntax_parser.split_components(element_components[4]) if len(
             element_components) > 4 else None
 
-        return SegmentUNH(
+        return self._create_model(
+            SegmentUNH, context,
             nachrichten_referenznummer=nachrichten_referenz_info,
-            nachrichten_kennung=NachrichtenKennung(
+            nachrichten_kennung=self._create_model(
+                NachrichtenKennung, context,
                 nachrichtentyp_kennung=nachrichten_kennung[0],
                 versionsnummer_des_nachrichtentyps=nachrichten_kennung[1],
                 freigabenummer_des_nachrichtentyps=nachrichten_kennung[2],
@@ -72,7 +74,8 @@ class UNHSegmentConverter(SegmentConverter[SegmentUNH]):
                 anwendungscode_der_zustaendigen_organisation=nachrichten_kennung[4],
             ),
             allgemeine_zuordnungsreferenz=allgemeine_zuordnungsreferenz if allgemeine_zuordnungsreferenz else None,
-            status_der_uebermittlung=StatusDerUebermittlung(
+            status_der_uebermittlung=self._create_model(
+                StatusDerUebermittlung, context,
                 uebermittlungsfolgenummer=status_der_uebermittlung_details[0],
                 erste_und_letzte_uebermittlung=status_der_uebermittlung_details[1]
             ) if status_der_uebermittlung_details else None
@@ -51,6 +51,7 @@ class UNSSegmentConverter(SegmentConverter[SegmentUNS]):
         UNS+D'
         """
         abschnittskennung_codiert = element_components[1]
-        return SegmentUNS(
+        return self._create_model(
+            SegmentUNS, context,
             abschnittskennung_codiert=abschnittskennung_codiert
         )
@@ -54,7 +54,8 @@ class UNTSegmentConverter(SegmentConverter[SegmentUNT]):
         anzahl_der_segmente_in_einer_nachricht = int(element_components[1])
         nachrichten_referenznummer = element_components[2]
 
-        return SegmentUNT(
+        return self._create_model(
+            SegmentUNT, context,
             anzahl_der_segmente_in_einer_nachricht=anzahl_der_segmente_in_einer_nachricht,
             nachrichten_referenznummer=nachrichten_referenznummer
         )
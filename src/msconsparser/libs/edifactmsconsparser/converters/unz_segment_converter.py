@@ -53,7 +53,8 @@ class UNZSegmentConverter(SegmentConverter[SegmentUNZ]):
         """
         anzahl_msg = int(element_components[1])
         datenaustauschreferenz = element_components[2]
-        return SegmentUNZ(
+        return self._create_model(
+            SegmentUNZ, context,
             datenaustauschzaehler=anzahl_msg,
             datenaustauschreferenz=datenaustauschreferenz
         )
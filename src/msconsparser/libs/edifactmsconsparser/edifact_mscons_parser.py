@@ -1,17 +1,97 @@
 # coding: utf-8
 
+import itertools
 import logging
-from typing import Optional
-
-from msconsparser.libs.edifactmsconsparser.wrappers import ParsingContext
-from msconsparser.libs.edifactmsconsparser.exceptions import MSCONSParserException
-from msconsparser.libs.edifactmsconsparser.wrappers.segments import SegmentType, SegmentGroup, EdifactInterchange
+import mmap
+import os
+import re
+import time
+from typing import Iterable, Iterator, Optional, Union
+
+from msconsparser.libs.edifactmsconsparser.wrappers import (
+    CancelToken, ConversionCache, Duplicate, DuplicateCheck, DuplicateKind, InterchangeQueryIndex, NumericMode,
+    ParseBudget, ParsingContext, ParsePhase, ParseStatistics, SegmentProfiler
+)
+from msconsparser.libs.edifactmsconsparser.exceptions import (
+    CONTRLException, DuplicateInterchangeException, MSCONSParserException, ParseCancelledException
+)
+from msconsparser.libs.edifactmsconsparser.wrappers.segments import (
+    SegmentType, SegmentGroup, EdifactInterchange, EdifactMSconsMessage, CompactNode, CodeListRegistry,
+    get_default_code_list_registry
+)
 from msconsparser.libs.edifactmsconsparser.handlers import SegmentHandlerFactory
+from msconsparser.libs.edifactmsconsparser.utils.edifact_decoder import decode_edifact_bytes, get_fallback_encoding
 from msconsparser.libs.edifactmsconsparser.utils.edifact_syntax_helper import EdifactSyntaxHelper
+from msconsparser.libs.edifactmsconsparser.utils.segment_index import SegmentIndex
+from msconsparser.libs.edifactmsconsparser.utils.segment_tag_matcher import SegmentTagMatcher
 from msconsparser.libs.edifactmsconsparser.wrappers.segments.constants import EdifactConstants
 
 logger = logging.getLogger(__name__)
 
+# Number of segments converted between two checks of the wall-clock budget and the cancel token of a parse
+CHECK_INTERVAL = 256
+
+# Minimum number of characters parsed at once by iter_messages
+DEFAULT_CHUNK_SIZE = 1024 * 1024
+
+
+def is_strict_model_validation_enabled() -> bool:
+    """
+    Checks if the strict validation of the segment models is enabled via the environment variable
+    STRICT_MODEL_VALIDATION.
+
+    Returns:
+        bool: True if the environment variable is set to 'true' (case-insensitive), False otherwise
+    """
+    return os.getenv("STRICT_MODEL_VALIDATION", "false").lower() == "true"
+
+
+def is_code_list_label_resolution_enabled() -> bool:
+    """
+    Checks if the labels (Bezeichner) of the qualifier codes are resolved, which can be disabled via the
+    environment variable RESOLVE_CODE_LIST_LABELS.
+
+    Returns:
+        bool: False if the environment variable is set to 'false' (case-insensitive), True otherwise
+    """
+    return os.getenv("RESOLVE_CODE_LIST_LABELS", "true").lower() != "false"
+
+
+def get_conversion_cache_size() -> int:
+    """
+    Gets the maximum number of segments memoized per interchange from the environment variable
+    CONVERSION_CACHE_SIZE, 0 disables the conversion cache.
+
+    Returns:
+        int: The configured size, or 0 (disabled) if the variable is not set or invalid
+    """
+    value = os.getenv("CONVERSION_CACHE_SIZE")
+    if value is None or value == "":
+        return 0
+    try:
+        return max(0, int(value))
+    except ValueError:
+        logger.warning("Invalid CONVERSION_CACHE_SIZE '%s', the conversion cache is disabled", value)
+        return 0
+
+
+def get_numeric_mode() -> NumericMode:
+    """
+    Gets the numeric mode of the converted quantities from the environment variable NUMERIC_MODE,
+    i.e. 'float', 'decimal' or 'milli'.
+
+    Returns:
+        NumericMode: The configured mode, or NumericMode.FLOAT if the variable is not set or invalid
+    """
+    value = os.getenv("NUMERIC_MODE")
+    if value is None:
+        return NumericMode.FLOAT
+    try:
+        return NumericMode(value.lower())
+    except ValueError:
+        logger.warning("Invalid NUMERIC_MODE '%s', using '%s'", value, NumericMode.FLOAT.value)
+        return NumericMode.FLOAT
+
 
 class EdifactMSCONSParser:
     """
@@ -19,12 +99,74 @@ class EdifactMSCONSParser:
     Uses dictionary-based handlers for the segment types.
     """
 
-    def __init__(self, handler_factory: Optional[SegmentHandlerFactory] = None) -> None:
+    def __init__(
+            self,
+            handler_factory: Optional[SegmentHandlerFactory] = None,
+            strict_models: Optional[bool] = None,
+            code_list_registry: Optional[CodeListRegistry] = None,
+            mig_version: Optional[str] = None,
+            resolve_labels: Optional[bool] = None,
+            conversion_cache_size: Optional[int] = None,
+            cached_segment_types: Optional[Iterable[str]] = None,
+            numeric_mode: Optional[Union[NumericMode, str]] = None,
+    ) -> None:
+        """
+        Initialize the parser.
+
+        Args:
+            handler_factory (Optional[SegmentHandlerFactory]): The factory of the segment handlers, defaults to
+                a factory with the handlers of all supported segment types
+            strict_models (Optional[bool]): If true, the segment models are validated in pydantic's strict mode,
+                which is meant for debugging the converters. Otherwise, the models are created from the converted
+                values without validation. If None, the environment variable STRICT_MODEL_VALIDATION decides.
+            code_list_registry (Optional[CodeListRegistry]): The code lists to resolve the labels (Bezeichner) of
+                the qualifier codes with, defaults to the code lists shipped with the package
+            mig_version (Optional[str]): The MIG version of the code lists for all messages. If None, the version
+                given in the UNH segment of each message is used, falling back to the default version.
+            resolve_labels (Optional[bool]): If false, the label resolution is skipped entirely and the labels
+                are None. If None, the environment variable RESOLVE_CODE_LIST_LABELS decides (enabled by default).
+            conversion_cache_size (Optional[int]): The maximum number of converted segments memoized per interchange,
+                so that duplicate segments of the cached segment types share one converted segment. As the shared
+                segments are mutable models, the cache is meant for parse trees that are not changed afterward.
+                0 disables the cache. If None, the environment variable CONVERSION_CACHE_SIZE decides (disabled by
+                default).
+            cached_segment_types (Optional[Iterable[str]]): The segment types memoized by the conversion cache,
+                defaults to ConversionCache.DEFAULT_SEGMENT_TYPES
+            numeric_mode (Optional[Union[NumericMode, str]]): The type of the converted quantities: 'float',
+                exact 'decimal' numbers or exact integers in thousandths ('milli'). If None, the environment
+                variable NUMERIC_MODE decides (float by default).
+
+        Raises:
+            ValueError: If the code list registry has no code lists of the given MIG version or the numeric mode
+                is unknown
+        """
         self.__context = ParsingContext()
         self.__syntax_parser = EdifactSyntaxHelper()
+        self.__segment_tag_matcher = SegmentTagMatcher.default()
         self.__handler_factory = handler_factory or SegmentHandlerFactory(self.__syntax_parser)
-
-    def parse(self, edifact_text: str, max_lines_to_parse: int = -1) -> EdifactInterchange:
+        self.__strict_models = is_strict_model_validation_enabled() if strict_models is None else strict_models
+        self.__code_list_registry = code_list_registry or get_default_code_list_registry()
+        if mig_version is not None and not self.__code_list_registry.has_version(mig_version):
+            raise ValueError(f"No code lists of the MIG version '{mig_version}' defined")
+        self.__mig_version = mig_version
+        self.__resolve_labels = is_code_list_label_resolution_enabled() if resolve_labels is None else resolve_labels
+        self.__conversion_cache_size = get_conversion_cache_size() \
+            if conversion_cache_size is None else conversion_cache_size
+        self.__cached_segment_types = cached_segment_types
+        self.__numeric_mode = get_numeric_mode() if numeric_mode is None else NumericMode(numeric_mode)
+
+    def parse(
+            self,
+            edifact_text: str,
+            max_lines_to_parse: int = -1,
+            statistics: Optional[ParseStatistics] = None,
+            profiler: Optional[SegmentProfiler] = None,
+            compact: bool = False,
+            budget: Optional[ParseBudget] = None,
+            cancel_token: Optional[CancelToken] = None,
+            query_index: Optional[InterchangeQueryIndex] = None,
+            duplicate_check: Optional[DuplicateCheck] = None,
+    ) -> Union[EdifactInterchange, CompactNode]:
         """
         Main method: Reads the EDIFACT string, splits it at the segment separators,
         and calls the appropriate handler for each segment.
@@ -32,40 +174,427 @@ class EdifactMSCONSParser:
         Args:
             edifact_text (str): The EDIFACT text to parse
             max_lines_to_parse (int): The maximum number of lines to parse, defaults to -1 has not parsing limit
+            statistics (Optional[ParseStatistics]): If given, it is filled with the durations of the UNA detection,
+                tokenize and convert phases, the segment and message counts of the interchange, the number of
+                recovered segment prefixes and the hit rates of the conversion cache
+            profiler (Optional[SegmentProfiler]): If given, the calls of the segment handlers and converters
+                are recorded per segment type (call count, cumulative time and allocated memory blocks)
+            compact (bool): If true, the parse tree is built of compact nodes with `__slots__` instead of pydantic
+                models, which needs considerably less memory. The compact interchange provides the same attributes
+                and can be dumped directly (model_dump) or converted into the EdifactInterchange (to_model).
+            budget (Optional[ParseBudget]): If given, the parse is aborted as soon as the interchange exceeds the
+                segments, bytes or seconds of the budget. The segments are counted before the text is split, so
+                that an oversized text is rejected without materializing its segments. A max_lines_to_parse
+                greater than 0 limits the segments of the budget further.
+            cancel_token (Optional[CancelToken]): If given, the parse is cancelled as soon as the token is tripped
+                or its deadline has passed. The token is checked every CHECK_INTERVAL segments.
+            query_index (Optional[InterchangeQueryIndex]): If given, it is filled with the location objects and
+                positions of the interchange by their location ID, device number, time series type and OBIS code,
+                which can be queried once the parse is finished
+            duplicate_check (Optional[DuplicateCheck]): If given, the interchange is checked after its UNB segment
+                and every message after its BGM segment against the index of the check. A flagged duplicate
+                message is left out of the parse tree and its segments are skipped without being converted, so
+                are the messages of a flagged duplicate interchange. The duplicates are listed by the check with
+                the estimated time saved, the keys of the interchange are added to the index by its commit().
 
         Returns:
-            EdifactInterchange: The parsed interchange object
+            Union[EdifactInterchange, CompactNode]: The parsed interchange object, a compact node if requested
+
+        Raises:
+            ParseBudgetExceededException: If the interchange exceeds the budget or max_lines_to_parse
+            ParseCancelledException: If the parse was cancelled via the cancel token, the exception carries the
+                CPU seconds spent on the parse
+            DuplicateInterchangeException: If the interchange or one of its messages is a duplicate and the
+                duplicate check rejects duplicates
         """
         if edifact_text is None:
             raise MSCONSParserException("No valid parsing input. Input was", str(edifact_text))
+        if 0 < max_lines_to_parse:
+            budget = ParseBudget(max_segments=max_lines_to_parse).limited_to(budget)
+
+        self.__start_parse(compact, profiler, query_index, duplicate_check)
+        cpu_start = time.thread_time()
+        try:
+            return self.__parse_segments(edifact_text, budget, cancel_token, statistics)
+        except DuplicateInterchangeException as ex:
+            self.__record_rejected_duplicate(ex.duplicate, self.__syntax_parser.count_segments(
+                string_content=edifact_text, context=self.__context
+            ))
+            raise
+        except ParseCancelledException as ex:
+            ex.cpu_seconds = time.thread_time() - cpu_start
+            raise
+        finally:
+            self.__finish_parse()
+
+    def parse_file(
+            self,
+            path: Union[str, os.PathLike],
+            max_lines_to_parse: int = -1,
+            statistics: Optional[ParseStatistics] = None,
+            profiler: Optional[SegmentProfiler] = None,
+            compact: bool = False,
+            budget: Optional[ParseBudget] = None,
+            cancel_token: Optional[CancelToken] = None,
+            query_index: Optional[InterchangeQueryIndex] = None,
+            duplicate_check: Optional[DuplicateCheck] = None,
+    ) -> Union[EdifactInterchange, CompactNode]:
+        """
+        Parses a local file like parse() without reading it into a string: the file is memory-mapped read-only and
+        split into segments directly over the mapped bytes, each segment is decoded only when it is converted.
 
-        segment_types = [segment_type.value for segment_type in SegmentType]
+        The memory of a parse is thus the parse tree (preferably compact) and the converted segment, the pages of
+        the mapped file are backed by the file itself. A segment is decoded as UTF-8 and, if it is no valid UTF-8,
+        with the encoding of the syntax identifier of the UNB segment (see get_fallback_encoding).
 
+        Args:
+            path (Union[str, os.PathLike]): The path of the EDIFACT file
+            max_lines_to_parse (int): The maximum number of lines to parse, defaults to -1 has not parsing limit
+            statistics (Optional[ParseStatistics]): If given, it is filled like by parse(), the segments are
+                decoded and split while they are converted, so that the tokenize phase is part of the convert phase
+            profiler (Optional[SegmentProfiler]): If given, the calls of the segment handlers and converters
+                are recorded per segment type
+            compact (bool): If true, the parse tree is built of compact nodes instead of pydantic models
+            budget (Optional[ParseBudget]): If given, the parse is aborted as soon as the file exceeds the budget.
+                The bytes are checked against the size of the file, the segments are counted as they are read.
+            cancel_token (Optional[CancelToken]): If given, the parse is cancelled as soon as the token is tripped
+                or its deadline has passed
+            query_index (Optional[InterchangeQueryIndex]): If given, it is filled like by parse()
+            duplicate_check (Optional[DuplicateCheck]): If given, the interchange and its messages are checked like
+                by parse()
+
+        Returns:
+            Union[EdifactInterchange, CompactNode]: The parsed interchange object, a compact node if requested
+
+        Raises:
+            OSError: If the file cannot be read
+            ParseBudgetExceededException: If the file exceeds the budget or max_lines_to_parse
+            ParseCancelledException: If the parse was cancelled via the cancel token
+            DuplicateInterchangeException: If the interchange or one of its messages is a rejected duplicate
+        """
+        if 0 < max_lines_to_parse:
+            budget = ParseBudget(max_segments=max_lines_to_parse).limited_to(budget)
+
+        with open(path, "rb") as file:
+            if os.fstat(file.fileno()).st_size == 0:
+                # An empty file cannot be mapped
+                return self.parse("", statistics=statistics, profiler=profiler, compact=compact, budget=budget,
+                                  cancel_token=cancel_token, query_index=query_index, duplicate_check=duplicate_check)
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+                self.__start_parse(compact, profiler, query_index, duplicate_check)
+                cpu_start = time.thread_time()
+                try:
+                    return self.__parse_buffer(buffer, budget, cancel_token, statistics)
+                except DuplicateInterchangeException as ex:
+                    segment_terminator = self.__syntax_parser.get_segment_terminator(self.__context)
+                    segment_index = SegmentIndex(buffer, segment_terminator.encode("utf-8"))
+                    total_segment_count = len(segment_index)
+                    if total_segment_count and len(segment_index.get_segment(total_segment_count - 1)) == 0:
+                        # The whitespace after the last segment terminator is no segment, like for count_segments
+                        total_segment_count -= 1
+                    self.__record_rejected_duplicate(ex.duplicate, total_segment_count)
+                    raise
+                except CONTRLException as ex:
+                    if ex.line_number is not None:
+                        segment_terminator = self.__syntax_parser.get_segment_terminator(self.__context)
+                        segment_index = SegmentIndex(buffer, segment_terminator.encode("utf-8"), ex.line_number)
+                        ex.locate(ex.line_number, segment_index.get_offsets(ex.line_number - 1))
+                    raise
+                except ParseCancelledException as ex:
+                    ex.cpu_seconds = time.thread_time() - cpu_start
+                    raise
+                finally:
+                    self.__finish_parse()
+
+    def reparse_message(
+            self,
+            segment_index: SegmentIndex,
+            message_index: int,
+            profiler: Optional[SegmentProfiler] = None,
+            compact: bool = False,
+            cancel_token: Optional[CancelToken] = None,
+    ) -> Union[EdifactMSconsMessage, CompactNode]:
+        """
+        Parses a single message of an indexed interchange, e.g. to inspect or correct it, without parsing the other
+        messages. Only the header of the interchange (UNA and UNB) and the segments of the message are decoded.
+
+        Args:
+            segment_index (SegmentIndex): The index of the segments of the interchange
+            message_index (int): The position of the message in the interchange, starting at 0
+            profiler (Optional[SegmentProfiler]): If given, the calls of the segment handlers and converters
+                are recorded per segment type
+            compact (bool): If true, the message is built of compact nodes instead of pydantic models
+            cancel_token (Optional[CancelToken]): If given, the parse is cancelled as soon as the token is tripped
+
+        Returns:
+            Union[EdifactMSconsMessage, CompactNode]: The parsed message
+
+        Raises:
+            IndexError: If the interchange has no message at the position
+            ParseCancelledException: If the parse was cancelled via the cancel token
+            CONTRLException: If a segment of the message is invalid, located by its line number and byte offsets
+                in the whole interchange
+        """
+        first, last = segment_index.get_message_range(message_index)
+        header_segment_count = segment_index.find(SegmentType.UNH)
+        content = bytes(segment_index.get_header()) + bytes(segment_index.get_message(first, last))
+        try:
+            interchange = self.parse(
+                decode_edifact_bytes(content, segment_index.get_fallback_encoding()),
+                profiler=profiler, compact=compact, cancel_token=cancel_token,
+            )
+        except CONTRLException as ex:
+            if ex.line_number is not None:
+                # The line numbers of the message follow the header within the parsed text
+                position = ex.line_number - 1
+                if position >= header_segment_count:
+                    position += first - header_segment_count
+                ex.locate(position + 1, segment_index.get_offsets(position))
+            raise
+        return interchange.unh_unt_nachrichten[0]
+
+    def iter_messages(
+            self,
+            edifact_text: Union[str, Iterable[str]],
+            chunk_size: int = DEFAULT_CHUNK_SIZE,
+            profiler: Optional[SegmentProfiler] = None,
+            compact: bool = False,
+            cancel_token: Optional[CancelToken] = None,
+    ) -> Iterator[tuple[int, Union[EdifactInterchange, CompactNode]]]:
+        """
+        Parses the interchange incrementally, a chunk of whole messages (UNH to UNT) at a time, so that only
+        the messages of one chunk are held in memory at once.
+
+        Every chunk is parsed together with the header of the interchange (UNA and UNB), the last chunk also
+        contains the trailer (UNZ). The messages of all chunks are the messages of parse().
+
+        Args:
+            edifact_text (Union[str, Iterable[str]]): The EDIFACT text to parse, or its consecutive parts, e.g. the
+                decoded blocks of a stream (see iter_message_texts)
+            chunk_size (int): The minimum number of characters of a chunk, a chunk ends at the start of the first
+                message beyond it. Defaults to DEFAULT_CHUNK_SIZE.
+            profiler (Optional[SegmentProfiler]): If given, the calls of the segment handlers and converters
+                are recorded per segment type
+            compact (bool): If true, the chunks are built of compact nodes instead of pydantic models
+            cancel_token (Optional[CancelToken]): If given, the parse is cancelled as soon as the token is tripped
+
+        Yields:
+            tuple[int, Union[EdifactInterchange, CompactNode]]: The number of characters of the text parsed so
+                far and the interchange of the next chunk, an interchange without messages is yielded as a whole
+
+        Raises:
+            ParseCancelledException: If the parse was cancelled via the cancel token
+        """
+        for offset, chunk_text in self.iter_message_texts(edifact_text, chunk_size=chunk_size):
+            yield offset, self.parse(chunk_text, profiler=profiler, compact=compact, cancel_token=cancel_token)
+
+    def iter_message_texts(
+            self,
+            edifact_text: Union[str, Iterable[str]],
+            chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ) -> Iterator[tuple[int, str]]:
+        """
+        Splits the interchange into chunks of whole messages (UNH to UNT) without parsing them, every chunk is
+        an interchange of its own, which can be parsed independently, e.g. by another process.
+
+        The text may be given in consecutive parts, of which only the parts of the current chunk are held in
+        memory, so that a stream is split without reading it completely.
+
+        Args:
+            edifact_text (Union[str, Iterable[str]]): The EDIFACT text, or its consecutive parts
+            chunk_size (int): The minimum number of characters of a chunk, a chunk ends at the start of the first
+                message beyond it. Defaults to DEFAULT_CHUNK_SIZE.
+
+        Yields:
+            tuple[int, str]: The number of characters of the text split so far and the text of the next chunk,
+                i.e. the header of the interchange (UNA and UNB), the messages of the chunk and, for the last chunk,
+                the trailer (UNZ). A text without messages is yielded as a whole.
+        """
+        if edifact_text is None:
+            raise MSCONSParserException("No valid parsing input. Input was", str(edifact_text))
+        parts = (edifact_text,) if isinstance(edifact_text, str) else edifact_text
+
+        pattern: Optional[re.Pattern] = None
+        segment_terminator = ""
+        # The text before the first message, None until the first message is found
+        header: Optional[str] = None
+        # The text not yielded yet, after the header
+        buffer = ""
+        # The characters of the text before the buffer
+        offset = 0
+        # The position of the buffer from which the message starts are searched
+        scan_from = 0
+        # None marks the end of the text, after which the rest of the buffer is split
+        for part in itertools.chain(parts, (None,)):
+            if part is not None:
+                buffer += part
+            if pattern is None:
+                if part is not None and len(buffer) < EdifactConstants.UNA_SEGMENT_MAX_LENGTH:
+                    continue
+                pattern, segment_terminator = self.__get_message_start_pattern(buffer)
+                text_start = len(buffer) - len(buffer.lstrip())
+                if buffer.startswith(SegmentType.UNH.value, text_start):
+                    header, buffer, offset = buffer[:text_start], buffer[text_start:], text_start
+                    scan_from = 1
+
+            message_starts = [match.end() for match in pattern.finditer(buffer, scan_from)]
+            # A segment terminator at the end of the buffer may be followed by an UNH segment in the next part
+            scan_from = max(message_starts[-1] if message_starts else 0, buffer.rfind(segment_terminator), scan_from)
+            if header is None:
+                if not message_starts:
+                    continue
+                first_start = message_starts.pop(0)
+                header, buffer, offset = buffer[:first_start], buffer[first_start:], first_start
+                message_starts = [message_start - first_start for message_start in message_starts]
+                scan_from -= first_start
+
+            chunk_start = 0
+            for message_start in message_starts:
+                if message_start - chunk_start >= chunk_size:
+                    yield offset + message_start, header + buffer[chunk_start:message_start]
+                    chunk_start = message_start
+            if chunk_start > 0:
+                buffer = buffer[chunk_start:]
+                offset += chunk_start
+                scan_from -= chunk_start
+
+        yield offset + len(buffer), buffer if header is None else header + buffer
+
+    def __get_message_start_pattern(self, edifact_text: str) -> tuple[re.Pattern, str]:
+        """
+        Returns the pattern of the message starts, i.e. the segments starting with UNH after a segment terminator,
+        with the segment terminator given by the UNA segment of the text, if any.
+
+        Args:
+            edifact_text (str): The beginning of the EDIFACT text
+
+        Returns:
+            tuple[re.Pattern, str]: The pattern, whose matches end at the UNH segments, and the segment terminator
+        """
+        self.__context = ParsingContext()
+        self.__initialize_una_segment_logic_return_if_has_una_segment(edifact_text=edifact_text)
+        segment_terminator = self.__syntax_parser.get_segment_terminator(self.__context)
+        pattern = re.compile(re.escape(segment_terminator) + r"\s*(?=" + SegmentType.UNH.value + ")")
+        return pattern, segment_terminator
+
+    def __parse_segments(
+            self,
+            edifact_text: str,
+            budget: Optional[ParseBudget],
+            cancel_token: Optional[CancelToken],
+            statistics: Optional[ParseStatistics],
+    ) -> Union[EdifactInterchange, CompactNode]:
+        t_start = time.perf_counter()
+        if cancel_token is not None:
+            cancel_token.raise_if_cancelled()
+        deadline = None
+        if budget is not None:
+            deadline = budget.deadline(t_start)
+            # The size of a decoded payload is known, otherwise the characters are a lower bound of its bytes
+            byte_count = statistics.byte_count if statistics is not None else None
+            budget.check_bytes(len(edifact_text) if byte_count is None else byte_count)
         has_una_segment = self.__initialize_una_segment_logic_return_if_has_una_segment(edifact_text=edifact_text)
+        t_una = time.perf_counter()
 
+        if budget is not None and budget.max_segments is not None:
+            # Reject an oversized text before its segments are materialized
+            budget.check_segments(self.__syntax_parser.count_segments(
+                string_content=edifact_text, context=self.__context, limit=budget.max_segments
+            ))
         segments = self.__syntax_parser.split_segments(string_content=edifact_text, context=self.__context)
-        amount_of_segments = len(segments)
+        t_tokenize = time.perf_counter()
+        segment_count = self.__convert_segments(segments, has_una_segment, budget, deadline, cancel_token)
+
+        if statistics is not None:
+            if statistics.byte_count is None:
+                statistics.byte_count = len(edifact_text)
+            self.__record_statistics(statistics, t_una - t_start, t_tokenize - t_una,
+                                     time.perf_counter() - t_tokenize, segment_count)
+        return self.__context.interchange
+
+    def __parse_buffer(
+            self,
+            buffer: mmap.mmap,
+            budget: Optional[ParseBudget],
+            cancel_token: Optional[CancelToken],
+            statistics: Optional[ParseStatistics],
+    ) -> Union[EdifactInterchange, CompactNode]:
+        t_start = time.perf_counter()
+        if cancel_token is not None:
+            cancel_token.raise_if_cancelled()
+        deadline = None
+        if budget is not None:
+            deadline = budget.deadline(t_start)
+            budget.check_bytes(len(buffer))
+        # Like parse(), the UNA segment is searched anywhere in the input, only the text up to it is decoded
+        una_index = buffer.find(SegmentType.UNA.value.encode("ascii"))
+        una_text = "" if una_index < 0 else decode_edifact_bytes(
+            buffer[:una_index + EdifactConstants.UNA_SEGMENT_MAX_LENGTH]
+        )
+        has_una_segment = self.__initialize_una_segment_logic_return_if_has_una_segment(edifact_text=una_text)
+        fallback_encoding = get_fallback_encoding(buffer)
+        t_una = time.perf_counter()
+
+        segments = self.__syntax_parser.iter_segments(
+            buffer, context=self.__context, decode=lambda content: decode_edifact_bytes(content, fallback_encoding)
+        )
+        max_segments = budget.max_segments if budget is not None else None
+        segment_count = self.__convert_segments(segments, has_una_segment, budget, deadline, cancel_token, max_segments)
+
+        if statistics is not None:
+            if statistics.byte_count is None:
+                statistics.byte_count = len(buffer)
+            self.__record_statistics(statistics, t_una - t_start, 0.0, time.perf_counter() - t_una, segment_count)
+        return self.__context.interchange
 
-        if (0 < max_lines_to_parse) and (max_lines_to_parse < amount_of_segments):
-            raise MSCONSParserException(f"Maximum number of segments reached (max: {max_lines_to_parse} less than number of segments: {amount_of_segments})")
+    def __convert_segments(
+            self,
+            segments: Iterable[str],
+            has_una_segment: bool,
+            budget: Optional[ParseBudget],
+            deadline: Optional[float],
+            cancel_token: Optional[CancelToken],
+            max_segments: Optional[int] = None,
+    ) -> int:
+        """
+        Converts the segments with their handlers into the interchange of the context and returns the number of
+        non-empty segments. If max_segments is given, the segments are checked against the budget as they are read.
+        """
+        segment_tag_matcher = self.__segment_tag_matcher
+        periodic_checks = deadline is not None or cancel_token is not None
+        duplicate_check = self.__context.duplicate_check
+        t_start = time.perf_counter()
 
         last_segment_type: Optional[str] = None
         current_segment_group: Optional[str] = None
+        non_empty_segment_count = 0
         for segment in segments:
             self.__context.segment_count += 1
             line_number = self.__context.segment_count
+            if periodic_checks and line_number % CHECK_INTERVAL == 0:
+                if deadline is not None:
+                    budget.check_deadline(deadline)
+                if cancel_token is not None:
+                    cancel_token.raise_if_cancelled()
 
             segment_line = segment.strip()
             if not segment_line:
                 continue
+            if max_segments is not None and line_number > max_segments:
+                # The segments of a lazily split input are counted as they are read
+                budget.check_segments(line_number)
+            non_empty_segment_count += 1
             if has_una_segment:
                 # Reset back the flag to continue with other segments
                 has_una_segment = False
                 continue
+            if duplicate_check is not None and duplicate_check.skipping is not None \
+                    and self.__skip_duplicate_segment(segment_line, duplicate_check):
+                continue
 
             segment_line = self.__syntax_parser.remove_invalid_prefix_from_segment_data(
                 string_content=segment_line,
-                segment_types=segment_types,
+                segment_types=segment_tag_matcher,
                 context=self.__context,
             )
 
@@ -87,7 +616,7 @@ class EdifactMSCONSParser:
                 current_segment_group=current_segment_group
             )
 
-            segment_handler = self.__handler_factory.get_handler(segment_type)
+            segment_handler = self.__handler_factory.get_handler(segment_type, context=self.__context)
             if segment_handler:
                 # Use the dedicated handler
                 segment_handler.handle(
@@ -99,7 +628,93 @@ class EdifactMSCONSParser:
                 )
             last_segment_type = segment_type
 
-        return self.__context.interchange
+        if duplicate_check is not None:
+            self.__finish_duplicate_check(duplicate_check, time.perf_counter() - t_start, non_empty_segment_count)
+        return non_empty_segment_count
+
+    @staticmethod
+    def __skip_duplicate_segment(segment_line: str, duplicate_check: DuplicateCheck) -> bool:
+        """
+        Returns true if the segment belongs to the duplicate being skipped. The segments of a duplicate message are
+        skipped up to its UNT segment, the ones of a duplicate interchange up to its UNZ segment.
+        """
+        duplicate = duplicate_check.skipping
+        tag = segment_line[:3]
+        if duplicate.kind == DuplicateKind.MESSAGE:
+            if tag == SegmentType.UNT:
+                duplicate.skipped_segments += 1
+                duplicate_check.end_skip()
+                return True
+            if tag == SegmentType.UNH:
+                # The message has no UNT segment, the next message is converted
+                duplicate_check.end_skip()
+                return False
+        if tag == SegmentType.UNZ:
+            duplicate_check.end_skip()
+            return False
+        duplicate.skipped_segments += 1
+        return True
+
+    @staticmethod
+    def __finish_duplicate_check(duplicate_check: DuplicateCheck, convert_seconds: float, segment_count: int) -> None:
+        if duplicate_check.skipping is not None:
+            # The input ended within the duplicate
+            duplicate_check.end_skip()
+        skipped_segments = sum(duplicate.skipped_segments for duplicate in duplicate_check.duplicates)
+        duplicate_check.finish(convert_seconds, segment_count - skipped_segments)
+        for duplicate in duplicate_check.duplicates:
+            logger.info("Skipped duplicate %s", duplicate.kind, extra={"duplicate": duplicate.as_dict()})
+
+    def __record_rejected_duplicate(self, duplicate: Duplicate, total_segment_count: int) -> None:
+        # The segments after the rejected duplicate are not converted, the time saved is estimated from the
+        # convert time of the earlier parses checked against the index
+        duplicate.skipped_segments = max(total_segment_count - self.__context.segment_count, 0)
+        self.__context.duplicate_check.finish(0.0, 0)
+        logger.info("Rejected duplicate %s", duplicate.kind, extra={"duplicate": duplicate.as_dict()})
+
+    def __record_statistics(
+            self,
+            statistics: ParseStatistics,
+            una_duration: float,
+            tokenize_duration: float,
+            convert_duration: float,
+            segment_count: int,
+    ) -> None:
+        statistics.record_phase(ParsePhase.UNA, una_duration)
+        statistics.record_phase(ParsePhase.TOKENIZE, tokenize_duration)
+        statistics.record_phase(ParsePhase.CONVERT, convert_duration)
+        statistics.segment_count = segment_count
+        statistics.message_count = len(self.__context.interchange.unh_unt_nachrichten)
+        statistics.recovered_prefix_count = self.__context.recovered_prefix_count
+        if self.__context.conversion_cache is not None:
+            statistics.conversion_cache = self.__context.conversion_cache.as_dict()
+
+    def __start_parse(
+            self,
+            compact: bool,
+            profiler: Optional[SegmentProfiler],
+            query_index: Optional[InterchangeQueryIndex] = None,
+            duplicate_check: Optional[DuplicateCheck] = None,
+    ) -> None:
+        # Every parse starts with a fresh context, so that one parser instance can be reused
+        self.__context = ParsingContext(compact_nodes=compact)
+        self.__context.profiler = profiler
+        self.__context.query_index = query_index
+        self.__context.duplicate_check = duplicate_check
+        self.__context.strict_models = self.__strict_models
+        self.__context.use_code_lists(
+            self.__code_list_registry if self.__resolve_labels else None, self.__mig_version
+        )
+        self.__context.use_numeric_mode(self.__numeric_mode)
+        if self.__conversion_cache_size > 0:
+            self.__context.conversion_cache = ConversionCache(self.__conversion_cache_size, self.__cached_segment_types)
+        if profiler is not None:
+            profiler.count_parse()
+
+    def __finish_parse(self) -> None:
+        # Repeated warnings are logged once per interchange instead of once per segment
+        self.__context.warnings.log_summary(logger)
+        self.__context.release_shared_values()
 
     def __initialize_una_segment_logic_return_if_has_una_segment(self, edifact_text: str) -> bool:
         una_segment: Optional[str] = None
@@ -110,7 +725,7 @@ class EdifactMSCONSParser:
             # Check for UNA segment is somewhere in the middle of the text
             index = edifact_text.find(SegmentType.UNA)
             if index > 0:
-                logger.warning(f"Removing invalid prefix from UNA segment '{edifact_text[:index]}'")
+                logger.warning("Removing invalid prefix from UNA segment '%s'", edifact_text[:index])
                 una_segment = edifact_text[index:EdifactConstants.UNA_SEGMENT_MAX_LENGTH]
 
         if una_segment:
@@ -142,7 +757,7 @@ class EdifactMSCONSParser:
             Optional[SegmentGroup]: The determined segment group, or None if the segment type is empty
         """
         if not current_segment_type:
-            logger.error(f"Error: Segment type '{current_segment_type}' not exist!")
+            logger.error("Error: Segment type '%s' not exist!", current_segment_type)
             return None
 
         if current_segment_type.startswith(SegmentType.DTM):
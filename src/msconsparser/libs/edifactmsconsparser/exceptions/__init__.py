@@ -3,4 +3,7 @@
 Package for the exception classes.
 """
 from msconsparser.libs.edifactmsconsparser.exceptions.contrl_exceptions import CONTRLException
-from msconsparser.libs.edifactmsconsparser.exceptions.parser_exceptions import MSCONSParserException
\ No newline at end of file
+from msconsparser.libs.edifactmsconsparser.exceptions.parser_exceptions import (
+    ArchiveReadException, DuplicateInterchangeException, MSCONSParserException, ParseBudgetExceededException,
+    ParseCancelledException
+)
@@ -1,7 +1,35 @@
 # coding: utf-8
+from typing import Optional
+
 
 class CONTRLException(Exception):
-    def __init__(self, message: str = "CONTRL – Syntax-Check - Message contains syntax error", value: str = None):
+    def __init__(
+            self,
+            message: str = "CONTRL – Syntax-Check - Message contains syntax error",
+            value: str = None,
+            line_number: Optional[int] = None,
+    ):
         self.message = message
         self.value = value
+        # The line number of the segment with the error, i.e. its position in the interchange + 1, if known
+        self.line_number = line_number
+        # The byte offsets of the start and the end of the segment in the input, if located (see locate)
+        self.byte_range: Optional[tuple[int, int]] = None
         super().__init__(f"{message}{': ' + value if value else ''}")
+
+    def locate(self, line_number: int, byte_range: tuple[int, int]) -> None:
+        """
+        Sets the position of the segment with the error in the input, e.g. from a SegmentIndex.
+
+        Args:
+            line_number: The line number of the segment in the whole interchange
+            byte_range: The byte offsets of the start and the end of the segment
+        """
+        self.line_number = line_number
+        self.byte_range = byte_range
+
+    def __str__(self) -> str:
+        text = super().__str__()
+        if self.byte_range is None:
+            return text
+        return f"{text} (segment {self.line_number} at bytes {self.byte_range[0]}-{self.byte_range[1]})"
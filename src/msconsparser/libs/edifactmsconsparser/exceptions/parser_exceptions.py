@@ -5,3 +5,30 @@ class MSCONSParserException(Exception):
         self.message = message
         self.value = value
         super().__init__(f"{message}{': ' + value if value else ''}")
+
+
+class ParseBudgetExceededException(MSCONSParserException):
+    def __init__(self, budget: str, limit: float, value: str = None):
+        self.budget = budget
+        self.limit = limit
+        super().__init__(f"Parse budget exceeded (max {budget}: {limit})", value)
+
+
+class ParseCancelledException(MSCONSParserException):
+    def __init__(self, reason: str, value: str = None):
+        self.reason = reason
+        # The CPU seconds spent on the parse until it was cancelled, set by the parser
+        self.cpu_seconds = 0.0
+        super().__init__(f"Parse cancelled ({reason})", value)
+
+
+class ArchiveReadException(MSCONSParserException):
+    def __init__(self, value: str = None):
+        super().__init__("Invalid archive", value)
+
+
+class DuplicateInterchangeException(MSCONSParserException):
+    def __init__(self, duplicate):
+        # The rejected duplicate, see DuplicateCheck, the parser sets its skipped segments and the time saved
+        self.duplicate = duplicate
+        super().__init__(f"Duplicate {duplicate.kind}", ", ".join(duplicate.key[1:]))
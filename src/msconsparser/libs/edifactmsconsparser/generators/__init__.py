@@ -0,0 +1,7 @@
+# coding: utf-8
+"""
+Package for the generators of synthetic MSCONS interchanges.
+"""
+from msconsparser.libs.edifactmsconsparser.generators.mscons_generator import (
+    MSCONSGeneratorSettings, MSCONSInterchangeGenerator
+)
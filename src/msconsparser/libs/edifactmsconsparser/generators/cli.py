@@ -0,0 +1,120 @@
+# coding: utf-8
+"""
+Command line interface of the synthetic MSCONS interchange generator.
+
+Example:
+    python -m msconsparser.libs.edifactmsconsparser.generators corpus.edi \
+        --messages 100 --locations 2 --objects 5 --positions 2 --intervals 2880 --seed 42
+"""
+import argparse
+import os
+import sys
+import time
+from typing import Optional, Sequence
+
+from pydantic import ValidationError
+
+from msconsparser.libs.edifactmsconsparser.generators.mscons_generator import (
+    MSCONSGeneratorSettings, MSCONSInterchangeGenerator
+)
+
+
+def create_argument_parser() -> argparse.ArgumentParser:
+    """
+    Creates the argument parser of the generator command line interface.
+
+    Returns:
+        argparse.ArgumentParser: The argument parser
+    """
+    parser = argparse.ArgumentParser(
+        prog="mscons-generate",
+        description="Generates a synthetic MSCONS 2.4c interchange for load and scale testing.",
+    )
+    parser.add_argument("output", help="The file to write the interchange to, '-' for stdout")
+    parser.add_argument("--seed", type=int, default=None, help="Seed for a deterministic output")
+    parser.add_argument("--messages", type=int, default=1, help="Number of messages (UNH...UNT)")
+    parser.add_argument("--locations", type=int, default=1, help="Number of delivery locations (SG5) per message")
+    parser.add_argument("--objects", type=int, default=1, help="Number of location objects (SG6) per location")
+    parser.add_argument("--positions", type=int, default=1, help="Number of positions (SG9) per location object")
+    parser.add_argument("--intervals", type=int, default=96, help="Number of intervals (SG10) per position")
+    parser.add_argument("--interval-minutes", type=int, default=15, help="Length of an interval in minutes")
+    parser.add_argument("--una", default=None, metavar="CHARS",
+                        help="Custom UNA characters in the order component separator, element separator, "
+                             "decimal mark, release character, segment terminator, e.g. ':+,?\\''")
+    parser.add_argument("--no-una", action="store_true", help="Omit the UNA segment")
+    parser.add_argument("--escape-rate", type=float, default=0.0,
+                        help="Share of free-text values and location IDs containing characters to be escaped (0..1)")
+    parser.add_argument("--dirty-prefix-rate", type=float, default=0.0,
+                        help="Share of segments preceded by an invalid technical prefix (0..1)")
+    parser.add_argument("--status-rate", type=float, default=0.0, help="Share of intervals with a STS segment (0..1)")
+    parser.add_argument("--single-line", action="store_true", help="Do not add line breaks after the segments")
+    parser.add_argument("--encoding", default="utf-8", help="Encoding of the output file")
+    return parser
+
+
+def create_settings(args: argparse.Namespace) -> MSCONSGeneratorSettings:
+    """
+    Creates the generator settings from the parsed command line arguments.
+
+    Args:
+        args: The parsed command line arguments
+
+    Returns:
+        MSCONSGeneratorSettings: The generator settings
+
+    Raises:
+        ValueError: If the UNA characters are not exactly five characters
+        ValidationError: If the settings are not valid
+    """
+    una = {}
+    if args.una is not None:
+        if len(args.una) != 5:
+            raise ValueError(f"Expected five UNA characters, but got '{args.una}'")
+        una = dict(zip(
+            ("component_separator", "element_separator", "decimal_mark", "release_character", "segment_terminator"),
+            args.una,
+        ))
+    return MSCONSGeneratorSettings(
+        seed=args.seed,
+        messages=args.messages,
+        locations_per_message=args.locations,
+        objects_per_location=args.objects,
+        positions_per_object=args.positions,
+        intervals_per_position=args.intervals,
+        interval_minutes=args.interval_minutes,
+        with_una=not args.no_una,
+        escape_rate=args.escape_rate,
+        dirty_prefix_rate=args.dirty_prefix_rate,
+        status_rate=args.status_rate,
+        line_breaks=not args.single_line,
+        **una,
+    )
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """
+    Runs the generator command line interface.
+
+    Args:
+        argv: The command line arguments, defaults to sys.argv
+
+    Returns:
+        int: The exit code
+    """
+    parser = create_argument_parser()
+    args = parser.parse_args(argv)
+    try:
+        settings = create_settings(args)
+    except (ValueError, ValidationError) as ex:
+        parser.error(str(ex))
+
+    generator = MSCONSInterchangeGenerator(settings)
+    start = time.perf_counter()
+    if args.output == "-":
+        generator.write(sys.stdout)
+        return 0
+
+    generator.write_file(args.output, encoding=args.encoding)
+    size = os.path.getsize(args.output)
+    print(f"Wrote {size} bytes to {args.output} in {time.perf_counter() - start:.2f} s", file=sys.stderr)
+    return 0
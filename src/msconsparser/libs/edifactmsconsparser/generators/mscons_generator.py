@@ -0,0 +1,253 @@
+# coding: utf-8
+"""
+Generator of synthetic MSCONS 2.4c interchanges.
+
+The generator produces structurally valid interchanges of any size for load and scale testing.
+The segments are yielded one by one, so that even multi-GB interchanges can be written to disk
+without holding them in memory.
+"""
+import random
+from datetime import datetime, timedelta
+from typing import Iterator, Optional, TextIO
+
+from pydantic import BaseModel, Field, model_validator
+
+from msconsparser.libs.edifactmsconsparser.wrappers.segments.constants import EdifactConstants, SegmentType
+
+
+class MSCONSGeneratorSettings(BaseModel):
+    """
+    Settings of the synthetic MSCONS interchange.
+
+    The size of the interchange is defined by the number of messages and, per message, by the number of
+    delivery locations (SG5), the number of location objects per delivery location (SG6), the number of
+    positions per location object (SG9) and the number of intervals per position (SG10).
+    """
+    seed: Optional[int] = Field(default=None, description="Seed of the random generator for a deterministic output")
+
+    messages: int = Field(default=1, ge=1, description="Number of messages (UNH...UNT)")
+    locations_per_message: int = Field(default=1, ge=1, description="Number of delivery locations (SG5) per message")
+    objects_per_location: int = Field(default=1, ge=1, description="Number of location objects (SG6) per location")
+    positions_per_object: int = Field(default=1, ge=1, description="Number of positions (SG9) per location object")
+    intervals_per_position: int = Field(default=96, ge=1, description="Number of intervals (SG10) per position")
+    interval_minutes: int = Field(default=15, ge=1, description="Length of an interval in minutes")
+    start: datetime = Field(default=datetime(2024, 1, 1), description="Start of the first interval")
+
+    with_una: bool = Field(default=True, description="If true, the interchange starts with an UNA segment")
+    component_separator: str = Field(default=EdifactConstants.DEFAULT_COMPONENT_SEPARATOR, min_length=1, max_length=1)
+    element_separator: str = Field(default=EdifactConstants.DEFAULT_ELEMENT_SEPARATOR, min_length=1, max_length=1)
+    decimal_mark: str = Field(default=EdifactConstants.DEFAULT_DECIMAL_MARK, min_length=1, max_length=1)
+    release_character: str = Field(default=EdifactConstants.DEFAULT_RELEASE_INDICATOR, min_length=1, max_length=1)
+    segment_terminator: str = Field(default=EdifactConstants.DEFAULT_SEGMENT_TERMINATOR, min_length=1, max_length=1)
+
+    escape_rate: float = Field(default=0.0, ge=0.0, le=1.0,
+                               description="Share of free-text values and location IDs containing characters to be "
+                                           "escaped, the quantities and timestamps are never extended")
+    dirty_prefix_rate: float = Field(default=0.0, ge=0.0, le=1.0,
+                                     description="Share of segments preceded by an invalid technical prefix")
+    status_rate: float = Field(default=0.0, ge=0.0, le=1.0, description="Share of intervals with a STS segment")
+    line_breaks: bool = Field(default=True, description="If true, every segment is followed by a line break")
+
+    sender_id: str = Field(default="9900000000001", description="Market partner ID of the sender")
+    recipient_id: str = Field(default="9900000000002", description="Market partner ID of the recipient")
+
+    @model_validator(mode="after")
+    def validate_separators(self) -> "MSCONSGeneratorSettings":
+        separators = [self.component_separator, self.element_separator, self.release_character,
+                      self.segment_terminator]
+        if len(set(separators)) != len(separators):
+            raise ValueError(f"The UNA separators must be distinct, but got {separators}")
+        if any(separator.isalnum() for separator in [*separators, self.decimal_mark]):
+            raise ValueError(f"The UNA separators and the decimal mark must not be letters or digits, "
+                             f"but got {[*separators, self.decimal_mark]}")
+        if self.component_separator != EdifactConstants.DEFAULT_COMPONENT_SEPARATOR:
+            # The segment converters of the parser split the components with the default component separator
+            raise ValueError(f"The component separator must be '{EdifactConstants.DEFAULT_COMPONENT_SEPARATOR}', "
+                             f"but got '{self.component_separator}'")
+        if self.decimal_mark in separators:
+            raise ValueError(f"The decimal mark '{self.decimal_mark}' must differ from the separators")
+        if not self.with_una and separators != [
+            EdifactConstants.DEFAULT_COMPONENT_SEPARATOR, EdifactConstants.DEFAULT_ELEMENT_SEPARATOR,
+            EdifactConstants.DEFAULT_RELEASE_INDICATOR, EdifactConstants.DEFAULT_SEGMENT_TERMINATOR,
+        ]:
+            raise ValueError("Custom separators require the UNA segment")
+        return self
+
+
+class MSCONSInterchangeGenerator:
+    """
+    Generates a synthetic MSCONS 2.4c interchange segment by segment.
+
+    Example:
+        settings = MSCONSGeneratorSettings(messages=10, intervals_per_position=2880, seed=42)
+        MSCONSInterchangeGenerator(settings).write_file("corpus.edi")
+    """
+
+    DIRTY_PREFIXES = ("[${test(TEST_DATA)}]:", "0000:", "#~ ")
+    FREE_TEXT_SAMPLES = ("Getty", "Netz Nord", "Stadtwerke", "Messstelle", "Zaehler")
+
+    def __init__(self, settings: Optional[MSCONSGeneratorSettings] = None):
+        """
+        Initialize the generator.
+
+        Args:
+            settings: The settings of the interchange, defaults to a single message with one day of 15 minute intervals
+        """
+        self.settings = settings or MSCONSGeneratorSettings()
+        self.__random = random.Random(self.settings.seed)
+        self.__special_characters = (
+            self.settings.component_separator,
+            self.settings.element_separator,
+            self.settings.release_character,
+            self.settings.segment_terminator,
+        )
+        self.__escape_table = str.maketrans({
+            character: self.settings.release_character + character for character in self.__special_characters
+        })
+        self.__segment_end = self.settings.segment_terminator + ("\n" if self.settings.line_breaks else "")
+
+    def iter_segments(self) -> Iterator[str]:
+        """
+        Yields the segments of the interchange including the segment terminators.
+
+        Returns:
+            Iterator[str]: The segments in the order of the interchange
+        """
+        settings = self.settings
+        reference = self.__reference("REF", 10)
+
+        if settings.with_una:
+            yield (f"{SegmentType.UNA}{settings.component_separator}{settings.element_separator}"
+                   f"{settings.decimal_mark}{settings.release_character}"
+                   f"{EdifactConstants.DEFAULT_RESERVED_INDICATOR}{self.__segment_end}")
+        yield self.__segment(
+            SegmentType.UNB, ("UNOC", "3"), (settings.sender_id, "500"), (settings.recipient_id, "500"),
+            (settings.start.strftime("%y%m%d"), settings.start.strftime("%H%M")), reference, "", "TL",
+        )
+
+        interval_start = settings.start
+        for message_number in range(1, settings.messages + 1):
+            segment_count = 0
+            for segment in self.__iter_message_segments(message_number, interval_start):
+                segment_count += 1
+                yield segment
+            yield self.__segment(SegmentType.UNT, str(segment_count + 1), str(message_number))
+
+        yield self.__segment(SegmentType.UNZ, str(settings.messages), reference)
+
+    def write(self, stream: TextIO) -> None:
+        """
+        Writes the interchange into a text stream segment by segment.
+
+        Args:
+            stream: The text stream to write to
+        """
+        stream.writelines(self.iter_segments())
+
+    def write_file(self, path: str, encoding: str = "utf-8") -> None:
+        """
+        Writes the interchange into a file segment by segment.
+
+        Args:
+            path: The path of the file to write
+            encoding: The encoding of the file
+        """
+        with open(path, "w", encoding=encoding, newline="") as stream:
+            self.write(stream)
+
+    def __iter_message_segments(self, message_number: int, interval_start: datetime) -> Iterator[str]:
+        settings = self.settings
+        interval = timedelta(minutes=settings.interval_minutes)
+        yield self.__segment(SegmentType.UNH, str(message_number), ("MSCONS", "D", "04B", "UN", "2.4c"))
+        yield self.__segment(SegmentType.BGM, "7", self.__free_text(f"MSI{message_number}"), "9")
+        yield self.__segment(SegmentType.DTM, ("137", self.__timestamp(settings.start), "303"))
+        yield self.__segment(SegmentType.RFF, ("Z13", "13025"))
+        yield self.__segment(SegmentType.NAD, "MS", (settings.sender_id, "", "293"))
+        yield self.__segment(SegmentType.CTA, "IC", ("", self.__free_text("Kontakt")))
+        yield self.__segment(SegmentType.COM, ("no-reply@example.com", "EM"))
+        yield self.__segment(SegmentType.NAD, "MR", (settings.recipient_id, "", "293"))
+        yield self.__segment(SegmentType.UNS, "D")
+
+        for _ in range(settings.locations_per_message):
+            yield self.__segment(SegmentType.NAD, "DP")
+            for _ in range(settings.objects_per_location):
+                period_end = interval_start + interval * settings.intervals_per_position
+                yield self.__segment(SegmentType.LOC, "172", self.__free_text(self.__reference("DE", 31)))
+                yield self.__segment(SegmentType.DTM, ("163", self.__timestamp(interval_start), "303"))
+                yield self.__segment(SegmentType.DTM, ("164", self.__timestamp(period_end), "303"))
+                yield self.__segment(SegmentType.RFF, ("MG", self.__free_text(self.__reference("1EMH", 10))))
+                yield self.__segment(SegmentType.CCI, "15", "", "BI1")
+                for position_number in range(1, settings.positions_per_object + 1):
+                    yield self.__segment(SegmentType.LIN, str(position_number))
+                    yield self.__segment(SegmentType.PIA, "5", ("1-1:1.29.1", "SRW"))
+                    yield from self.__iter_interval_segments(interval_start, interval)
+
+    def __iter_interval_segments(self, interval_start: datetime, interval: timedelta) -> Iterator[str]:
+        # The interval segments make up the bulk of the interchange, so they are built from prepared
+        # segment parts around the values, the timestamps of the period are formatted and escaped only once
+        settings = self.settings
+        qty_head, qty_tail = self.__segment_parts(SegmentType.QTY, "220", "KWH")
+        start_head, start_tail = self.__segment_parts(SegmentType.DTM, "163", "303")
+        end_head, end_tail = self.__segment_parts(SegmentType.DTM, "164", "303")
+        timestamps = [self.__timestamp(interval_start + interval * index).translate(self.__escape_table)
+                      for index in range(settings.intervals_per_position + 1)]
+        for index in range(settings.intervals_per_position):
+            # The quantity only contains digits and the decimal mark, so it needs no escaping
+            yield self.__dirty(qty_head + self.__quantity() + qty_tail)
+            yield self.__dirty(start_head + timestamps[index] + start_tail)
+            yield self.__dirty(end_head + timestamps[index + 1] + end_tail)
+            if settings.status_rate and self.__random.random() < settings.status_rate:
+                yield self.__segment(SegmentType.STS, "Z33", "", "Z83")
+
+    def __segment_parts(self, segment_type: str, qualifier: str, code: str) -> tuple[str, str]:
+        """
+        Returns the parts of a segment "TAG+qualifier:<value>:code'" before and after the value.
+        """
+        placeholder = "\x00"
+        return tuple(self.__segment(segment_type, (qualifier, placeholder, code), dirty=False).split(placeholder))
+
+    def __segment(self, segment_type: str, *elements, dirty: bool = True) -> str:
+        """
+        Builds a segment from its elements, an element is either a single value or a tuple of component values.
+        All values are escaped, so that the separators may be part of the data.
+        """
+        settings = self.settings
+        parts = [segment_type]
+        for element in elements:
+            if isinstance(element, tuple):
+                parts.append(settings.component_separator.join(component.translate(self.__escape_table)
+                                                               for component in element))
+            else:
+                parts.append(element.translate(self.__escape_table))
+        segment = settings.element_separator.join(parts) + self.__segment_end
+        return self.__dirty(segment) if dirty else segment
+
+    def __dirty(self, segment: str) -> str:
+        """
+        Returns the segment, with the configured probability preceded by an invalid technical prefix.
+        """
+        if self.settings.dirty_prefix_rate and self.__random.random() < self.settings.dirty_prefix_rate:
+            return self.__random.choice(MSCONSInterchangeGenerator.DIRTY_PREFIXES) + segment
+        return segment
+
+    def __free_text(self, value: str) -> str:
+        """
+        Returns the value, with the configured probability extended by characters to be escaped.
+        Escaped segment terminators are left out, as the parser splits the segments before resolving escapes.
+        """
+        if self.settings.escape_rate and self.__random.random() < self.settings.escape_rate:
+            separator = self.__random.choice(self.__special_characters[:3])
+            return f"{value}{separator}{self.__random.choice(MSCONSInterchangeGenerator.FREE_TEXT_SAMPLES)}"
+        return value
+
+    def __reference(self, prefix: str, length: int) -> str:
+        digits = length - len(prefix)
+        return prefix + str(self.__random.randrange(10 ** (digits - 1), 10 ** digits))
+
+    def __quantity(self) -> str:
+        return f"{self.__random.uniform(0, 5000):.3f}".replace(EdifactConstants.DOT_DECIMAL, self.settings.decimal_mark)
+
+    @staticmethod
+    def __timestamp(moment: datetime) -> str:
+        # Format code 303 (CCYYMMDDHHMMZZZ), the "+" of the UTC offset gets escaped if it is a separator
+        return moment.strftime("%Y%m%d%H%M") + "+00"
@@ -38,3 +38,5 @@ class BGMSegmentHandler(SegmentHandler[SegmentBGM]):
             context: The parsing context to update.
         """
         context.current_message.bgm_beginn_der_nachricht = segment
+        if context.duplicate_check is not None:
+            context.check_duplicate_message()
@@ -5,7 +5,7 @@ from typing import Optional
 from msconsparser.libs.edifactmsconsparser.converters import CCISegmentConverter
 from msconsparser.libs.edifactmsconsparser.handlers import SegmentHandler
 from msconsparser.libs.edifactmsconsparser.utils import EdifactSyntaxHelper
-from msconsparser.libs.edifactmsconsparser.wrappers import ParsingContext
+from msconsparser.libs.edifactmsconsparser.wrappers import ParsingContext, QueryKey
 from msconsparser.libs.edifactmsconsparser.wrappers.segments import (
     SegmentGroup, SegmentCCI, SegmentGroup8
 )
@@ -41,6 +41,8 @@ class CCISegmentHandler(SegmentHandler[SegmentCCI]):
             context: The parsing context to update.
         """
         if SegmentGroup.SG8 == current_segment_group:
-            context.current_sg8 = SegmentGroup8()
+            context.current_sg8 = context.create_model(SegmentGroup8)
             context.current_sg8.cci_zeitreihentyp = segment
             context.current_sg6.sg8_zeitreihentypen.append(context.current_sg8)
+            if context.query_index is not None and segment.merkmalsbeschreibung is not None:
+                context.add_to_query_index(QueryKey.TIME_SERIES_TYPE, segment.merkmalsbeschreibung.merkmal_code)
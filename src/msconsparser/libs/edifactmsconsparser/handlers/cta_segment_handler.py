@@ -41,6 +41,6 @@ class CTASegmentHandler(SegmentHandler[SegmentCTA]):
             context: The parsing context to update.
         """
         if SegmentGroup.SG4 == current_segment_group:
-            context.current_sg4 = SegmentGroup4()
+            context.current_sg4 = context.create_model(SegmentGroup4)
             context.current_sg4.cta_ansprechpartner = segment
             context.current_sg2.sg4_kontaktinformationen.append(context.current_sg4)
@@ -52,4 +52,4 @@ class DTMSegmentHandler(SegmentHandler[SegmentDTM]):
             context.current_sg10.dtm_zeitangaben.append(segment)
         else:
             # Unknown segment group
-            logger.warning(f"Keine Behandlung für DTM-Segment '{segment}' definiert.")
+            context.warnings.add("Keine Behandlung für DTM-Segment '%s' definiert.", segment)
@@ -41,6 +41,6 @@ class LINSegmentHandler(SegmentHandler[SegmentLIN]):
             context: The parsing context to update.
         """
         if SegmentGroup.SG9 == current_segment_group:
-            context.current_sg9 = SegmentGroup9()
+            context.current_sg9 = context.create_model(SegmentGroup9)
             context.current_sg9.lin_lfd_position = segment
             context.current_sg6.sg9_positionsdaten.append(context.current_sg9)
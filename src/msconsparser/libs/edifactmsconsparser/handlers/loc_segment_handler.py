@@ -5,7 +5,7 @@ from typing import Optional
 from msconsparser.libs.edifactmsconsparser.converters import LOCSegmentConverter
 from msconsparser.libs.edifactmsconsparser.handlers import SegmentHandler
 from msconsparser.libs.edifactmsconsparser.utils import EdifactSyntaxHelper
-from msconsparser.libs.edifactmsconsparser.wrappers import ParsingContext
+from msconsparser.libs.edifactmsconsparser.wrappers import ParsingContext, QueryKey
 from msconsparser.libs.edifactmsconsparser.wrappers.segments import (
     SegmentGroup, SegmentLOC, SegmentGroup6
 )
@@ -42,7 +42,9 @@ class LOCSegmentHandler(SegmentHandler[SegmentLOC]):
             context: The parsing context to update.
         """
         if SegmentGroup.SG6 == current_segment_group:
-            if not context.current_sg6:
-                context.current_sg6 = SegmentGroup6()
+            # Every LOC segment starts a new location object, also within the same delivery location (SG5)
+            context.current_sg6 = context.create_model(SegmentGroup6)
             context.current_sg6.loc_identifikationsangabe = segment
             context.current_sg5.sg6_wert_und_erfassungsangaben_zum_objekt.append(context.current_sg6)
+            if context.query_index is not None and segment.ortsangabe is not None:
+                context.add_to_query_index(QueryKey.LOCATION, segment.ortsangabe.ortsangabe_code)
@@ -41,11 +41,11 @@ class NADSegmentHandler(SegmentHandler[SegmentNAD]):
             context: The parsing context to update.
         """
         if SegmentGroup.SG2 == current_segment_group:
-            context.current_sg2 = SegmentGroup2()
+            context.current_sg2 = context.create_model(SegmentGroup2)
             context.current_sg2.nad_marktpartner = segment
             context.current_message.sg2_marktpartnern.append(context.current_sg2)
         elif SegmentGroup.SG5 == current_segment_group:
             if not context.current_sg5:
-                context.current_sg5 = SegmentGroup5()
+                context.current_sg5 = context.create_model(SegmentGroup5)
             context.current_sg5.nad_name_und_adresse = segment
             context.current_message.sg5_liefer_bzw_bezugsorte.append(context.current_sg5)
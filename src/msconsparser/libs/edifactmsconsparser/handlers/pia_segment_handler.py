@@ -5,7 +5,7 @@ from typing import Optional
 from msconsparser.libs.edifactmsconsparser.converters import PIASegmentConverter
 from msconsparser.libs.edifactmsconsparser.handlers import SegmentHandler
 from msconsparser.libs.edifactmsconsparser.utils import EdifactSyntaxHelper
-from msconsparser.libs.edifactmsconsparser.wrappers import ParsingContext
+from msconsparser.libs.edifactmsconsparser.wrappers import ParsingContext, QueryKey
 from msconsparser.libs.edifactmsconsparser.wrappers.segments import SegmentGroup, SegmentPIA
 
 
@@ -40,3 +40,8 @@ class PIASegmentHandler(SegmentHandler[SegmentPIA]):
         """
         if SegmentGroup.SG9 == current_segment_group:
             context.current_sg9.pia_produktidentifikation = segment
+            if context.query_index is not None and segment.waren_leistungsnummer_identifikation is not None:
+                context.add_to_query_index(
+                    QueryKey.OBIS, segment.waren_leistungsnummer_identifikation.produkt_leistungsnummer,
+                    position=context.current_sg9,
+                )
@@ -42,6 +42,6 @@ class QTYSegmentHandler(SegmentHandler[SegmentQTY]):
             context: The parsing context to update.
         """
         if SegmentGroup.SG10 == current_segment_group:
-            context.current_sg10 = SegmentGroup10()
+            context.current_sg10 = context.create_model(SegmentGroup10)
             context.current_sg10.qty_mengenangaben = segment
             context.current_sg9.sg10_mengen_und_statusangaben.append(context.current_sg10)
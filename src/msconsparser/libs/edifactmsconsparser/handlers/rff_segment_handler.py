@@ -6,13 +6,16 @@ from typing import Optional
 from msconsparser.libs.edifactmsconsparser.converters import RFFSegmentConverter
 from msconsparser.libs.edifactmsconsparser.handlers import SegmentHandler
 from msconsparser.libs.edifactmsconsparser.utils import EdifactSyntaxHelper
-from msconsparser.libs.edifactmsconsparser.wrappers import ParsingContext
+from msconsparser.libs.edifactmsconsparser.wrappers import ParsingContext, QueryKey
 from msconsparser.libs.edifactmsconsparser.wrappers.segments import (
     SegmentGroup, SegmentRFF, SegmentGroup1, SegmentGroup7
 )
 
 logger = logging.getLogger(__name__)
 
+# The reference qualifier of the device number (Gerätenummer) in SG7
+DEVICE_NUMBER_QUALIFIER = "MG"
+
 
 class RFFSegmentHandler(SegmentHandler[SegmentRFF]):
     """
@@ -45,10 +48,12 @@ class RFFSegmentHandler(SegmentHandler[SegmentRFF]):
             context: The parsing context to update.
         """
         if SegmentGroup.SG1 == current_segment_group:
-            context.current_sg1 = SegmentGroup1()
+            context.current_sg1 = context.create_model(SegmentGroup1)
             context.current_sg1.rff_referenzangaben = segment
             context.current_message.sg1_referenzen.append(context.current_sg1)
         elif SegmentGroup.SG7 == current_segment_group:
-            context.current_sg7 = SegmentGroup7()
+            context.current_sg7 = context.create_model(SegmentGroup7)
             context.current_sg7.rff_referenzangabe = segment
             context.current_sg6.sg7_referenzangaben.append(context.current_sg7)
+            if context.query_index is not None and segment.referenz_qualifier == DEVICE_NUMBER_QUALIFIER:
+                context.add_to_query_index(QueryKey.DEVICE_NUMBER, segment.referenz_identifikation)
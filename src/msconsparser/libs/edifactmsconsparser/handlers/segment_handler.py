@@ -4,7 +4,7 @@ from abc import ABC, abstractmethod
 from typing import Optional, TypeVar, Generic
 
 from msconsparser.libs.edifactmsconsparser.converters import SegmentConverter
-from msconsparser.libs.edifactmsconsparser.wrappers import ParsingContext
+from msconsparser.libs.edifactmsconsparser.wrappers import ParsingContext, SegmentProfiler
 from msconsparser.libs.edifactmsconsparser.wrappers.segments import SegmentGroup
 
 T = TypeVar('T')
@@ -36,6 +36,9 @@ class SegmentHandler(ABC, Generic[T]):
         """
         Handle a segment by converting it and updating the context.
 
+        If a profiler is set in the context, the call is recorded for the segment type.
+        Without a profiler, the only overhead is a single attribute check.
+
         Args:
             line_number: The line number of the segment in the input file.
             element_components: The components of the segment.
@@ -47,6 +50,9 @@ class SegmentHandler(ABC, Generic[T]):
         if not self._can_handle(context):
             return
 
+        profiler = context.profiler
+        start = profiler.start() if profiler is not None else None
+
         # Convert the segment
         segment = self.converter.convert(
             line_number=line_number,
@@ -59,6 +65,9 @@ class SegmentHandler(ABC, Generic[T]):
         # Update the context with the converted segment
         self._update_context(segment, current_segment_group, context)
 
+        if profiler is not None:
+            profiler.record(SegmentProfiler.HANDLER, element_components[0], start)
+
     def _can_handle(self, context: ParsingContext) -> bool:
         """
         Check if the context is valid for this handler.
@@ -5,6 +5,7 @@ from typing import Dict, Optional
 
 # Keep this style to avoid circular imports
 from msconsparser.libs.edifactmsconsparser.utils.edifact_syntax_helper import EdifactSyntaxHelper
+from msconsparser.libs.edifactmsconsparser.wrappers.context import ParsingContext
 
 from msconsparser.libs.edifactmsconsparser.wrappers.segments.constants import SegmentType
 
@@ -81,17 +82,22 @@ class SegmentHandlerFactory:
             SegmentType.UNZ: UNZSegmentHandler(syntax_parser),
         }
 
-    def get_handler(self, segment_type: str) -> Optional[SegmentHandler]:
+    def get_handler(self, segment_type: str, context: Optional[ParsingContext] = None) -> Optional[SegmentHandler]:
         """
         Get the handler for the specified segment type.
 
         Args:
             segment_type: The segment type to get a handler for.
+            context: The parsing context, if given, a missing handler is added to its aggregated warnings
+                instead of being logged immediately.
 
         Returns:
             The handler for the segment type, or None if no handler is found.
         """
         handler = self.__handlers.get(segment_type)
         if not handler:
-            logger.warning(f"Kein Handler für Segmenttyp '{segment_type}' definiert.")
+            if context is not None:
+                context.warnings.add("Kein Handler für Segmenttyp '%s' definiert.", segment_type)
+            else:
+                logger.warning("Kein Handler für Segmenttyp '%s' definiert.", segment_type)
         return handler
@@ -51,3 +51,4 @@ class UNASegmentHandler(SegmentHandler[SegmentUNA]):
         """
         # Store the UNA segment in the interchange
         context.interchange.una_service_string_advice = segment
+        context.update_conversion_dialect()
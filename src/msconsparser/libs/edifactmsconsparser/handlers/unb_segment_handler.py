@@ -52,3 +52,5 @@ class UNBSegmentHandler(SegmentHandler[SegmentUNB]):
             context: The parsing context to update.
         """
         context.interchange.unb_nutzdaten_kopfsegment = segment
+        if context.duplicate_check is not None:
+            context.check_duplicate_interchange()
@@ -46,7 +46,7 @@ class UNHSegmentHandler(SegmentHandler[SegmentUNH]):
                         context: ParsingContext) -> None:
         """
         Update the context with the converted UNH segment.
-        This also resets the context for a new message.
+        This also resets the context for a new message and selects the code lists of its MIG version.
 
         Args:
             segment: The converted UNH segment.
@@ -56,8 +56,15 @@ class UNHSegmentHandler(SegmentHandler[SegmentUNH]):
         # Reset for a new message
         context.reset_for_new_message()
 
+        # The association assigned code of the message identifier is the MIG version, e.g. '2.4c'
+        message_identifier = segment.nachrichten_kennung
+        context.select_code_lists(
+            message_identifier.anwendungscode_der_zustaendigen_organisation if message_identifier else None
+        )
+
         # Create a new message and add it to the interchange
-        context.current_message = EdifactMSconsMessage(
+        context.current_message = context.create_model(
+            EdifactMSconsMessage,
             unh_nachrichtenkopfsegment=segment
         )
         context.interchange.unh_unt_nachrichten.append(context.current_message)
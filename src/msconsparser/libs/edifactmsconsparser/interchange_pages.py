@@ -0,0 +1,453 @@
+# coding: utf-8
+"""
+Cursor-based pages of the messages or measurements (SG10) of a parsed interchange.
+
+A page is produced from a sequence of message handles, i.e. the position of a message together with a function
+loading its JSON dump, which are skipped up to the cursor without loading them. The messages of a lazy
+interchange (see LazyEdifactInterchange) are thus only parsed from the cursor on, the messages of a stored
+result only read from the cursor on, so that page N costs as much as page 1.
+
+A cursor is opaque to the clients: the position of the next message (message pages) or of the next measurement
+(measurement pages), i.e. the message, the location object (SG6, counted across the SG5 groups), the position
+data (SG9) and the interval (SG10).
+"""
+import base64
+import binascii
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Iterable, Iterator, Optional
+
+from msconsparser.libs.edifactmsconsparser.lazy_edifact_interchange import LazyEdifactInterchange
+
+PAGE_BY_MESSAGES = "messages"
+PAGE_BY_MEASUREMENTS = "measurements"
+PAGE_BY_VALUES = (PAGE_BY_MESSAGES, PAGE_BY_MEASUREMENTS)
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 10000
+
+# The query parameters of a page request
+PAGE_BY_PARAMETER = "page_by"
+PAGE_SIZE_PARAMETER = "page_size"
+CURSOR_PARAMETER = "cursor"
+LOCATION_PARAMETER = "location"
+FROM_PARAMETER = "from"
+TO_PARAMETER = "to"
+
+_MESSAGES_KEY = "unh_unt_nachrichten"
+_MEASUREMENTS_KEY = "measurements"
+
+# The qualifiers of the DTM segments of the start and the end of an interval
+_START_QUALIFIER = "163"
+_END_QUALIFIER = "164"
+
+# The formats of the DTM values by their format code (DE2379) and the length of their date and time part
+_DTM_FORMATS = {
+    "102": ("%Y%m%d", 8),
+    "203": ("%Y%m%d%H%M", 12),
+    "303": ("%Y%m%d%H%M", 12),
+}
+
+# A message handle: the position of the message and the function loading its JSON dump
+MessageHandle = tuple[int, Callable[[], dict]]
+
+
+def parse_dtm_value(value: Optional[str], format_code: Optional[str]) -> Optional[datetime]:
+    """
+    Converts the value of a DTM segment into a timestamp.
+
+    Args:
+        value: The value, e.g. '202401010000+00'
+        format_code: The format code, '102' (CCYYMMDD), '203' (CCYYMMDDHHMM) or '303' (CCYYMMDDHHMMZZZ, with the
+            offset from UTC in hours)
+
+    Returns:
+        Optional[datetime]: The timestamp, in UTC if the format has no offset, or None if the value is missing or
+            has another format
+    """
+    date_format = _DTM_FORMATS.get(format_code)
+    if not value or date_format is None:
+        return None
+    pattern, length = date_format
+    try:
+        timestamp = datetime.strptime(value[:length], pattern)
+        offset = timedelta(hours=int(value[length:])) if format_code == "303" and value[length:] else timedelta()
+    except ValueError:
+        return None
+    return timestamp.replace(tzinfo=timezone(offset))
+
+
+def _parse_timestamp(name: str, value: Optional[str]) -> Optional[datetime]:
+    if value is None:
+        return None
+    try:
+        # Python 3.9 does not accept the designator Z of UTC
+        timestamp = datetime.fromisoformat(value[:-1] + "+00:00" if value.endswith("Z") else value)
+    except ValueError:
+        raise ValueError(f"Query parameter '{name}' must be an ISO 8601 timestamp, got '{value}'")
+    return timestamp if timestamp.tzinfo is not None else timestamp.replace(tzinfo=timezone.utc)
+
+
+def _get(node: Optional[dict], *keys: str):
+    for key in keys:
+        if node is None:
+            return None
+        node = node.get(key)
+    return node
+
+
+def _find_date(dates: Optional[list], qualifier: str) -> Optional[datetime]:
+    for date in dates or ():
+        if date.get("datums_oder_uhrzeits_oder_zeitspannen_funktion_qualifier") == qualifier:
+            return parse_dtm_value(date.get("datum_oder_uhrzeit_oder_zeitspanne_wert"),
+                                   date.get("datums_oder_uhrzeit_oder_zeitspannen_format_code"))
+    return None
+
+
+def _iter_location_objects(message: dict) -> Iterator[dict]:
+    for delivery_location in message.get("sg5_liefer_bzw_bezugsorte") or ():
+        yield from delivery_location.get("sg6_wert_und_erfassungsangaben_zum_objekt") or ()
+
+
+def _get_location(location_object: dict) -> Optional[str]:
+    return _get(location_object, "loc_identifikationsangabe", "ortsangabe", "ortsangabe_code")
+
+
+class PageCursor:
+    """
+    Position of the first message or measurement of a page.
+
+    Attributes:
+        message_index (int): The position of the message, starting at 0
+        location_index (int): The position of the location object (SG6) in the message
+        position_index (int): The position of the position data (SG9) in the location object
+        interval_index (int): The position of the interval (SG10) in the position data
+    """
+
+    def __init__(self, message_index: int = 0, location_index: int = 0, position_index: int = 0,
+                 interval_index: int = 0):
+        """
+        Initialize the cursor.
+
+        Args:
+            message_index: The position of the message
+            location_index: The position of the location object in the message
+            position_index: The position of the position data in the location object
+            interval_index: The position of the interval in the position data
+        """
+        self.message_index = message_index
+        self.location_index = location_index
+        self.position_index = position_index
+        self.interval_index = interval_index
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, PageCursor) and self.as_tuple() == other.as_tuple()
+
+    def __repr__(self) -> str:
+        return f"PageCursor{self.as_tuple()}"
+
+    def as_tuple(self) -> tuple[int, int, int, int]:
+        """
+        Returns the positions of the cursor.
+
+        Returns:
+            tuple[int, int, int, int]: The message, location, position and interval index
+        """
+        return self.message_index, self.location_index, self.position_index, self.interval_index
+
+    def encode(self) -> str:
+        """
+        Encodes the cursor into an opaque URL-safe token.
+
+        Returns:
+            str: The token
+        """
+        positions = ".".join(str(position) for position in self.as_tuple())
+        return base64.urlsafe_b64encode(positions.encode("ascii")).decode("ascii").rstrip("=")
+
+    @classmethod
+    def decode(cls, token: str) -> "PageCursor":
+        """
+        Decodes a token of encode.
+
+        Args:
+            token: The token
+
+        Returns:
+            PageCursor: The cursor
+
+        Raises:
+            ValueError: If the token is no valid cursor
+        """
+        try:
+            positions = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4)).decode("ascii").split(".")
+        except (binascii.Error, UnicodeDecodeError):
+            positions = []
+        if len(positions) != 4 or not all(position.isdigit() for position in positions):
+            raise ValueError(f"Invalid cursor '{token}'")
+        return cls(*(int(position) for position in positions))
+
+
+class PageRequest:
+    """
+    A page of the messages or measurements of an interchange, selected via the query parameters page_by,
+    page_size and cursor, optionally filtered by the location ID (LOC) and, for measurement pages, the time window
+    (from, to) of the intervals.
+
+    Attributes:
+        page_by (str): 'messages' or 'measurements'
+        page_size (int): The number of messages or measurements of the page at most
+        cursor (PageCursor): The position of the first message or measurement of the page
+        location (Optional[str]): If given, only the messages or location objects (SG6) with the location ID
+        start (Optional[datetime]): If given, only the intervals ending after the timestamp
+        end (Optional[datetime]): If given, only the intervals starting before the timestamp
+    """
+
+    def __init__(
+            self,
+            page_by: str = PAGE_BY_MESSAGES,
+            page_size: int = DEFAULT_PAGE_SIZE,
+            cursor: Optional[PageCursor] = None,
+            location: Optional[str] = None,
+            start: Optional[datetime] = None,
+            end: Optional[datetime] = None,
+    ):
+        """
+        Initialize the page request.
+
+        Args:
+            page_by: 'messages' or 'measurements'
+            page_size: The number of messages or measurements of the page at most, between 1 and MAX_PAGE_SIZE
+            cursor: The position of the first message or measurement, defaults to the start of the interchange
+            location: The location ID to filter by, if any
+            start: The start of the time window of the intervals, if any
+            end: The end of the time window of the intervals, if any
+
+        Raises:
+            ValueError: If a value is invalid or the time window is given for a message page
+        """
+        if page_by not in PAGE_BY_VALUES:
+            raise ValueError(f"Query parameter '{PAGE_BY_PARAMETER}' must be one of {', '.join(PAGE_BY_VALUES)}, "
+                             f"got '{page_by}'")
+        if not 1 <= page_size <= MAX_PAGE_SIZE:
+            raise ValueError(f"Query parameter '{PAGE_SIZE_PARAMETER}' must be between 1 and {MAX_PAGE_SIZE}, "
+                             f"got {page_size}")
+        if page_by == PAGE_BY_MESSAGES and (start is not None or end is not None):
+            raise ValueError(f"Query parameters '{FROM_PARAMETER}' and '{TO_PARAMETER}' require "
+                             f"'{PAGE_BY_PARAMETER}={PAGE_BY_MEASUREMENTS}'")
+        self.page_by = page_by
+        self.page_size = page_size
+        self.cursor = cursor or PageCursor()
+        self.location = location
+        self.start = start
+        self.end = end
+
+    @classmethod
+    def from_query_params(cls, query_params) -> Optional["PageRequest"]:
+        """
+        Reads the page request from the query parameters of a request.
+
+        Args:
+            query_params: The query parameters of the request
+
+        Returns:
+            Optional[PageRequest]: The page request, or None if none of page_by, page_size and cursor is given
+
+        Raises:
+            ValueError: If a parameter is invalid
+        """
+        if not any(query_params.get(name) is not None
+                   for name in (PAGE_BY_PARAMETER, PAGE_SIZE_PARAMETER, CURSOR_PARAMETER)):
+            return None
+        page_size = query_params.get(PAGE_SIZE_PARAMETER)
+        if page_size is not None and not page_size.isdigit():
+            raise ValueError(f"Query parameter '{PAGE_SIZE_PARAMETER}' must be a positive integer, got '{page_size}'")
+        cursor = query_params.get(CURSOR_PARAMETER)
+        return cls(
+            page_by=query_params.get(PAGE_BY_PARAMETER, PAGE_BY_MESSAGES),
+            page_size=DEFAULT_PAGE_SIZE if page_size is None else int(page_size),
+            cursor=None if cursor is None else PageCursor.decode(cursor),
+            location=query_params.get(LOCATION_PARAMETER) or None,
+            start=_parse_timestamp(FROM_PARAMETER, query_params.get(FROM_PARAMETER)),
+            end=_parse_timestamp(TO_PARAMETER, query_params.get(TO_PARAMETER)),
+        )
+
+    def matches_location(self, location_object: dict) -> bool:
+        """
+        Checks the location filter of the request.
+
+        Args:
+            location_object: The JSON dump of a location object (SG6)
+
+        Returns:
+            bool: True if no location is requested or the location object has the requested location ID
+        """
+        return self.location is None or _get_location(location_object) == self.location
+
+    def matches_interval(self, interval: dict) -> bool:
+        """
+        Checks the time window of the request, an interval matches if it overlaps the window.
+
+        Args:
+            interval: The JSON dump of an interval (SG10)
+
+        Returns:
+            bool: True if no time window is requested or the interval overlaps it. An interval without the
+                start or end needed for the comparison does not match.
+        """
+        if self.start is None and self.end is None:
+            return True
+        dates = interval.get("dtm_zeitangaben")
+        if self.start is not None:
+            interval_end = _find_date(dates, _END_QUALIFIER)
+            if interval_end is None or interval_end <= self.start:
+                return False
+        if self.end is not None:
+            interval_start = _find_date(dates, _START_QUALIFIER)
+            if interval_start is None or interval_start >= self.end:
+                return False
+        return True
+
+
+class InterchangePage:
+    """
+    A page of the messages or measurements of an interchange.
+
+    Attributes:
+        page_by (str): 'messages' or 'measurements'
+        items (list[dict]): The JSON dumps of the messages, or the measurements
+        next_cursor (Optional[PageCursor]): The cursor of the next page, None if this is the last page. The next page
+            of a filtered request may be empty.
+        message_count (int): The number of messages of the interchange
+        envelope (Optional[dict]): The JSON dump of the interchange with an empty list of messages, for message
+            pages
+    """
+
+    def __init__(self, page_by: str, items: list[dict], next_cursor: Optional[PageCursor], message_count: int,
+                 envelope: Optional[dict] = None):
+        """
+        Initialize the page.
+
+        Args:
+            page_by: 'messages' or 'measurements'
+            items: The JSON dumps of the messages, or the measurements
+            next_cursor: The cursor of the next page, if any
+            message_count: The number of messages of the interchange
+            envelope: The JSON dump of the interchange with an empty list of messages, for message pages
+        """
+        self.page_by = page_by
+        self.items = items
+        self.next_cursor = next_cursor
+        self.message_count = message_count
+        self.envelope = envelope
+
+    def model_dump(self, mode: str = "json") -> dict[str, Any]:
+        """
+        Dumps the page: a message page like a whole interchange restricted to the messages of the page,
+        a measurement page as {"measurements": [...]}.
+
+        Args:
+            mode (str): Only "json" is supported, as the items are JSON dumps already
+
+        Returns:
+            dict[str, Any]: The page
+        """
+        if self.page_by == PAGE_BY_MEASUREMENTS:
+            return {_MEASUREMENTS_KEY: self.items}
+        # The messages replace the ones of the envelope, so that the keys keep the order of a whole interchange
+        content = dict(self.envelope or {})
+        content[_MESSAGES_KEY] = self.items
+        return content
+
+
+def iter_measurements(message: dict, message_index: int, page_request: PageRequest) -> Iterator[
+        tuple[PageCursor, dict]]:
+    """
+    Flattens the intervals (SG10) of a message into measurements, starting at the cursor of the page request if
+    it points into the message.
+
+    Args:
+        message: The JSON dump of the message
+        message_index: The position of the message in the interchange
+        page_request: The page request with the cursor and the filters
+
+    Yields:
+        tuple[PageCursor, dict]: The position of each matching interval and its measurement, i.e. the message
+            index and reference, the location ID, the product code (PIA, e.g. the OBIS code) and the interval
+    """
+    start = page_request.cursor.as_tuple()[1:] if page_request.cursor.message_index == message_index else (0, 0, 0)
+    message_reference = _get(message, "unh_nachrichtenkopfsegment", "nachrichten_referenznummer")
+    for location_index, location_object in enumerate(_iter_location_objects(message)):
+        if location_index < start[0] or not page_request.matches_location(location_object):
+            continue
+        location = _get_location(location_object)
+        for position_index, position in enumerate(location_object.get("sg9_positionsdaten") or ()):
+            if (location_index, position_index) < start[:2]:
+                continue
+            product_code = _get(position, "pia_produktidentifikation", "waren_leistungsnummer_identifikation",
+                                "produkt_leistungsnummer")
+            for interval_index, interval in enumerate(position.get("sg10_mengen_und_statusangaben") or ()):
+                if (location_index, position_index, interval_index) < start:
+                    continue
+                if page_request.matches_interval(interval):
+                    yield PageCursor(message_index, location_index, position_index, interval_index), {
+                        "message_index": message_index,
+                        "message_reference": message_reference,
+                        "location": location,
+                        "product_code": product_code,
+                        "interval": interval,
+                    }
+
+
+def get_page(handles: Iterable[MessageHandle], page_request: PageRequest, message_count: int,
+             envelope: Optional[dict] = None) -> InterchangePage:
+    """
+    Collects a page from the messages from the cursor of the page request on. The messages are loaded as they are
+    reached, a page of messages ends before loading the message following the page.
+
+    Args:
+        handles: The handles of the messages from the message of the cursor on, which may skip the messages
+            without the requested location ID
+        page_request: The page request
+        message_count: The number of messages of the interchange
+        envelope: The JSON dump of the interchange with an empty list of messages, for message pages
+
+    Returns:
+        InterchangePage: The page
+    """
+    items = []
+    for message_index, load in handles:
+        if page_request.page_by == PAGE_BY_MESSAGES:
+            if len(items) == page_request.page_size:
+                return InterchangePage(page_request.page_by, items, PageCursor(message_index), message_count,
+                                       envelope)
+            message = load()
+            if page_request.location is None or any(
+                    page_request.matches_location(location_object)
+                    for location_object in _iter_location_objects(message)):
+                items.append(message)
+            continue
+        for cursor, measurement in iter_measurements(load(), message_index, page_request):
+            if len(items) == page_request.page_size:
+                return InterchangePage(page_request.page_by, items, cursor, message_count)
+            items.append(measurement)
+    return InterchangePage(page_request.page_by, items, None, message_count, envelope)
+
+
+def get_interchange_page(interchange: LazyEdifactInterchange, page_request: PageRequest) -> InterchangePage:
+    """
+    Collects a page of a lazy interchange, only the messages of the page are parsed. The messages without the
+    requested location ID are skipped by searching their raw segments, without parsing them.
+
+    Args:
+        interchange: The lazy interchange
+        page_request: The page request
+
+    Returns:
+        InterchangePage: The page
+    """
+    def iter_handles() -> Iterator[MessageHandle]:
+        for message_index in range(page_request.cursor.message_index, interchange.message_count):
+            if page_request.location is None or interchange.message_contains(message_index, page_request.location):
+                yield message_index, lambda index=message_index: interchange.get_message(index).model_dump(mode="json")
+
+    envelope = interchange.model_dump(mode="json", limit=0) if page_request.page_by == PAGE_BY_MESSAGES else None
+    return get_page(iter_handles(), page_request, interchange.message_count, envelope)
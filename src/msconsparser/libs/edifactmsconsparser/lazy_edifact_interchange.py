@@ -0,0 +1,270 @@
+# coding: utf-8
+
+import copy
+import time
+from typing import Any, Iterator, Optional, Union
+
+from msconsparser.libs.edifactmsconsparser.edifact_mscons_parser import EdifactMSCONSParser
+from msconsparser.libs.edifactmsconsparser.utils.edifact_decoder import decode_edifact_bytes
+from msconsparser.libs.edifactmsconsparser.utils.segment_index import SegmentIndex
+from msconsparser.libs.edifactmsconsparser.wrappers import (
+    CancelToken, ParseBudget, ParsePhase, ParseStatistics, SegmentProfiler
+)
+from msconsparser.libs.edifactmsconsparser.wrappers.segments import (
+    CompactNode, EdifactInterchange, EdifactMSconsMessage, SegmentUNA, SegmentUNB, SegmentUNZ
+)
+from msconsparser.libs.edifactmsconsparser.wrappers.segments.constants import EdifactConstants, SegmentType
+
+_MESSAGES_KEY = "unh_unt_nachrichten"
+
+
+class LazyEdifactInterchange:
+    """
+    Interchange whose messages are parsed only when they are accessed or dumped, e.g. to return a few messages of
+    an interchange with thousands of them.
+
+    A structural pass indexes the segments of the interchange (see SegmentIndex), which gives the offsets of the
+    messages (UNH to UNT), and parses the envelope (UNA, UNB and UNZ). The reference number of a message is read
+    from its UNH segment without parsing the message. A message is parsed on first access together with the header
+    of the interchange, which is decoded again for every message, and cached. The parsed messages are the messages
+    of a whole parse.
+
+    The budget of a lazy interchange applies to the bytes of the interchange and to the segments and seconds of
+    the parses of the envelope and the accessed messages, so that the size of an interchange only costs its
+    structural pass.
+    """
+
+    def __init__(
+            self,
+            edifact_content: Union[str, bytes],
+            parser: Optional[EdifactMSCONSParser] = None,
+            compact: bool = False,
+            statistics: Optional[ParseStatistics] = None,
+            profiler: Optional[SegmentProfiler] = None,
+            budget: Optional[ParseBudget] = None,
+            cancel_token: Optional[CancelToken] = None,
+    ):
+        """
+        Initialize the interchange by indexing its segments and parsing its envelope.
+
+        Args:
+            edifact_content (Union[str, bytes]): The EDIFACT text, which is encoded as UTF-8, or its raw bytes
+            parser (Optional[EdifactMSCONSParser]): The parser of the envelope and the messages, defaults to a new
+                parser. A parser is not thread-safe, so that a lazy interchange must not be shared between threads.
+            compact (bool): If true, the envelope and the messages are built of compact nodes
+            statistics (Optional[ParseStatistics]): If given, it is filled with the duration of the structural pass
+                (tokenize phase), of the parse of the envelope (convert phase) and with the segment, message and
+                byte counts of the interchange
+            profiler (Optional[SegmentProfiler]): If given, the calls of the segment handlers and converters
+                of all parses are recorded per segment type
+            budget (Optional[ParseBudget]): If given, the interchange is rejected as soon as it exceeds the bytes
+                of the budget, or its parses exceed the segments or seconds of the budget
+            cancel_token (Optional[CancelToken]): If given, the parses are cancelled as soon as the token is tripped
+
+        Raises:
+            ParseBudgetExceededException: If the interchange exceeds the byte budget or its envelope the segment
+                budget
+        """
+        self.__buffer = edifact_content.encode("utf-8") if isinstance(edifact_content, str) else edifact_content
+        self.__parser = parser or EdifactMSCONSParser()
+        self.__compact = compact
+        self.__profiler = profiler
+        self.__budget = None if budget is None or budget.is_unlimited else budget
+        self.__cancel_token = cancel_token
+        self.__messages: dict[int, Union[EdifactMSconsMessage, CompactNode]] = {}
+
+        t_start = time.perf_counter()
+        self.__deadline = None
+        if self.__budget is not None:
+            self.__budget.check_bytes(len(self.__buffer))
+            self.__deadline = self.__budget.deadline(t_start)
+        self.__segment_index = SegmentIndex(self.__buffer)
+        self.__message_count = self.__segment_index.get_message_count()
+        t_tokenize = time.perf_counter()
+
+        header = bytes(self.__segment_index.get_header())
+        self.__header_segment_count = self.__segment_index.find(SegmentType.UNH) if self.__message_count \
+            else len(self.__segment_index)
+        self.__parsed_segment_count = 0
+        self.__check_budget(self.__header_segment_count)
+        envelope_text = decode_edifact_bytes(
+            header + bytes(self.__segment_index.get_trailer()), self.__segment_index.get_fallback_encoding()
+        )
+        self.__envelope = self.__parser.parse(
+            envelope_text, profiler=profiler, compact=compact, cancel_token=cancel_token
+        )
+
+        if statistics is not None:
+            statistics.record_phase(ParsePhase.TOKENIZE, t_tokenize - t_start)
+            statistics.record_phase(ParsePhase.CONVERT, time.perf_counter() - t_tokenize)
+            statistics.segment_count = len(self.__segment_index)
+            statistics.message_count = self.__message_count
+            if statistics.byte_count is None:
+                statistics.byte_count = len(self.__buffer)
+
+    @property
+    def una_service_string_advice(self) -> Optional[SegmentUNA]:
+        """
+        The service string advice (UNA) of the interchange, if any.
+        """
+        return self.__envelope.una_service_string_advice
+
+    @property
+    def unb_nutzdaten_kopfsegment(self) -> Optional[SegmentUNB]:
+        """
+        The interchange header (UNB).
+        """
+        return self.__envelope.unb_nutzdaten_kopfsegment
+
+    @property
+    def unz_nutzdaten_endsegment(self) -> Optional[SegmentUNZ]:
+        """
+        The interchange trailer (UNZ).
+        """
+        return self.__envelope.unz_nutzdaten_endsegment
+
+    @property
+    def message_count(self) -> int:
+        """
+        The number of messages of the interchange.
+        """
+        return self.__message_count
+
+    @property
+    def parsed_message_count(self) -> int:
+        """
+        The number of messages parsed so far.
+        """
+        return len(self.__messages)
+
+    def get_message_reference(self, message_index: int) -> Optional[str]:
+        """
+        Returns the message reference number (UNH DE0062) of a message without parsing the message.
+
+        Args:
+            message_index (int): The position of the message in the interchange, starting at 0
+
+        Returns:
+            Optional[str]: The reference number of the message, if given
+        """
+        first, _ = self.__segment_index.get_message_range(message_index)
+        una = self.una_service_string_advice
+        element_separator = una.element_separator if una is not None and una.element_separator \
+            else EdifactConstants.DEFAULT_ELEMENT_SEPARATOR
+        segment = decode_edifact_bytes(bytes(self.__segment_index.get_segment(first)))
+        elements = segment.split(element_separator)
+        return elements[1] if len(elements) > 1 and elements[1] else None
+
+    def message_contains(self, message_index: int, value: str) -> bool:
+        """
+        Checks if the raw segments of a message contain a value without parsing the message, e.g. to skip the
+        messages without a location ID. The value is escaped with the release character of the interchange first.
+
+        Args:
+            message_index (int): The position of the message in the interchange, starting at 0
+            value (str): The unescaped value, e.g. the location ID 'DE0001234567890000000000000000001'
+
+        Returns:
+            bool: True if the message contains the value in UTF-8 or in the fallback encoding of the interchange
+        """
+        first, last = self.__segment_index.get_message_range(message_index)
+        escaped_value = self.__escape(value)
+        for encoding in ("utf-8", self.__segment_index.get_fallback_encoding()):
+            try:
+                encoded_value = escaped_value.encode(encoding)
+            except UnicodeEncodeError:
+                continue
+            if self.__segment_index.contains(encoded_value, first, last):
+                return True
+        return False
+
+    def get_message(self, message_index: int) -> Union[EdifactMSconsMessage, CompactNode]:
+        """
+        Returns a message of the interchange, which is parsed on first access.
+
+        Args:
+            message_index (int): The position of the message in the interchange, starting at 0, negative
+                positions count from the end
+
+        Returns:
+            Union[EdifactMSconsMessage, CompactNode]: The parsed message
+
+        Raises:
+            IndexError: If the interchange has no message at the position
+            ParseBudgetExceededException: If the parse of the message exceeds the segment or seconds budget
+            CONTRLException: If a segment of the message is invalid
+        """
+        first, last = self.__segment_index.get_message_range(message_index)
+        message_index %= self.__message_count
+        message = self.__messages.get(message_index)
+        if message is None:
+            self.__check_budget(self.__header_segment_count + last - first + 1)
+            message = self.__parser.reparse_message(
+                self.__segment_index, message_index, profiler=self.__profiler, compact=self.__compact,
+                cancel_token=self.__cancel_token,
+            )
+            self.__messages[message_index] = message
+        return message
+
+    def iter_messages(self, offset: int = 0, limit: Optional[int] = None) -> Iterator[
+            Union[EdifactMSconsMessage, CompactNode]]:
+        """
+        Iterates a range of the messages, which are parsed as they are reached.
+
+        Args:
+            offset (int): The position of the first message, starting at 0
+            limit (Optional[int]): The number of messages at most, defaults to all messages from the offset on
+
+        Yields:
+            Union[EdifactMSconsMessage, CompactNode]: The parsed messages
+        """
+        stop = self.message_count if limit is None else min(self.message_count, offset + limit)
+        for message_index in range(offset, stop):
+            yield self.get_message(message_index)
+
+    def model_dump(self, mode: str = "python", offset: int = 0, limit: Optional[int] = None) -> dict[str, Any]:
+        """
+        Dumps the interchange like the dump of a whole parse, restricted to a range of its messages.
+
+        Args:
+            mode (str): "python" or "json", see the model_dump of the pydantic models
+            offset (int): The position of the first dumped message, starting at 0
+            limit (Optional[int]): The number of dumped messages at most, defaults to all messages from the offset on
+
+        Returns:
+            dict[str, Any]: The envelope with the selected messages
+        """
+        content = self.__envelope.model_dump(mode=mode)
+        content[_MESSAGES_KEY] = [message.model_dump(mode=mode) for message in self.iter_messages(offset, limit)]
+        return content
+
+    def to_interchange(self) -> Union[EdifactInterchange, CompactNode]:
+        """
+        Parses all messages and returns the interchange of a whole parse.
+
+        Returns:
+            Union[EdifactInterchange, CompactNode]: The interchange with all its messages
+        """
+        interchange = copy.copy(self.__envelope)
+        interchange.unh_unt_nachrichten = list(self.iter_messages())
+        return interchange
+
+    def __escape(self, value: str) -> str:
+        una = self.una_service_string_advice
+        release_character = una.release_character if una is not None and una.release_character \
+            else EdifactConstants.DEFAULT_RELEASE_INDICATOR
+        service_characters = {release_character}
+        for name, default in (
+                ("component_separator", EdifactConstants.DEFAULT_COMPONENT_SEPARATOR),
+                ("element_separator", EdifactConstants.DEFAULT_ELEMENT_SEPARATOR),
+                ("segment_terminator", EdifactConstants.DEFAULT_SEGMENT_TERMINATOR),
+        ):
+            service_characters.add(getattr(una, name, None) or default)
+        return "".join(release_character + char if char in service_characters else char for char in value)
+
+    def __check_budget(self, segment_count: int) -> None:
+        if self.__budget is None:
+            return
+        self.__parsed_segment_count += segment_count
+        self.__budget.check_segments(self.__parsed_segment_count)
+        self.__budget.check_deadline(self.__deadline)
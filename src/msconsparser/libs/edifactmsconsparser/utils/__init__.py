@@ -2,4 +2,12 @@
 """
 Package for utility classes.
 """
-from msconsparser.libs.edifactmsconsparser.utils.edifact_syntax_helper import EdifactSyntaxHelper
\ No newline at end of file
+from msconsparser.libs.edifactmsconsparser.utils.archive_reader import (
+    count_archive_members, detect_archive_format, iter_archive_members
+)
+from msconsparser.libs.edifactmsconsparser.utils.edifact_decoder import (
+    decode_edifact_bytes, get_fallback_encoding, iter_decoded_text
+)
+from msconsparser.libs.edifactmsconsparser.utils.edifact_syntax_helper import EdifactSyntaxHelper
+from msconsparser.libs.edifactmsconsparser.utils.segment_index import SEGMENT_TAGS, SegmentIndex
+from msconsparser.libs.edifactmsconsparser.utils.segment_tag_matcher import SegmentTagMatcher
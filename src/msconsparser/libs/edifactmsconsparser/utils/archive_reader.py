@@ -0,0 +1,216 @@
+# coding: utf-8
+
+import gzip
+import io
+import shutil
+import tarfile
+import tempfile
+import zipfile
+import zlib
+from typing import BinaryIO, Iterator, Optional, Union
+
+from msconsparser.libs.edifactmsconsparser.exceptions import ArchiveReadException
+
+ZIP_MAGIC = b"PK\x03\x04"
+EMPTY_ZIP_MAGIC = b"PK\x05\x06"
+GZIP_MAGIC = b"\x1f\x8b"
+TAR_MAGIC = b"ustar"
+TAR_MAGIC_OFFSET = 257
+# The number of bytes read ahead to detect the format of a file, i.e. the size of a tar header
+PEEK_SIZE = 512
+# The size up to which a zip archive read from a stream is spooled in memory instead of a temporary file
+SPOOL_MAX_MEMORY_SIZE = 16 * 1024 * 1024
+
+ZIP_FORMAT = "zip"
+TAR_FORMAT = "tar"
+GZIP_FORMAT = "gzip"
+
+ArchiveMember = tuple[str, Union[BinaryIO, Exception]]
+
+# The errors of a corrupt archive or compressed stream
+_READ_ERRORS = (
+    zipfile.BadZipFile, tarfile.TarError, gzip.BadGzipFile, zlib.error, EOFError, OSError, RuntimeError,
+    NotImplementedError,
+)
+
+
+class _PrefixedReader(io.RawIOBase):
+    """
+    Binary stream returning the bytes read ahead to detect the format before the rest of the underlying stream.
+    """
+
+    def __init__(self, prefix: bytes, stream: BinaryIO):
+        super().__init__()
+        self.__prefix = memoryview(prefix)
+        self.__stream = stream
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        if self.__prefix:
+            size = min(len(buffer), len(self.__prefix))
+            buffer[:size] = self.__prefix[:size]
+            self.__prefix = self.__prefix[size:]
+            return size
+        data = self.__stream.read(len(buffer))
+        buffer[:len(data)] = data
+        return len(data)
+
+
+def _peek(stream: BinaryIO) -> tuple[bytes, BinaryIO]:
+    head = b""
+    while len(head) < PEEK_SIZE:
+        data = stream.read(PEEK_SIZE - len(head))
+        if not data:
+            break
+        head += data
+    return head, io.BufferedReader(_PrefixedReader(head, stream))
+
+
+def _is_tar(head: bytes) -> bool:
+    return head[TAR_MAGIC_OFFSET:TAR_MAGIC_OFFSET + len(TAR_MAGIC)] == TAR_MAGIC
+
+
+def _remove_suffix(name: str, suffix: str) -> str:
+    return name[:-len(suffix)] if name.lower().endswith(suffix) else name
+
+
+def _iter_zip_members(fileobj: BinaryIO) -> Iterator[ArchiveMember]:
+    try:
+        archive = zipfile.ZipFile(fileobj)
+    except zipfile.BadZipFile as ex:
+        raise ArchiveReadException(str(ex)) from ex
+    with archive:
+        for member in archive.infolist():
+            if member.is_dir():
+                continue
+            try:
+                member_file = archive.open(member)
+            except _READ_ERRORS as ex:
+                yield member.filename, ex
+                continue
+            with member_file:
+                yield member.filename, member_file
+
+
+def _iter_tar_members(stream: BinaryIO, name: str) -> Iterator[ArchiveMember]:
+    try:
+        archive = tarfile.open(fileobj=stream, mode="r|")
+    except _READ_ERRORS as ex:
+        raise ArchiveReadException(str(ex)) from ex
+    with archive:
+        member_name = name
+        try:
+            for member in archive:
+                if not member.isfile():
+                    continue
+                member_name = member.name
+                yield member_name, archive.extractfile(member)
+        except _READ_ERRORS as ex:
+            # A stream cannot be resynchronized, the members after a corrupt one are lost
+            yield member_name, ArchiveReadException(str(ex))
+
+
+def iter_archive_members(fileobj: BinaryIO, name: str = "") -> Iterator[ArchiveMember]:
+    """
+    Reads the files of a zip, tar or tar.gz archive member by member, without extracting them, a gzip compressed
+    file is decompressed on the fly, any other file is returned as its own single member.
+
+    The format is detected by the content of the file, not by its name. Tar archives are read as a stream, so that
+    the members have to be read in order: a member stream is only valid until the next member is requested. Zip
+    archives need random access, a zip archive read from a stream which is not seekable is spooled first.
+
+    Args:
+        fileobj: The binary stream of the file
+        name: The name of the file, which names a file which is no archive
+
+    Yields:
+        tuple[str, Union[BinaryIO, Exception]]: The name of each file and its stream, or the exception raised while
+            opening or reading it, directories are skipped
+
+    Raises:
+        ArchiveReadException: If the file looks like an archive, which cannot be opened
+    """
+    seekable = fileobj.seekable()
+    start = fileobj.tell() if seekable else 0
+    head, stream = _peek(fileobj)
+
+    if head.startswith((ZIP_MAGIC, EMPTY_ZIP_MAGIC)):
+        if seekable:
+            fileobj.seek(start)
+            yield from _iter_zip_members(fileobj)
+            return
+        with tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_MEMORY_SIZE) as spool:
+            shutil.copyfileobj(stream, spool)
+            spool.seek(0)
+            yield from _iter_zip_members(spool)
+        return
+
+    if head.startswith(GZIP_MAGIC):
+        decompressed = gzip.GzipFile(fileobj=stream, mode="rb")
+        try:
+            head, stream = _peek(decompressed)
+        except _READ_ERRORS as ex:
+            raise ArchiveReadException(str(ex)) from ex
+        if not _is_tar(head):
+            yield _remove_suffix(name, ".gz"), stream
+            return
+
+    if _is_tar(head):
+        yield from _iter_tar_members(stream, name)
+        return
+
+    yield name, stream
+
+
+def detect_archive_format(fileobj: BinaryIO) -> Optional[str]:
+    """
+    Detects the format of an archive by its content.
+
+    Args:
+        fileobj: The seekable binary stream of the file, which is read from its current position and reset to it
+
+    Returns:
+        Optional[str]: ZIP_FORMAT, TAR_FORMAT or GZIP_FORMAT (a gzip compressed tar archive or file), or None for
+            a file which is no archive
+    """
+    start = fileobj.tell()
+    head = fileobj.read(PEEK_SIZE)
+    fileobj.seek(start)
+    if head.startswith((ZIP_MAGIC, EMPTY_ZIP_MAGIC)):
+        return ZIP_FORMAT
+    if head.startswith(GZIP_MAGIC):
+        return GZIP_FORMAT
+    if _is_tar(head):
+        return TAR_FORMAT
+    return None
+
+
+def count_archive_members(fileobj: BinaryIO) -> Optional[int]:
+    """
+    Counts the files of an archive, as far as this is possible without reading the archive.
+
+    Args:
+        fileobj: The seekable binary stream of the file, which is read from its current position and reset to it
+
+    Returns:
+        Optional[int]: The number of files of a zip archive, 1 for a file which is no archive, or None for
+            a tar archive or a gzip compressed file, whose files are only known once the file is read
+
+    Raises:
+        ArchiveReadException: If the zip archive cannot be opened
+    """
+    archive_format = detect_archive_format(fileobj)
+    if archive_format is None:
+        return 1
+    if archive_format != ZIP_FORMAT:
+        return None
+    start = fileobj.tell()
+    try:
+        with zipfile.ZipFile(fileobj) as archive:
+            return sum(not member.is_dir() for member in archive.infolist())
+    except zipfile.BadZipFile as ex:
+        raise ArchiveReadException(str(ex)) from ex
+    finally:
+        fileobj.seek(start)
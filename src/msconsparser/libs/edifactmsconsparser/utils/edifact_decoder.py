@@ -0,0 +1,112 @@
+# coding: utf-8
+
+import codecs
+import re
+from typing import BinaryIO, Iterator, Optional
+
+from msconsparser.libs.edifactmsconsparser.wrappers import ParseBudget
+
+# The size of the blocks read from a stream by iter_decoded_text
+DEFAULT_BLOCK_SIZE = 64 * 1024
+
+# The encoding of the EDIFACT files which are no valid UTF-8 and do not declare another character set
+DEFAULT_FALLBACK_ENCODING = "iso-8859-1"
+
+# The single-byte encodings of the syntax identifiers (UNB DE0001) of the character repertoires C to K. The
+# repertoires A and B are subsets of ASCII, UNOW and UNOY are UTF-8, so that they keep the default fallback.
+SYNTAX_IDENTIFIER_ENCODINGS = {
+    "UNOC": "iso-8859-1",
+    "UNOD": "iso-8859-2",
+    "UNOE": "iso-8859-5",
+    "UNOF": "iso-8859-7",
+    "UNOG": "iso-8859-3",
+    "UNOH": "iso-8859-4",
+    "UNOI": "iso-8859-6",
+    "UNOJ": "iso-8859-8",
+    "UNOK": "iso-8859-9",
+}
+
+# The syntax identifier of the UNB segment, with any element separator
+_SYNTAX_IDENTIFIER_PATTERN = re.compile(rb"UNB[^A-Z0-9](UNO[A-Z])")
+
+
+def decode_edifact_bytes(content: bytes, fallback_encoding: str = DEFAULT_FALLBACK_ENCODING) -> str:
+    """
+    Decodes the bytes of an EDIFACT file, attempting UTF-8 first and falling back to ISO-8859-1 (Latin-1),
+    which is a common encoding for EDIFACT files and can handle all byte values from 0x00 to 0xFF.
+
+    Args:
+        content: The bytes of the file
+        fallback_encoding: The single-byte encoding of bytes which are no valid UTF-8, e.g. the encoding of the
+            syntax identifier of the file (see get_fallback_encoding)
+
+    Returns:
+        str: The decoded EDIFACT text
+    """
+    try:
+        return content.decode("utf-8")
+    except UnicodeDecodeError:
+        return content.decode(fallback_encoding)
+
+
+def get_fallback_encoding(content) -> str:
+    """
+    Chooses the fallback encoding of decode_edifact_bytes by the syntax identifier of the UNB segment, e.g. UNOC
+    for ISO-8859-1 or UNOE for ISO-8859-5 (Cyrillic).
+
+    Args:
+        content: The bytes of the file, or any bytes-like object supporting regular expressions, e.g. a memory-mapped
+            file, which is searched for the first UNB segment only
+
+    Returns:
+        str: The single-byte encoding of the syntax identifier, DEFAULT_FALLBACK_ENCODING for a file without UNB
+            segment or with an identifier of an ASCII or UTF-8 repertoire
+    """
+    match = _SYNTAX_IDENTIFIER_PATTERN.search(content)
+    if match is None:
+        return DEFAULT_FALLBACK_ENCODING
+    return SYNTAX_IDENTIFIER_ENCODINGS.get(match.group(1).decode("ascii"), DEFAULT_FALLBACK_ENCODING)
+
+
+def iter_decoded_text(
+        stream: BinaryIO,
+        block_size: int = DEFAULT_BLOCK_SIZE,
+        budget: Optional[ParseBudget] = None,
+) -> Iterator[str]:
+    """
+    Decodes an EDIFACT stream block by block, so that it is split into messages without reading it completely.
+
+    Like decode_edifact_bytes, UTF-8 is attempted first. Since the blocks already returned cannot be decoded
+    again, the stream falls back to ISO-8859-1 from the block with the first invalid UTF-8 sequence on. Both
+    decodings agree on ASCII, which EDIFACT files mostly are.
+
+    Args:
+        stream: The binary stream of the file, e.g. a member of an archive
+        block_size: The number of bytes read at a time
+        budget: The budget of the parse of the file, if any. Its byte limit is checked while reading, so that
+            e.g. a highly compressed member of an archive is not decompressed beyond it.
+
+    Yields:
+        str: The decoded text of each block, empty blocks are skipped
+
+    Raises:
+        ParseBudgetExceededException: If the stream exceeds the byte budget
+    """
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    byte_count = 0
+    while True:
+        block = stream.read(block_size)
+        byte_count += len(block)
+        if budget is not None:
+            budget.check_bytes(byte_count)
+        try:
+            text = decoder.decode(block, final=not block)
+        except UnicodeDecodeError:
+            # The bytes of an incomplete UTF-8 sequence at the end of the previous block are decoded as well
+            pending, _ = decoder.getstate()
+            decoder = codecs.getincrementaldecoder("iso-8859-1")()
+            text = decoder.decode(pending + block, final=not block)
+        if text:
+            yield text
+        if not block:
+            return
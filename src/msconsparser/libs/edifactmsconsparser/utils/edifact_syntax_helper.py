@@ -1,11 +1,13 @@
 # coding: utf-8
 
 import logging
-from typing import Optional
+from typing import Callable, Iterable, Iterator, Optional, Union
 
 from msconsparser.libs.edifactmsconsparser.wrappers import ParsingContext
 from msconsparser.libs.edifactmsconsparser.wrappers.segments.constants import EdifactConstants
 from msconsparser.libs.edifactmsconsparser.exceptions.parser_exceptions import MSCONSParserException
+from msconsparser.libs.edifactmsconsparser.utils.edifact_decoder import decode_edifact_bytes
+from msconsparser.libs.edifactmsconsparser.utils.segment_tag_matcher import SegmentTagMatcher
 
 
 logger = logging.getLogger(__name__)
@@ -174,6 +176,73 @@ class EdifactSyntaxHelper:
         """
         return string_content.split(EdifactSyntaxHelper.get_segment_terminator(context))
 
+    @staticmethod
+    def iter_segments(
+            buffer,
+            context: ParsingContext = None,
+            decode: Callable[[bytes], str] = decode_edifact_bytes,
+    ) -> Iterator[str]:
+        """
+        Splits the bytes of an interchange into segments like split_segments, one segment at a time, so that
+        only the segment being converted is decoded and held as string.
+
+        The segment terminator is searched in the encoded bytes, which is safe for the single-byte encodings and
+        for UTF-8, whose multibyte sequences never contain an ASCII byte.
+
+        Args:
+            buffer: The bytes-like input supporting find and slicing, e.g. a memory-mapped file.
+            context: The context containing the segment terminator, if any.
+            decode: The function decoding the bytes of a segment.
+
+        Yields:
+            The decoded segments, the same as split_segments of the decoded input.
+        """
+        segment_terminator = EdifactSyntaxHelper.get_segment_terminator(context).encode("utf-8")
+        start = 0
+        while True:
+            end = buffer.find(segment_terminator, start)
+            if end < 0:
+                yield decode(buffer[start:])
+                return
+            yield decode(buffer[start:end])
+            start = end + len(segment_terminator)
+
+    @staticmethod
+    def count_segments(string_content: str, context: ParsingContext = None, limit: Optional[int] = None) -> int:
+        """
+        Counts the segments of a string without splitting it, i.e. the segment terminators and
+        a trailing segment without terminator, if any.
+
+        If a limit is given, the scan stops at the first segment beyond the limit, so that the size of an
+        oversized text does not matter.
+
+        Args:
+            string_content: The input string to count the segments of.
+            context: The context containing the segment terminator, if any.
+            limit: The number of segments to count at most, the count exceeds it by one if the string has
+                more segments. Defaults to counting all segments.
+
+        Returns:
+            The number of segments, at most limit + 1 if a limit is given.
+        """
+        segment_terminator = EdifactSyntaxHelper.get_segment_terminator(context)
+        if limit is None:
+            count = string_content.count(segment_terminator)
+            last_terminator = string_content.rfind(segment_terminator)
+        else:
+            count = 0
+            last_terminator = -1
+            position = string_content.find(segment_terminator)
+            while position >= 0:
+                count += 1
+                if count > limit:
+                    return count
+                last_terminator = position
+                position = string_content.find(segment_terminator, position + 1)
+        if string_content[last_terminator + 1:].strip():
+            count += 1
+        return count
+
     @staticmethod
     def split_components(string_content: str, context: ParsingContext = None) -> list[str]:
         """
@@ -215,7 +284,7 @@ class EdifactSyntaxHelper:
     @staticmethod
     def remove_invalid_prefix_from_segment_data(
             string_content: str,
-            segment_types: Optional[list[str]],
+            segment_types: Optional[Union[SegmentTagMatcher, Iterable[str]]],
             context: ParsingContext,
     ) -> str:
         """
@@ -226,9 +295,11 @@ class EdifactSyntaxHelper:
         that appears before a valid segment type.
 
         The method works by:
-        1. First checking if the string starts with any valid segment type (using the faster startswith method)
-        2. If no segment type is found at the beginning, it searches for segment types anywhere in the string
-        3. If a segment type is found, it removes everything before that segment type
+        1. First checking if the string starts with a valid segment type (a single set lookup)
+        2. If no segment type is found at the beginning, it searches for the first segment type in the string
+           in a single pass (see SegmentTagMatcher)
+        3. If a segment type is found, it removes everything before that segment type and counts the
+           recovered prefix in the parsing context
         4. If no segment type is found, it returns the original string
 
         Examples:
@@ -239,31 +310,30 @@ class EdifactSyntaxHelper:
 
         Args:
             string_content: The input string that may contain an invalid prefix.
-            segment_types: A list of valid segment types. Must not be None, or an exception will be raised.
-            context: The parsing context to retrieve.
+            segment_types: The matcher of the valid segment types (preferred, as it is built once), or the
+                valid segment types. Must not be None nor empty, or an exception will be raised.
+            context: The parsing context counting the recovered prefixes.
 
         Returns:
             The string with the invalid prefix is removed, if present.
 
         Raises:
-            MSCONSParserException: If segment_types is None.
+            MSCONSParserException: If segment_types is None or empty.
         """
-        if segment_types is None or len(segment_types) == 0:
+        if isinstance(segment_types, SegmentTagMatcher):
+            matcher = segment_types
+        elif not segment_types:
             raise MSCONSParserException("Segment types must not be None nor empty")
+        else:
+            matcher = SegmentTagMatcher.for_segment_types(tuple(segment_types))
 
-        if not string_content:
+        if not string_content or matcher.starts_with_tag(string_content):
             return string_content
 
-        for segment_type in segment_types:
-            if string_content.startswith(segment_type):
-                return string_content
-
-        for segment_type in segment_types:
-            index = string_content.find(segment_type)
-            if index > 0:
-                line_number = context.segment_count
-                logger.warning(f"L{line_number} -> Removing invalid prefix from segment data '{string_content[:index]}' from '{string_content}'")
-                return string_content[index:]
+        index = matcher.find_tag(string_content)
+        if index > 0:
+            context.recovered_prefix_count += 1
+            return string_content[index:]
 
         return string_content
 
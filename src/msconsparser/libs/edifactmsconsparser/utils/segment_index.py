@@ -0,0 +1,269 @@
+# coding: utf-8
+
+import re
+from array import array
+from typing import Iterator, Optional
+
+from msconsparser.libs.edifactmsconsparser.utils.edifact_decoder import get_fallback_encoding
+from msconsparser.libs.edifactmsconsparser.wrappers.segments.constants import EdifactConstants, SegmentType
+
+# The tags of the segment types by their codes in SegmentIndex.tag_codes, 0 stands for an unknown or empty segment
+SEGMENT_TAGS: tuple[str, ...] = ("",) + tuple(segment_type.value for segment_type in SegmentType)
+UNKNOWN_TAG_CODE = 0
+
+_TAG_CODES = {tag: code for code, tag in enumerate(SEGMENT_TAGS) if tag}
+_ENCODED_TAG_CODES = {tag.encode("ascii"): code for tag, code in _TAG_CODES.items()}
+_TAG_LENGTH = 3
+_UNA_TAG = SegmentType.UNA.value.encode("ascii")
+# The ASCII characters str.strip removes from a segment, i.e. the whitespace of str.isspace including \x1c to \x1f
+_WHITESPACE = bytes(code for code in range(128) if chr(code).isspace())
+
+
+class SegmentIndex:
+    """
+    Compact index of the segments of an interchange, built in one scan over its bytes without creating a string per
+    segment: the byte offsets of the start and the end of every segment in an array('Q') and the code of its tag in
+    a bytearray, i.e. 17 bytes per segment.
+
+    The segments are split like the parser does (see EdifactSyntaxHelper.split_segments), so that the segment at
+    position i is the segment with the line number i + 1 of a parse, e.g. of a CONTRL error. The offsets exclude
+    the segment terminator and the surrounding whitespace. Segments and messages are sliced from the input on
+    demand as memoryview, the input must thus not be changed or closed while they are in use.
+    """
+
+    def __init__(self, buffer, segment_terminator: Optional[bytes] = None, limit: Optional[int] = None):
+        """
+        Initialize the index by scanning the input.
+
+        Args:
+            buffer: The bytes of the interchange, or any bytes-like object supporting find and the buffer protocol,
+                e.g. a memory-mapped file
+            segment_terminator (Optional[bytes]): The segment terminator, defaults to the one of the UNA segment at
+                the start of the input or to the default segment terminator
+            limit (Optional[int]): The number of segments to index at most, e.g. to locate a single segment
+                near the start of a large input
+        """
+        self.__buffer = buffer
+        self.__segment_terminator = segment_terminator or self.__detect_segment_terminator(buffer)
+        self.__offsets = array("Q")
+        self.__tag_codes = bytearray()
+        # The positions of the first and the last segment of every message, collected on first use
+        self.__message_ranges: Optional[array] = None
+        self.__scan(limit)
+
+    @staticmethod
+    def __detect_segment_terminator(buffer) -> bytes:
+        head = bytes(buffer[:EdifactConstants.UNA_SEGMENT_MAX_LENGTH + 1]).lstrip()
+        if head.startswith(_UNA_TAG) and len(head) >= EdifactConstants.UNA_SEGMENT_MAX_LENGTH:
+            return head[EdifactConstants.UNA_SEGMENT_MAX_LENGTH - 1:EdifactConstants.UNA_SEGMENT_MAX_LENGTH]
+        return EdifactConstants.DEFAULT_SEGMENT_TERMINATOR.encode("ascii")
+
+    def __scan(self, limit: Optional[int]) -> None:
+        buffer = self.__buffer
+        size = len(buffer)
+        segment_terminator = re.escape(self.__segment_terminator)
+        # The whitespace stripped from a segment never includes its terminator, e.g. a newline, so that blank
+        # segments between two terminators are kept like split_segments does
+        whitespace = b"[" + re.escape(_WHITESPACE.replace(self.__segment_terminator, b"")) + b"]*"
+        # The segment without the surrounding whitespace and its terminator, or the end of the input
+        pattern = re.compile(whitespace + rb"([^" + segment_terminator + rb"]*?)" + whitespace
+                             + rb"(" + segment_terminator + rb"|\Z)")
+        for match in pattern.finditer(buffer):
+            start, end = match.span(1)
+            self.__offsets.append(start)
+            self.__offsets.append(end)
+            self.__tag_codes.append(_ENCODED_TAG_CODES.get(bytes(buffer[start:start + _TAG_LENGTH]), UNKNOWN_TAG_CODE))
+            if match.start(2) == size or len(self.__tag_codes) == limit:
+                return
+
+    def __len__(self) -> int:
+        return len(self.__tag_codes)
+
+    @property
+    def segment_terminator(self) -> bytes:
+        """
+        The segment terminator the input was split at.
+        """
+        return self.__segment_terminator
+
+    @property
+    def tag_codes(self) -> bytearray:
+        """
+        The codes of the tags of the segments, see SEGMENT_TAGS.
+        """
+        return self.__tag_codes
+
+    def get_offsets(self, position: int) -> tuple[int, int]:
+        """
+        Returns the byte offsets of a segment.
+
+        Args:
+            position: The position of the segment, i.e. its line number - 1
+
+        Returns:
+            tuple[int, int]: The offset of the first byte of the segment and the offset after its last byte,
+                without the segment terminator and the surrounding whitespace
+        """
+        if not 0 <= position < len(self):
+            raise IndexError(f"Segment position {position} out of range")
+        return self.__offsets[2 * position], self.__offsets[2 * position + 1]
+
+    def get_tag(self, position: int) -> str:
+        """
+        Returns the tag of a segment.
+
+        Args:
+            position: The position of the segment
+
+        Returns:
+            str: The segment type, or an empty string for an unknown or empty segment
+        """
+        return SEGMENT_TAGS[self.__tag_codes[position]]
+
+    def get_segment(self, position: int) -> memoryview:
+        """
+        Slices a segment from the input without copying it.
+
+        Args:
+            position: The position of the segment
+
+        Returns:
+            memoryview: The bytes of the segment without the segment terminator
+        """
+        start, end = self.get_offsets(position)
+        return memoryview(self.__buffer)[start:end]
+
+    def find(self, tag: str, start: int = 0) -> int:
+        """
+        Finds the next segment of a segment type.
+
+        Args:
+            tag: The segment type, e.g. 'UNH'
+            start: The position to search from
+
+        Returns:
+            int: The position of the segment, or -1 if there is none
+        """
+        return self.__find(tag, start, len(self))
+
+    def __find(self, tag: str, start: int, end: int) -> int:
+        code = _TAG_CODES.get(tag)
+        if code is None:
+            raise ValueError(f"Unknown segment type '{tag}'")
+        return self.__tag_codes.find(code, start, end)
+
+    def iter_message_ranges(self) -> Iterator[tuple[int, int]]:
+        """
+        Iterates the messages (UNH to UNT) of the interchange.
+
+        Yields:
+            tuple[int, int]: The positions of the first and of the last segment of each message. A message
+                without UNT segment ends before the next UNH or UNZ segment.
+        """
+        unh = self.find(SegmentType.UNH)
+        while unh >= 0:
+            next_unh = self.find(SegmentType.UNH, unh + 1)
+            stop = len(self) if next_unh < 0 else next_unh
+            unt = self.__find(SegmentType.UNT, unh + 1, stop)
+            if unt < 0:
+                unz = self.__find(SegmentType.UNZ, unh + 1, stop)
+                unt = (stop if unz < 0 else unz) - 1
+            yield unh, unt
+            unh = next_unh
+
+    def get_message_count(self) -> int:
+        """
+        Returns the number of messages of the interchange.
+
+        Returns:
+            int: The number of UNH segments
+        """
+        return self.__tag_codes.count(_TAG_CODES[SegmentType.UNH])
+
+    def get_message_range(self, message_index: int) -> tuple[int, int]:
+        """
+        Returns the segments of a message, see iter_message_ranges.
+
+        Args:
+            message_index: The position of the message in the interchange, starting at 0, negative positions
+                count from the end
+
+        Returns:
+            tuple[int, int]: The positions of the first and of the last segment of the message
+
+        Raises:
+            IndexError: If the interchange has no message at the position
+        """
+        if self.__message_ranges is None:
+            self.__message_ranges = array("Q")
+            for message_range in self.iter_message_ranges():
+                self.__message_ranges.extend(message_range)
+        message_count = len(self.__message_ranges) // 2
+        if not -message_count <= message_index < message_count:
+            raise IndexError(f"Message index {message_index} out of range")
+        message_index %= message_count
+        return self.__message_ranges[2 * message_index], self.__message_ranges[2 * message_index + 1]
+
+    def get_header(self) -> memoryview:
+        """
+        Slices the header of the interchange (UNA and UNB), i.e. the input before its first message.
+
+        Returns:
+            memoryview: The bytes before the first UNH segment, the whole input if it has no message
+        """
+        unh = self.find(SegmentType.UNH)
+        end = len(self.__buffer) if unh < 0 else self.get_offsets(unh)[0]
+        return memoryview(self.__buffer)[:end]
+
+    def get_trailer(self) -> memoryview:
+        """
+        Slices the trailer of the interchange (UNZ), i.e. the input after its last message.
+
+        Returns:
+            memoryview: The bytes after the segment terminator of the last message, empty if it has no message
+        """
+        if self.get_message_count() == 0:
+            return memoryview(self.__buffer)[len(self.__buffer):]
+        return memoryview(self.__buffer)[self.__get_message_end(self.get_message_range(-1)[1]):]
+
+    def get_message(self, first: int, last: int) -> memoryview:
+        """
+        Slices the segments of a message from the input without copying them.
+
+        Args:
+            first: The position of the first segment (UNH), see iter_message_ranges
+            last: The position of the last segment (UNT)
+
+        Returns:
+            memoryview: The bytes of the segments including the segment terminator of the last one, if any
+        """
+        return memoryview(self.__buffer)[self.get_offsets(first)[0]:self.__get_message_end(last)]
+
+    def contains(self, value: bytes, first: int, last: int) -> bool:
+        """
+        Searches the bytes of a range of segments without copying them, e.g. to skip a message without parsing it.
+
+        Args:
+            value: The bytes to search, e.g. an encoded and escaped location ID
+            first: The position of the first searched segment
+            last: The position of the last searched segment
+
+        Returns:
+            bool: True if the segments contain the bytes
+        """
+        return self.__buffer.find(value, self.get_offsets(first)[0], self.get_offsets(last)[1]) >= 0
+
+    def __get_message_end(self, last: int) -> int:
+        end = self.get_offsets(last)[1]
+        # Only whitespace is between the end of a segment and its terminator, the last segment may have none
+        terminator = self.__buffer.find(self.__segment_terminator, end)
+        return end if terminator < 0 else terminator + len(self.__segment_terminator)
+
+    def get_fallback_encoding(self) -> str:
+        """
+        Returns the encoding of the bytes of the input which are no valid UTF-8, see get_fallback_encoding.
+
+        Returns:
+            str: The encoding of the syntax identifier of the header
+        """
+        return get_fallback_encoding(bytes(self.get_header()))
@@ -0,0 +1,94 @@
+# coding: utf-8
+
+import re
+from functools import lru_cache
+from typing import Iterable, Optional
+
+from msconsparser.libs.edifactmsconsparser.exceptions.parser_exceptions import MSCONSParserException
+from msconsparser.libs.edifactmsconsparser.wrappers.segments.constants import SegmentType
+
+
+class SegmentTagMatcher:
+    """
+    Recognizer of the segment tags (segment types) at the start of the segments, built once per set of tags.
+
+    A clean segment is recognized by a single set lookup of its first characters. Only a segment that does
+    not start with a tag is searched for the first tag in a single pass of a compiled alternation of all tags,
+    instead of searching for every tag one by one.
+
+    Attributes:
+        segment_types (frozenset[str]): The recognized segment tags
+    """
+
+    def __init__(self, segment_types: Optional[Iterable[str]]):
+        """
+        Initialize the matcher with the segment tags.
+
+        Args:
+            segment_types: The segment tags, e.g. "UNB" or "QTY"
+
+        Raises:
+            MSCONSParserException: If no segment tags are given
+        """
+        self.segment_types = frozenset(segment_types or ())
+        if not self.segment_types:
+            raise MSCONSParserException("Segment types must not be None nor empty")
+        # The tag lengths, as only the tags of the same length as the start of a segment can match it
+        self.__tag_lengths = tuple(sorted({len(segment_type) for segment_type in self.segment_types}))
+        # Longer tags first, so that a tag is preferred over a shorter tag at the same position
+        self.__pattern = re.compile("|".join(
+            re.escape(segment_type) for segment_type in sorted(self.segment_types, key=len, reverse=True)
+        ))
+
+    def starts_with_tag(self, string_content: str) -> bool:
+        """
+        Checks if the string starts with a segment tag.
+
+        Args:
+            string_content: The segment data
+
+        Returns:
+            bool: True if the string starts with one of the segment tags, False otherwise
+        """
+        segment_types = self.segment_types
+        for tag_length in self.__tag_lengths:
+            if string_content[:tag_length] in segment_types:
+                return True
+        return False
+
+    def find_tag(self, string_content: str) -> int:
+        """
+        Finds the first segment tag in the string.
+
+        Args:
+            string_content: The segment data
+
+        Returns:
+            int: The index of the first segment tag, -1 if the string contains no segment tag
+        """
+        match = self.__pattern.search(string_content)
+        return match.start() if match is not None else -1
+
+    @staticmethod
+    @lru_cache(maxsize=32)
+    def for_segment_types(segment_types: tuple[str, ...]) -> "SegmentTagMatcher":
+        """
+        Returns the matcher of the segment tags, it is built once per tuple of tags.
+
+        Args:
+            segment_types: The segment tags
+
+        Returns:
+            SegmentTagMatcher: The shared matcher of the tags
+        """
+        return SegmentTagMatcher(segment_types)
+
+    @staticmethod
+    def default() -> "SegmentTagMatcher":
+        """
+        Returns the matcher of all supported segment types (SegmentType).
+
+        Returns:
+            SegmentTagMatcher: The shared matcher of the supported segment types
+        """
+        return SegmentTagMatcher.for_segment_types(tuple(segment_type.value for segment_type in SegmentType))
@@ -1,2 +1,26 @@
 # Import context
-from msconsparser.libs.edifactmsconsparser.wrappers.context import ParsingContext
\ No newline at end of file
+from msconsparser.libs.edifactmsconsparser.wrappers.context import ParsingContext
+# Import statistics
+from msconsparser.libs.edifactmsconsparser.wrappers.statistics import ParsePhase, ParseStatistics
+# Import profiler
+from msconsparser.libs.edifactmsconsparser.wrappers.profiler import SegmentProfileEntry, SegmentProfiler
+# Import query indexes
+from msconsparser.libs.edifactmsconsparser.wrappers.query_index import (
+    InterchangeQueryIndex, QueryIndexEntry, QueryKey
+)
+# Import duplicate detection
+from msconsparser.libs.edifactmsconsparser.wrappers.duplicate_index import (
+    Duplicate, DuplicateCheck, DuplicateIndex, DuplicateKind, DuplicateMode
+)
+# Import parse warnings
+from msconsparser.libs.edifactmsconsparser.wrappers.parse_warnings import ParseWarnings
+# Import conversion cache
+from msconsparser.libs.edifactmsconsparser.wrappers.conversion_cache import ConversionCache
+# Import numeric modes
+from msconsparser.libs.edifactmsconsparser.wrappers.numeric_mode import (
+    NumericMode, create_number_converter
+)
+# Import parse budgets
+from msconsparser.libs.edifactmsconsparser.wrappers.parse_budget import ParseBudget
+# Import cancel token
+from msconsparser.libs.edifactmsconsparser.wrappers.cancel_token import CancelToken
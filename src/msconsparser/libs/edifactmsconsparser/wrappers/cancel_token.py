@@ -0,0 +1,97 @@
+"""
+Cooperative cancellation of a parse.
+
+A parse runs to its end unless it checks for a cancellation itself. The caller hands a CancelToken to the parser,
+which checks it periodically between the segments, and trips the token from another thread or task, e.g. when the
+client of a request disconnects. A token may also carry a deadline, after which it counts as cancelled without
+being tripped.
+"""
+import threading
+import time
+from typing import Optional
+
+from msconsparser.libs.edifactmsconsparser.exceptions.parser_exceptions import ParseCancelledException
+
+
+class CancelToken:
+    """
+    Thread-safe token to cancel a parse.
+
+    Attributes:
+        deadline (Optional[float]): The time (time.monotonic) after which the token counts as cancelled, if any
+    """
+    CANCELLED = "cancelled"
+    CLIENT_DISCONNECTED = "client disconnected"
+    DEADLINE_EXCEEDED = "deadline exceeded"
+
+    def __init__(self, deadline: Optional[float] = None):
+        """
+        Initialize a token, which is not cancelled.
+
+        Args:
+            deadline: The time (time.monotonic) after which the token counts as cancelled, defaults to no deadline
+        """
+        self.deadline = deadline
+        self.__event = threading.Event()
+        self.__lock = threading.Lock()
+        self.__reason: Optional[str] = None
+
+    @staticmethod
+    def with_timeout(seconds: Optional[float]) -> "CancelToken":
+        """
+        Creates a token, which is cancelled after the given seconds.
+
+        Args:
+            seconds: The seconds from now until the deadline, None means no deadline
+
+        Returns:
+            CancelToken: The token
+        """
+        return CancelToken(None if seconds is None else time.monotonic() + seconds)
+
+    def cancel(self, reason: str = CANCELLED) -> None:
+        """
+        Trips the token, the first reason is kept.
+
+        Args:
+            reason: The reason of the cancellation
+        """
+        with self.__lock:
+            if not self.__event.is_set():
+                self.__reason = reason
+                self.__event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        """
+        Checks if the token was tripped or its deadline has passed.
+
+        Returns:
+            bool: True if the parse should be cancelled
+        """
+        if self.__event.is_set():
+            return True
+        if self.deadline is not None and time.monotonic() > self.deadline:
+            self.cancel(self.DEADLINE_EXCEEDED)
+            return True
+        return False
+
+    @property
+    def reason(self) -> Optional[str]:
+        """
+        Returns the reason of the cancellation.
+
+        Returns:
+            Optional[str]: The reason of the cancellation, None if not cancelled
+        """
+        return self.__reason
+
+    def raise_if_cancelled(self) -> None:
+        """
+        Checks the token.
+
+        Raises:
+            ParseCancelledException: If the token was tripped or its deadline has passed
+        """
+        if self.cancelled:
+            raise ParseCancelledException(self.__reason)
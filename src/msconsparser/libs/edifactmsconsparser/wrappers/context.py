@@ -5,8 +5,24 @@ This module provides the context object used during the parsing of MSCONS messag
 It maintains the state of the current interchange, message, and segment groups
 being processed, allowing the parser to build the message structure incrementally.
 """
-from typing import Optional
+from typing import Any, Hashable, Optional, TypeVar, Union
 
+from pydantic import BaseModel
+
+from msconsparser.libs.edifactmsconsparser.wrappers.conversion_cache import ConversionCache
+from msconsparser.libs.edifactmsconsparser.wrappers.duplicate_index import DuplicateCheck
+from msconsparser.libs.edifactmsconsparser.wrappers.numeric_mode import (
+    Number, NumberConverter, NumericMode, create_number_converter
+)
+from msconsparser.libs.edifactmsconsparser.wrappers.parse_warnings import ParseWarnings
+from msconsparser.libs.edifactmsconsparser.wrappers.profiler import SegmentProfiler
+from msconsparser.libs.edifactmsconsparser.wrappers.query_index import InterchangeQueryIndex, QueryIndexEntry
+from msconsparser.libs.edifactmsconsparser.wrappers.segments.code_list_registry import (
+    CodeLabels, CodeListRegistry, get_default_code_list_registry
+)
+from msconsparser.libs.edifactmsconsparser.wrappers.segments.compact import create_compact_node
+from msconsparser.libs.edifactmsconsparser.wrappers.segments.constants import EdifactConstants
+from msconsparser.libs.edifactmsconsparser.wrappers.segments.model_factory import construct_model
 from msconsparser.libs.edifactmsconsparser.wrappers.segments.message_structure import (
     EdifactInterchange, EdifactMSconsMessage
 )
@@ -15,6 +31,11 @@ from msconsparser.libs.edifactmsconsparser.wrappers.segments.segment_group impor
     SegmentGroup6, SegmentGroup7, SegmentGroup8, SegmentGroup9, SegmentGroup10
 )
 
+M = TypeVar('M', bound=BaseModel)
+
+# Marks the number conversion as not resolved yet, as None stands for an interchange without UNA segment
+_UNRESOLVED = object()
+
 
 class ParsingContext:
     """
@@ -29,14 +50,22 @@ class ParsingContext:
     in this hierarchy during parsing.
     """
 
-    def __init__(self):
+    def __init__(self, compact_nodes: bool = False):
         """
         Initialize a new parsing context.
 
         Creates an empty interchange and initializes all current segment group references to None.
-        Also initializes the segment counter to 0.
+        Also initializes the segment counter to 0, the warning aggregation, the tables of the interned values
+        and shared nodes and the code lists of the default MIG version, converts the numbers to floats and
+        disables the segment profiling as well as the strict model validation.
+
+        Args:
+            compact_nodes: If true, the parse tree is built of compact nodes (see wrappers.segments.compact)
+                instead of pydantic models
         """
-        self.interchange = EdifactInterchange()
+        self.compact_nodes = compact_nodes
+        self.strict_models = False  # If true, the segment models are validated in strict mode (for debugging)
+        self.interchange = self.create_model(EdifactInterchange)
         self.current_message: Optional[EdifactMSconsMessage] = None
         self.current_sg1: Optional[SegmentGroup1] = None
         self.current_sg2: Optional[SegmentGroup2] = None
@@ -48,6 +77,251 @@ class ParsingContext:
         self.current_sg9: Optional[SegmentGroup9] = None
         self.current_sg10: Optional[SegmentGroup10] = None
         self.segment_count = 0  # Segment counter for the interchange file
+        self.recovered_prefix_count = 0  # Segments of the interchange whose invalid prefix was removed
+        self.profiler: Optional[SegmentProfiler] = None  # Set to profile the segment handlers and converters
+        self.query_index: Optional[InterchangeQueryIndex] = None  # Set to index the location objects and positions
+        self.duplicate_check: Optional[DuplicateCheck] = None  # Set to check the interchange and its messages
+        self.warnings = ParseWarnings()  # Repeated warnings of the interchange, logged as one summary record
+        self.interned_values: dict[Optional[str], Optional[str]] = {}  # Repeated code values of the interchange
+        self.shared_nodes: dict[Hashable, Any] = {}  # Immutable nodes shared within the interchange (flyweights)
+        self.conversion_cache: Optional[ConversionCache] = None  # Set to memoize duplicate segments
+        self.conversion_dialect: tuple = ()  # Separators and code lists the converted segments depend on
+        self.code_list_registry: Optional[CodeListRegistry] = None
+        self.code_list_version: Optional[str] = None
+        self.code_labels: Optional[CodeLabels] = None  # The labels of the qualifier codes, None skips the labels
+        self.__selected_code_list_version: Optional[str] = None
+        self.numeric_mode = NumericMode.FLOAT  # The type of the converted quantities, see use_numeric_mode
+        # The number parser and the decimal mark to replace (None for the dot), resolved on first use per UNA segment
+        self.__number_conversion: tuple[NumberConverter, Optional[str]] = (float, None)
+        self.__number_conversion_una: Optional[Any] = _UNRESOLVED
+        self.use_code_lists(get_default_code_list_registry())
+
+    def use_code_lists(self, registry: Optional[CodeListRegistry], version: Optional[str] = None) -> None:
+        """
+        Sets the code lists to resolve the labels (Bezeichner) of the qualifier codes with.
+
+        Args:
+            registry: The registry of the code lists, None skips the label resolution entirely
+            version: The MIG version of the code lists for all messages. If None, the version given in the
+                UNH segment of each message is used, falling back to the default version of the registry.
+
+        Raises:
+            KeyError: If the registry has no code lists of the given version
+        """
+        self.code_list_registry = registry
+        self.code_list_version = version
+        self.code_labels = registry.get_code_labels(version) if registry is not None else None
+        self.__selected_code_list_version = (version or registry.default_version) if registry is not None else None
+        self.update_conversion_dialect()
+
+    def select_code_lists(self, mig_version: Optional[str]) -> None:
+        """
+        Selects the code lists of the MIG version of a message, unless the version is fixed for all messages.
+
+        Args:
+            mig_version: The MIG version given in the UNH segment, e.g. "2.4c"
+        """
+        registry = self.code_list_registry
+        if registry is None or self.code_list_version is not None:
+            return
+        if not registry.has_version(mig_version):
+            if mig_version:
+                self.warnings.add(
+                    "Keine Codelisten für MIG-Version '%s' definiert, die Version '%s' wird verwendet.",
+                    mig_version, registry.default_version
+                )
+            mig_version = registry.default_version
+        self.code_labels = registry.get_code_labels(mig_version)
+        self.__selected_code_list_version = mig_version
+        self.update_conversion_dialect()
+
+    def use_numeric_mode(self, numeric_mode: Union[NumericMode, str]) -> None:
+        """
+        Sets the numeric mode of the converted quantities, see wrappers.numeric_mode.
+
+        Args:
+            numeric_mode: The numeric mode, i.e. float, decimal or milli
+
+        Raises:
+            ValueError: If the numeric mode is unknown
+        """
+        self.numeric_mode = NumericMode(numeric_mode)
+        self.__number_conversion_una = _UNRESOLVED
+
+    def convert_number(self, value: str) -> Number:
+        """
+        Converts a number of the interchange according to the numeric mode and the decimal mark of the UNA segment.
+
+        The converter is resolved once per UNA segment instead of looking up the decimal mark for every number.
+        If the interchange has no decimal mark, the dot is used and a warning is added.
+
+        Args:
+            value: The number string, e.g. '4250,465'
+
+        Returns:
+            Number: The float, Decimal or integer (in thousandths) of the numeric mode
+
+        Raises:
+            ValueError: If the value is no number of the numeric mode
+        """
+        una = self.interchange.una_service_string_advice
+        if una is not self.__number_conversion_una:
+            self.__number_conversion = self.__resolve_number_conversion(una)
+            self.__number_conversion_una = una
+        parse, decimal_mark = self.__number_conversion
+        if decimal_mark is not None:
+            value = value.replace(decimal_mark, EdifactConstants.DOT_DECIMAL)
+        return parse(value)
+
+    def __resolve_number_conversion(self, una: Optional[Any]) -> tuple[NumberConverter, Optional[str]]:
+        parse = create_number_converter(self.numeric_mode)
+        decimal_mark = una.decimal_mark if una is not None else None
+        if decimal_mark:
+            # The numbers are parsed as they are (fast path), unless the decimal mark has to be replaced
+            return parse, decimal_mark if decimal_mark != EdifactConstants.DOT_DECIMAL else None
+
+        reason = "UNA decimal_mark is None or empty." if una is not None else "UNA service string advice is missing."
+
+        def parse_with_default_decimal_mark(value: str) -> Number:
+            self.warnings.add(
+                "Decimal mark not found in UNA service string advice. Using '%s' as default value."
+                " Original error: '%s'",
+                EdifactConstants.DOT_DECIMAL,
+                reason,
+            )
+            return parse(value)
+        return parse_with_default_decimal_mark, None
+
+    def update_conversion_dialect(self) -> None:
+        """
+        Updates the dialect of the conversion cache keys after the separators (UNA) or the code lists changed.
+
+        Segments with the same text are converted alike only within the same dialect, i.e. with the same
+        separators, decimal mark and code lists.
+        """
+        una = self.interchange.una_service_string_advice
+        separators = (
+            una.component_separator, una.element_separator, una.decimal_mark, una.release_character,
+            una.segment_terminator
+        ) if una is not None else None
+        self.conversion_dialect = (separators, self.__selected_code_list_version)
+
+    def create_model(self, model_class: type[M], **values: Any) -> M:
+        """
+        Creates a node of the parse tree, i.e. a segment group, a segment or one of its nested models.
+
+        The node is a compact node if the context builds a compact parse tree. Otherwise, it is a pydantic
+        model created without validation, or validated in strict mode if the strict model validation is enabled.
+
+        Args:
+            model_class: The pydantic model class of the node
+            **values: The field values by field name, preferably in the declaration order of the model fields
+
+        Returns:
+            The pydantic model or the compact node of the model class
+        """
+        if self.compact_nodes:
+            return create_compact_node(model_class, values)
+        return construct_model(model_class, values, strict=self.strict_models)
+
+    def intern(self, value: Optional[str]) -> Optional[str]:
+        """
+        Returns the first instance of an equal value of the interchange, so that repeated codes (e.g. the
+        quantity qualifier '220' or the unit 'KWH' of every interval) share one string object.
+
+        In contrast to sys.intern, the values are only kept for the parse of one interchange.
+
+        Args:
+            value: The code value, e.g. a qualifier or a unit code
+
+        Returns:
+            The interned value
+        """
+        return self.interned_values.setdefault(value, value)
+
+    def create_shared_model(self, model_class: type[M], key: Optional[Hashable] = None, /, **values: Any) -> M:
+        """
+        Returns a node of the parse tree that is shared by all equal nodes of the interchange (flyweight), if the
+        context builds a compact parse tree.
+
+        The node is created on first use only. It must not be changed afterward, which holds for the segments
+        and nested models of the converters, as the segment handlers only add them to their segment groups.
+        The compact nodes are internal to the parser and converted into separate pydantic models at the API
+        boundary (see CompactNode.to_model). The pydantic models of a parse tree are public and mutable, so
+        they are created per call and never shared.
+
+        Args:
+            model_class: The pydantic model class of the node
+            key: The key identifying equal nodes, defaults to the field values (which must be hashable then)
+            **values: The field values by field name, preferably in the declaration order of the model fields
+
+        Returns:
+            The shared compact node, or a new pydantic model of the model class
+        """
+        if not self.compact_nodes:
+            return self.create_model(model_class, **values)
+        if key is None:
+            key = (model_class, *values.items())
+        node = self.shared_nodes.get(key)
+        if node is None:
+            node = self.shared_nodes[key] = self.create_model(model_class, **values)
+        return node
+
+    def release_shared_values(self) -> None:
+        """
+        Releases the tables of the interned values and shared nodes at the end of the parse.
+
+        The values and nodes themselves stay in the parse tree, only the lookup tables (and the segments
+        of the conversion cache) are freed.
+        """
+        self.interned_values = {}
+        self.shared_nodes = {}
+        if self.conversion_cache is not None:
+            self.conversion_cache.clear()
+
+    def add_to_query_index(self, key: str, value: Optional[str], position: Optional[Any] = None) -> None:
+        """
+        Adds the current location object (SG6), or one of its positions (SG9), to the query index of the parse.
+
+        Args:
+            key: The kind of the value, see QueryKey
+            value: The value, e.g. the location ID of the current location object
+            position: The position the value belongs to, e.g. the current SG9 for an OBIS code
+        """
+        if self.query_index is None or self.current_sg6 is None:
+            return
+        message_index = len(self.interchange.unh_unt_nachrichten) - 1
+        entry = QueryIndexEntry(message_index, self.current_message, self.current_sg6, position)
+        self.query_index.add(key, value, entry)
+
+    def check_duplicate_interchange(self) -> None:
+        """
+        Checks the interchange against the duplicate check of the parse once its UNB segment is converted.
+        """
+        unb = self.interchange.unb_nutzdaten_kopfsegment
+        sender = unb.absender_der_uebertragungsdatei if unb is not None else None
+        self.duplicate_check.check_interchange(
+            sender.marktpartneridentifikationsnummer if sender is not None else None,
+            unb.datenaustauschreferenz if unb is not None else None,
+            self.segment_count,
+        )
+
+    def check_duplicate_message(self) -> None:
+        """
+        Checks the current message against the duplicate check of the parse once its BGM segment is converted.
+        A flagged duplicate is removed from the interchange, its remaining segments are skipped by the parser.
+        """
+        unh = self.current_message.unh_nachrichtenkopfsegment
+        bgm = self.current_message.bgm_beginn_der_nachricht
+        identification = bgm.dokumenten_nachrichten_identifikation if bgm is not None else None
+        if self.duplicate_check.check_message(
+                unh.nachrichten_referenznummer if unh is not None else None,
+                identification.dokumentennummer if identification is not None else None,
+                self.segment_count,
+        ):
+            messages = self.interchange.unh_unt_nachrichten
+            if messages and messages[-1] is self.current_message:
+                messages.pop()
 
     def reset_for_new_message(self):
         """
@@ -0,0 +1,131 @@
+"""
+Memo cache of the converted segments of an interchange.
+
+Gas quality and status data repeat identical segments thousands of times (e.g. 'STS+Z34++Z81',
+'CCI+Z23++Z60' or 'PIA+5+1-1?:1.29.0:SRW'). With the cache, such a segment is split and converted
+only once per interchange, and the following duplicates get the same segment object.
+
+The segment models are not frozen, so the duplicates of a parse tree share one mutable object: changing
+the segment of one segment group changes it in all the others. Therefore, the cache is disabled by default
+and meant for parse trees that are only read, e.g. dumped into a response.
+
+The cache is bounded and evicts the least recently used segments. It counts the hits and misses per
+segment type, so that the cacheable segment types can be chosen for a given traffic mix.
+"""
+from collections import OrderedDict
+from typing import Any, Hashable, Iterable, Optional
+
+
+class ConversionCache:
+    """
+    Bounded LRU cache of the converted segments of the cacheable segment types.
+
+    The keys are built by the segment converters from the segment type, the elements of the segment,
+    the segment group and the dialect of the interchange (separators and code lists), see
+    ParsingContext.conversion_dialect.
+
+    Attributes:
+        max_size (int): The maximum number of cached segments
+        segment_types (frozenset[str]): The segment types whose segments are cached
+    """
+    DEFAULT_MAX_SIZE = 1024
+    DEFAULT_SEGMENT_TYPES = frozenset({"CCI", "PIA", "STS"})
+
+    def __init__(self, max_size: int = DEFAULT_MAX_SIZE, segment_types: Optional[Iterable[str]] = None):
+        """
+        Initialize an empty cache.
+
+        Args:
+            max_size: The maximum number of cached segments, must be positive
+            segment_types: The segment types whose segments are cached, defaults to DEFAULT_SEGMENT_TYPES
+
+        Raises:
+            ValueError: If the maximum size is not positive
+        """
+        if max_size <= 0:
+            raise ValueError(f"The maximum size of the conversion cache must be positive, got {max_size}")
+        self.max_size = max_size
+        self.segment_types = frozenset(segment_types) if segment_types is not None else self.DEFAULT_SEGMENT_TYPES
+        self.__entries: OrderedDict[Hashable, Any] = OrderedDict()
+        self.__counts: dict[str, list[int]] = {}  # [hits, misses] per segment type
+
+    def get(self, segment_type: str, key: Hashable) -> Optional[Any]:
+        """
+        Returns the cached segment of the key and counts the hit or miss for the segment type.
+
+        Args:
+            segment_type: The segment type of the segment
+            key: The key of the segment
+
+        Returns:
+            Optional[Any]: The cached segment, or None if the segment is not cached
+        """
+        counts = self.__counts.get(segment_type)
+        if counts is None:
+            counts = self.__counts[segment_type] = [0, 0]
+        segment = self.__entries.get(key)
+        if segment is None:
+            counts[1] += 1
+            return None
+        self.__entries.move_to_end(key)
+        counts[0] += 1
+        return segment
+
+    def put(self, key: Hashable, segment: Any) -> None:
+        """
+        Caches a converted segment, evicting the least recently used segment if the cache is full.
+
+        Args:
+            key: The key of the segment
+            segment: The converted segment, it must not be changed afterward, neither by the parser nor by
+                the consumers of the parse tree
+        """
+        self.__entries[key] = segment
+        if len(self.__entries) > self.max_size:
+            self.__entries.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self.__entries)
+
+    def clear(self) -> None:
+        """
+        Removes the cached segments, while the hit and miss counts are kept.
+        """
+        self.__entries.clear()
+
+    def hits(self, segment_type: str) -> int:
+        """
+        Returns the number of cache hits of a segment type.
+        """
+        return self.__counts.get(segment_type, (0, 0))[0]
+
+    def misses(self, segment_type: str) -> int:
+        """
+        Returns the number of cache misses of a segment type.
+        """
+        return self.__counts.get(segment_type, (0, 0))[1]
+
+    def hit_rate(self, segment_type: str) -> float:
+        """
+        Returns the share of the segments of a segment type that were taken from the cache.
+
+        Args:
+            segment_type: The segment type
+
+        Returns:
+            float: The hit rate between 0 and 1, 0 if no segment of the type was looked up
+        """
+        hits, misses = self.__counts.get(segment_type, (0, 0))
+        return hits / (hits + misses) if hits + misses else 0.0
+
+    def as_dict(self) -> dict[str, dict[str, Any]]:
+        """
+        Returns the hits, misses and hit rates per segment type as a plain dictionary.
+
+        Returns:
+            dict[str, dict[str, Any]]: The counts per segment type, sorted by segment type
+        """
+        return {
+            segment_type: {"hits": hits, "misses": misses, "hit_rate": round(self.hit_rate(segment_type), 4)}
+            for segment_type, (hits, misses) in sorted(self.__counts.items())
+        }
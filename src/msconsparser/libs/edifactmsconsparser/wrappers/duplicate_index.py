@@ -0,0 +1,350 @@
+"""
+Detection of resent interchanges and messages.
+
+A DuplicateIndex keeps the keys of the interchanges and messages seen so far: the sender (MP-ID of the UNB
+segment) with the interchange reference (UNB DE0020) for an interchange, and with the message reference
+(UNH DE0062) and the document number (BGM DE1004) for a message. It lives as long as the service and can be
+persisted to a file.
+
+A DuplicateCheck is passed to a single parse. The segment handlers check the keys right after the UNB and the BGM
+segment, i.e. before the detail section of a message is converted. A checked key is reserved in the index until the
+check is committed or rolled back, so that of two parses of the same interchange running at the same time only one
+takes it as new. A duplicate is either rejected, the parse then
+stops with a DuplicateInterchangeException, or flagged, the parse then skips the segments of the duplicate message
+(or of all messages of a duplicate interchange) without converting them and reports the duplicate with the
+estimated time saved.
+"""
+import json
+import logging
+import os
+import threading
+import time
+from typing import Any, Iterable, Optional, Union
+
+from msconsparser.libs.edifactmsconsparser.exceptions import DuplicateInterchangeException
+
+logger = logging.getLogger(__name__)
+
+# The number of converted segments from which the convert time of a parse is used to estimate the time saved,
+# the estimates of shorter parses are based on the average convert time of the earlier parses of the index
+MIN_RATE_SEGMENTS = 1000
+
+DuplicateKey = tuple[str, ...]
+
+
+class DuplicateMode:
+    """
+    Names of the ways to handle a duplicate.
+    """
+    FLAG = "flag"  # Skip the duplicate and report it, the other messages are parsed
+    REJECT = "reject"  # Stop the parse with a DuplicateInterchangeException
+
+    ALL = (FLAG, REJECT)
+
+
+class DuplicateKind:
+    """
+    Names of the kinds of duplicates.
+    """
+    INTERCHANGE = "interchange"  # Same sender and interchange reference (UNB)
+    MESSAGE = "message"  # Same sender, message reference (UNH) and document number (BGM)
+
+
+class Duplicate:
+    """
+    An interchange or message detected as duplicate during a parse.
+    """
+
+    def __init__(self, kind: str, key: DuplicateKey, line_number: int):
+        """
+        Initialize the duplicate.
+
+        Args:
+            kind (str): The kind of the duplicate, see DuplicateKind
+            key (DuplicateKey): The key of the duplicate, the kind followed by the sender and the references
+            line_number (int): The line number of the segment the duplicate was detected at (UNB or BGM)
+        """
+        self.kind = kind
+        self.key = key
+        self.line_number = line_number
+        # The number of segments not converted because of the duplicate
+        self.skipped_segments = 0
+        # The seconds spent on skipping the segments
+        self.skip_seconds = 0.0
+        # The estimated seconds the conversion of the skipped segments would have taken, if an estimate is known
+        self.seconds_saved: Optional[float] = None
+
+    def as_dict(self) -> dict[str, Any]:
+        """
+        Returns the duplicate as a plain dictionary, e.g. to be used in a response or a structured log record.
+
+        Returns:
+            dict[str, Any]: The kind, the key, the line number, the skipped segments and the estimated time saved
+        """
+        return {
+            "kind": self.kind,
+            "key": list(self.key),
+            "line_number": self.line_number,
+            "skipped_segments": self.skipped_segments,
+            "seconds_saved": None if self.seconds_saved is None else round(self.seconds_saved, 6),
+        }
+
+
+class DuplicateIndex:
+    """
+    The keys of the interchanges and messages seen so far, in memory and optionally appended to a file.
+
+    The index is shared by the parses of a process, its methods are thread-safe. Every key of the file is a JSON
+    array on its own line, the file is read when the index is created. The keys reserved by the parses in progress
+    (see reserve) are only kept in memory and are not counted as keys of the index.
+    """
+
+    def __init__(self, path: Optional[Union[str, os.PathLike]] = None):
+        """
+        Initialize the index.
+
+        Args:
+            path (Optional[Union[str, os.PathLike]]): The file the keys are persisted to, if any. Its keys are
+                loaded, a missing file is created on the first added key.
+        """
+        self.__path = path
+        self.__lock = threading.Lock()
+        self.__keys: set[DuplicateKey] = set()
+        # The keys checked by the parses in progress, which are neither added nor released yet
+        self.__reserved_keys: set[DuplicateKey] = set()
+        # The convert seconds and segments of the finished parses, to estimate the time saved by a duplicate
+        self.__convert_seconds = 0.0
+        self.__converted_segments = 0
+        if path is not None and os.path.exists(path):
+            self.__load(path)
+
+    def __load(self, path: Union[str, os.PathLike]) -> None:
+        with open(path, "r", encoding="utf-8") as file:
+            for line_number, line in enumerate(file, start=1):
+                try:
+                    self.__keys.add(tuple(json.loads(line)))
+                except (ValueError, TypeError):
+                    # E.g. a line cut off by a crash while it was written
+                    logger.warning("Invalid duplicate key in line %d of %s, ignoring it", line_number, path)
+
+    def __len__(self) -> int:
+        with self.__lock:
+            return len(self.__keys)
+
+    def __contains__(self, key: DuplicateKey) -> bool:
+        with self.__lock:
+            return key in self.__keys
+
+    def add(self, keys: Iterable[DuplicateKey]) -> list[DuplicateKey]:
+        """
+        Adds keys to the index and appends the new ones to the file of the index, their reservations are released.
+
+        Args:
+            keys (Iterable[DuplicateKey]): The keys to add
+
+        Returns:
+            list[DuplicateKey]: The keys which were not in the index yet
+        """
+        with self.__lock:
+            new_keys = []
+            for key in keys:
+                self.__reserved_keys.discard(key)
+                if key not in self.__keys:
+                    self.__keys.add(key)
+                    new_keys.append(key)
+            if new_keys and self.__path is not None:
+                with open(self.__path, "a", encoding="utf-8") as file:
+                    file.writelines(json.dumps(list(key), separators=(",", ":")) + "\n" for key in new_keys)
+            return new_keys
+
+    def reserve(self, key: DuplicateKey) -> bool:
+        """
+        Reserves a key for a parse in progress, unless it is in the index or reserved by another parse. The key is
+        to be added (see add) or released (see release) once the parse is finished.
+
+        Args:
+            key (DuplicateKey): The key to reserve
+
+        Returns:
+            bool: True if the key was reserved, False if it is a duplicate
+        """
+        with self.__lock:
+            if key in self.__keys or key in self.__reserved_keys:
+                return False
+            self.__reserved_keys.add(key)
+            return True
+
+    def release(self, keys: Iterable[DuplicateKey]) -> None:
+        """
+        Releases the reservations of keys without adding them, e.g. of a parse which failed.
+
+        Args:
+            keys (Iterable[DuplicateKey]): The reserved keys
+        """
+        with self.__lock:
+            self.__reserved_keys.difference_update(keys)
+
+    @property
+    def segment_seconds(self) -> Optional[float]:
+        """
+        The average convert seconds per segment of the parses checked against the index, None before the first one.
+        """
+        with self.__lock:
+            if self.__converted_segments == 0:
+                return None
+            return self.__convert_seconds / self.__converted_segments
+
+    def record_convert_time(self, seconds: float, segments: int) -> None:
+        """
+        Records the convert time of a parse, see segment_seconds.
+
+        Args:
+            seconds (float): The seconds spent on converting the segments
+            segments (int): The number of converted segments
+        """
+        with self.__lock:
+            self.__convert_seconds += seconds
+            self.__converted_segments += segments
+
+
+class DuplicateCheck:
+    """
+    The check of a single parse against a DuplicateIndex.
+
+    The keys of the parse are reserved in the index when they are checked, but only added to it by commit(), e.g.
+    once the parsed interchange has been stored or forwarded. If the parse or the processing fails, rollback()
+    releases them, so that the interchange is not taken as seen when it is sent again. A check is thus to be either
+    committed or rolled back.
+
+    Attributes:
+        duplicates (list[Duplicate]): The duplicates detected by the parse
+        skipping (Optional[Duplicate]): The duplicate whose segments are being skipped, if any
+    """
+
+    def __init__(self, index: DuplicateIndex, mode: str = DuplicateMode.FLAG):
+        """
+        Initialize the check.
+
+        Args:
+            index (DuplicateIndex): The index of the interchanges and messages seen so far
+            mode (str): How a duplicate is handled, see DuplicateMode
+        """
+        if mode not in DuplicateMode.ALL:
+            raise ValueError(f"Invalid duplicate mode '{mode}', expected one of {', '.join(DuplicateMode.ALL)}")
+        self.index = index
+        self.mode = mode
+        self.duplicates: list[Duplicate] = []
+        self.skipping: Optional[Duplicate] = None
+        self.__keys: list[DuplicateKey] = []
+        self.__seen: set[DuplicateKey] = set()
+        self.__sender: Optional[str] = None
+        self.__skip_start = 0.0
+
+    @property
+    def is_duplicate_interchange(self) -> bool:
+        """
+        True if the interchange was detected as duplicate.
+        """
+        return any(duplicate.kind == DuplicateKind.INTERCHANGE for duplicate in self.duplicates)
+
+    def check_interchange(self, sender: Optional[str], interchange_reference: Optional[str],
+                          line_number: int) -> bool:
+        """
+        Checks the interchange after its UNB segment.
+
+        Args:
+            sender (Optional[str]): The MP-ID of the sender of the interchange
+            interchange_reference (Optional[str]): The interchange reference (UNB DE0020)
+            line_number (int): The line number of the UNB segment
+
+        Returns:
+            bool: True if the interchange is a flagged duplicate, whose messages are to be skipped
+
+        Raises:
+            DuplicateInterchangeException: If the interchange is a duplicate and duplicates are rejected
+        """
+        self.__sender = sender
+        if sender is None or interchange_reference is None:
+            return False
+        return self.__check(DuplicateKind.INTERCHANGE, (DuplicateKind.INTERCHANGE, sender, interchange_reference),
+                            line_number)
+
+    def check_message(self, message_reference: Optional[str], document_number: Optional[str],
+                      line_number: int) -> bool:
+        """
+        Checks a message after its BGM segment.
+
+        Args:
+            message_reference (Optional[str]): The message reference (UNH DE0062)
+            document_number (Optional[str]): The document number (BGM DE1004)
+            line_number (int): The line number of the BGM segment
+
+        Returns:
+            bool: True if the message is a flagged duplicate, whose segments are to be skipped
+
+        Raises:
+            DuplicateInterchangeException: If the message is a duplicate and duplicates are rejected
+        """
+        if self.__sender is None or message_reference is None or document_number is None:
+            return False
+        return self.__check(DuplicateKind.MESSAGE,
+                            (DuplicateKind.MESSAGE, self.__sender, message_reference, document_number), line_number)
+
+    def __check(self, kind: str, key: DuplicateKey, line_number: int) -> bool:
+        # A key is also a duplicate if it repeats within the parse or is reserved by a parse running at the same time
+        if key not in self.__seen and self.index.reserve(key):
+            self.__seen.add(key)
+            self.__keys.append(key)
+            return False
+        duplicate = Duplicate(kind, key, line_number)
+        self.duplicates.append(duplicate)
+        if self.mode == DuplicateMode.REJECT:
+            raise DuplicateInterchangeException(duplicate)
+        self.skipping = duplicate
+        self.__skip_start = time.perf_counter()
+        return True
+
+    def end_skip(self) -> None:
+        """
+        Ends skipping the segments of the current duplicate, e.g. at the UNT segment of a duplicate message.
+        """
+        self.skipping.skip_seconds += time.perf_counter() - self.__skip_start
+        self.skipping = None
+
+    def finish(self, convert_seconds: float, converted_segments: int) -> None:
+        """
+        Estimates the time saved by the duplicates of the finished parse from its convert time per segment and
+        records the convert time in the index.
+
+        Args:
+            convert_seconds (float): The seconds spent on the segments, including the skipped ones
+            converted_segments (int): The number of converted segments, excluding the skipped ones
+        """
+        convert_seconds = max(convert_seconds - sum(duplicate.skip_seconds for duplicate in self.duplicates), 0.0)
+        segment_seconds = self.index.segment_seconds
+        if converted_segments >= MIN_RATE_SEGMENTS or (segment_seconds is None and converted_segments > 0):
+            segment_seconds = convert_seconds / converted_segments
+        if converted_segments > 0:
+            self.index.record_convert_time(convert_seconds, converted_segments)
+        if segment_seconds is None:
+            return
+        for duplicate in self.duplicates:
+            duplicate.seconds_saved = max(duplicate.skipped_segments * segment_seconds - duplicate.skip_seconds, 0.0)
+
+    def commit(self) -> list[DuplicateKey]:
+        """
+        Adds the keys of the interchange and its messages, which are no duplicates, to the index.
+
+        Returns:
+            list[DuplicateKey]: The keys which were not in the index yet
+        """
+        keys, self.__keys = self.__keys, []
+        return self.index.add(keys)
+
+    def rollback(self) -> None:
+        """
+        Releases the keys of the interchange and its messages reserved in the index without adding them, e.g. if
+        the parse or the storing of the interchange failed.
+        """
+        keys, self.__keys = self.__keys, []
+        self.index.release(keys)
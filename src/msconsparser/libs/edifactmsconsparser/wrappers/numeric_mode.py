@@ -0,0 +1,116 @@
+"""
+Numeric modes of the converted quantities (QTY) and the conversion of the EDIFACT numbers.
+
+The numbers of an interchange are written with the decimal mark of its UNA segment, e.g. '4250,465'.
+They are converted according to the numeric mode:
+
+- float: binary floating point numbers (default), fast but not exact, e.g. 0.1 + 0.2 != 0.3
+- decimal: exact decimal.Decimal numbers for billing, serialized as JSON strings (like pydantic does)
+- milli: exact integers in thousandths of the unit (scaled int64), e.g. '4250.465' kWh -> 4250465. The QTY
+  segment (SegmentQTYMilli) keeps the quantity in the unit as float and adds the thousandths as menge_milli.
+
+The converter of a mode is resolved once per decimal mark. If the decimal mark is the dot, the numbers are
+converted directly without replacing the decimal mark first. The quantities are converted per QTY segment by
+its converter, so that an invalid number is reported with the line of its segment.
+"""
+from decimal import Decimal, InvalidOperation
+from typing import Callable, Union
+
+from msconsparser.libs.edifactmsconsparser.wrappers.segments.constants import EdifactConstants, StrEnum
+
+Number = Union[float, Decimal, int]
+NumberConverter = Callable[[str], Number]
+
+MILLI_DECIMAL_PLACES = 3
+# The number of thousandths per unit
+MILLI_FACTOR = 10 ** MILLI_DECIMAL_PLACES
+_INT64_MIN = -2 ** 63
+_INT64_MAX = 2 ** 63 - 1
+
+
+class NumericMode(StrEnum):
+    """
+    The numeric types the quantities are converted to.
+    """
+    FLOAT = "float"
+    DECIMAL = "decimal"
+    MILLI = "milli"
+
+
+def to_decimal(value: str) -> Decimal:
+    """
+    Converts a number with a dot as decimal mark to an exact Decimal number.
+
+    Args:
+        value: The number, e.g. '-4.987'
+
+    Returns:
+        Decimal: The number, e.g. Decimal('-4.987')
+
+    Raises:
+        ValueError: If the value is no number, like float and to_milli (Decimal raises InvalidOperation)
+    """
+    try:
+        return Decimal(value)
+    except InvalidOperation:
+        raise ValueError(f"Invalid number '{value}'")
+
+
+def to_milli(value: str) -> int:
+    """
+    Converts a number with a dot as decimal mark to an integer in thousandths, without rounding.
+
+    Args:
+        value: The number, e.g. '-4.987'
+
+    Returns:
+        int: The number in thousandths, e.g. -4987
+
+    Raises:
+        ValueError: If the value is no number, has more than 3 (significant) decimal places or exceeds int64
+    """
+    integer, _, fraction = value.partition(EdifactConstants.DOT_DECIMAL)
+    if len(fraction) != MILLI_DECIMAL_PLACES:
+        # Slow path, the usual quantities have exactly 3 decimal places
+        if len(fraction) > MILLI_DECIMAL_PLACES:
+            if fraction[MILLI_DECIMAL_PLACES:].rstrip("0"):
+                raise ValueError(f"The number '{value}' has more than {MILLI_DECIMAL_PLACES} decimal places")
+            fraction = fraction[:MILLI_DECIMAL_PLACES]
+        elif not fraction and not integer.strip(" +-"):
+            raise ValueError(f"Invalid number '{value}'")
+        fraction = fraction.ljust(MILLI_DECIMAL_PLACES, "0")
+    milli = int(integer + fraction)
+    if not _INT64_MIN <= milli <= _INT64_MAX:
+        raise ValueError(f"The number '{value}' exceeds the range of the milli mode")
+    return milli
+
+
+_PARSERS: dict[NumericMode, NumberConverter] = {
+    NumericMode.FLOAT: float,
+    NumericMode.DECIMAL: to_decimal,
+    NumericMode.MILLI: to_milli,
+}
+
+
+def create_number_converter(
+        mode: Union[NumericMode, str] = NumericMode.FLOAT,
+        decimal_mark: str = EdifactConstants.DOT_DECIMAL,
+) -> NumberConverter:
+    """
+    Creates the converter of the numbers of an interchange.
+
+    Args:
+        mode: The numeric mode
+        decimal_mark: The decimal mark of the interchange
+
+    Returns:
+        NumberConverter: The converter of a number string to the number type of the mode
+
+    Raises:
+        ValueError: If the numeric mode is unknown
+    """
+    parse = _PARSERS[NumericMode(mode)]
+    if decimal_mark == EdifactConstants.DOT_DECIMAL:
+        # Fast path, the numbers are parsed as they are
+        return parse
+    return lambda value: parse(value.replace(decimal_mark, EdifactConstants.DOT_DECIMAL))
@@ -0,0 +1,198 @@
+"""
+Budgets of a parse, which bound the work done for a single interchange.
+
+A budget limits the number of segments, the size of the payload in bytes and the wall-clock time of a parse.
+The budgets are checked as early as possible, so that an oversized payload is rejected before its segments
+are materialized:
+
+- bytes: before the payload is read (e.g. from the Content-Length header) or decoded
+- segments: by counting the segment terminators up to the limit, before the text is split into segments
+- seconds: periodically while the segments are converted
+
+An exceeded budget raises a ParseBudgetExceededException. A budget is not changed by a parse, so that one
+budget can be configured per endpoint and shared by all its parses.
+"""
+import logging
+import os
+import time
+from typing import Optional
+
+from msconsparser.libs.edifactmsconsparser.exceptions.parser_exceptions import ParseBudgetExceededException
+
+logger = logging.getLogger(__name__)
+
+
+def _tighter(limit: Optional[float], other: Optional[float]) -> Optional[float]:
+    if limit is None:
+        return other
+    if other is None:
+        return limit
+    return min(limit, other)
+
+
+def _read_limit(name: str, limit_type: type) -> Optional[float]:
+    value = os.getenv(name)
+    if value is None or value == "":
+        return None
+    try:
+        limit = limit_type(value)
+    except ValueError:
+        logger.warning("Invalid %s '%s', using no limit", name, value)
+        return None
+    return limit if limit > 0 else None
+
+
+class ParseBudget:
+    """
+    Limits of the segments, bytes and seconds of a parse, None means no limit.
+
+    Attributes:
+        max_segments (Optional[int]): The maximum number of segments of the interchange
+        max_bytes (Optional[int]): The maximum size of the payload in bytes
+        max_seconds (Optional[float]): The maximum wall-clock time of the parse in seconds
+    """
+    SEGMENTS = "segments"
+    BYTES = "bytes"
+    SECONDS = "seconds"
+
+    def __init__(
+            self,
+            max_segments: Optional[int] = None,
+            max_bytes: Optional[int] = None,
+            max_seconds: Optional[float] = None,
+    ):
+        """
+        Initialize the budget.
+
+        Args:
+            max_segments: The maximum number of segments, defaults to no limit
+            max_bytes: The maximum size of the payload in bytes, defaults to no limit
+            max_seconds: The maximum wall-clock time of the parse in seconds, defaults to no limit
+
+        Raises:
+            ValueError: If a limit is not positive
+        """
+        for name, limit in ((self.SEGMENTS, max_segments), (self.BYTES, max_bytes), (self.SECONDS, max_seconds)):
+            if limit is not None and limit <= 0:
+                raise ValueError(f"The maximum {name} of a parse budget must be positive, got {limit}")
+        self.max_segments = max_segments
+        self.max_bytes = max_bytes
+        self.max_seconds = max_seconds
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, ParseBudget):
+            return NotImplemented
+        return self.as_dict() == other.as_dict()
+
+    def __hash__(self) -> int:
+        return hash((self.max_segments, self.max_bytes, self.max_seconds))
+
+    def __repr__(self) -> str:
+        return (f"ParseBudget(max_segments={self.max_segments}, max_bytes={self.max_bytes}, "
+                f"max_seconds={self.max_seconds})")
+
+    @property
+    def is_unlimited(self) -> bool:
+        """
+        Checks if the budget has no limit at all.
+
+        Returns:
+            bool: True if neither the segments, the bytes nor the seconds are limited
+        """
+        return self.max_segments is None and self.max_bytes is None and self.max_seconds is None
+
+    def limited_to(self, other: Optional["ParseBudget"]) -> "ParseBudget":
+        """
+        Returns the budget with the tighter limits of both budgets.
+
+        Args:
+            other: The other budget, if any
+
+        Returns:
+            ParseBudget: The combined budget
+        """
+        if other is None:
+            return self
+        return ParseBudget(
+            max_segments=_tighter(self.max_segments, other.max_segments),
+            max_bytes=_tighter(self.max_bytes, other.max_bytes),
+            max_seconds=_tighter(self.max_seconds, other.max_seconds),
+        )
+
+    def check_bytes(self, byte_count: Optional[int]) -> None:
+        """
+        Checks the size of the payload.
+
+        Args:
+            byte_count: The size of the payload in bytes, if known
+
+        Raises:
+            ParseBudgetExceededException: If the payload exceeds the byte budget
+        """
+        if self.max_bytes is not None and byte_count is not None and byte_count > self.max_bytes:
+            raise ParseBudgetExceededException(self.BYTES, self.max_bytes, f"{byte_count} bytes")
+
+    def check_segments(self, segment_count: int) -> None:
+        """
+        Checks the number of segments.
+
+        Args:
+            segment_count: The number of segments counted so far
+
+        Raises:
+            ParseBudgetExceededException: If the segments exceed the segment budget
+        """
+        if self.max_segments is not None and segment_count > self.max_segments:
+            raise ParseBudgetExceededException(self.SEGMENTS, self.max_segments, "more segments found")
+
+    def deadline(self, start: float) -> Optional[float]:
+        """
+        Returns the deadline of a parse started at the given time.
+
+        Args:
+            start: The start of the parse (time.perf_counter)
+
+        Returns:
+            Optional[float]: The deadline (time.perf_counter), or None if the time is not limited
+        """
+        return None if self.max_seconds is None else start + self.max_seconds
+
+    def check_deadline(self, deadline: Optional[float]) -> None:
+        """
+        Checks if the deadline of the parse has passed.
+
+        Args:
+            deadline: The deadline returned by deadline(), if any
+
+        Raises:
+            ParseBudgetExceededException: If the deadline has passed
+        """
+        if deadline is not None and time.perf_counter() > deadline:
+            raise ParseBudgetExceededException(self.SECONDS, self.max_seconds)
+
+    def as_dict(self) -> dict:
+        """
+        Returns the limits of the budget as dictionary.
+
+        Returns:
+            dict: The limits, None means no limit
+        """
+        return {self.SEGMENTS: self.max_segments, self.BYTES: self.max_bytes, self.SECONDS: self.max_seconds}
+
+    @staticmethod
+    def from_environment(prefix: str) -> "ParseBudget":
+        """
+        Reads the budget from the environment variables <prefix>_MAX_SEGMENTS, <prefix>_MAX_BYTES and
+        <prefix>_MAX_SECONDS. Unset, invalid and non-positive values mean no limit.
+
+        Args:
+            prefix: The prefix of the environment variables, e.g. 'PARSE_BUDGET_PARSE_RAW_FILE'
+
+        Returns:
+            ParseBudget: The configured budget
+        """
+        return ParseBudget(
+            max_segments=_read_limit(f"{prefix}_MAX_SEGMENTS", int),
+            max_bytes=_read_limit(f"{prefix}_MAX_BYTES", int),
+            max_seconds=_read_limit(f"{prefix}_MAX_SECONDS", float),
+        )
@@ -0,0 +1,95 @@
+"""
+Aggregation of the warnings raised while parsing a single interchange.
+
+Dirty interchanges may raise the same warning for thousands of segments (e.g. unknown segment
+types or invalid prefixes). Instead of logging every occurrence, the warnings are counted per
+message template and logged as one summary record at the end of the parse.
+"""
+import logging
+from typing import Any
+
+
+class ParseWarnings:
+    """
+    Counts the repeated warnings of a single parse and logs them as one summary record.
+
+    The warnings are identified by their %-style message template, e.g. "Kein Handler für Segmenttyp '%s' definiert.".
+    Only the arguments of the first occurrences of each template are kept, and they are not formatted
+    before the summary is logged, so recording a warning is cheap.
+    """
+    MAX_EXAMPLES_PER_WARNING = 3
+
+    def __init__(self):
+        """
+        Initialize the aggregation without warnings.
+        """
+        self.__counts: dict[str, int] = {}
+        self.__examples: dict[str, list[tuple[Any, ...]]] = {}
+
+    def add(self, template: str, *args: Any) -> None:
+        """
+        Records an occurrence of a warning.
+
+        Args:
+            template: The %-style message template of the warning
+            *args: The arguments of the message template
+        """
+        count = self.__counts.get(template)
+        if count is None:
+            self.__counts[template] = 1
+            self.__examples[template] = [args]
+            return
+        self.__counts[template] = count + 1
+        if count < ParseWarnings.MAX_EXAMPLES_PER_WARNING:
+            self.__examples[template].append(args)
+
+    @property
+    def total(self) -> int:
+        """
+        Returns the number of all recorded warnings.
+        """
+        return sum(self.__counts.values())
+
+    def count(self, template: str) -> int:
+        """
+        Returns the number of occurrences of a warning.
+
+        Args:
+            template: The %-style message template of the warning
+
+        Returns:
+            int: The number of occurrences, 0 if the warning was not recorded
+        """
+        return self.__counts.get(template, 0)
+
+    def as_dict(self) -> dict:
+        """
+        Returns the recorded warnings with their counts and the formatted first occurrences.
+
+        Returns:
+            dict: The count and the examples per message template
+        """
+        return {
+            template: {
+                "count": count,
+                "examples": [template % args for args in self.__examples[template]],
+            }
+            for template, count in self.__counts.items()
+        }
+
+    def log_summary(self, logger: logging.Logger) -> None:
+        """
+        Logs all recorded warnings as one summary record, if any.
+
+        Args:
+            logger: The logger to log the summary record with
+        """
+        if not self.__counts:
+            return
+        summary = self.as_dict()
+        logger.warning(
+            "%d warnings while parsing the interchange: %s",
+            self.total,
+            "; ".join(f"{details['count']}x {details['examples'][0]}" for details in summary.values()),
+            extra={"parse_warnings": summary},
+        )
@@ -0,0 +1,175 @@
+"""
+Profiling counters for the segment handlers and converters.
+
+This module provides an optional profiler that records, per segment type, how often the
+segment handlers and converters were called, how much time they took and how many memory
+blocks were allocated meanwhile. It is meant to find the converters worth optimizing for
+a given traffic mix (e.g. STS-heavy gas quality data vs. pure QTY/DTM time series).
+"""
+import sys
+import threading
+import time
+from typing import Optional
+
+
+class SegmentProfileEntry:
+    """
+    The counters of one processing stage (handler or converter) for one segment type.
+
+    Attributes:
+        calls (int): The number of calls
+        total_time (float): The cumulative wall-clock time of all calls in seconds
+        allocated_blocks (int): The cumulative net number of memory blocks allocated by all calls
+            (see sys.getallocatedblocks), i.e. the objects that survived the calls
+    """
+    __slots__ = ("calls", "total_time", "allocated_blocks")
+
+    def __init__(self):
+        """
+        Initialize the counters with zero.
+        """
+        self.calls = 0
+        self.total_time = 0.0
+        self.allocated_blocks = 0
+
+    def as_dict(self) -> dict:
+        """
+        Returns the counters as a plain dictionary.
+
+        Returns:
+            dict: The counters, the times given in milliseconds
+        """
+        return {
+            "calls": self.calls,
+            "total_ms": round(self.total_time * 1000, 3),
+            "avg_us": round(self.total_time * 1_000_000 / self.calls, 3) if self.calls else 0.0,
+            "allocated_blocks": self.allocated_blocks,
+        }
+
+
+class SegmentProfiler:
+    """
+    Collects call counts, cumulative time and allocated memory blocks per segment type.
+
+    A profiler is handed to a single parse (see EdifactMSCONSParser.parse) and is filled by the
+    segment handlers and converters. The handler figures include the figures of its converter.
+    Profilers of several parses can be merged into one aggregate, which is safe to be shared
+    between threads.
+    """
+    HANDLER = "handler"
+    CONVERTER = "converter"
+
+    def __init__(self, track_allocations: bool = False):
+        """
+        Initialize an empty profiler.
+
+        Args:
+            track_allocations: If true, the allocated memory blocks are counted per call. Counting the blocks
+                takes time growing with the heap size and distorts the timings of large interchanges, so it is
+                only enabled where the allocation counts are wanted.
+        """
+        self.__entries: dict[str, dict[str, SegmentProfileEntry]] = {}
+        self.__parse_count = 0
+        self.__lock = threading.Lock()
+        self.__track_allocations = track_allocations
+
+    def start(self) -> tuple[float, int]:
+        """
+        Takes the starting point of a measurement.
+
+        Returns:
+            tuple[float, int]: The current performance counter and the number of allocated memory blocks
+                (0 if the allocations are not tracked)
+        """
+        return time.perf_counter(), sys.getallocatedblocks() if self.__track_allocations else 0
+
+    def record(self, stage: str, segment_type: str, start: tuple[float, int]) -> None:
+        """
+        Records a call of a processing stage for a segment type, measured from the given starting point.
+
+        Args:
+            stage: The processing stage, either SegmentProfiler.HANDLER or SegmentProfiler.CONVERTER
+            segment_type: The segment type (tag) of the processed segment, e.g. 'QTY'
+            start: The starting point taken by SegmentProfiler.start
+        """
+        end_time = time.perf_counter()
+        end_blocks = sys.getallocatedblocks() if self.__track_allocations else 0
+        entry = self.__get_entry(segment_type, stage)
+        entry.calls += 1
+        entry.total_time += end_time - start[0]
+        entry.allocated_blocks += end_blocks - start[1]
+
+    def count_parse(self) -> None:
+        """
+        Counts a parse that was profiled by this profiler.
+        """
+        self.__parse_count += 1
+
+    def merge(self, other: "SegmentProfiler") -> None:
+        """
+        Adds the counters of another profiler (e.g. of a single parse) to this profiler.
+
+        Args:
+            other: The profiler to merge into this one
+        """
+        with self.__lock:
+            self.__parse_count += other.__parse_count
+            for segment_type, stages in other.__entries.items():
+                for stage, other_entry in stages.items():
+                    entry = self.__get_entry(segment_type, stage)
+                    entry.calls += other_entry.calls
+                    entry.total_time += other_entry.total_time
+                    entry.allocated_blocks += other_entry.allocated_blocks
+
+    def reset(self) -> None:
+        """
+        Resets all counters.
+        """
+        with self.__lock:
+            self.__entries = {}
+            self.__parse_count = 0
+
+    def get_entry(self, segment_type: str, stage: str) -> Optional[SegmentProfileEntry]:
+        """
+        Returns the counters of a processing stage for a segment type.
+
+        Args:
+            segment_type: The segment type (tag), e.g. 'QTY'
+            stage: The processing stage, either SegmentProfiler.HANDLER or SegmentProfiler.CONVERTER
+
+        Returns:
+            Optional[SegmentProfileEntry]: The counters, or None if nothing was recorded
+        """
+        return self.__entries.get(segment_type, {}).get(stage)
+
+    def report(self) -> dict:
+        """
+        Returns the recorded counters as a plain dictionary.
+
+        The segment types are ordered by the cumulative handler time, the most expensive first.
+
+        Returns:
+            dict: The number of profiled parses and the counters per segment type and processing stage,
+                e.g. {"parses": 1, "segment_types": {"QTY": {"handler": {...}, "converter": {...}}}}
+        """
+        with self.__lock:
+            def sort_key(item) -> float:
+                handler_entry = item[1].get(SegmentProfiler.HANDLER)
+                return handler_entry.total_time if handler_entry is not None else 0.0
+
+            return {
+                "parses": self.__parse_count,
+                "segment_types": {
+                    segment_type: {stage: entry.as_dict() for stage, entry in stages.items()}
+                    for segment_type, stages in sorted(self.__entries.items(), key=sort_key, reverse=True)
+                },
+            }
+
+    def __get_entry(self, segment_type: str, stage: str) -> SegmentProfileEntry:
+        stages = self.__entries.get(segment_type)
+        if stages is None:
+            stages = self.__entries[segment_type] = {}
+        entry = stages.get(stage)
+        if entry is None:
+            entry = stages[stage] = SegmentProfileEntry()
+        return entry
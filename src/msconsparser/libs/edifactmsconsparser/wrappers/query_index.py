@@ -0,0 +1,195 @@
+"""
+Query indexes of a parsed interchange.
+
+An InterchangeQueryIndex is filled by the segment handlers during a parse, if one is passed to the parser. It maps
+the location IDs (MaLo/MeLo, LOC in SG6), the device numbers (RFF+MG in SG7), the time series types (CCI in SG8)
+and the OBIS codes (PIA in SG9) to the nodes of the parse tree, so that a query returns the matching location
+objects or positions without walking or dumping the whole interchange.
+"""
+from typing import Any, Optional
+
+
+class QueryKey:
+    """
+    Names of the values an interchange is indexed by.
+    """
+    LOCATION = "location"  # The location ID of a location object (LOC DE3225), e.g. a MaLo or MeLo ID
+    DEVICE_NUMBER = "device_number"  # The device number of a location object (RFF+MG DE1154)
+    TIME_SERIES_TYPE = "time_series_type"  # The time series type of a location object (CCI DE7037), e.g. 'BI1'
+    OBIS = "obis"  # The OBIS code of a position (PIA DE7140), e.g. '1-1:1.29.1'
+
+    ALL = (LOCATION, DEVICE_NUMBER, TIME_SERIES_TYPE, OBIS)
+
+
+class QueryIndexEntry:
+    """
+    A node of the parse tree found by a query: a location object (SG6) or one of its positions (SG9).
+    """
+
+    def __init__(self, message_index: int, message: Any, location_object: Any, position: Optional[Any] = None):
+        """
+        Initialize the entry.
+
+        Args:
+            message_index (int): The position of the message in the interchange, starting at 0
+            message: The message (UNH to UNT) of the node
+            location_object: The location object (SG6) of the node
+            position (Optional[Any]): The position (SG9) of the node, None for the location object itself
+        """
+        self.message_index = message_index
+        self.message = message
+        self.location_object = location_object
+        self.position = position
+
+    @property
+    def message_reference(self) -> Optional[str]:
+        """
+        The message reference number (UNH DE0062) of the message of the node.
+        """
+        unh = self.message.unh_nachrichtenkopfsegment
+        return unh.nachrichten_referenznummer if unh is not None else None
+
+    @property
+    def location(self) -> Optional[str]:
+        """
+        The location ID of the location object of the node.
+        """
+        loc = self.location_object.loc_identifikationsangabe
+        return loc.ortsangabe.ortsangabe_code if loc is not None and loc.ortsangabe is not None else None
+
+    def model_dump(self, mode: str = "python") -> dict[str, Any]:
+        """
+        Dumps the node with the message and the location it belongs to.
+
+        Args:
+            mode (str): "python" or "json", see the model_dump of the pydantic models
+
+        Returns:
+            dict[str, Any]: The message index and reference, the location ID and either the dumped location
+                object (key 'sg6_wert_und_erfassungsangaben_zum_objekt') or the dumped position
+                (key 'sg9_positionsdaten')
+        """
+        content = {
+            "message_index": self.message_index,
+            "message_reference": self.message_reference,
+            "location": self.location,
+        }
+        if self.position is None:
+            content["sg6_wert_und_erfassungsangaben_zum_objekt"] = self.location_object.model_dump(mode=mode)
+        else:
+            content["sg9_positionsdaten"] = self.position.model_dump(mode=mode)
+        return content
+
+
+class InterchangeQueryIndex:
+    """
+    In-memory indexes of the location objects and positions of an interchange by their location ID, device number,
+    time series type and OBIS code.
+
+    The entries of a value are kept in the order of the interchange. The index refers to the nodes of the parse
+    tree, which are complete once the parse is finished, so that it must only be queried after the parse.
+    """
+
+    def __init__(self):
+        """
+        Initialize an empty index.
+        """
+        self.__entries: dict[str, dict[str, list[QueryIndexEntry]]] = {key: {} for key in QueryKey.ALL}
+
+    def add(self, key: str, value: Optional[str], entry: QueryIndexEntry) -> None:
+        """
+        Adds a node of the parse tree under a value. An empty value is ignored, as is the same node added twice
+        under the same value, e.g. for two references with the same device number.
+
+        Args:
+            key (str): The kind of the value, see QueryKey
+            value (Optional[str]): The value, e.g. the location ID
+            entry (QueryIndexEntry): The node
+        """
+        if not value:
+            return
+        entries = self.__entries[key].setdefault(value, [])
+        if entries and entries[-1].location_object is entry.location_object \
+                and entries[-1].position is entry.position:
+            return
+        entries.append(entry)
+
+    def find(self, key: str, value: str) -> list[QueryIndexEntry]:
+        """
+        Finds the nodes added under a value.
+
+        Args:
+            key (str): The kind of the value, see QueryKey
+            value (str): The value
+
+        Returns:
+            list[QueryIndexEntry]: The location objects (or the positions for an OBIS code) in the order of the
+                interchange, empty if there is none
+
+        Raises:
+            KeyError: If the key is unknown
+        """
+        return list(self.__entries[key].get(value, ()))
+
+    def values(self, key: str) -> list[str]:
+        """
+        Returns the values of a kind found in the interchange.
+
+        Args:
+            key (str): The kind of the values, see QueryKey
+
+        Returns:
+            list[str]: The values in the order of their first occurrence
+        """
+        return list(self.__entries[key])
+
+    def query(
+            self,
+            location: Optional[str] = None,
+            obis: Optional[str] = None,
+            device_number: Optional[str] = None,
+            time_series_type: Optional[str] = None,
+    ) -> list[QueryIndexEntry]:
+        """
+        Finds the nodes matching all given values. The location objects are matched by their location ID, device
+        number and time series type. If an OBIS code is given, the matching positions of these location objects are
+        returned instead.
+
+        Args:
+            location (Optional[str]): The location ID, e.g. a MaLo or MeLo ID
+            obis (Optional[str]): The OBIS code of the positions, e.g. '1-1:1.29.1'
+            device_number (Optional[str]): The device number
+            time_series_type (Optional[str]): The time series type, e.g. 'BI1'
+
+        Returns:
+            list[QueryIndexEntry]: The matching location objects or positions in the order of the interchange
+
+        Raises:
+            ValueError: If no value is given
+        """
+        criteria = [
+            (key, value) for key, value in (
+                (QueryKey.LOCATION, location),
+                (QueryKey.DEVICE_NUMBER, device_number),
+                (QueryKey.TIME_SERIES_TYPE, time_series_type),
+            ) if value is not None
+        ]
+        if not criteria and obis is None:
+            raise ValueError("At least one of location, obis, device_number or time_series_type is required")
+
+        entries: Optional[list[QueryIndexEntry]] = None
+        for key, value in criteria:
+            found = self.__entries[key].get(value, ())
+            if entries is None:
+                entries = list(found)
+            else:
+                entries = _filter_by_location_objects(entries, found)
+        if obis is None:
+            return entries
+        positions = list(self.__entries[QueryKey.OBIS].get(obis, ()))
+        return positions if entries is None else _filter_by_location_objects(positions, entries)
+
+
+def _filter_by_location_objects(entries: list[QueryIndexEntry], others) -> list[QueryIndexEntry]:
+    location_objects = {id(other.location_object) for other in others}
+    return [entry for entry in entries if id(entry.location_object) in location_objects]
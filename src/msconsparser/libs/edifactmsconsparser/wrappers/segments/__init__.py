@@ -17,7 +17,7 @@ from msconsparser.libs.edifactmsconsparser.wrappers.segments.location import (
 # Import measurement models
 from msconsparser.libs.edifactmsconsparser.wrappers.segments.measurement import (
     SegmentLIN, WarenLeistungsnummerIdentifikation, SegmentPIA,
-    SegmentQTY, Statuskategorie, Status, Statusanlass, SegmentSTS
+    SegmentQTY, SegmentQTYMilli, Statuskategorie, Status, Statusanlass, SegmentSTS
 )
 # Import message models
 from msconsparser.libs.edifactmsconsparser.wrappers.segments.message import (
@@ -38,6 +38,18 @@ from msconsparser.libs.edifactmsconsparser.wrappers.segments.partner import (
 from msconsparser.libs.edifactmsconsparser.wrappers.segments.reference import (
     SegmentDTM, SegmentRFF
 )
+# Import model factory
+from msconsparser.libs.edifactmsconsparser.wrappers.segments.model_factory import (
+    construct_model, construct_strict, construct_trusted
+)
+# Import compact node types
+from msconsparser.libs.edifactmsconsparser.wrappers.segments.compact import (
+    CompactNode, compact_node_type, create_compact_node, to_model
+)
+# Import code list registry
+from msconsparser.libs.edifactmsconsparser.wrappers.segments.code_list_registry import (
+    CodeLabels, CodeListRegistry, get_default_code_list_registry
+)
 # Import segment group models
 from msconsparser.libs.edifactmsconsparser.wrappers.segments.segment_group import (
     SegmentGroup1, SegmentGroup2, SegmentGroup4,
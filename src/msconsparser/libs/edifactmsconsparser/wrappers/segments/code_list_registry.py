@@ -0,0 +1,193 @@
+"""
+Registry of the code lists, which map the qualifier codes of the segments to their labels (Bezeichner).
+
+The labels depend on the segment type, the qualifier code and the segment group of the segment, e.g. the
+DTM qualifier 163 is the "Beginn Messperiode" in SG10, but the "Beginn Messperiode Übertragungszeitraum" in SG6.
+They are defined per MIG version in a declarative table (mscons_code_lists.json) shipped with the package:
+
+    {
+      "default_version": "2.4c",
+      "versions": {
+        "2.4c": {
+          "DTM": [
+            {"qualifier": "137", "label": "Nachrichtendatum"},
+            {"qualifier": "163", "groups": ["SG10"], "label": "Beginn Messperiode"}
+          ]
+        },
+        "2.4d": {"extends": "2.4c", "DTM": [...]}
+      }
+    }
+
+An entry without groups applies to every segment group (and to segments outside of a segment group).
+A version may extend another version, its entries are added to (or replace) the ones of the extended version.
+
+The table is loaded once into immutable dictionaries keyed by (segment type, qualifier code, segment group),
+so resolving a label is a single dictionary lookup.
+"""
+import json
+import os
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Any, Mapping, Optional
+
+from msconsparser.libs.edifactmsconsparser.wrappers.segments.constants import SegmentGroup
+
+# The labels of a MIG version by (segment type, qualifier code, segment group)
+CodeLabels = Mapping[tuple[str, str, Optional[str]], str]
+
+DEFAULT_CODE_LISTS_PATH = os.path.join(os.path.dirname(__file__), "mscons_code_lists.json")
+
+# Segment groups an entry without groups applies to, None stands for segments outside of a segment group
+_ALL_SEGMENT_GROUPS: tuple[Optional[SegmentGroup], ...] = (None, *SegmentGroup)
+
+
+class CodeListRegistry:
+    """
+    The code lists of several MIG versions, see the module description for the table format.
+
+    Attributes:
+        default_version (str): The MIG version used if a message does not specify a known version
+    """
+
+    def __init__(self, code_labels_by_version: Mapping[str, CodeLabels], default_version: str):
+        """
+        Initialize the registry with the labels of the MIG versions.
+
+        Args:
+            code_labels_by_version: The labels by (segment type, qualifier code, segment group) per MIG version
+            default_version: The MIG version used if a message does not specify a known version
+
+        Raises:
+            ValueError: If there are no labels of the default version
+        """
+        if default_version not in code_labels_by_version:
+            raise ValueError(f"No code lists of the default MIG version '{default_version}' defined")
+        self.__code_labels_by_version = MappingProxyType(
+            {version: MappingProxyType(dict(code_labels)) for version, code_labels in code_labels_by_version.items()}
+        )
+        self.default_version = default_version
+
+    @classmethod
+    def from_table(cls, table: dict[str, Any]) -> "CodeListRegistry":
+        """
+        Creates the registry from a declarative table, see the module description for its format.
+
+        Args:
+            table: The table with the default version and the code list entries per MIG version
+
+        Returns:
+            CodeListRegistry: The registry of the MIG versions of the table
+
+        Raises:
+            ValueError: If the table is invalid, e.g. has an unknown segment group or a cyclic extension
+        """
+        versions: dict[str, dict[str, Any]] = table.get("versions", {})
+        code_labels_by_version: dict[str, dict[tuple[str, str, Optional[str]], str]] = {}
+
+        def load_version(version: str, extending: tuple[str, ...]) -> dict[tuple[str, str, Optional[str]], str]:
+            if version in code_labels_by_version:
+                return code_labels_by_version[version]
+            if version in extending:
+                raise ValueError(f"Cyclic extension of the MIG version '{version}'")
+            if version not in versions:
+                raise ValueError(f"Unknown MIG version '{version}'")
+            definition = versions[version]
+            base_version = definition.get("extends")
+            code_labels = dict(load_version(base_version, extending + (version,))) if base_version else {}
+            for segment_type, entries in definition.items():
+                if segment_type == "extends":
+                    continue
+                for entry in entries:
+                    groups = entry.get("groups")
+                    try:
+                        segment_groups = [SegmentGroup(group) for group in groups] if groups else _ALL_SEGMENT_GROUPS
+                    except ValueError as ex:
+                        raise ValueError(f"Invalid code list entry {entry} of the MIG version '{version}': {ex}")
+                    for segment_group in segment_groups:
+                        code_labels[(segment_type, entry["qualifier"], segment_group)] = entry["label"]
+            code_labels_by_version[version] = code_labels
+            return code_labels
+
+        for version in versions:
+            load_version(version, ())
+        return cls(code_labels_by_version, table.get("default_version", ""))
+
+    @classmethod
+    def from_file(cls, path: str) -> "CodeListRegistry":
+        """
+        Creates the registry from a declarative table in a JSON file.
+
+        Args:
+            path: The path of the JSON file
+
+        Returns:
+            CodeListRegistry: The registry of the MIG versions of the table
+        """
+        with open(path, encoding="utf-8") as file:
+            return cls.from_table(json.load(file))
+
+    @property
+    def versions(self) -> tuple[str, ...]:
+        """
+        Returns the MIG versions of the registry.
+        """
+        return tuple(self.__code_labels_by_version)
+
+    def has_version(self, version: Optional[str]) -> bool:
+        """
+        Checks if the registry has the code lists of a MIG version.
+
+        Args:
+            version: The MIG version, e.g. "2.4c"
+
+        Returns:
+            bool: True if the code lists of the version are defined, False otherwise
+        """
+        return version in self.__code_labels_by_version
+
+    def get_code_labels(self, version: Optional[str] = None) -> CodeLabels:
+        """
+        Returns the immutable labels of a MIG version by (segment type, qualifier code, segment group).
+
+        Args:
+            version: The MIG version, defaults to the default version
+
+        Returns:
+            CodeLabels: The labels of the version
+
+        Raises:
+            KeyError: If the registry has no code lists of the version
+        """
+        return self.__code_labels_by_version[version or self.default_version]
+
+    def get_label(
+            self,
+            segment_type: str,
+            qualifier_code: Optional[str],
+            segment_group: Optional[SegmentGroup],
+            version: Optional[str] = None,
+    ) -> Optional[str]:
+        """
+        Returns the label of a qualifier code.
+
+        Args:
+            segment_type: The segment type, e.g. "DTM"
+            qualifier_code: The qualifier code of the segment, e.g. "163"
+            segment_group: The segment group of the segment, None outside of a segment group
+            version: The MIG version, defaults to the default version
+
+        Returns:
+            Optional[str]: The label, or None if the code list has no label for the qualifier code
+        """
+        return self.get_code_labels(version).get((segment_type, qualifier_code, segment_group))
+
+
+@lru_cache(maxsize=None)
+def get_default_code_list_registry() -> CodeListRegistry:
+    """
+    Returns the registry of the code lists shipped with the package, the table is loaded on first use.
+
+    Returns:
+        CodeListRegistry: The default registry
+    """
+    return CodeListRegistry.from_file(DEFAULT_CODE_LISTS_PATH)
@@ -0,0 +1,187 @@
+"""
+Compact node types of the parse tree.
+
+For every pydantic model of the parse tree (from EdifactInterchange down to the segment models), a
+compact node type with the same attributes is provided. The nodes store their fields in `__slots__`
+instead of a per-instance `__dict__` and carry none of pydantic's bookkeeping (fields set, extra and
+private attributes), which reduces the memory of large interchanges considerably.
+
+The nodes are meant for the internal use of the parser: The segment handlers and converters fill them
+like the pydantic models, while the REST adapter dumps them directly (`model_dump`) or converts them
+into the public pydantic models (`to_model`) at the API boundary.
+"""
+import json
+from decimal import Decimal
+from typing import Any, Optional
+
+from pydantic import BaseModel
+from pydantic_core import PydanticUndefined
+
+from msconsparser.libs.edifactmsconsparser.wrappers.segments.model_factory import construct_trusted
+
+# The compact node type per pydantic model class
+_compact_node_types: dict[type, type["CompactNode"]] = {}
+
+
+class CompactNode:
+    """
+    Base class of the compact node types, see compact_node_type.
+
+    Attributes:
+        model_class (type[BaseModel]): The pydantic model class represented by the node type
+        field_specs (tuple[tuple[str, Any, Optional[Callable]], ...]): The field names in declaration order
+            with their defaults and default factories
+    """
+    __slots__ = ()
+
+    model_class: type[BaseModel] = None
+    field_specs: tuple = ()
+
+    def __init__(self, **values: Any):
+        """
+        Initialize the node with the given field values, missing fields get their defaults.
+
+        Args:
+            **values: The field values by field name, unknown names are ignored
+
+        Raises:
+            TypeError: If a required field is missing
+        """
+        for name, default, default_factory in self.field_specs:
+            value = values.get(name, default)
+            if value is PydanticUndefined:
+                if default_factory is None:
+                    raise TypeError(f"{type(self).__name__} missing required field '{name}'")
+                value = default_factory()
+            setattr(self, name, value)
+
+    def model_dump(self, mode: str = "python") -> dict[str, Any]:
+        """
+        Dumps the node with all its child nodes into plain python objects, like pydantic's model_dump.
+
+        Args:
+            mode: "python" keeps the values as they are, "json" dumps Decimal numbers as strings (like pydantic)
+
+        Returns:
+            dict[str, Any]: The field values by field name
+        """
+        dump_value = _dump_json_value if mode == "json" else _dump_value
+        return {name: dump_value(getattr(self, name)) for name, _, _ in self.field_specs}
+
+    def model_dump_json(self) -> str:
+        """
+        Dumps the node with all its child nodes as a compact JSON string.
+
+        Returns:
+            str: The JSON string
+        """
+        return json.dumps(self.model_dump(mode="json"), ensure_ascii=False, separators=(",", ":"))
+
+    def to_model(self) -> BaseModel:
+        """
+        Converts the node with all its child nodes into the public pydantic model.
+
+        The values were already typed by the parser, so the models are created without validation.
+
+        Returns:
+            BaseModel: The pydantic model instance
+        """
+        return construct_trusted(
+            self.model_class,
+            {name: _to_model_value(getattr(self, name)) for name, _, _ in self.field_specs},
+        )
+
+    def __eq__(self, other: object) -> bool:
+        if type(other) is not type(self):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name, _, _ in self.field_specs)
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        fields = ", ".join(f"{name}={getattr(self, name)!r}" for name, _, _ in self.field_specs)
+        return f"{type(self).__name__}({fields})"
+
+
+def _dump_value(value: Any) -> Any:
+    if isinstance(value, CompactNode):
+        return value.model_dump()
+    if isinstance(value, list):
+        return [_dump_value(item) for item in value]
+    return value
+
+
+def _dump_json_value(value: Any) -> Any:
+    if isinstance(value, CompactNode):
+        return value.model_dump(mode="json")
+    if isinstance(value, list):
+        return [_dump_json_value(item) for item in value]
+    if isinstance(value, Decimal):
+        return str(value)
+    return value
+
+
+def _to_model_value(value: Any) -> Any:
+    if isinstance(value, CompactNode):
+        return value.to_model()
+    if isinstance(value, list):
+        return [_to_model_value(item) for item in value]
+    return value
+
+
+def compact_node_type(model_class: type[BaseModel]) -> type[CompactNode]:
+    """
+    Returns the compact node type of a pydantic model class, the type is created on first use.
+
+    The node type is named like the model class with the prefix "Compact" (e.g. CompactSegmentQTY) and
+    has a slot for every field of the model.
+
+    Args:
+        model_class: The pydantic model class of the parse tree
+
+    Returns:
+        type[CompactNode]: The compact node type
+    """
+    node_type = _compact_node_types.get(model_class)
+    if node_type is None:
+        field_specs = tuple(
+            (name, field.default, field.default_factory) for name, field in model_class.model_fields.items()
+        )
+        node_type = type(f"Compact{model_class.__name__}", (CompactNode,), {
+            "__slots__": tuple(model_class.model_fields),
+            "__doc__": f"Compact node of the {model_class.__name__} model.",
+            "__module__": __name__,
+            "model_class": model_class,
+            "field_specs": field_specs,
+        })
+        _compact_node_types[model_class] = node_type
+    return node_type
+
+
+def create_compact_node(model_class: type[BaseModel], values: dict[str, Any]) -> CompactNode:
+    """
+    Creates a compact node of the given pydantic model class.
+
+    Args:
+        model_class: The pydantic model class of the parse tree
+        values: The field values by field name
+
+    Returns:
+        CompactNode: The compact node
+    """
+    return compact_node_type(model_class)(**values)
+
+
+def to_model(node: Any) -> Optional[BaseModel]:
+    """
+    Converts a compact node into its pydantic model, pydantic models (and None) are returned as they are.
+
+    Args:
+        node: The compact node, the pydantic model or None
+
+    Returns:
+        Optional[BaseModel]: The pydantic model
+    """
+    if isinstance(node, CompactNode):
+        return node.to_model()
+    return node
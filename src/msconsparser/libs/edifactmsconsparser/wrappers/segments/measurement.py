@@ -5,7 +5,8 @@ These models represent measurement data and related information in the MSCONS me
 According to the MSCONS D.04B 2.4c standard, these segments are used to provide
 detailed measurement values, their units, status information, and timestamps.
 """
-from typing import Optional
+from decimal import Decimal
+from typing import Optional, Union
 
 from pydantic import BaseModel
 
@@ -75,10 +76,21 @@ class SegmentQTY(BaseModel):
     - 'D54': Watt/m²
     """
     menge_qualifier: Optional[str] = None  # e.g., '220' Wahrer Wert, '67' Ersatzwert
-    menge: Optional[float] = None  # The quantity value
+    # The quantity value in the unit, a Decimal in the decimal numeric mode of the parser, else a float
+    menge: Optional[Union[float, Decimal]] = None
     masseinheit_code: Optional[str] = None  # e.g., 'KWH', 'KWT', 'D54'
 
 
+class SegmentQTYMilli(SegmentQTY):
+    """
+    QTY-Segment (Quantity / Mengenelement) of the milli numeric mode.
+
+    The quantity stays in the unit (menge) and the exact quantity in thousandths of the unit is added,
+    e.g. 4250465 for 4250.465 kWh. The QTY segments of the other numeric modes have no such field.
+    """
+    menge_milli: Optional[int] = None  # NON-EDIFACT exact quantity in thousandths of the unit
+
+
 class Statuskategorie(BaseModel):
     """
     Status category (Statuskategorie).
@@ -0,0 +1,198 @@
+"""
+Factory for the segment models created by the segment converters.
+
+The converters create millions of small segment models from values that were already typed by the
+parser itself (strings from the tokenizer, floats from the decimal conversion and ints from the
+counters). Validating these values again in the pydantic constructor is pure overhead, so the
+models are created on a trusted path by default, which fills the fields directly. The strict path
+validates the values in pydantic's strict mode (no type coercion) and is meant for debugging converters.
+
+The trusted path sets the instance attributes that pydantic's model_construct sets. model_construct itself
+is not used, as it inspects the signature of every default factory per call and is slower than the
+validating constructor. As these attributes are internals of pydantic, they are checked against
+model_construct once on import. If a pydantic version sets other attributes, the trusted path falls back
+to model_construct.
+"""
+import copy
+import logging
+from enum import Enum
+from typing import Any, Callable, Optional, TypeVar
+
+from pydantic import BaseModel, Field
+from pydantic_core import PydanticUndefined
+
+logger = logging.getLogger(__name__)
+
+M = TypeVar('M', bound=BaseModel)
+
+_new_instance = object.__new__
+_set_attribute = object.__setattr__
+
+# The instance attributes set by pydantic's model_construct, see _is_trusted_construction_supported
+_INSTANCE_ATTRIBUTES = ("__dict__", "__pydantic_fields_set__", "__pydantic_extra__", "__pydantic_private__")
+
+# Defaults of these types are shared between the instances, all other defaults are copied per instance
+_IMMUTABLE_DEFAULT_TYPES = (type(None), bool, int, float, str, bytes, Enum, tuple, frozenset)
+
+# The field names and the (field name, default, default factory) triples of a model class in declaration order
+_FieldSpec = tuple[tuple[str, ...], tuple[tuple[str, Any, Optional[Callable[[], Any]]], ...]]
+
+# Per model class its field spec, or None if the trusted construction is not applicable to the model class and
+# model_construct is used instead
+_field_specs: dict[type, Optional[_FieldSpec]] = {}
+
+
+def _get_field_spec(
+        model_class: type[BaseModel],
+) -> Optional[_FieldSpec]:
+    try:
+        return _field_specs[model_class]
+    except KeyError:
+        pass
+    field_spec = None
+    if (
+            not model_class.__private_attributes__
+            and model_class.model_config.get("extra") != "allow"
+            and model_class.__pydantic_post_init__ is None
+            # Default factories taking the validated data are supported by pydantic 2.10 and later
+            and not any(getattr(field, "default_factory_takes_validated_data", False)
+                        for field in model_class.model_fields.values())
+    ):
+        field_spec = (
+            tuple(model_class.model_fields),
+            tuple(
+                (name, field.default, field.default_factory) for name, field in model_class.model_fields.items()
+            ),
+        )
+    _field_specs[model_class] = field_spec
+    return field_spec
+
+
+def _create_instance(model_class: type[M], fields: dict[str, Any], fields_set: set[str]) -> M:
+    instance = _new_instance(model_class)
+    _set_attribute(instance, "__dict__", fields)
+    _set_attribute(instance, "__pydantic_fields_set__", fields_set)
+    _set_attribute(instance, "__pydantic_extra__", None)
+    _set_attribute(instance, "__pydantic_private__", None)
+    return instance
+
+
+def _is_trusted_construction_supported() -> bool:
+    """
+    Checks if the instance attributes set by the trusted path are the ones of the installed pydantic version,
+    by comparing an instance of a probe model with the one created by model_construct.
+
+    Returns:
+        bool: True if the trusted path creates the same instances as model_construct
+    """
+    if tuple(getattr(BaseModel, "__slots__", ())) != _INSTANCE_ATTRIBUTES:
+        return False
+
+    class Probe(BaseModel):
+        code: str
+        values: list[int] = Field(default_factory=list)
+
+    try:
+        expected = Probe.model_construct(code="Z01")
+        instance = _create_instance(Probe, {"code": "Z01", "values": []}, {"code"})
+        return (
+                all(getattr(instance, name) == getattr(expected, name) for name in _INSTANCE_ATTRIBUTES)
+                and instance == expected
+                and instance.model_dump_json() == expected.model_dump_json()
+        )
+    except Exception:
+        return False
+
+
+_trusted_construction_supported = _is_trusted_construction_supported()
+if not _trusted_construction_supported:
+    logger.warning("The trusted model construction does not match the installed pydantic version, "
+                   "using model_construct")
+
+
+def construct_trusted(model_class: type[M], values: dict[str, Any]) -> M:
+    """
+    Creates a model instance from trusted values without validating them.
+
+    The instance equals the one created by the validating constructor, provided that the values already
+    have the types of the fields. Unknown field names are ignored and missing fields get their defaults
+    (default factories are called and mutable defaults are copied per instance). Models with private
+    attributes, extra fields or a post init hook are created with pydantic's model_construct, as are all
+    models if the installed pydantic version sets other instance attributes than the trusted path.
+
+    Passing all fields in declaration order (as the converters do) is the fastest path, as the given
+    dictionary becomes the field dictionary of the instance.
+
+    Args:
+        model_class: The model class to create an instance of
+        values: The field values by field name, the dictionary is taken over by the instance
+
+    Returns:
+        The model instance
+
+    Raises:
+        ValidationError: If a required field is missing
+    """
+    field_spec = _get_field_spec(model_class) if _trusted_construction_supported else None
+    if field_spec is None:
+        return model_class.model_construct(**values)
+
+    field_names, field_defaults = field_spec
+    if len(values) == len(field_names) and tuple(values) == field_names:
+        fields = values
+        fields_set = set(values)
+    else:
+        fields = {}
+        fields_set = {name for name in values if name in field_names}
+        for name, default, default_factory in field_defaults:
+            if name in values:
+                value = values[name]
+            elif default_factory is not None:
+                value = default_factory()
+            elif default is PydanticUndefined:
+                # Let the validating constructor raise the error of the missing required field
+                return model_class(**values)
+            elif isinstance(default, _IMMUTABLE_DEFAULT_TYPES):
+                value = default
+            else:
+                value = copy.deepcopy(default)
+            fields[name] = value
+
+    return _create_instance(model_class, fields, fields_set)
+
+
+def construct_strict(model_class: type[M], values: dict[str, Any]) -> M:
+    """
+    Creates a model instance by validating the values in pydantic's strict mode.
+
+    In contrast to the lax mode of the constructor, no values are coerced (e.g. a str for an int field),
+    which reveals converters producing values of the wrong type.
+
+    Args:
+        model_class: The model class to create an instance of
+        values: The field values by field name
+
+    Returns:
+        The validated model instance
+
+    Raises:
+        ValidationError: If a value does not have the type of its field or a required field is missing
+    """
+    return model_class.model_validate(values, strict=True)
+
+
+def construct_model(model_class: type[M], values: dict[str, Any], strict: bool = False) -> M:
+    """
+    Creates a model instance on the trusted or on the strict path.
+
+    Args:
+        model_class: The model class to create an instance of
+        values: The field values by field name
+        strict: If true, the values are validated in pydantic's strict mode, otherwise they are trusted
+
+    Returns:
+        The model instance
+    """
+    if strict:
+        return construct_strict(model_class, values)
+    return construct_trusted(model_class, values)
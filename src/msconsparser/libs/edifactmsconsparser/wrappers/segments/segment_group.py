@@ -7,7 +7,7 @@ the segments in a message.
 """
 from typing import Optional
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, SerializeAsAny
 
 from msconsparser.libs.edifactmsconsparser.wrappers.segments.location import SegmentLOC, SegmentCCI
 from msconsparser.libs.edifactmsconsparser.wrappers.segments.measurement import (
@@ -87,7 +87,8 @@ class SegmentGroup10(BaseModel):
     This group is used to provide the actual measurement values along with their
     timestamps and status information.
     """
-    qty_mengenangaben: Optional[SegmentQTY] = None  # Quantity information
+    # Quantity information, a SegmentQTYMilli in the milli numeric mode (dumped with its own fields)
+    qty_mengenangaben: Optional[SerializeAsAny[SegmentQTY]] = None
     dtm_zeitangaben: list[SegmentDTM] = Field(default_factory=list)  # Time information
     sts_statusangaben: list[SegmentSTS] = Field(default_factory=list)  # Status information
 
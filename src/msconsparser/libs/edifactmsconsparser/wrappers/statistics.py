@@ -0,0 +1,131 @@
+"""
+Statistics collected while parsing MSCONS interchanges.
+
+This module provides the statistics object that callers can hand to the parser
+to learn where the time of a single parse goes (per processing phase) and how
+large the parsed interchange was (segments, messages, bytes).
+"""
+import time
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+
+class ParsePhase:
+    """
+    Names of the processing phases measured for a single parse request.
+
+    The phases are listed in the order in which they are executed by the parsing pipeline,
+    from decoding the raw payload up to encoding the JSON response.
+    """
+    DECODE = "decode"  # Decoding the raw payload bytes into a string
+    UNA = "una"  # Detecting and processing the UNA service string advice
+    TOKENIZE = "tokenize"  # Splitting the interchange into segments
+    CONVERT = "convert"  # Running the segment handlers and converters
+    SERIALIZE = "serialize"  # Dumping the parsed interchange into plain python objects (model_dump)
+    STORE = "store"  # Storing the dumped interchange in the measurement store
+    ENCODE = "encode"  # Encoding the dumped interchange as JSON
+
+
+class ParseStatistics:
+    """
+    Collects per-phase timings and size figures for a single parse.
+
+    The parser fills in the phases it executes itself (UNA detection, tokenizing and converting)
+    together with the segment and message counts, while the caller (e.g. the REST adapter) adds
+    the phases around the parser (decoding, serializing, encoding) and the payload size.
+
+    Attributes:
+        phase_durations (dict[str, float]): The measured duration in seconds per phase, in execution order
+        segment_count (int): The number of segments of the interchange
+        message_count (int): The number of messages (UNH...UNT) of the interchange
+        byte_count (Optional[int]): The size of the parsed payload in bytes as set by the caller,
+            the parser falls back to the number of characters of the parsed text
+        conversion_cache (dict[str, dict]): The hits, misses and hit rate of the conversion cache per segment type
+        recovered_prefix_count (int): The number of segments whose invalid prefix was removed
+    """
+
+    def __init__(self):
+        """
+        Initialize empty statistics.
+        """
+        self.phase_durations: dict[str, float] = {}
+        self.segment_count: int = 0
+        self.message_count: int = 0
+        self.byte_count: Optional[int] = None
+        self.conversion_cache: dict[str, dict] = {}
+        self.recovered_prefix_count: int = 0
+
+    def record_phase(self, phase: str, duration: float) -> None:
+        """
+        Records the duration of a phase. Durations of repeated phases are accumulated.
+
+        Args:
+            phase: The name of the phase, see ParsePhase
+            duration: The duration of the phase in seconds
+        """
+        self.phase_durations[phase] = self.phase_durations.get(phase, 0.0) + duration
+
+    @contextmanager
+    def measure(self, phase: str) -> Iterator[None]:
+        """
+        Context manager measuring the wall-clock duration of the enclosed block as the given phase.
+
+        Args:
+            phase: The name of the phase, see ParsePhase
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record_phase(phase, time.perf_counter() - start)
+
+    @property
+    def total_duration(self) -> float:
+        """
+        Returns the sum of all recorded phase durations in seconds.
+        """
+        return sum(self.phase_durations.values())
+
+    def to_server_timing(self) -> str:
+        """
+        Formats the phase durations as the value of a `Server-Timing` HTTP header.
+
+        Durations are given in milliseconds, see https://www.w3.org/TR/server-timing/.
+
+        Returns:
+            str: The header value, e.g. "decode;dur=0.52, una;dur=0.01, tokenize;dur=1.20"
+        """
+        return ", ".join(
+            f"{phase};dur={duration * 1000:.2f}" for phase, duration in self.phase_durations.items()
+        )
+
+    def to_stats_header(self) -> str:
+        """
+        Formats the size figures as the value of the `X-Parse-Stats` HTTP header.
+
+        Returns:
+            str: The header value, e.g. "segments=26; messages=2; bytes=1622"
+        """
+        byte_count = self.byte_count if self.byte_count is not None else 0
+        return f"segments={self.segment_count}; messages={self.message_count}; bytes={byte_count}"
+
+    def as_dict(self) -> dict:
+        """
+        Returns the statistics as a plain dictionary, e.g. to be used as a structured log record.
+
+        Returns:
+            dict: The size figures, the phase durations in milliseconds, the recovered prefixes and the conversion
+                cache hits (if any)
+        """
+        result = {
+            "segments": self.segment_count,
+            "messages": self.message_count,
+            "bytes": self.byte_count,
+            "phases_ms": {phase: round(duration * 1000, 3) for phase, duration in self.phase_durations.items()},
+            "total_ms": round(self.total_duration * 1000, 3),
+        }
+        if self.recovered_prefix_count:
+            result["recovered_prefixes"] = self.recovered_prefix_count
+        if self.conversion_cache:
+            result["conversion_cache"] = self.conversion_cache
+        return result
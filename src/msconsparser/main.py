@@ -13,6 +13,27 @@ from fastapi.responses import RedirectResponse
 from msconsparser.adapters.inbound.rest import main
 from msconsparser.adapters.inbound.rest.impl.health_check_routers import router as HealthChecksApiRouter
 from msconsparser.adapters.inbound.rest.impl.lifespan_events import startup_lifespan
+from msconsparser.adapters.inbound.rest.impl.measurement_store_routers import (
+    MEASUREMENT_STORE_INTERCHANGES_PATH, router as MeasurementStoreApiRouter, shutdown_measurement_store_service
+)
+from msconsparser.adapters.inbound.rest.impl.parse_batch_routers import (
+    router as ParseBatchApiRouter, shutdown_batch_parse_service
+)
+from msconsparser.adapters.inbound.rest.impl.parse_cancellation_routers import (
+    router as ParseCancellationApiRouter, ParseCancellationMiddleware
+)
+from msconsparser.adapters.inbound.rest.impl.parse_job_routers import (
+    router as ParseJobApiRouter, shutdown_parse_job_service
+)
+from msconsparser.adapters.inbound.rest.impl.parse_mscons_routers import (
+    PARSE_BUDGET_ENDPOINTS, ParseBudgetMiddleware, message_selection_middleware
+)
+from msconsparser.adapters.inbound.rest.impl.parse_query_routers import (
+    router as ParseQueryApiRouter, PARSE_QUERY_PATH
+)
+from msconsparser.adapters.inbound.rest.impl.segment_profiling_routers import (
+    router as SegmentProfilingApiRouter, segment_profiling_middleware
+)
 from msconsparser.infrastructure.logging_config import get_logging_config
 
 logging.config.dictConfig(get_logging_config())
@@ -22,9 +43,38 @@ app = main.app
 # Add event handler during application startup
 app.add_event_handler("startup", startup_lifespan)
 
+# Cancel the running parse jobs and stop their workers during application shutdown
+app.add_event_handler("shutdown", shutdown_parse_job_service)
+
+# Stop the worker processes of the batch parse during application shutdown
+app.add_event_handler("shutdown", shutdown_batch_parse_service)
+
+# Close the database of the measurement store during application shutdown
+app.add_event_handler("shutdown", shutdown_measurement_store_service)
+
+# Enable the segment profiling per request via the X-Profile-Segments header
+app.middleware("http")(segment_profiling_middleware)
+
+# Reject payloads exceeding the byte budget of a parse endpoint with status 413
+app.add_middleware(ParseBudgetMiddleware)
+
+# Select the messages of the response of a parse endpoint via the message_index, offset and limit query parameters
+app.middleware("http")(message_selection_middleware)
+
+# Cancel the parse of a request if the client disconnects or the request timeout passes
+app.add_middleware(ParseCancellationMiddleware, paths=[
+    *PARSE_BUDGET_ENDPOINTS.keys(), PARSE_QUERY_PATH, MEASUREMENT_STORE_INTERCHANGES_PATH
+])
+
 # Make a redirect to the swagger-ui docs when accessing the base url
 @app.get("/", include_in_schema=False)
 async def docs_redirect() -> RedirectResponse:
     return RedirectResponse(url=str(app.docs_url))
 
 app.include_router(HealthChecksApiRouter)
+app.include_router(SegmentProfilingApiRouter)
+app.include_router(ParseCancellationApiRouter)
+app.include_router(ParseJobApiRouter)
+app.include_router(ParseBatchApiRouter)
+app.include_router(ParseQueryApiRouter)
+app.include_router(MeasurementStoreApiRouter)
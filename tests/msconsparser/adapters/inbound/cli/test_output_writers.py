@@ -0,0 +1,114 @@
+import io
+import json
+import os
+import tempfile
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from msconsparser.adapters.inbound.cli.output_writers import (
+    DirectoryRecordWriter, StreamRecordWriter, get_output_file_name, iter_interval_rows
+)
+from msconsparser.application.services import BatchParseService
+from msconsparser.libs.edifactmsconsparser.edifact_mscons_parser import EdifactMSCONSParser
+from msconsparser.libs.edifactmsconsparser.generators import MSCONSGeneratorSettings, MSCONSInterchangeGenerator
+
+
+class TestOutputWriters(unittest.TestCase):
+    """Test cases for the writers of the records of the batch parse."""
+
+    def setUp(self):
+        """Parse an interchange in chunks of one message and a bad file."""
+        settings = MSCONSGeneratorSettings(seed=42, messages=3, intervals_per_position=2)
+        self.edifact_text = "".join(MSCONSInterchangeGenerator(settings).iter_segments())
+        service = BatchParseService(max_workers=1, executor=ThreadPoolExecutor(max_workers=1), chunk_size=1)
+        files = [("2024/a.edi", io.BytesIO(self.edifact_text.encode("utf-8"))), ("bad.edi", b"")]
+        try:
+            self.lines = list(service.iter_records(files))
+        finally:
+            service.shutdown()
+        self.records = [json.loads(line) for line in self.lines]
+
+    def write(self, writer) -> None:
+        for record, line in zip(self.records, self.lines):
+            writer.write(record, line)
+        writer.close()
+
+    def test_directory_writer_json(self):
+        """Test that the parsed interchange of a file is written and failed files have no output."""
+        with tempfile.TemporaryDirectory() as output_dir:
+            # Arrange
+            with open(os.path.join(output_dir, "bad.edi.json"), "w", encoding="utf-8") as file:
+                file.write("{}")
+
+            # Act
+            self.write(DirectoryRecordWriter(output_dir, "json"))
+
+            # Assert
+            with open(os.path.join(output_dir, "2024", "a.edi.json"), encoding="utf-8") as file:
+                interchange = json.load(file)
+            expected = EdifactMSCONSParser().parse(self.edifact_text).model_dump(mode="json")
+            self.assertEqual(expected, interchange)
+            self.assertEqual(list(expected), list(interchange))
+            self.assertFalse(os.path.exists(os.path.join(output_dir, "bad.edi.json")))
+
+    def test_directory_writer_ndjson(self):
+        """Test that the records of each file are written to its own file, including the errors."""
+        with tempfile.TemporaryDirectory() as output_dir:
+            # Act
+            self.write(DirectoryRecordWriter(output_dir, "ndjson"))
+
+            # Assert
+            with open(os.path.join(output_dir, "2024", "a.edi.ndjson"), encoding="utf-8") as file:
+                self.assertEqual(1, len(file.read().splitlines()))
+            with open(os.path.join(output_dir, "bad.edi.ndjson"), encoding="utf-8") as file:
+                self.assertEqual("error", json.loads(file.read())["status"])
+
+    def test_stream_writer(self):
+        """Test that the records are written as JSON array and the intervals as CSV rows."""
+        # Arrange
+        json_output = io.BytesIO()
+        csv_output = io.BytesIO()
+
+        # Act
+        self.write(StreamRecordWriter(json_output, "json"))
+        self.write(StreamRecordWriter(csv_output, "csv"))
+
+        # Assert
+        self.assertEqual(self.records, json.loads(json_output.getvalue()))
+        csv_lines = csv_output.getvalue().decode("utf-8").splitlines()
+        self.assertEqual("file_name,message,location,product_code,quantity_qualifier,quantity,unit,start,end",
+                         csv_lines[0])
+        self.assertEqual(1 + 3 * 2, len(csv_lines))
+        self.assertTrue(all(line.startswith("2024/a.edi,") for line in csv_lines[1:]))
+
+    def test_stream_writer_without_records(self):
+        """Test that an empty batch is an empty JSON array and a CSV header."""
+        for output_format, expected in (("json", b"[]\n"), ("ndjson", b""), ("csv", b"file_name,")):
+            with self.subTest(output_format=output_format):
+                output = io.BytesIO()
+                StreamRecordWriter(output, output_format).close()
+                self.assertTrue(output.getvalue().startswith(expected))
+
+    def test_iter_interval_rows(self):
+        """Test that an interval is flattened with its location, product code, quantity and period."""
+        # Act
+        row = next(iter_interval_rows("a.edi", self.records[0]["result"]))
+
+        # Assert
+        self.assertEqual("a.edi", row["file_name"])
+        self.assertEqual("1", row["message"])
+        self.assertIsNotNone(row["location"])
+        self.assertIsNotNone(row["product_code"])
+        self.assertIsInstance(row["quantity"], float)
+        self.assertLess(row["start"], row["end"])
+
+    def test_get_output_file_name(self):
+        """Test that the output files stay within the output directory."""
+        self.assertEqual(os.path.join("archive.zip", "2024", "a.edi.json"),
+                         get_output_file_name("/archive.zip/../2024/./a.edi", "json"))
+        self.assertEqual(os.path.join("data", "a.edi.csv"), get_output_file_name("C:\\data\\a.edi", "csv"))
+        self.assertEqual("stdin.ndjson", get_output_file_name("", "ndjson"))
+
+
+if __name__ == "__main__":
+    unittest.main()
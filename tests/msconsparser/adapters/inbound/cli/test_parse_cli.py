@@ -0,0 +1,188 @@
+import gzip
+import io
+import json
+import os
+import tarfile
+import tempfile
+import unittest
+import zipfile
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import redirect_stderr
+from io import StringIO
+from unittest.mock import patch
+
+from msconsparser.adapters.inbound.cli.output_writers import StreamRecordWriter
+from msconsparser.adapters.inbound.cli.parse_cli import (
+    BatchProgress, get_member_name, iter_batch_files, iter_input_paths, main, run_batch
+)
+from msconsparser.adapters.inbound.cli.parse_manifest import ParseManifest
+from msconsparser.application.services import BatchParseService
+from msconsparser.libs.edifactmsconsparser.generators import MSCONSGeneratorSettings, MSCONSInterchangeGenerator
+
+
+def generate_interchange(seed: int, messages: int = 1) -> str:
+    settings = MSCONSGeneratorSettings(seed=seed, messages=messages, intervals_per_position=2)
+    return "".join(MSCONSInterchangeGenerator(settings).iter_segments())
+
+
+class TestParseCli(unittest.TestCase):
+    """Test cases for the command line interface of the batch parse."""
+
+    def setUp(self):
+        """Create a directory of input files."""
+        self.directory = tempfile.TemporaryDirectory()
+        self.input_dir = os.path.join(self.directory.name, "in")
+        os.makedirs(os.path.join(self.input_dir, "sub"))
+        self.interchanges = {}
+        for seed, file_name in enumerate(("a.edi", "b.edi", os.path.join("sub", "c.edi"))):
+            self.interchanges[file_name] = generate_interchange(seed)
+            with open(os.path.join(self.input_dir, file_name), "w", encoding="utf-8") as file:
+                file.write(self.interchanges[file_name])
+
+    def tearDown(self):
+        """Remove the input files."""
+        self.directory.cleanup()
+
+    def run_batch(self, paths, manifest=None, stdin=None) -> tuple[list, BatchProgress]:
+        output = io.BytesIO()
+        progress = BatchProgress(StringIO(), show_progress=False)
+        service = BatchParseService(max_workers=2, executor=ThreadPoolExecutor(max_workers=2), chunk_size=1)
+        try:
+            run_batch(service, iter(paths), StreamRecordWriter(output), progress, manifest=manifest, stdin=stdin)
+        finally:
+            service.shutdown()
+        return [json.loads(line) for line in output.getvalue().splitlines()], progress
+
+    def test_iter_input_paths(self):
+        """Test that files, directories and glob patterns are resolved in sorted order."""
+        # Arrange
+        a_path = os.path.join(self.input_dir, "a.edi")
+        c_path = os.path.join(self.input_dir, "sub", "c.edi")
+
+        # Act
+        paths = list(iter_input_paths([a_path, self.input_dir, os.path.join(self.input_dir, "**", "c.*"), "-",
+                                       "missing.edi"]))
+
+        # Assert
+        self.assertEqual([a_path, a_path, os.path.join(self.input_dir, "b.edi"), c_path, c_path, "-", "missing.edi"],
+                         paths)
+
+    def test_iter_input_paths_without_excluded_paths(self):
+        """Test that the manifest and the output directory are not parsed."""
+        # Arrange
+        output_dir = os.path.join(self.input_dir, "sub")
+        manifest_path = os.path.join(self.input_dir, "b.edi")
+
+        # Act
+        paths = list(iter_input_paths([self.input_dir], excluded_paths=[manifest_path, output_dir]))
+
+        # Assert
+        self.assertEqual([os.path.join(self.input_dir, "a.edi")], paths)
+
+    def test_get_member_name(self):
+        """Test that the members of archives are named after the archive."""
+        self.assertEqual("a.edi", get_member_name("a.edi", "a.edi"))
+        self.assertEqual("a.edi", get_member_name("a.edi.gz", "a.edi"))
+        self.assertEqual("m.tar.gz/2024/a.edi", get_member_name("m.tar.gz", "2024/a.edi"))
+
+    def test_run_batch_with_archive_and_stdin(self):
+        """Test that the members of an archive and stdin are parsed, with one record per file."""
+        # Arrange
+        archive_path = os.path.join(self.directory.name, "monthly.tar.gz")
+        with tarfile.open(archive_path, "w:gz") as archive:
+            archive.add(os.path.join(self.input_dir, "a.edi"), arcname="2024/a.edi")
+        stdin = io.BytesIO(gzip.compress(generate_interchange(7, messages=2).encode("utf-8")))
+
+        # Act
+        records, progress = self.run_batch([archive_path, "-", "missing.edi"], stdin=stdin)
+
+        # Assert
+        self.assertEqual([(f"{archive_path}/2024/a.edi", "ok"), ("stdin", "ok"), ("missing.edi", "error")],
+                         [(record["file_name"], record["status"]) for record in records])
+        self.assertEqual(2, len(records[1]["result"]["unh_unt_nachrichten"]))
+        self.assertEqual((3, 1), (progress.file_count, progress.error_count))
+        self.assertFalse(stdin.closed)
+
+    def test_run_batch_with_manifest(self):
+        """Test that inputs parsed without errors are recorded and skipped by the next run, as are duplicates."""
+        # Arrange
+        manifest_path = os.path.join(self.directory.name, "manifest.jsonl")
+        bad_path = os.path.join(self.input_dir, "bad.edi")
+        with open(bad_path, "wb") as file:
+            file.write(b"  \n")
+        with open(os.path.join(self.input_dir, "copy.edi"), "w", encoding="utf-8") as file:
+            file.write(self.interchanges["a.edi"])
+        paths = sorted(iter_input_paths([self.input_dir]))
+
+        # Act
+        manifest = ParseManifest(manifest_path)
+        first_records, first_progress = self.run_batch(paths, manifest=manifest)
+        manifest.close()
+        manifest = ParseManifest(manifest_path)
+        second_records, second_progress = self.run_batch(paths, manifest=manifest)
+        manifest.close()
+
+        # Assert
+        self.assertEqual(4, len(first_records))
+        self.assertEqual(1, first_progress.skipped_count)
+        self.assertEqual([bad_path], [record["file_name"] for record in second_records])
+        self.assertEqual(4, second_progress.skipped_count)
+        with open(manifest_path, encoding="utf-8") as file:
+            entries = [json.loads(line) for line in file]
+        self.assertEqual(["error", "error"], [entry["status"] for entry in entries if entry["input"] == bad_path])
+        self.assertEqual(5, len(entries))
+
+    def test_iter_batch_files_with_empty_archive(self):
+        """Test that an input without files is started without returning a file."""
+        # Arrange
+        archive_path = os.path.join(self.directory.name, "empty.zip")
+        with zipfile.ZipFile(archive_path, "w"):
+            pass
+        started_inputs = deque()
+
+        # Act
+        files = list(iter_batch_files(iter([archive_path]), started_inputs))
+
+        # Assert
+        self.assertEqual([], files)
+        self.assertEqual([archive_path], [batch_input.name for batch_input in started_inputs])
+
+    def test_main_writes_csv_files(self):
+        """Test that main parses in worker processes and writes one CSV file per parsed file."""
+        # Arrange
+        output_dir = os.path.join(self.directory.name, "out")
+
+        # Act
+        with redirect_stderr(StringIO()) as stderr:
+            exit_code = main([self.input_dir, "--format", "csv", "--output-dir", output_dir, "--workers", "1"])
+
+        # Assert
+        self.assertEqual(0, exit_code)
+        self.assertIn("Parsed 3 files", stderr.getvalue())
+        self.assertIn("files/s", stderr.getvalue())
+        output_path = os.path.join(output_dir, self.input_dir.lstrip(os.sep), "sub", "c.edi.csv")
+        with open(output_path, encoding="utf-8") as file:
+            lines = file.read().splitlines()
+        self.assertEqual("file_name,message,location,product_code,quantity_qualifier,quantity,unit,start,end", lines[0])
+        self.assertEqual(3, len(lines))
+
+    def test_main_returns_error_for_failed_files(self):
+        """Test that main exits with 1 if a file could not be parsed."""
+        # Act
+        with redirect_stderr(StringIO()), patch("sys.stdout", new=io.TextIOWrapper(io.BytesIO())):
+            exit_code = main([os.path.join(self.directory.name, "missing.edi"), "--workers", "1", "--quiet"])
+
+        # Assert
+        self.assertEqual(1, exit_code)
+
+    def test_main_rejects_invalid_arguments(self):
+        """Test that main exits with a usage error for invalid numbers of workers."""
+        with redirect_stderr(StringIO()), self.assertRaises(SystemExit) as context:
+            main(["--workers", "0"])
+
+        self.assertEqual(2, context.exception.code)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,48 @@
+import io
+import os
+import tempfile
+import unittest
+
+from msconsparser.adapters.inbound.cli.parse_manifest import ParseManifest, hash_content
+
+
+class TestParseManifest(unittest.TestCase):
+    """Test cases for the manifest of the parsed inputs."""
+
+    def test_record_and_reload(self):
+        """Test that inputs parsed without errors are skipped after a reload and a truncated line is ignored."""
+        with tempfile.TemporaryDirectory() as directory:
+            # Arrange
+            path = os.path.join(directory, "state", "manifest.jsonl")
+            manifest = ParseManifest(path)
+
+            # Act
+            manifest.record("ok-hash", "a.edi", is_ok=True)
+            manifest.record("error-hash", "b.edi", is_ok=False)
+            manifest.close()
+            with open(path, "a", encoding="utf-8") as file:
+                file.write('{"sha256": "trunc')
+            reloaded = ParseManifest(path)
+
+            # Assert
+            self.assertTrue(manifest.is_parsed("ok-hash"))
+            self.assertTrue(reloaded.is_parsed("ok-hash"))
+            self.assertFalse(reloaded.is_parsed("error-hash"))
+            self.assertFalse(reloaded.is_parsed("trunc"))
+
+    def test_hash_content(self):
+        """Test that the content hash does not depend on the name and keeps the position of the stream."""
+        # Arrange
+        stream = io.BytesIO(b"UNA:+.? 'UNB+UNOC:3'")
+
+        # Act
+        content_hash = hash_content(stream)
+
+        # Assert
+        self.assertEqual(hash_content(io.BytesIO(b"UNA:+.? 'UNB+UNOC:3'")), content_hash)
+        self.assertEqual(64, len(content_hash))
+        self.assertEqual(0, stream.tell())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,157 @@
+import os
+import re
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from fastapi import FastAPI, status
+from fastapi.testclient import TestClient
+
+from msconsparser.adapters.inbound.rest.impl import measurement_store_routers
+from msconsparser.adapters.inbound.rest.impl.measurement_store_routers import (
+    MEASUREMENT_STORE_INTERCHANGES_PATH, MEASUREMENT_STORE_MEASUREMENTS_PATH, router, shutdown_measurement_store_service
+)
+from msconsparser.libs.edifactmsconsparser.generators import MSCONSGeneratorSettings, MSCONSInterchangeGenerator
+
+
+class TestMeasurementStoreRouters(unittest.TestCase):
+    """Test cases for the measurement store endpoints."""
+
+    def setUp(self):
+        """Set up test fixtures with a store in a temporary database file."""
+        self.directory = tempfile.TemporaryDirectory()
+        self.environment = patch.dict(
+            os.environ, {"MEASUREMENT_STORE_PATH": os.path.join(self.directory.name, "measurements.db")}
+        )
+        self.environment.start()
+        app = FastAPI()
+        app.include_router(router)
+        self.client = TestClient(app)
+        settings = MSCONSGeneratorSettings(seed=42, messages=2, objects_per_location=2, intervals_per_position=4)
+        self.edifact_text = "".join(MSCONSInterchangeGenerator(settings).iter_segments())
+        self.locations = re.findall(r"LOC\+172\+(\w+)'", self.edifact_text)
+
+    def tearDown(self):
+        """Close the store and remove the database."""
+        shutdown_measurement_store_service()
+        self.environment.stop()
+        self.directory.cleanup()
+
+    def test_store_and_query_measurements(self):
+        """Test that a stored interchange is listed and its measurements are found by location and time range."""
+        # Act
+        response = self.client.post(MEASUREMENT_STORE_INTERCHANGES_PATH, params={"source": "test.edi"},
+                                    content=self.edifact_text.encode("utf-8"))
+        interchanges = self.client.get(MEASUREMENT_STORE_INTERCHANGES_PATH)
+        measurements = self.client.get(MEASUREMENT_STORE_MEASUREMENTS_PATH, params={
+            "location": self.locations[2], "obis": "1-1:1.29.1", "from": "2024-01-01T01:15:00+01:00",
+            "to": "2024-01-01T00:45:00Z",
+        })
+
+        # Assert
+        self.assertEqual(status.HTTP_201_CREATED, response.status_code)
+        self.assertEqual({"interchange_id": 1, "message_count": 2, "location_count": 4, "measurement_count": 16},
+                         response.json())
+        self.assertIn("store;dur=", response.headers["Server-Timing"])
+        self.assertEqual(status.HTTP_200_OK, interchanges.status_code)
+        self.assertEqual(["test.edi"], [interchange["source"] for interchange in interchanges.json()["interchanges"]])
+        self.assertEqual(status.HTTP_200_OK, measurements.status_code)
+        self.assertEqual(
+            [("2", "2024-01-01T00:15:00+00:00"), ("2", "2024-01-01T00:30:00+00:00")],
+            [(m["message_reference"], m["interval_start"]) for m in measurements.json()["measurements"]]
+        )
+
+    def test_store_flagged_duplicate_interchange(self):
+        """Test that a resent interchange is answered with status 200 and its duplicate, and not stored again."""
+        # Arrange
+        with patch.dict(os.environ, {"MEASUREMENT_STORE_DEDUP": "flag"}):
+            first = self.client.post(MEASUREMENT_STORE_INTERCHANGES_PATH, content=self.edifact_text)
+
+            # Act
+            response = self.client.post(MEASUREMENT_STORE_INTERCHANGES_PATH, content=self.edifact_text)
+
+        # Assert
+        self.assertEqual(status.HTTP_201_CREATED, first.status_code)
+        self.assertEqual([], first.json()["duplicates"])
+        self.assertEqual(status.HTTP_200_OK, response.status_code)
+        self.assertIsNone(response.json()["interchange_id"])
+        duplicate, = response.json()["duplicates"]
+        self.assertEqual("interchange", duplicate["kind"])
+        self.assertEqual(1, len(self.client.get(MEASUREMENT_STORE_INTERCHANGES_PATH).json()["interchanges"]))
+
+    def test_store_rejected_duplicate_after_restart(self):
+        """Test that a duplicate of an interchange stored before a restart is answered with status 409."""
+        # Arrange
+        environment = {"MEASUREMENT_STORE_DEDUP": "reject",
+                       "MEASUREMENT_STORE_DEDUP_PATH": os.path.join(self.directory.name, "keys.jsonl")}
+        with patch.dict(os.environ, environment):
+            self.client.post(MEASUREMENT_STORE_INTERCHANGES_PATH, content=self.edifact_text)
+            shutdown_measurement_store_service()
+
+            # Act
+            response = self.client.post(MEASUREMENT_STORE_INTERCHANGES_PATH, content=self.edifact_text)
+
+        # Assert
+        self.assertEqual(status.HTTP_409_CONFLICT, response.status_code)
+        self.assertIn("Duplicate interchange", response.json()["error_message"])
+        self.assertEqual(2, response.json()["duplicate"]["line_number"])
+        self.assertEqual(1, len(self.client.get(MEASUREMENT_STORE_INTERCHANGES_PATH).json()["interchanges"]))
+
+    def test_store_invalid_interchange(self):
+        """Test that an invalid interchange is answered with status 400 and not stored."""
+        # Arrange
+        edifact_text = "UNA:+.? 'UNB+UNOC:3+1:500+2:500+240101:0000+REF'UNH+1+MSCONS:D:04B:UN:2.4c'BGM+7'" \
+                       "DTM+137:invalid:303'"
+
+        # Act
+        response = self.client.post(MEASUREMENT_STORE_INTERCHANGES_PATH, content=edifact_text)
+
+        # Assert
+        self.assertEqual(status.HTTP_400_BAD_REQUEST, response.status_code)
+        self.assertEqual({"interchanges": []}, self.client.get(MEASUREMENT_STORE_INTERCHANGES_PATH).json())
+
+    def test_store_empty_body(self):
+        """Test that a request without message is answered with status 400."""
+        # Act
+        response = self.client.post(MEASUREMENT_STORE_INTERCHANGES_PATH, content=b"")
+
+        # Assert
+        self.assertEqual(status.HTTP_400_BAD_REQUEST, response.status_code)
+
+    def test_store_exceeding_the_budget(self):
+        """Test that a payload exceeding the byte budget of the endpoint is answered with status 413."""
+        # Act
+        with patch.dict(os.environ, {"PARSE_BUDGET_MEASUREMENT_STORE_MAX_BYTES": "100"}):
+            response = self.client.post(MEASUREMENT_STORE_INTERCHANGES_PATH, content=self.edifact_text)
+
+        # Assert
+        self.assertEqual(413, response.status_code)
+
+    def test_invalid_limit(self):
+        """Test that a limit out of range is rejected."""
+        # Act
+        response = self.client.get(MEASUREMENT_STORE_MEASUREMENTS_PATH, params={"limit": 0})
+
+        # Assert
+        self.assertEqual(422, response.status_code)
+
+    def test_store_not_configured(self):
+        """Test that the endpoints answer with status 404 without a configured database."""
+        # Arrange
+        shutdown_measurement_store_service()
+
+        # Act
+        with patch.dict(os.environ, {"MEASUREMENT_STORE_PATH": ""}):
+            responses = [
+                self.client.post(MEASUREMENT_STORE_INTERCHANGES_PATH, content=self.edifact_text),
+                self.client.get(MEASUREMENT_STORE_INTERCHANGES_PATH),
+                self.client.get(MEASUREMENT_STORE_MEASUREMENTS_PATH),
+            ]
+
+        # Assert
+        self.assertEqual([status.HTTP_404_NOT_FOUND] * 3, [response.status_code for response in responses])
+        self.assertIsNone(measurement_store_routers._measurement_store_service)
+
+
+if __name__ == '__main__':
+    unittest.main()
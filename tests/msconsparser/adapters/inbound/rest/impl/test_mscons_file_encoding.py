@@ -1,5 +1,5 @@
 import unittest
-from unittest.mock import patch, MagicMock
+from unittest.mock import MagicMock, ANY
 
 import pytest
 from fastapi import status
@@ -8,7 +8,7 @@ from starlette.responses import JSONResponse
 from msconsparser.adapters.inbound.rest.impl.parse_mscons_routers import ParseMSCONSRouter
 
 
-class TestMSCONSFileEncoding(unittest.TestCase):
+class TestMSCONSFileEncoding(unittest.IsolatedAsyncioTestCase):
     """Test cases for handling different file encodings in ParseMSCONSRouter."""
 
     def setUp(self):
@@ -42,7 +42,12 @@ class TestMSCONSFileEncoding(unittest.TestCase):
         expected_decoded = "UNA:+.? 'UNB+UNOC:3+9904935000ä"
         self.mock_parser_service.parse_message.assert_called_once_with(
             message_content=expected_decoded,
-            max_lines_to_parse=-1
+            max_lines_to_parse=-1,
+            statistics=ANY,
+            profiler=None,
+            compact=True,
+            budget=None,
+            cancel_token=None
         )
 
     @pytest.mark.asyncio
@@ -70,7 +75,12 @@ class TestMSCONSFileEncoding(unittest.TestCase):
         expected_decoded = "UNA:+.? 'UNB+UNOC:3+9904935000ä"
         self.mock_parser_service.parse_message.assert_called_once_with(
             message_content=expected_decoded,
-            max_lines_to_parse=-1
+            max_lines_to_parse=-1,
+            statistics=ANY,
+            profiler=None,
+            compact=True,
+            budget=None,
+            cancel_token=None
         )
 
 
@@ -0,0 +1,279 @@
+import gzip
+import io
+import json
+import os
+import tarfile
+import unittest
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+from fastapi import FastAPI, status
+from fastapi.testclient import TestClient
+
+from msconsparser.adapters.inbound.rest.impl import parse_batch_routers
+from msconsparser.adapters.inbound.rest.impl.parse_batch_routers import (
+    DEFAULT_MAX_FILE_BYTES, get_parse_batch_budget, get_parse_batch_max_files, is_archive_file, router,
+    shutdown_batch_parse_service
+)
+from msconsparser.adapters.inbound.rest.impl.parse_mscons_routers import ParseBudgetMiddleware
+from msconsparser.application.services import BatchParseService
+from msconsparser.libs.edifactmsconsparser.generators import MSCONSGeneratorSettings, MSCONSInterchangeGenerator
+from msconsparser.libs.edifactmsconsparser.wrappers import ParseBudget
+
+
+def create_zip(files: dict) -> bytes:
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as archive:
+        for file_name, content in files.items():
+            archive.writestr(file_name, content)
+    return buffer.getvalue()
+
+
+def create_tar_gz(files: dict) -> bytes:
+    buffer = io.BytesIO()
+    with tarfile.open(fileobj=buffer, mode="w:gz") as archive:
+        for file_name, content in files.items():
+            member = tarfile.TarInfo(file_name)
+            member.size = len(content)
+            archive.addfile(member, io.BytesIO(content))
+    return buffer.getvalue()
+
+
+class TestParseBatchRouters(unittest.TestCase):
+    """Test cases for the batch parse endpoint."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        parse_batch_routers._batch_parse_service = BatchParseService(
+            max_workers=2, executor=ThreadPoolExecutor(max_workers=2)
+        )
+        app = FastAPI()
+        app.include_router(router)
+        self.client = TestClient(app)
+        settings = MSCONSGeneratorSettings(seed=42, messages=1)
+        self.edifact_text = "".join(MSCONSInterchangeGenerator(settings).iter_segments()).encode("utf-8")
+
+    def tearDown(self):
+        """Stop the workers."""
+        shutdown_batch_parse_service()
+
+    @staticmethod
+    def read_records(response) -> list:
+        return [json.loads(line) for line in response.text.splitlines()]
+
+    def test_parse_multipart_batch(self):
+        """Test that the files of a multipart upload are parsed with one record per file, including bad files."""
+        # Act
+        response = self.client.post("/parse-raw-batch", files=[
+            ("files", ("a.edi", self.edifact_text)),
+            ("files", ("bad.edi", b"UNH+1'")),
+            ("files", ("b.edi", self.edifact_text)),
+        ])
+
+        # Assert
+        self.assertEqual(status.HTTP_200_OK, response.status_code)
+        self.assertEqual("application/x-ndjson", response.headers["content-type"])
+        records = self.read_records(response)
+        self.assertEqual(["a.edi", "bad.edi", "b.edi"], [record["file_name"] for record in records])
+        self.assertEqual("ok", records[0]["status"])
+        self.assertEqual("ok", records[2]["status"])
+        self.assertEqual(records[0]["result"], records[2]["result"])
+
+    def test_parse_zip_batch(self):
+        """Test that the files of a zip archive sent as body are parsed, directories are skipped."""
+        # Arrange
+        archive = create_zip({"2024/": "", "2024/a.edi": self.edifact_text, "2024/b.edi": self.edifact_text})
+
+        # Act
+        response = self.client.post("/parse-raw-batch", content=archive, headers={"Content-Type": "application/zip"})
+
+        # Assert
+        self.assertEqual(status.HTTP_200_OK, response.status_code)
+        records = self.read_records(response)
+        self.assertEqual(["2024/a.edi", "2024/b.edi"], [record["file_name"] for record in records])
+        self.assertTrue(all(record["status"] == "ok" for record in records))
+
+    def test_parse_zip_in_multipart_batch(self):
+        """Test that a zip archive of a multipart upload is expanded into its files."""
+        # Arrange
+        archive = create_zip({"a.edi": self.edifact_text, "b.edi": self.edifact_text})
+
+        # Act
+        response = self.client.post("/parse-raw-batch", files=[
+            ("files", ("archive.zip", archive, "application/zip")),
+            ("files", ("c.edi", self.edifact_text)),
+        ])
+
+        # Assert
+        records = self.read_records(response)
+        self.assertEqual(["a.edi", "b.edi", "c.edi"], [record["file_name"] for record in records])
+        self.assertEqual([0, 1, 2], [record["index"] for record in records])
+
+    def test_parse_tar_gz_batch(self):
+        """Test that the members of a tar.gz archive sent as body are parsed with one record per member."""
+        # Arrange
+        archive = create_tar_gz({"a.edi": self.edifact_text, "b.edi": self.edifact_text})
+
+        # Act
+        response = self.client.post("/parse-raw-batch", content=archive, headers={"Content-Type": "application/gzip"})
+
+        # Assert
+        self.assertEqual(status.HTTP_200_OK, response.status_code)
+        records = self.read_records(response)
+        self.assertEqual(["a.edi", "b.edi"], [record["file_name"] for record in records])
+        self.assertTrue(all("chunk" not in record for record in records))
+        self.assertTrue(all(record["status"] == "ok" for record in records))
+
+    def test_parse_gzip_file_in_multipart_batch(self):
+        """Test that a gzip compressed file of a multipart upload is decompressed."""
+        # Act
+        response = self.client.post("/parse-raw-batch", files=[
+            ("files", ("a.edi.gz", gzip.compress(self.edifact_text), "application/gzip")),
+        ])
+
+        # Assert
+        records = self.read_records(response)
+        self.assertEqual(["a.edi"], [record["file_name"] for record in records])
+        self.assertEqual("ok", records[0]["status"])
+
+    def test_parse_tar_gz_batch_with_too_many_files(self):
+        """Test that the members of a tar archive beyond PARSE_BATCH_MAX_FILES end the batch with an error record."""
+        # Arrange
+        archive = create_tar_gz({f"{index}.edi": self.edifact_text for index in range(3)})
+
+        # Act
+        with patch.dict(os.environ, {"PARSE_BATCH_MAX_FILES": "2"}):
+            response = self.client.post("/parse-raw-batch", content=archive,
+                                        headers={"Content-Type": "application/gzip"})
+
+        # Assert
+        records = self.read_records(response)
+        self.assertEqual(["ok", "ok", "error"], [record["status"] for record in records])
+        self.assertIn("Too many files", records[2]["error_message"])
+
+    def test_parse_zip_batch_exceeding_byte_budget(self):
+        """Test that a file of a zip archive exceeding the byte budget results in an error record."""
+        # Arrange
+        archive = create_zip({"a.edi": self.edifact_text, "small.edi": b"UNA:+.? '"})
+        shutdown_batch_parse_service()
+        parse_batch_routers._batch_parse_service = BatchParseService(
+            max_workers=1, executor=ThreadPoolExecutor(max_workers=1), budget=ParseBudget(max_bytes=100)
+        )
+
+        # Act
+        with patch.dict(os.environ, {"PARSE_BUDGET_PARSE_BATCH_MAX_BYTES": "100"}):
+            response = self.client.post("/parse-raw-batch", content=archive,
+                                        headers={"Content-Type": "application/zip"})
+
+        # Assert
+        records = self.read_records(response)
+        self.assertEqual("error", records[0]["status"])
+        self.assertIn("bytes", records[0]["error_message"])
+
+    def test_parse_zip_batch_exceeding_total_byte_budget(self):
+        """Test that the file exceeding the decompressed bytes of the batch results in an error record ending it."""
+        # Arrange
+        archive = create_zip({f"{index}.edi": self.edifact_text for index in range(3)})
+
+        # Act
+        with patch.dict(os.environ, {"PARSE_BATCH_MAX_TOTAL_BYTES": str(len(self.edifact_text) * 3 // 2)}):
+            response = self.client.post("/parse-raw-batch", content=archive,
+                                        headers={"Content-Type": "application/zip"})
+
+        # Assert
+        records = self.read_records(response)
+        self.assertEqual(["ok", "error"], [record["status"] for record in records])
+        self.assertEqual("1.edi", records[1]["file_name"])
+        self.assertIn("bytes", records[1]["error_message"])
+
+    def test_parse_batch_exceeding_archive_byte_budget(self):
+        """Test that a body exceeding PARSE_BATCH_MAX_ARCHIVE_BYTES is rejected while it is received."""
+        # Arrange
+        archive = create_zip({f"{index}.edi": self.edifact_text for index in range(3)})
+
+        def iter_body():
+            # Sent without Content-Length
+            yield archive[:100]
+            yield archive[100:]
+
+        # Act
+        with patch.dict(os.environ, {"PARSE_BATCH_MAX_ARCHIVE_BYTES": "100"}):
+            archive_response = self.client.post("/parse-raw-batch", content=iter_body(),
+                                                headers={"Content-Type": "application/zip"})
+            multipart_response = self.client.post("/parse-raw-batch", files=[("files", ("a.edi", self.edifact_text))])
+
+        # Assert
+        self.assertEqual(413, archive_response.status_code)
+        self.assertEqual(413, multipart_response.status_code)
+
+    def test_parse_batch_content_length_exceeding_archive_byte_budget(self):
+        """Test that the budget middleware rejects a body by its Content-Length before it is read."""
+        # Arrange
+        app = FastAPI()
+        app.include_router(router)
+        app.add_middleware(ParseBudgetMiddleware)
+        client = TestClient(app)
+
+        # Act
+        with patch.dict(os.environ, {"PARSE_BATCH_MAX_ARCHIVE_BYTES": "100"}):
+            with patch.object(parse_batch_routers, "_with_body_budget") as with_body_budget:
+                response = client.post("/parse-raw-batch", content=create_zip({"a.edi": self.edifact_text}),
+                                       headers={"Content-Type": "application/zip"})
+
+        # Assert
+        self.assertEqual(413, response.status_code)
+        with_body_budget.assert_not_called()
+
+    def test_get_parse_batch_budget(self):
+        """Test that the bytes of each file are limited by default."""
+        self.assertEqual(ParseBudget(max_bytes=DEFAULT_MAX_FILE_BYTES), get_parse_batch_budget())
+        with patch.dict(os.environ, {"PARSE_BUDGET_PARSE_BATCH_MAX_BYTES": str(DEFAULT_MAX_FILE_BYTES * 2),
+                                     "PARSE_BUDGET_PARSE_BATCH_MAX_SEGMENTS": "1000"}):
+            self.assertEqual(ParseBudget(max_segments=1000, max_bytes=DEFAULT_MAX_FILE_BYTES * 2),
+                             get_parse_batch_budget())
+
+    def test_parse_batch_with_too_many_files(self):
+        """Test that a batch with more files than PARSE_BATCH_MAX_FILES is rejected."""
+        # Arrange
+        archive = create_zip({f"{index}.edi": self.edifact_text for index in range(3)})
+
+        # Act
+        with patch.dict(os.environ, {"PARSE_BATCH_MAX_FILES": "2"}):
+            response = self.client.post("/parse-raw-batch", content=archive,
+                                        headers={"Content-Type": "application/zip"})
+
+        # Assert
+        self.assertEqual(413, response.status_code)
+
+    def test_parse_batch_with_invalid_input(self):
+        """Test that an invalid zip archive, an empty batch and other media types are rejected."""
+        cases = [
+            ({"content": b"no zip", "headers": {"Content-Type": "application/zip"}}, status.HTTP_400_BAD_REQUEST),
+            ({"content": b"PK\x03\x04 corrupt", "headers": {"Content-Type": "application/zip"}},
+             status.HTTP_400_BAD_REQUEST),
+            ({"content": create_zip({}), "headers": {"Content-Type": "application/zip"}}, status.HTTP_400_BAD_REQUEST),
+            ({"content": self.edifact_text, "headers": {"Content-Type": "text/plain"}},
+             status.HTTP_415_UNSUPPORTED_MEDIA_TYPE),
+        ]
+        for kwargs, expected_status in cases:
+            with self.subTest(expected_status=expected_status, content_type=kwargs["headers"]["Content-Type"]):
+                self.assertEqual(expected_status, self.client.post("/parse-raw-batch", **kwargs).status_code)
+
+    def test_is_archive_file(self):
+        """Test that archives are recognized by their media type or extension."""
+        self.assertTrue(is_archive_file("archive.ZIP", None))
+        self.assertTrue(is_archive_file("archive.tgz", None))
+        self.assertTrue(is_archive_file(None, "application/x-zip-compressed"))
+        self.assertTrue(is_archive_file(None, "application/gzip; charset=binary"))
+        self.assertFalse(is_archive_file("file.edi", "application/octet-stream"))
+
+    def test_get_parse_batch_max_files(self):
+        """Test that an invalid PARSE_BATCH_MAX_FILES falls back to the default."""
+        with patch.dict(os.environ, {"PARSE_BATCH_MAX_FILES": "many"}):
+            with self.assertLogs("msconsparser.adapters.inbound.rest.impl.parse_batch_routers", level="WARNING"):
+                self.assertEqual(10000, get_parse_batch_max_files())
+
+
+if __name__ == "__main__":
+    unittest.main()
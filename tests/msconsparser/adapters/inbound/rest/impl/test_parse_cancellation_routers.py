@@ -0,0 +1,123 @@
+import asyncio
+import json
+import os
+import unittest
+from unittest.mock import patch
+
+from fastapi import status
+from starlette.datastructures import Headers
+
+from msconsparser.adapters.inbound.rest.impl.parse_cancellation_routers import (
+    ParseCancellationMiddleware, cancellation_metrics, get_parse_cancellations, get_request_cancel_token,
+    get_request_timeout, record_cancelled_parse, reset_parse_cancellations
+)
+from msconsparser.libs.edifactmsconsparser.exceptions import ParseCancelledException
+from msconsparser.libs.edifactmsconsparser.wrappers import CancelToken
+
+
+def create_scope(path: str, headers: list = None) -> dict:
+    return {"type": "http", "method": "POST", "path": path, "headers": headers or []}
+
+
+class TestParseCancellationRouters(unittest.IsolatedAsyncioTestCase):
+    """Test cases for the parse cancellation middleware and router functions."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        cancellation_metrics.reset()
+
+    def tearDown(self):
+        """Clean up the cancellation metrics."""
+        cancellation_metrics.reset()
+
+    async def test_get_parse_cancellations(self):
+        """Test that the cancelled parses are counted per reason with their CPU seconds."""
+        for reason, cpu_seconds in ((CancelToken.CLIENT_DISCONNECTED, 1.5), (CancelToken.CLIENT_DISCONNECTED, 0.5),
+                                    (CancelToken.DEADLINE_EXCEEDED, 2.0)):
+            exception = ParseCancelledException(reason)
+            exception.cpu_seconds = cpu_seconds
+            record_cancelled_parse(exception)
+
+        response = await get_parse_cancellations()
+
+        self.assertEqual(status.HTTP_200_OK, response.status_code)
+        self.assertEqual({
+            "cancelled_parses": {"client disconnected": 2, "deadline exceeded": 1},
+            "total": 3,
+            "wasted_cpu_seconds": 4.0,
+        }, json.loads(response.body))
+
+    async def test_reset_parse_cancellations(self):
+        """Test that reset_parse_cancellations clears the counters."""
+        record_cancelled_parse(ParseCancelledException(CancelToken.CANCELLED))
+
+        response = await reset_parse_cancellations()
+
+        self.assertEqual(status.HTTP_204_NO_CONTENT, response.status_code)
+        self.assertEqual(0, cancellation_metrics.report()["total"])
+
+    def test_get_request_timeout(self):
+        """Test that the header X-Request-Timeout shortens the timeout of the environment variable."""
+        with patch.dict(os.environ, {"PARSE_REQUEST_TIMEOUT_SECONDS": "30"}):
+            self.assertEqual(5.0, get_request_timeout(Headers({"X-Request-Timeout": "5"})))
+            self.assertEqual(30.0, get_request_timeout(Headers({"X-Request-Timeout": "soon"})))
+            self.assertEqual(30.0, get_request_timeout(Headers()))
+        self.assertEqual(5.0, get_request_timeout(Headers({"X-Request-Timeout": "5"})))
+        self.assertIsNone(get_request_timeout(Headers()))
+
+    def test_get_request_timeout_header_does_not_extend_environment_variable(self):
+        """Test that a larger X-Request-Timeout header cannot extend the timeout of the environment variable."""
+        with patch.dict(os.environ, {"PARSE_REQUEST_TIMEOUT_SECONDS": "30"}):
+            self.assertEqual(30.0, get_request_timeout(Headers({"X-Request-Timeout": "3600"})))
+
+    async def test_middleware_trips_token_when_client_disconnects(self):
+        """Test that the token of a request is tripped once the client disconnects after sending the body."""
+        messages = asyncio.Queue()
+        await messages.put({"type": "http.request", "body": b"UNA:+.? '", "more_body": False})
+        tokens = []
+
+        async def app(scope, receive, send):
+            await receive()
+            tokens.append(get_request_cancel_token())
+            await messages.put({"type": "http.disconnect"})
+            for _ in range(100):
+                if tokens[0].cancelled:
+                    break
+                await asyncio.sleep(0.01)
+
+        middleware = ParseCancellationMiddleware(app, paths=["/parse-raw-format"])
+        await middleware(create_scope("/parse-raw-format"), messages.get, None)
+
+        self.assertTrue(tokens[0].cancelled)
+        self.assertEqual(CancelToken.CLIENT_DISCONNECTED, tokens[0].reason)
+        self.assertIsNone(get_request_cancel_token())
+
+    async def test_middleware_sets_request_timeout(self):
+        """Test that the token of a request counts as cancelled after the request timeout."""
+        tokens = []
+
+        async def app(scope, receive, send):
+            tokens.append(get_request_cancel_token())
+
+        middleware = ParseCancellationMiddleware(app, paths=["/parse-raw-format"])
+        await middleware(create_scope("/parse-raw-format", [(b"x-request-timeout", b"0.000001")]), None, None)
+        await asyncio.sleep(0.001)
+
+        self.assertTrue(tokens[0].cancelled)
+        self.assertEqual(CancelToken.DEADLINE_EXCEEDED, tokens[0].reason)
+
+    async def test_middleware_ignores_other_paths(self):
+        """Test that the requests of other paths get no cancel token."""
+        tokens = []
+
+        async def app(scope, receive, send):
+            tokens.append(get_request_cancel_token())
+
+        middleware = ParseCancellationMiddleware(app, paths=["/parse-raw-format"])
+        await middleware(create_scope("/health/liveness"), None, None)
+
+        self.assertEqual([None], tokens)
+
+
+if __name__ == "__main__":
+    unittest.main()
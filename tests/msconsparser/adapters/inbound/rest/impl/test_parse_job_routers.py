@@ -0,0 +1,167 @@
+import asyncio
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+from unittest.mock import patch
+
+from fastapi import FastAPI, status
+from fastapi.testclient import TestClient
+
+from msconsparser.adapters.inbound.rest.impl import parse_job_routers
+from msconsparser.adapters.inbound.rest.impl.parse_job_routers import router, shutdown_parse_job_service
+from msconsparser.application.services import ParseJobService
+from msconsparser.libs.edifactmsconsparser.edifact_mscons_parser import EdifactMSCONSParser
+from msconsparser.libs.edifactmsconsparser.generators import MSCONSGeneratorSettings, MSCONSInterchangeGenerator
+
+
+class TestParseJobRouters(unittest.TestCase):
+    """Test cases for the parse job endpoints."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.spool_dir = tempfile.mkdtemp()
+        self.service = ParseJobService(spool_dir=self.spool_dir, max_workers=1, max_pending_jobs=1)
+        parse_job_routers._parse_job_service = self.service
+        app = FastAPI()
+        app.include_router(router)
+        self.client = TestClient(app)
+        settings = MSCONSGeneratorSettings(seed=42, messages=3)
+        self.edifact_text = "".join(MSCONSInterchangeGenerator(settings).iter_segments())
+
+    def tearDown(self):
+        """Stop the workers and remove the spool directory."""
+        asyncio.run(shutdown_parse_job_service())
+        shutil.rmtree(self.spool_dir, ignore_errors=True)
+
+    def wait_for_job(self, job_id: str) -> dict:
+        deadline = time.monotonic() + 30
+        while True:
+            response = self.client.get(f"/jobs/{job_id}")
+            job = response.json()
+            if job["status"] in ("succeeded", "failed") or time.monotonic() > deadline:
+                return job
+            time.sleep(0.01)
+
+    def test_parse_job(self):
+        """Test that an uploaded message is parsed in the background and its result is streamed."""
+        # Act
+        response = self.client.post("/jobs", content=self.edifact_text.encode("utf-8"))
+        job_id = response.json()["job_id"]
+        job = self.wait_for_job(job_id)
+        json_response = self.client.get(f"/jobs/{job_id}/result")
+        ndjson_response = self.client.get(f"/jobs/{job_id}/result", params={"format": "ndjson"})
+
+        # Assert
+        self.assertEqual(status.HTTP_202_ACCEPTED, response.status_code)
+        self.assertEqual(f"/jobs/{job_id}", response.headers["Location"])
+        self.assertEqual("succeeded", job["status"])
+        self.assertEqual(3, job["processed_messages"])
+        self.assertEqual(len(self.edifact_text), job["processed_bytes"])
+        self.assertEqual(status.HTTP_200_OK, json_response.status_code)
+        expected = EdifactMSCONSParser().parse(self.edifact_text).model_dump(mode="json")
+        self.assertEqual(expected, json_response.json())
+        self.assertEqual("application/x-ndjson", ndjson_response.headers["content-type"])
+        self.assertEqual(5, len(ndjson_response.text.splitlines()))
+        self.assertEqual(expected["unh_unt_nachrichten"],
+                         [json.loads(line) for line in ndjson_response.text.splitlines()[1:-1]])
+
+    def test_parse_job_result_pages(self):
+        """Test that the result is paged with the cursor of the X-Next-Cursor header."""
+        # Arrange
+        response = self.client.post("/jobs", content=self.edifact_text.encode("utf-8"))
+        job_id = response.json()["job_id"]
+        self.wait_for_job(job_id)
+        expected = EdifactMSCONSParser().parse(self.edifact_text).model_dump(mode="json")
+
+        # Act
+        messages = []
+        responses = [self.client.get(f"/jobs/{job_id}/result", params={"page_size": 2})]
+        while True:
+            messages.extend(responses[-1].json()["unh_unt_nachrichten"])
+            if "X-Next-Cursor" not in responses[-1].headers:
+                break
+            responses.append(self.client.get(f"/jobs/{job_id}/result", params={
+                "page_size": 2, "cursor": responses[-1].headers["X-Next-Cursor"]
+            }))
+        invalid_response = self.client.get(f"/jobs/{job_id}/result", params={"cursor": "invalid"})
+
+        # Assert
+        self.assertEqual([status.HTTP_200_OK] * 2, [page_response.status_code for page_response in responses])
+        self.assertEqual("3", responses[0].headers["X-Message-Count"])
+        self.assertEqual(expected["unh_unt_nachrichten"], messages)
+        self.assertEqual(status.HTTP_400_BAD_REQUEST, invalid_response.status_code)
+
+    def test_parse_job_without_body(self):
+        """Test that an empty upload is rejected."""
+        # Act
+        response = self.client.post("/jobs", content=b"")
+
+        # Assert
+        self.assertEqual(status.HTTP_400_BAD_REQUEST, response.status_code)
+
+    def test_parse_job_exceeding_byte_budget(self):
+        """Test that an upload exceeding PARSE_BUDGET_PARSE_JOB_MAX_BYTES is rejected and removed."""
+        # Act
+        with patch.dict(os.environ, {"PARSE_BUDGET_PARSE_JOB_MAX_BYTES": "100"}):
+            response = self.client.post("/jobs", content=self.edifact_text.encode("utf-8"))
+
+        # Assert
+        self.assertEqual(413, response.status_code)
+        self.assertEqual([], os.listdir(self.spool_dir))
+
+    def test_parse_job_with_full_queue(self):
+        """Test that a job is rejected while the maximum number of pending jobs is reached."""
+        # Arrange
+        self.service.create_job()
+
+        # Act
+        response = self.client.post("/jobs", content=self.edifact_text.encode("utf-8"))
+
+        # Assert
+        self.assertEqual(status.HTTP_503_SERVICE_UNAVAILABLE, response.status_code)
+        self.assertIn("Retry-After", response.headers)
+
+    def test_unknown_job(self):
+        """Test that the status and the result of an unknown job are not found."""
+        for path in ("/jobs/unknown", "/jobs/unknown/result"):
+            with self.subTest(path=path):
+                self.assertEqual(status.HTTP_404_NOT_FOUND, self.client.get(path).status_code)
+
+    def test_result_of_pending_job(self):
+        """Test that the result of a job which has not succeeded is a conflict."""
+        # Arrange
+        job = self.service.create_job()
+
+        # Act
+        response = self.client.get(f"/jobs/{job.job_id}/result")
+
+        # Assert
+        self.assertEqual(status.HTTP_409_CONFLICT, response.status_code)
+        self.assertEqual("receiving", response.json()["job"]["status"])
+
+    def test_shutdown_stops_the_service_in_a_worker_thread(self):
+        """Test that the shutdown handler does not block the event loop while the service stops."""
+        # Arrange
+        shutdown_threads = []
+        stop_service = self.service.shutdown
+
+        def shutdown():
+            shutdown_threads.append(threading.current_thread())
+            stop_service()
+
+        # Act
+        with patch.object(self.service, "shutdown", shutdown):
+            asyncio.run(shutdown_parse_job_service())
+
+        # Assert
+        self.assertEqual(1, len(shutdown_threads))
+        self.assertIsNot(threading.main_thread(), shutdown_threads[0])
+        self.assertIsNone(parse_job_routers._parse_job_service)
+
+
+if __name__ == "__main__":
+    unittest.main()
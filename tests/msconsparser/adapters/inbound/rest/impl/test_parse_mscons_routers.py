@@ -1,15 +1,27 @@
+import json
+import os
+import threading
 import unittest
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch, MagicMock, ANY
 
 import pytest
 from fastapi import status
 from starlette.responses import JSONResponse
 
-from msconsparser.adapters.inbound.rest.impl.parse_mscons_routers import ParseMSCONSRouter
-from msconsparser.libs.edifactmsconsparser.exceptions import CONTRLException, MSCONSParserException
+from msconsparser.adapters.inbound.rest.impl.parse_mscons_routers import (
+    ParseBudgetMiddleware, ParseMSCONSRouter, HTTP_413_CONTENT_TOO_LARGE, LIMIT_MODE_BUDGET, MessageSelection,
+    get_message_selection, get_page_request, get_parse_budget, message_selection_middleware
+)
+from msconsparser.libs.edifactmsconsparser.exceptions import (
+    CONTRLException, MSCONSParserException, ParseBudgetExceededException, ParseCancelledException
+)
+from msconsparser.libs.edifactmsconsparser.generators import MSCONSGeneratorSettings, MSCONSInterchangeGenerator
+from msconsparser.libs.edifactmsconsparser.interchange_pages import PageCursor, PageRequest
+from msconsparser.libs.edifactmsconsparser.lazy_edifact_interchange import LazyEdifactInterchange
+from msconsparser.libs.edifactmsconsparser.wrappers import CancelToken, ParseBudget, SegmentProfiler
 
 
-class TestParseMSCONSRouter(unittest.TestCase):
+class TestParseMSCONSRouter(unittest.IsolatedAsyncioTestCase):
     """Test cases for the ParseMSCONSRouter class."""
 
     def setUp(self):
@@ -33,11 +45,9 @@ class TestParseMSCONSRouter(unittest.TestCase):
         mock_parser_service_class.assert_called_once()
 
     @pytest.mark.asyncio
-    @patch('time.perf_counter')
-    async def test_parse_mscons_raw_format_success(self, mock_perf_counter):
+    async def test_parse_mscons_raw_format_success(self):
         """Test that parse_mscons_raw_format returns parsed data on success."""
         # Setup
-        mock_perf_counter.side_effect = [1.0, 2.0]  # t1=1.0, t2=2.0
         mock_parsed_obj = MagicMock()
         mock_parsed_obj.model_dump.return_value = {"key": "value"}
         self.mock_parser_service.parse_message.return_value = mock_parsed_obj
@@ -52,16 +62,19 @@ class TestParseMSCONSRouter(unittest.TestCase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(response.body.decode(), '{"key":"value"}')
         self.mock_parser_service.parse_message.assert_called_once_with(message_content=mscons_input,
-                                                                       max_lines_to_parse=-1)
+                                                                       max_lines_to_parse=-1,
+                                                                       statistics=ANY,
+                                                                       profiler=None,
+                                                                       compact=True,
+                                                                       budget=None,
+                                                                       cancel_token=None)
         mock_parsed_obj.model_dump.assert_called_once()
 
     @pytest.mark.asyncio
-    @patch('time.perf_counter')
     @patch('msconsparser.adapters.inbound.rest.impl.parse_mscons_routers.logger')
-    async def test_parse_mscons_raw_format_logs_performance(self, mock_logger, mock_perf_counter):
-        """Test that parse_mscons_raw_format logs performance metrics."""
+    async def test_parse_mscons_raw_format_logs_performance(self, mock_logger):
+        """Test that parse_mscons_raw_format logs one structured record with the parse statistics."""
         # Setup
-        mock_perf_counter.side_effect = [1.0, 3.5]  # t1=1.0, t2=3.5 (2.5s difference)
         mock_parsed_obj = MagicMock()
         mock_parsed_obj.model_dump.return_value = {}
         self.mock_parser_service.parse_message.return_value = mock_parsed_obj
@@ -71,7 +84,45 @@ class TestParseMSCONSRouter(unittest.TestCase):
         await self.router.parse_mscons_raw_format(limit_mode, "test_data")
 
         # Verify
-        mock_logger.info.assert_called_once_with("PERFORMANCE: Parsing took 2.50s")
+        mock_logger.info.assert_called_once()
+        parse_stats = mock_logger.info.call_args.kwargs["extra"]["parse_stats"]
+        self.assertIn("segments", parse_stats)
+        self.assertIn("messages", parse_stats)
+        self.assertIn("bytes", parse_stats)
+        self.assertIn("serialize", parse_stats["phases_ms"])
+        self.assertIn("encode", parse_stats["phases_ms"])
+
+    @pytest.mark.asyncio
+    async def test_parse_mscons_raw_format_sets_server_timing_header(self):
+        """Test that parse_mscons_raw_format returns the phase timings in the Server-Timing header."""
+        # Setup
+        mock_parsed_obj = MagicMock()
+        mock_parsed_obj.model_dump.return_value = {}
+        self.mock_parser_service.parse_message.return_value = mock_parsed_obj
+
+        # Execute
+        response = await self.router.parse_mscons_raw_format(False, "test_data")
+
+        # Verify
+        self.assertIn("serialize;dur=", response.headers["Server-Timing"])
+        self.assertIn("encode;dur=", response.headers["Server-Timing"])
+        self.assertNotIn("X-Parse-Stats", response.headers)
+
+    @pytest.mark.asyncio
+    async def test_parse_mscons_file_sets_parse_stats_header_if_enabled(self):
+        """Test that parse_mscons_file returns the X-Parse-Stats header if it is enabled."""
+        # Setup
+        router = ParseMSCONSRouter(parser_service=self.mock_parser_service, expose_parse_stats=True)
+        mock_parsed_obj = MagicMock()
+        mock_parsed_obj.model_dump.return_value = {}
+        self.mock_parser_service.parse_message.return_value = mock_parsed_obj
+
+        # Execute
+        response = await router.parse_mscons_file(False, b"test_mscons_data")
+
+        # Verify
+        self.assertEqual(response.headers["X-Parse-Stats"], "segments=0; messages=0; bytes=16")
+        self.assertIn("decode;dur=", response.headers["Server-Timing"])
 
     @pytest.mark.asyncio
     async def test_parse_mscons_raw_format_contrl_exception(self):
@@ -106,11 +157,9 @@ class TestParseMSCONSRouter(unittest.TestCase):
         self.assertEqual(response.body.decode(), f'{{"error_message":"{error_message}"}}')
 
     @pytest.mark.asyncio
-    @patch('time.perf_counter')
-    async def test_parse_mscons_file_success(self, mock_perf_counter):
+    async def test_parse_mscons_file_success(self):
         """Test that parse_mscons_file returns parsed data on success."""
         # Setup
-        mock_perf_counter.side_effect = [1.0, 2.0]  # t1=1.0, t2=2.0
         mock_parsed_obj = MagicMock()
         mock_parsed_obj.model_dump.return_value = {"key": "value"}
         self.mock_parser_service.parse_message.return_value = mock_parsed_obj
@@ -125,7 +174,12 @@ class TestParseMSCONSRouter(unittest.TestCase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(response.body.decode(), '{"key":"value"}')
         self.mock_parser_service.parse_message.assert_called_once_with(message_content=mscons_file,
-                                                                       max_lines_to_parse=-1)
+                                                                       max_lines_to_parse=-1,
+                                                                       statistics=ANY,
+                                                                       profiler=None,
+                                                                       compact=True,
+                                                                       budget=None,
+                                                                       cancel_token=None)
         mock_parsed_obj.model_dump.assert_called_once()
 
     @pytest.mark.asyncio
@@ -195,7 +249,12 @@ class TestParseMSCONSRouter(unittest.TestCase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(response.body.decode(), '{"key":"value"}')
         self.mock_parser_service.parse_message.assert_called_once_with(message_content="test_mscons_data",
-                                                                       max_lines_to_parse=-1)
+                                                                       max_lines_to_parse=-1,
+                                                                       statistics=ANY,
+                                                                       profiler=None,
+                                                                       compact=True,
+                                                                       budget=None,
+                                                                       cancel_token=None)
 
     @pytest.mark.asyncio
     async def test_parse_mscons_file_tuple(self):
@@ -215,15 +274,18 @@ class TestParseMSCONSRouter(unittest.TestCase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(response.body.decode(), '{"key":"value"}')
         self.mock_parser_service.parse_message.assert_called_once_with(message_content="test_mscons_data",
-                                                                       max_lines_to_parse=-1)
+                                                                       max_lines_to_parse=-1,
+                                                                       statistics=ANY,
+                                                                       profiler=None,
+                                                                       compact=True,
+                                                                       budget=None,
+                                                                       cancel_token=None)
 
     @pytest.mark.asyncio
     @patch('time.strftime')
-    @patch('time.perf_counter')
-    async def test_download_parsed_result_success(self, mock_perf_counter, mock_strftime):
+    async def test_download_parsed_result_success(self, mock_strftime):
         """Test that download_parsed_result returns downloadable JSON on success."""
         # Setup
-        mock_perf_counter.side_effect = [1.0, 2.0]  # t1=1.0, t2=2.0
         mock_strftime.return_value = "20230101_120000"
         mock_parsed_obj = MagicMock()
         mock_parsed_obj.model_dump.return_value = {"key": "value"}
@@ -235,12 +297,17 @@ class TestParseMSCONSRouter(unittest.TestCase):
 
         # Verify
         self.assertIsInstance(response, JSONResponse)
-        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
         self.assertEqual(response.body.decode(), '{"key":"value"}')
         self.assertEqual(response.headers["Content-Disposition"],
                          "attachment; filename=mscons_parsed_20230101_120000.json")
         self.mock_parser_service.parse_message.assert_called_once_with(message_content=mscons_input,
-                                                                       max_lines_to_parse=-1)
+                                                                       max_lines_to_parse=-1,
+                                                                       statistics=ANY,
+                                                                       profiler=None,
+                                                                       compact=True,
+                                                                       budget=None,
+                                                                       cancel_token=None)
         mock_parsed_obj.model_dump.assert_called_once()
 
     @pytest.mark.asyncio
@@ -275,11 +342,9 @@ class TestParseMSCONSRouter(unittest.TestCase):
 
     @pytest.mark.asyncio
     @patch('time.strftime')
-    @patch('time.perf_counter')
-    async def test_download_parsed_file_result_success(self, mock_perf_counter, mock_strftime):
+    async def test_download_parsed_file_result_success(self, mock_strftime):
         """Test that download_parsed_file_result returns downloadable JSON on success."""
         # Setup
-        mock_perf_counter.side_effect = [1.0, 2.0]  # t1=1.0, t2=2.0
         mock_strftime.return_value = "20230101_120000"
         mock_parsed_obj = MagicMock()
         mock_parsed_obj.model_dump.return_value = {"key": "value"}
@@ -296,7 +361,12 @@ class TestParseMSCONSRouter(unittest.TestCase):
         self.assertEqual(response.headers["Content-Disposition"],
                          "attachment; filename=mscons_parsed_20230101_120000.json")
         self.mock_parser_service.parse_message.assert_called_once_with(message_content=mscons_file,
-                                                                       max_lines_to_parse=-1)
+                                                                       max_lines_to_parse=-1,
+                                                                       statistics=ANY,
+                                                                       profiler=None,
+                                                                       compact=True,
+                                                                       budget=None,
+                                                                       cancel_token=None)
         mock_parsed_obj.model_dump.assert_called_once()
 
     @pytest.mark.asyncio
@@ -362,7 +432,12 @@ class TestParseMSCONSRouter(unittest.TestCase):
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
         self.assertEqual(response.body.decode(), '{"key":"value"}')
         self.mock_parser_service.parse_message.assert_called_once_with(message_content="test_mscons_data",
-                                                                       max_lines_to_parse=-1)
+                                                                       max_lines_to_parse=-1,
+                                                                       statistics=ANY,
+                                                                       profiler=None,
+                                                                       compact=True,
+                                                                       budget=None,
+                                                                       cancel_token=None)
 
     @pytest.mark.asyncio
     async def test_download_parsed_file_result_tuple(self):
@@ -381,7 +456,361 @@ class TestParseMSCONSRouter(unittest.TestCase):
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
         self.assertEqual(response.body.decode(), '{"key":"value"}')
         self.mock_parser_service.parse_message.assert_called_once_with(message_content="test_mscons_data",
-                                                                       max_lines_to_parse=-1)
+                                                                       max_lines_to_parse=-1,
+                                                                       statistics=ANY,
+                                                                       profiler=None,
+                                                                       compact=True,
+                                                                       budget=None,
+                                                                       cancel_token=None)
+
+    @pytest.mark.asyncio
+    @patch('msconsparser.adapters.inbound.rest.impl.parse_mscons_routers.segment_profile')
+    @patch('msconsparser.adapters.inbound.rest.impl.segment_profiling_routers.is_segment_profiling_requested')
+    async def test_parse_mscons_raw_format_merges_segment_profile_if_requested(
+            self, mock_is_segment_profiling_requested, mock_segment_profile):
+        """Test that the segment profile of the parse is merged into the aggregated profile if requested."""
+        # Setup
+        mock_is_segment_profiling_requested.return_value = True
+        mock_parsed_obj = MagicMock()
+        mock_parsed_obj.model_dump.return_value = {"key": "value"}
+        self.mock_parser_service.parse_message.return_value = mock_parsed_obj
+
+        # Execute
+        await self.router.parse_mscons_raw_format(False, "test_mscons_data")
+
+        # Verify
+        profiler = self.mock_parser_service.parse_message.call_args.kwargs["profiler"]
+        self.assertIsInstance(profiler, SegmentProfiler)
+        self.assertFalse(profiler._SegmentProfiler__track_allocations)
+        mock_segment_profile.merge.assert_called_once_with(profiler)
+
+    @pytest.mark.asyncio
+    async def test_parse_mscons_raw_format_limit_mode_passes_budget(self):
+        """Test that the limit mode bounds the parse by the budget of the limit mode."""
+        # Setup
+        mock_parsed_obj = MagicMock()
+        mock_parsed_obj.model_dump.return_value = {}
+        self.mock_parser_service.parse_message.return_value = mock_parsed_obj
+
+        # Execute
+        await self.router.parse_mscons_raw_format(True, "test_mscons_data")
+
+        # Verify
+        self.mock_parser_service.parse_message.assert_called_once_with(message_content="test_mscons_data",
+                                                                       max_lines_to_parse=2442,
+                                                                       statistics=ANY,
+                                                                       profiler=None,
+                                                                       compact=True,
+                                                                       budget=LIMIT_MODE_BUDGET,
+                                                                       cancel_token=None)
+
+    @pytest.mark.asyncio
+    async def test_parse_mscons_raw_format_budget_exceeded(self):
+        """Test that parse_mscons_raw_format answers an exceeded parse budget with status 413."""
+        # Setup
+        self.mock_parser_service.parse_message.side_effect = ParseBudgetExceededException(ParseBudget.SEGMENTS, 2442)
+
+        # Execute
+        response = await self.router.parse_mscons_raw_format(True, "test_mscons_data")
+
+        # Verify
+        self.assertEqual(response.status_code, HTTP_413_CONTENT_TOO_LARGE)
+        self.assertEqual(response.body.decode(), '{"error_message":"Parse budget exceeded (max segments: 2442)"}')
+
+    @pytest.mark.asyncio
+    @patch.dict(os.environ, {"PARSE_BUDGET_DOWNLOAD_PARSED_RAW_FILE_MAX_BYTES": "4"})
+    async def test_download_parsed_file_result_rejects_oversized_file_before_parsing(self):
+        """Test that a file exceeding the byte budget of the endpoint is rejected before it is decoded and parsed."""
+        # Execute
+        response = await self.router.download_parsed_file_result(b"UNA:+.? '")
+
+        # Verify
+        self.assertEqual(response.status_code, HTTP_413_CONTENT_TOO_LARGE)
+        self.mock_parser_service.parse_message.assert_not_called()
+
+    @pytest.mark.asyncio
+    @patch('msconsparser.adapters.inbound.rest.impl.parse_mscons_routers.record_cancelled_parse')
+    @patch('msconsparser.adapters.inbound.rest.impl.parse_mscons_routers.get_request_cancel_token')
+    async def test_parse_mscons_raw_format_cancelled(self, mock_get_request_cancel_token, mock_record_cancelled_parse):
+        """Test that a request with a cancel token is parsed in a worker thread and a cancellation answered with 503."""
+        # Setup
+        cancel_token = CancelToken()
+        mock_get_request_cancel_token.return_value = cancel_token
+        cancelled = ParseCancelledException(CancelToken.CLIENT_DISCONNECTED)
+        parse_threads = []
+
+        def parse_message(**_):
+            parse_threads.append(threading.get_ident())
+            raise cancelled
+        self.mock_parser_service.parse_message.side_effect = parse_message
+
+        # Execute
+        response = await self.router.parse_mscons_raw_format(False, "test_mscons_data")
+
+        # Verify
+        self.assertEqual(response.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+        self.assertIs(cancel_token, self.mock_parser_service.parse_message.call_args.kwargs["cancel_token"])
+        mock_record_cancelled_parse.assert_called_once_with(cancelled)
+        self.assertNotEqual([threading.get_ident()], parse_threads)
+
+    @pytest.mark.asyncio
+    @patch('msconsparser.adapters.inbound.rest.impl.parse_mscons_routers.get_message_selection')
+    async def test_parse_mscons_raw_format_selected_messages(self, mock_get_message_selection):
+        """Test that only the selected messages of a lazily parsed interchange are returned."""
+        # Setup
+        mock_get_message_selection.return_value = MessageSelection(offset=2, limit=3)
+        mock_interchange = MagicMock()
+        mock_interchange.message_count = 10
+        mock_interchange.model_dump.return_value = {"unh_unt_nachrichten": []}
+        self.mock_parser_service.parse_message_lazily.return_value = mock_interchange
+
+        # Execute
+        response = await self.router.parse_mscons_raw_format(False, "test_mscons_data")
+
+        # Verify
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual("10", response.headers["X-Message-Count"])
+        self.mock_parser_service.parse_message.assert_not_called()
+        self.mock_parser_service.parse_message_lazily.assert_called_once_with(message_content="test_mscons_data",
+                                                                              statistics=ANY,
+                                                                              profiler=None,
+                                                                              compact=True,
+                                                                              budget=None,
+                                                                              cancel_token=None)
+        mock_interchange.iter_messages.assert_called_once_with(2, 3)
+        mock_interchange.model_dump.assert_called_once_with(mode="json", offset=2, limit=3)
+
+    @pytest.mark.asyncio
+    @patch('msconsparser.adapters.inbound.rest.impl.parse_mscons_routers.get_message_selection')
+    async def test_parse_mscons_raw_format_missing_message_index(self, mock_get_message_selection):
+        """Test that a message_index beyond the last message is answered with status 400."""
+        # Setup
+        mock_get_message_selection.return_value = MessageSelection(message_index=10)
+        mock_interchange = MagicMock()
+        mock_interchange.get_message.side_effect = IndexError("Message index 10 out of range")
+        self.mock_parser_service.parse_message_lazily.return_value = mock_interchange
+
+        # Execute
+        response = await self.router.parse_mscons_raw_format(False, "test_mscons_data")
+
+        # Verify
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.body.decode(), '{"error_message":"Message index 10 out of range"}')
+
+    @pytest.mark.asyncio
+    @patch('msconsparser.adapters.inbound.rest.impl.parse_mscons_routers.get_page_request')
+    async def test_parse_mscons_raw_format_page(self, mock_get_page_request):
+        """Test that a requested page is returned with the cursor of the next page."""
+        # Setup
+        settings = MSCONSGeneratorSettings(seed=7, messages=3)
+        edifact_text = "".join(MSCONSInterchangeGenerator(settings).iter_segments())
+        mock_get_page_request.return_value = PageRequest(page_size=2)
+        self.mock_parser_service.parse_message_lazily.side_effect = \
+            lambda message_content, **kwargs: LazyEdifactInterchange(message_content, **kwargs)
+
+        # Execute
+        response = await self.router.parse_mscons_raw_format(False, edifact_text)
+
+        # Verify
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual("3", response.headers["X-Message-Count"])
+        self.assertEqual(PageCursor(2), PageCursor.decode(response.headers["X-Next-Cursor"]))
+        self.assertEqual(2, len(json.loads(response.body)["unh_unt_nachrichten"]))
+        self.mock_parser_service.parse_message.assert_not_called()
+
+    @patch.dict(os.environ, {
+        "PARSE_BUDGET_PARSE_RAW_FILE_MAX_SECONDS": "30", "PARSE_BUDGET_PARSE_RAW_FILE_MAX_BYTES": "10"
+    })
+    def test_get_parse_budget_per_endpoint(self):
+        """Test that the budget is configured per endpoint and limited further in the limit mode."""
+        self.assertEqual(ParseBudget(max_bytes=10, max_seconds=30.0), get_parse_budget("/parse-raw-file", False))
+        self.assertEqual(ParseBudget(max_segments=2442, max_bytes=10, max_seconds=30.0),
+                         get_parse_budget("/parse-raw-file", True))
+        self.assertEqual(LIMIT_MODE_BUDGET, get_parse_budget("/parse-raw-format", True))
+        self.assertTrue(get_parse_budget("/download-parsed-raw-format", False).is_unlimited)
+
+
+class TestParseBudgetMiddleware(unittest.IsolatedAsyncioTestCase):
+    """Test cases for the ParseBudgetMiddleware class."""
+
+    def setUp(self):
+        """Set up a middleware around an endpoint reading the whole body."""
+        self.received_bodies = []
+        self.middleware = ParseBudgetMiddleware(self.read_body)
+
+    async def read_body(self, scope, receive, send):
+        body = b""
+        more_body = True
+        while more_body:
+            message = await receive()
+            body += message.get("body", b"")
+            more_body = message.get("more_body", False)
+        self.received_bodies.append(body)
+        await JSONResponse({"bytes": len(body)})(scope, receive, send)
+
+    async def call(self, path: str, content_length: str = "", query_string: bytes = b"", chunks: list = None):
+        chunks = list(chunks or [b""])
+        messages = [
+            {"type": "http.request", "body": chunk, "more_body": index < len(chunks) - 1}
+            for index, chunk in enumerate(chunks)
+        ]
+        received = []
+        sent = []
+
+        async def receive():
+            received.append(messages[len(received)])
+            return received[-1]
+
+        async def send(message):
+            sent.append(message)
+
+        headers = [(b"content-length", content_length.encode())] if content_length else []
+        scope = {"type": "http", "method": "POST", "path": path, "query_string": query_string, "headers": headers}
+        await self.middleware(scope, receive, send)
+        return sent[0]["status"], b"".join(message.get("body", b"") for message in sent[1:]), len(received)
+
+    @patch.dict(os.environ, {"PARSE_BUDGET_PARSE_RAW_FORMAT_MAX_BYTES": "1024"})
+    async def test_rejects_content_length_exceeding_byte_budget(self):
+        """Test that a too large Content-Length is answered with status 413 before the body is read."""
+        # Execute
+        status_code, body, received_count = await self.call("/parse-raw-format", "2048", chunks=[b"x" * 2048])
+
+        # Verify
+        self.assertEqual(HTTP_413_CONTENT_TOO_LARGE, status_code)
+        self.assertIn(b"error_message", body)
+        self.assertEqual(0, received_count)
+
+    @patch.dict(os.environ, {"PARSE_BUDGET_PARSE_RAW_FORMAT_MAX_BYTES": "1024"})
+    async def test_passes_requests_within_byte_budget(self):
+        """Test that the requests within the budget, without byte budget or to other paths are passed on."""
+        large = b"x" * 2048
+        calls = [
+            ("/parse-raw-format", "1024", b"", [b"x" * 1024]),
+            ("/parse-raw-file", str(len(large)), b"", [large]),
+            ("/download-parsed-raw-file", "", b"", [large]),
+            ("/readiness", str(len(large)), b"", [large]),
+        ]
+
+        for path, content_length, query_string, chunks in calls:
+            self.assertEqual(200, (await self.call(path, content_length, query_string, chunks))[0])
+
+    async def test_does_not_limit_bytes_of_limit_mode_by_default(self):
+        """Test that the bytes of the limit mode are only limited if a byte budget is configured."""
+        status_code, _, _ = await self.call("/parse-raw-format", query_string=b"limit_mode=true",
+                                            chunks=[b"x" * 1024 * 1024] * 3)
+
+        self.assertEqual(200, status_code)
+        self.assertEqual([3 * 1024 * 1024], [len(body) for body in self.received_bodies])
+
+    @patch.dict(os.environ, {"PARSE_BUDGET_PARSE_RAW_FORMAT_MAX_BYTES": "1024"})
+    async def test_rejects_body_without_content_length_exceeding_byte_budget(self):
+        """Test that a body without Content-Length is answered with status 413 once it exceeds the byte budget."""
+        # Execute
+        status_code, body, received_count = await self.call("/parse-raw-format", chunks=[b"x" * 512] * 8)
+
+        # Verify
+        self.assertEqual(HTTP_413_CONTENT_TOO_LARGE, status_code)
+        self.assertIn(b"1024", body)
+        self.assertEqual(3, received_count)
+        self.assertEqual([], self.received_bodies)
+
+    @patch.dict(os.environ, {"PARSE_BUDGET_PARSE_RAW_FORMAT_MAX_BYTES": "1024"})
+    async def test_hands_on_body_without_content_length_within_byte_budget(self):
+        """Test that a body without Content-Length within the byte budget reaches the endpoint unchanged."""
+        # Execute
+        status_code, _, _ = await self.call("/parse-raw-format", chunks=[b"UNA:+.? '", b"UNB+UNOC:3'"])
+
+        # Verify
+        self.assertEqual(200, status_code)
+        self.assertEqual([b"UNA:+.? 'UNB+UNOC:3'"], self.received_bodies)
+
+
+class TestMessageSelection(unittest.TestCase):
+    """Test cases for the MessageSelection class."""
+
+    def test_from_query_params(self):
+        """Test that the selection is read from the message_index, offset and limit query parameters."""
+        # Execute
+        single = MessageSelection.from_query_params({"message_index": "4"})
+        page = MessageSelection.from_query_params({"offset": "10", "limit": "5"})
+        tail = MessageSelection.from_query_params({"offset": "10"})
+
+        # Verify
+        self.assertIsNone(MessageSelection.from_query_params({"limit_mode": "false"}))
+        self.assertEqual((4, 1, 4), (single.offset, single.limit, single.message_index))
+        self.assertEqual((10, 5, None), (page.offset, page.limit, page.message_index))
+        self.assertEqual((10, None), (tail.offset, tail.limit))
+
+    def test_from_query_params_rejects_invalid_selection(self):
+        """Test that negative or non-integer values and a message_index with offset or limit are rejected."""
+        for query_params in ({"offset": "-1"}, {"limit": "abc"}, {"message_index": "1", "limit": "2"}):
+            with self.subTest(query_params=query_params):
+                with self.assertRaises(ValueError):
+                    MessageSelection.from_query_params(query_params)
+
+
+class TestMessageSelectionMiddleware(unittest.IsolatedAsyncioTestCase):
+    """Test cases for the message_selection_middleware function."""
+
+    @staticmethod
+    def create_request(path: str, query_params: dict):
+        request = MagicMock()
+        request.url.path = path
+        request.query_params = query_params
+        return request
+
+    async def test_sets_selection_for_the_request(self):
+        """Test that the selection of a parse request is available while the request is processed."""
+        # Setup
+        selections = []
+
+        async def call_next(_):
+            selections.append(get_message_selection())
+            return "response"
+
+        # Execute
+        response = await message_selection_middleware(self.create_request("/parse-raw-file", {"offset": "3"}),
+                                                      call_next)
+
+        # Verify
+        self.assertEqual("response", response)
+        self.assertEqual(3, selections[0].offset)
+        self.assertIsNone(get_message_selection())
+
+    async def test_sets_page_request_for_the_request(self):
+        """Test that the page request of a parse request is available while the request is processed."""
+        # Setup
+        page_requests = []
+
+        async def call_next(_):
+            page_requests.append(get_page_request())
+            return "response"
+
+        # Execute
+        await message_selection_middleware(self.create_request("/parse-raw-file", {"page_size": "3"}), call_next)
+
+        # Verify
+        self.assertEqual(3, page_requests[0].page_size)
+        self.assertIsNone(get_page_request())
+
+    async def test_rejects_page_request_with_selection(self):
+        """Test that a page request combined with a message selection is answered with status 400."""
+        # Execute
+        response = await message_selection_middleware(
+            self.create_request("/parse-raw-format", {"page_size": "3", "offset": "1"}), self.fail
+        )
+
+        # Verify
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    async def test_rejects_invalid_selection(self):
+        """Test that an invalid selection is answered with status 400 before the body is read."""
+        # Execute
+        response = await message_selection_middleware(self.create_request("/parse-raw-format", {"limit": "-5"}),
+                                                      self.fail)
+
+        # Verify
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
 
 
 if __name__ == "__main__":
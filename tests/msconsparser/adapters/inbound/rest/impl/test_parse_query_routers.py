@@ -0,0 +1,101 @@
+import os
+import re
+import unittest
+from unittest.mock import patch
+
+from fastapi import FastAPI, status
+from fastapi.testclient import TestClient
+
+from msconsparser.adapters.inbound.rest.impl.parse_query_routers import (
+    MATCH_COUNT_HEADER, PARSE_QUERY_PATH, router
+)
+from msconsparser.libs.edifactmsconsparser.generators import MSCONSGeneratorSettings, MSCONSInterchangeGenerator
+
+
+class TestParseQueryRouters(unittest.TestCase):
+    """Test cases for the query endpoint."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        app = FastAPI()
+        app.include_router(router)
+        self.client = TestClient(app)
+        settings = MSCONSGeneratorSettings(seed=42, messages=2, objects_per_location=2, intervals_per_position=4)
+        self.edifact_text = "".join(MSCONSInterchangeGenerator(settings).iter_segments())
+        self.locations = re.findall(r"LOC\+172\+(\w+)'", self.edifact_text)
+
+    def test_query_by_location(self):
+        """Test that only the location object of the location is returned."""
+        # Act
+        response = self.client.post(PARSE_QUERY_PATH, params={"location": self.locations[2]},
+                                    content=self.edifact_text)
+
+        # Assert
+        self.assertEqual(status.HTTP_200_OK, response.status_code)
+        self.assertEqual("1", response.headers[MATCH_COUNT_HEADER])
+        self.assertIn("Server-Timing", response.headers)
+        match, = response.json()["matches"]
+        self.assertEqual(1, match["message_index"])
+        self.assertEqual(self.locations[2], match["location"])
+        location_object = match["sg6_wert_und_erfassungsangaben_zum_objekt"]
+        self.assertEqual(self.locations[2],
+                         location_object["loc_identifikationsangabe"]["ortsangabe"]["ortsangabe_code"])
+        self.assertEqual(4, len(location_object["sg9_positionsdaten"][0]["sg10_mengen_und_statusangaben"]))
+
+    def test_query_by_obis_returns_the_positions(self):
+        """Test that a query with an OBIS code returns the positions of the matching location objects."""
+        # Act
+        response = self.client.post(PARSE_QUERY_PATH, params={"obis": "1-1:1.29.1", "time_series_type": "BI1"},
+                                    content=self.edifact_text)
+
+        # Assert
+        self.assertEqual(status.HTTP_200_OK, response.status_code)
+        matches = response.json()["matches"]
+        self.assertEqual(self.locations, [match["location"] for match in matches])
+        self.assertTrue(all("sg9_positionsdaten" in match for match in matches))
+
+    def test_query_without_match(self):
+        """Test that a query without match returns an empty list."""
+        # Act
+        response = self.client.post(PARSE_QUERY_PATH, params={"device_number": "unknown"},
+                                    content=self.edifact_text)
+
+        # Assert
+        self.assertEqual(status.HTTP_200_OK, response.status_code)
+        self.assertEqual({"matches": []}, response.json())
+        self.assertEqual("0", response.headers[MATCH_COUNT_HEADER])
+
+    def test_query_without_values(self):
+        """Test that a query without values is rejected."""
+        # Act
+        response = self.client.post(PARSE_QUERY_PATH, content=self.edifact_text)
+
+        # Assert
+        self.assertEqual(status.HTTP_400_BAD_REQUEST, response.status_code)
+        self.assertIn("error_message", response.json())
+
+    def test_query_of_invalid_interchange(self):
+        """Test that an invalid interchange is answered with status 400."""
+        # Arrange
+        edifact_text = "UNA:+.? 'UNB+UNOC:3+1:500+2:500+240101:0000+REF'UNH+1+MSCONS:D:04B:UN:2.4c'BGM+7'" \
+                       "DTM+137:invalid:303'"
+
+        # Act
+        response = self.client.post(PARSE_QUERY_PATH, params={"location": "DE001"}, content=edifact_text)
+
+        # Assert
+        self.assertEqual(status.HTTP_400_BAD_REQUEST, response.status_code)
+
+    def test_query_exceeding_the_budget(self):
+        """Test that a payload exceeding the byte budget of the endpoint is answered with status 413."""
+        # Act
+        with patch.dict(os.environ, {"PARSE_BUDGET_PARSE_RAW_QUERY_MAX_BYTES": "100"}):
+            response = self.client.post(PARSE_QUERY_PATH, params={"location": self.locations[0]},
+                                        content=self.edifact_text)
+
+        # Assert
+        self.assertEqual(413, response.status_code)
+
+
+if __name__ == '__main__':
+    unittest.main()
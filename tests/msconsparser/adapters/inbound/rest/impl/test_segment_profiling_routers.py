@@ -0,0 +1,93 @@
+import os
+import unittest
+from unittest.mock import patch, MagicMock
+
+from fastapi import status
+from starlette.responses import JSONResponse
+
+from msconsparser.adapters.inbound.rest.impl.segment_profiling_routers import (
+    create_request_profiler, get_segment_profile, reset_segment_profile, is_segment_profiling_requested,
+    segment_profiling_middleware, segment_profile
+)
+from msconsparser.libs.edifactmsconsparser.wrappers import SegmentProfiler
+
+
+class TestSegmentProfilingRouters(unittest.IsolatedAsyncioTestCase):
+    """Test cases for the segment profiling router functions."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        segment_profile.reset()
+
+    def tearDown(self):
+        """Clean up the aggregated segment profile."""
+        segment_profile.reset()
+
+    async def test_get_segment_profile(self):
+        """Test that get_segment_profile returns the aggregated segment profile."""
+        profiler = SegmentProfiler()
+        profiler.count_parse()
+        profiler.record(SegmentProfiler.HANDLER, "QTY", (0.0, 0))
+        segment_profile.merge(profiler)
+
+        response = await get_segment_profile()
+
+        self.assertIsInstance(response, JSONResponse)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn('"parses":1', response.body.decode())
+        self.assertIn('"QTY":{"handler":{"calls":1', response.body.decode())
+
+    async def test_reset_segment_profile(self):
+        """Test that reset_segment_profile clears the aggregated segment profile."""
+        segment_profile.count_parse()
+
+        response = await reset_segment_profile()
+
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertEqual({"parses": 0, "segment_types": {}}, segment_profile.report())
+
+    @patch.dict(os.environ, {"ENABLE_SEGMENT_PROFILING": "false"})
+    async def test_segment_profiling_middleware_enables_profiling_per_request(self):
+        """Test that the X-Profile-Segments header enables the profiling only for its request."""
+        request = MagicMock()
+        request.headers = {"X-Profile-Segments": "true"}
+        requested_during_call = []
+
+        async def call_next(_):
+            requested_during_call.append(is_segment_profiling_requested())
+            return "response"
+
+        response = await segment_profiling_middleware(request, call_next)
+
+        self.assertEqual("response", response)
+        self.assertEqual([True], requested_during_call)
+        self.assertFalse(is_segment_profiling_requested())
+
+    @patch.dict(os.environ, {"ENABLE_SEGMENT_PROFILING": "true"})
+    def test_is_segment_profiling_requested_if_enabled_for_all_requests(self):
+        """Test that the environment variable ENABLE_SEGMENT_PROFILING enables the profiling for all requests."""
+        self.assertTrue(is_segment_profiling_requested())
+
+    @patch.dict(os.environ, {"ENABLE_SEGMENT_PROFILING": "true", "SEGMENT_PROFILING_TRACK_ALLOCATIONS": "true"})
+    @patch("sys.getallocatedblocks")
+    def test_create_request_profiler_tracking_allocations(self, mock_allocated_blocks):
+        """Test that the request profiler counts the allocated blocks only if enabled by the environment."""
+        mock_allocated_blocks.side_effect = [100, 110]
+
+        profiler = create_request_profiler()
+        profiler.record(SegmentProfiler.HANDLER, "QTY", profiler.start())
+
+        self.assertEqual(10, profiler.get_entry("QTY", SegmentProfiler.HANDLER).allocated_blocks)
+        with patch.dict(os.environ, {"SEGMENT_PROFILING_TRACK_ALLOCATIONS": "false"}):
+            create_request_profiler().start()
+        # Only the start and the record of the tracking profiler count the blocks
+        self.assertEqual(2, mock_allocated_blocks.call_count)
+
+    @patch.dict(os.environ, {"ENABLE_SEGMENT_PROFILING": "false"})
+    def test_create_request_profiler_without_profiling(self):
+        """Test that no profiler is created for a request which is not profiled."""
+        self.assertIsNone(create_request_profiler())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,174 @@
+import contextlib
+import os
+import re
+import sqlite3
+import tempfile
+import unittest
+from datetime import datetime, timedelta, timezone
+
+from msconsparser.adapters.outbound.sqlite import SQLiteMeasurementStore
+from msconsparser.libs.edifactmsconsparser.edifact_mscons_parser import EdifactMSCONSParser
+from msconsparser.libs.edifactmsconsparser.generators import MSCONSGeneratorSettings, MSCONSInterchangeGenerator
+
+
+def create_interchange(seed: int = 42, numeric_mode: str = "float") -> tuple[dict, list[str]]:
+    settings = MSCONSGeneratorSettings(seed=seed, messages=2, objects_per_location=2, intervals_per_position=4)
+    edifact_text = "".join(MSCONSInterchangeGenerator(settings).iter_segments())
+    parser = EdifactMSCONSParser(numeric_mode=numeric_mode)
+    interchange = parser.parse(edifact_text, compact=True).model_dump(mode="json")
+    return interchange, re.findall(r"LOC\+172\+(\w+)'", edifact_text)
+
+
+class TestSQLiteMeasurementStore(unittest.TestCase):
+    """Test cases for the SQLiteMeasurementStore."""
+
+    def setUp(self):
+        """Set up a store in a temporary database file."""
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "measurements.db")
+        self.store = SQLiteMeasurementStore(self.path, batch_size=3)
+        self.interchange, self.locations = create_interchange()
+
+    def tearDown(self):
+        """Close the store and remove the database."""
+        self.store.close()
+        self.directory.cleanup()
+
+    def test_store_interchange(self):
+        """Test that the interchange is stored with its messages, locations and intervals."""
+        # Act
+        summary = self.store.store_interchange(self.interchange, source="test.edi")
+
+        # Assert
+        self.assertEqual({"interchange_id": 1, "message_count": 2, "location_count": 4, "measurement_count": 16},
+                         summary)
+        interchange, = self.store.find_interchanges()
+        self.assertEqual("test.edi", interchange["source"])
+        self.assertEqual("9900000000001", interchange["sender"])
+        self.assertEqual("9900000000002", interchange["recipient"])
+        self.assertEqual(self.interchange["unb_nutzdaten_kopfsegment"]["datenaustauschreferenz"],
+                         interchange["interchange_reference"])
+        self.assertEqual(2, interchange["message_count"])
+
+    def test_quantities_are_stored_in_the_unit_in_every_numeric_mode(self):
+        """Test that the quantities of the decimal and milli numeric modes are stored like the float quantities."""
+        # Arrange
+        self.store.store_interchange(self.interchange)
+        for numeric_mode in ("decimal", "milli"):
+            self.store.store_interchange(create_interchange(numeric_mode=numeric_mode)[0])
+
+        # Act
+        quantities = [measurement["quantity"] for measurement in self.store.find_measurements(
+            location=self.locations[0], obis="1-1:1.29.1")]
+
+        # Assert
+        self.assertEqual(12, len(quantities))
+        self.assertTrue(all(isinstance(quantity, float) for quantity in quantities))
+        self.assertEqual(quantities[0::3], quantities[1::3])
+        self.assertEqual(quantities[0::3], quantities[2::3])
+
+    def test_database_is_in_wal_mode(self):
+        """Test that the database file is opened in WAL mode."""
+        self.assertEqual("wal", self.store.journal_mode)
+
+    def test_find_measurements_of_a_location(self):
+        """Test that the measurements of a location are returned in the order of their intervals in UTC."""
+        # Arrange
+        self.store.store_interchange(self.interchange)
+
+        # Act
+        measurements = self.store.find_measurements(location=self.locations[1], obis="1-1:1.29.1")
+
+        # Assert
+        self.assertEqual(4, len(measurements))
+        self.assertEqual({"interchange_id": 1, "message_reference": "1", "location": self.locations[1],
+                          "obis": "1-1:1.29.1", "quantity_qualifier": "220", "unit": "KWH",
+                          "interval_start": "2024-01-01T00:00:00+00:00", "interval_end": "2024-01-01T00:15:00+00:00"},
+                         {key: value for key, value in measurements[0].items() if key != "quantity"})
+        self.assertEqual(["2024-01-01T00:00:00+00:00", "2024-01-01T00:15:00+00:00", "2024-01-01T00:30:00+00:00",
+                          "2024-01-01T00:45:00+00:00"], [measurement["interval_start"] for measurement in measurements])
+
+    def test_find_measurements_of_a_time_range(self):
+        """Test that the start of the range is inclusive and its end exclusive, a naive timestamp is taken as UTC."""
+        # Arrange
+        self.store.store_interchange(self.interchange)
+        berlin = timezone(timedelta(hours=1))
+
+        # Act
+        measurements = self.store.find_measurements(
+            location=self.locations[0],
+            start=datetime(2024, 1, 1, 1, 15, tzinfo=berlin),
+            end=datetime(2024, 1, 1, 0, 45),
+        )
+
+        # Assert
+        self.assertEqual(["2024-01-01T00:15:00+00:00", "2024-01-01T00:30:00+00:00"],
+                         [measurement["interval_start"] for measurement in measurements])
+
+    def test_find_measurements_with_limit_and_offset(self):
+        """Test that the measurements are ordered by location, OBIS code and interval start and paged."""
+        # Arrange
+        self.store.store_interchange(self.interchange)
+        measurements = self.store.find_measurements()
+
+        # Act
+        page = self.store.find_measurements(limit=5, offset=3)
+
+        # Assert
+        self.assertEqual(16, len(measurements))
+        self.assertEqual(sorted(measurements, key=lambda m: (m["location"], m["obis"], m["interval_start"])),
+                         measurements)
+        self.assertEqual(measurements[3:8], page)
+
+    def test_find_interchanges_most_recent_first(self):
+        """Test that the interchanges are listed from the most recently stored one."""
+        # Arrange
+        second, _ = create_interchange(seed=7)
+        self.store.store_interchange(self.interchange, source="first.edi")
+        self.store.store_interchange(second, source="second.edi")
+
+        # Act
+        interchanges = self.store.find_interchanges()
+        page = self.store.find_interchanges(limit=1, offset=1)
+
+        # Assert
+        self.assertEqual(["second.edi", "first.edi"], [interchange["source"] for interchange in interchanges])
+        self.assertEqual(["first.edi"], [interchange["source"] for interchange in page])
+        self.assertEqual(32, len(self.store.find_measurements()))
+
+    def test_failed_store_is_rolled_back(self):
+        """Test that an interchange is stored completely or not at all."""
+        # Arrange
+        self.store.store_interchange(self.interchange)
+        invalid = dict(self.interchange, unh_unt_nachrichten=[*self.interchange["unh_unt_nachrichten"], None])
+
+        # Act
+        with self.assertRaises(AttributeError):
+            self.store.store_interchange(invalid, source="invalid.edi")
+
+        # Assert
+        self.assertEqual(1, len(self.store.find_interchanges()))
+        self.assertEqual(16, len(self.store.find_measurements()))
+        self.assertEqual({"interchange_id": 2, "message_count": 2, "location_count": 4, "measurement_count": 16},
+                         self.store.store_interchange(self.interchange))
+
+    def test_store_is_persistent(self):
+        """Test that the stored measurements are read by another connection."""
+        # Arrange
+        self.store.store_interchange(self.interchange)
+
+        # Act
+        with contextlib.closing(sqlite3.connect(self.path)) as connection:
+            count, = connection.execute("SELECT count(*) FROM measurements").fetchone()
+
+        # Assert
+        self.assertEqual(16, count)
+
+    def test_invalid_batch_size(self):
+        """Test that the batch size must be positive."""
+        with self.assertRaises(ValueError):
+            SQLiteMeasurementStore(":memory:", batch_size=0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,141 @@
+import asyncio
+import io
+import json
+import os
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+from msconsparser.application.services import BatchParseService
+from msconsparser.application.services.batch_parse_service import get_parse_batch_workers, parse_file_record
+from msconsparser.libs.edifactmsconsparser.edifact_mscons_parser import EdifactMSCONSParser
+from msconsparser.libs.edifactmsconsparser.generators import MSCONSGeneratorSettings, MSCONSInterchangeGenerator
+from msconsparser.libs.edifactmsconsparser.wrappers import ParseBudget
+
+
+def generate_interchange(seed: int) -> str:
+    settings = MSCONSGeneratorSettings(seed=seed, messages=1)
+    return "".join(MSCONSInterchangeGenerator(settings).iter_segments())
+
+
+class TestBatchParseService(unittest.TestCase):
+    """Test cases for the BatchParseService class."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.interchanges = [generate_interchange(seed) for seed in range(3)]
+        self.files = [(f"file_{index}.edi", interchange.encode("utf-8"))
+                      for index, interchange in enumerate(self.interchanges)]
+
+    def test_iter_records_in_worker_processes(self):
+        """Test that the files are parsed in worker processes and their records keep the order of the files."""
+        # Arrange
+        service = BatchParseService(max_workers=2)
+
+        try:
+            # Act
+            records = [json.loads(record) for record in service.iter_records(self.files)]
+        finally:
+            service.shutdown()
+
+        # Assert
+        parser = EdifactMSCONSParser()
+        self.assertEqual([0, 1, 2], [record["index"] for record in records])
+        self.assertEqual(["file_0.edi", "file_1.edi", "file_2.edi"], [record["file_name"] for record in records])
+        for record, interchange in zip(records, self.interchanges):
+            self.assertEqual("ok", record["status"])
+            self.assertEqual(parser.parse(interchange).model_dump(mode="json"), record["result"])
+
+    def test_iter_records_with_bad_files(self):
+        """Test that bad files result in error records without failing the batch."""
+        # Arrange
+        service = BatchParseService(max_workers=1, executor=ThreadPoolExecutor(max_workers=1))
+        files = [self.files[0], ("empty.edi", b"  \n"), ("unreadable.edi", OSError("Bad member")), self.files[1]]
+
+        try:
+            # Act
+            records = [json.loads(record) for record in service.iter_records(files)]
+        finally:
+            service.shutdown()
+
+        # Assert
+        self.assertEqual(["ok", "error", "error", "ok"], [record["status"] for record in records])
+        self.assertEqual("No message provided", records[1]["error_message"])
+        self.assertEqual("Bad member", records[2]["error_message"])
+
+    def test_aiter_records(self):
+        """Test that the records are returned asynchronously in the order of the files."""
+        # Arrange
+        service = BatchParseService(max_workers=1, executor=ThreadPoolExecutor(max_workers=2))
+
+        async def collect() -> list:
+            return [json.loads(record) async for record in service.aiter_records(self.files)]
+
+        try:
+            # Act
+            records = asyncio.run(collect())
+        finally:
+            service.shutdown()
+
+        # Assert
+        self.assertEqual([0, 1, 2], [record["index"] for record in records])
+        self.assertTrue(all(record["status"] == "ok" for record in records))
+
+    def test_iter_records_of_streams(self):
+        """Test that the chunks of messages of a file given as stream are merged into one record per file."""
+        # Arrange
+        settings = MSCONSGeneratorSettings(seed=42, messages=4)
+        edifact_text = "".join(MSCONSInterchangeGenerator(settings).iter_segments())
+        service = BatchParseService(max_workers=2, executor=ThreadPoolExecutor(max_workers=2), chunk_size=1)
+        files = [("large.edi", io.BytesIO(edifact_text.encode("utf-8"))), self.files[0]]
+
+        try:
+            # Act
+            records = [json.loads(record) for record in service.iter_records(files)]
+        finally:
+            service.shutdown()
+
+        # Assert
+        self.assertEqual([0, 1], [record["index"] for record in records])
+        self.assertEqual(json.loads(parse_file_record(0, "large.edi", edifact_text.encode("utf-8"))), records[0])
+        self.assertEqual(list(EdifactMSCONSParser().parse(edifact_text).model_dump(mode="json")),
+                         list(records[0]["result"]))
+
+    def test_iter_records_of_stream_exceeding_budget(self):
+        """Test that a stream exceeding the byte budget results in an error record of the file."""
+        # Arrange
+        service = BatchParseService(max_workers=1, executor=ThreadPoolExecutor(max_workers=1),
+                                    budget=ParseBudget(max_bytes=100))
+
+        try:
+            # Act
+            files = [("large.edi", io.BytesIO(self.files[0][1]))]
+            records = [json.loads(record) for record in service.iter_records(files)]
+        finally:
+            service.shutdown()
+
+        # Assert
+        self.assertEqual([("large.edi", "error")], [(record["file_name"], record["status"]) for record in records])
+        self.assertIn("bytes", records[0]["error_message"])
+
+    def test_parse_file_record_exceeding_budget(self):
+        """Test that a file exceeding the budget results in an error record."""
+        # Act
+        record = json.loads(parse_file_record(7, "large.edi", self.files[0][1], ParseBudget(max_bytes=100)))
+
+        # Assert
+        self.assertEqual({"index": 7, "file_name": "large.edi", "status": "error"},
+                         {key: record[key] for key in ("index", "file_name", "status")})
+        self.assertIn("bytes", record["error_message"])
+
+    def test_get_parse_batch_workers(self):
+        """Test that an invalid PARSE_BATCH_WORKERS falls back to the number of CPUs."""
+        with patch.dict(os.environ, {"PARSE_BATCH_WORKERS": "3"}):
+            self.assertEqual(3, get_parse_batch_workers())
+        with patch.dict(os.environ, {"PARSE_BATCH_WORKERS": "-1"}):
+            with self.assertLogs("msconsparser.application.services.batch_parse_service", level="WARNING"):
+                self.assertEqual(os.cpu_count() or 1, get_parse_batch_workers())
+
+
+if __name__ == "__main__":
+    unittest.main()
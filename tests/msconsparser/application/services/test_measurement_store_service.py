@@ -0,0 +1,189 @@
+import os
+import threading
+import time
+import unittest
+from datetime import datetime
+from unittest.mock import MagicMock, patch
+
+from msconsparser.application.services.measurement_store_service import (
+    MeasurementStoreService, get_measurement_store_dedup_mode, get_measurement_store_path
+)
+from msconsparser.application.services.parser_service import ParserService
+from msconsparser.domain.ports.outbound import MeasurementStorePort
+from msconsparser.libs.edifactmsconsparser.generators import MSCONSGeneratorSettings, MSCONSInterchangeGenerator
+from msconsparser.libs.edifactmsconsparser.exceptions import DuplicateInterchangeException
+from msconsparser.libs.edifactmsconsparser.wrappers import (
+    DuplicateIndex, DuplicateKind, DuplicateMode, ParsePhase, ParseStatistics
+)
+
+
+def create_interchange(messages: int = 2) -> str:
+    settings = MSCONSGeneratorSettings(seed=42, messages=messages, intervals_per_position=2)
+    return "".join(MSCONSInterchangeGenerator(settings).iter_segments())
+
+
+class TestMeasurementStoreService(unittest.TestCase):
+    """Test cases for the MeasurementStoreService class."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.mock_store = MagicMock(spec=MeasurementStorePort)
+        self.service = MeasurementStoreService(self.mock_store)
+
+    def test_store_message(self):
+        """Test that the message is parsed, dumped to JSON compatible objects and stored."""
+        # Arrange
+        edifact_text = create_interchange()
+        statistics = ParseStatistics()
+        self.mock_store.store_interchange.return_value = {"interchange_id": 1}
+
+        # Act
+        summary = self.service.store_message(edifact_text, source="test.edi", statistics=statistics)
+
+        # Assert
+        self.assertEqual({"interchange_id": 1}, summary)
+        interchange, source = self.mock_store.store_interchange.call_args.args
+        self.assertEqual("test.edi", source)
+        self.assertEqual(2, len(interchange["unh_unt_nachrichten"]))
+        self.assertIsInstance(interchange["unb_nutzdaten_kopfsegment"]["datum_uhrzeit_der_erstellung"]["datum"], str)
+        self.assertIn(ParsePhase.SERIALIZE, statistics.phase_durations)
+        self.assertIn(ParsePhase.STORE, statistics.phase_durations)
+
+    def test_store_message_parses_compact(self):
+        """Test that the injected parser service parses the message into compact nodes."""
+        # Arrange
+        mock_parser_service = MagicMock(spec=ParserService)
+        service = MeasurementStoreService(self.mock_store, parser_service=mock_parser_service)
+
+        # Act
+        service.store_message("test_message_content")
+
+        # Assert
+        self.assertTrue(mock_parser_service.parse_message.call_args.kwargs["compact"])
+        self.mock_store.store_interchange.assert_called_once_with(
+            mock_parser_service.parse_message.return_value.model_dump.return_value, None
+        )
+
+    def test_flagged_duplicates_are_not_stored(self):
+        """Test that a resent interchange is not stored and resent messages are left out of a new interchange."""
+        # Arrange
+        service = MeasurementStoreService(self.mock_store, duplicate_index=DuplicateIndex())
+        self.mock_store.store_interchange.return_value = {"interchange_id": 1}
+        first = service.store_message(create_interchange())
+        new_interchange = create_interchange(messages=3).replace("REF", "REFX")
+
+        # Act
+        resent = service.store_message(create_interchange())
+        self.mock_store.store_interchange.return_value = {"interchange_id": 2}
+        extended = service.store_message(new_interchange)
+
+        # Assert
+        self.assertEqual({"interchange_id": 1, "duplicates": []}, first)
+        self.assertIsNone(resent["interchange_id"])
+        self.assertEqual([DuplicateKind.INTERCHANGE], [duplicate["kind"] for duplicate in resent["duplicates"]])
+        self.assertEqual([DuplicateKind.MESSAGE] * 2, [duplicate["kind"] for duplicate in extended["duplicates"]])
+        self.assertEqual(2, self.mock_store.store_interchange.call_count)
+        interchange, _ = self.mock_store.store_interchange.call_args.args
+        message, = interchange["unh_unt_nachrichten"]
+        self.assertEqual("3", message["unh_nachrichtenkopfsegment"]["nachrichten_referenznummer"])
+
+    def test_rejected_duplicate_is_not_stored(self):
+        """Test that a rejected duplicate raises and keys of a failed store are not added to the index."""
+        # Arrange
+        duplicate_index = DuplicateIndex()
+        service = MeasurementStoreService(self.mock_store, duplicate_index=duplicate_index,
+                                          duplicate_mode=DuplicateMode.REJECT)
+        self.mock_store.store_interchange.side_effect = [OSError("disk full"), {"interchange_id": 1}]
+        with self.assertRaises(OSError):
+            service.store_message(create_interchange())
+
+        # Act
+        summary = service.store_message(create_interchange())
+        with self.assertRaises(DuplicateInterchangeException):
+            service.store_message(create_interchange())
+
+        # Assert
+        self.assertEqual({"interchange_id": 1, "duplicates": []}, summary)
+        self.assertEqual(3, len(duplicate_index))
+        self.assertEqual(2, self.mock_store.store_interchange.call_count)
+
+    def test_concurrently_resent_interchange_is_stored_once(self):
+        """Test that of an interchange sent by several threads at the same time only one copy is stored."""
+        # Arrange
+        duplicate_index = DuplicateIndex()
+        service = MeasurementStoreService(self.mock_store, duplicate_index=duplicate_index,
+                                          duplicate_mode=DuplicateMode.REJECT)
+        # The copies are parsed while the first one is being stored
+        self.mock_store.store_interchange.side_effect = \
+            lambda content, source: time.sleep(0.05) or {"interchange_id": 1}
+        edifact_text = create_interchange()
+        barrier = threading.Barrier(4)
+        summaries = []
+        rejected = []
+
+        def store():
+            barrier.wait()
+            try:
+                summaries.append(service.store_message(edifact_text))
+            except DuplicateInterchangeException as ex:
+                rejected.append(ex)
+
+        threads = [threading.Thread(target=store) for _ in range(4)]
+
+        # Act
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        # Assert
+        self.assertEqual([{"interchange_id": 1, "duplicates": []}], summaries)
+        self.assertEqual(3, len(rejected))
+        self.assertEqual(1, self.mock_store.store_interchange.call_count)
+        self.assertEqual(3, len(duplicate_index))
+
+    def test_find_measurements(self):
+        """Test that the query is passed to the store."""
+        # Arrange
+        start = datetime(2024, 1, 1)
+
+        # Act
+        result = self.service.find_measurements(location="DE001", obis="1-1:1.29.1", start=start, limit=10)
+
+        # Assert
+        self.assertEqual(self.mock_store.find_measurements.return_value, result)
+        self.mock_store.find_measurements.assert_called_once_with(
+            location="DE001", obis="1-1:1.29.1", start=start, end=None, limit=10, offset=0
+        )
+
+    def test_find_interchanges_and_close(self):
+        """Test that the listing and the closing are passed to the store."""
+        # Act
+        result = self.service.find_interchanges(limit=5, offset=10)
+        self.service.close()
+
+        # Assert
+        self.assertEqual(self.mock_store.find_interchanges.return_value, result)
+        self.mock_store.find_interchanges.assert_called_once_with(limit=5, offset=10)
+        self.mock_store.close.assert_called_once_with()
+
+    def test_get_measurement_store_path(self):
+        """Test that the measurement store is disabled without a configured path."""
+        with patch.dict(os.environ, {"MEASUREMENT_STORE_PATH": ""}):
+            self.assertIsNone(get_measurement_store_path())
+        with patch.dict(os.environ, {"MEASUREMENT_STORE_PATH": "/data/measurements.db"}):
+            self.assertEqual("/data/measurements.db", get_measurement_store_path())
+
+    def test_get_measurement_store_dedup_mode(self):
+        """Test that duplicates are only detected with a valid mode."""
+        with patch.dict(os.environ, {"MEASUREMENT_STORE_DEDUP": ""}):
+            self.assertIsNone(get_measurement_store_dedup_mode())
+        with patch.dict(os.environ, {"MEASUREMENT_STORE_DEDUP": " Reject"}):
+            self.assertEqual(DuplicateMode.REJECT, get_measurement_store_dedup_mode())
+        with patch.dict(os.environ, {"MEASUREMENT_STORE_DEDUP": "ignore"}):
+            with self.assertLogs(level="WARNING"):
+                self.assertIsNone(get_measurement_store_dedup_mode())
+
+
+if __name__ == '__main__':
+    unittest.main()
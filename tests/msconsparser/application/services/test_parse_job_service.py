@@ -0,0 +1,277 @@
+import json
+import os
+import shutil
+import tempfile
+import time
+import unittest
+from unittest.mock import MagicMock, patch
+
+from msconsparser.application.services import ParseJobQueueFullException, ParseJobService, ParserService
+from msconsparser.application.services.parse_job_service import get_parse_job_result_ttl, get_parse_job_workers
+from msconsparser.domain.models import ParseJob, ParseJobStatus
+from msconsparser.libs.edifactmsconsparser.edifact_mscons_parser import EdifactMSCONSParser
+from msconsparser.libs.edifactmsconsparser.exceptions import MSCONSParserException
+from msconsparser.libs.edifactmsconsparser.generators import MSCONSGeneratorSettings, MSCONSInterchangeGenerator
+from msconsparser.libs.edifactmsconsparser.interchange_pages import PAGE_BY_MEASUREMENTS, PageCursor, PageRequest
+
+
+class FakeClock:
+    """Clock advanced by the tests."""
+
+    def __init__(self):
+        self.now = 1_700_000_000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestParseJobService(unittest.TestCase):
+    """Test cases for the ParseJobService class."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.spool_dir = tempfile.mkdtemp()
+        self.clock = FakeClock()
+        self.service = ParseJobService(spool_dir=self.spool_dir, max_workers=1, max_pending_jobs=2,
+                                       result_ttl_seconds=60, clock=self.clock)
+        settings = MSCONSGeneratorSettings(seed=42, messages=3)
+        self.edifact_text = "".join(MSCONSInterchangeGenerator(settings).iter_segments())
+
+    def tearDown(self):
+        """Stop the workers and remove the spool directory."""
+        self.service.shutdown()
+        shutil.rmtree(self.spool_dir, ignore_errors=True)
+
+    def run_job(self, content: bytes, service: ParseJobService = None) -> ParseJob:
+        service = service or self.service
+        job = service.create_job()
+        with open(service.get_upload_path(job), "wb") as upload_file:
+            upload_file.write(content)
+        service.submit_job(job)
+        deadline = time.monotonic() + 30
+        while job.is_pending and time.monotonic() < deadline:
+            time.sleep(0.01)
+        return job
+
+    def test_run_job(self):
+        """Test that a job parses the upload and the JSON result equals the result of the parser."""
+        # Act
+        job = self.run_job(self.edifact_text.encode("utf-8"))
+
+        # Assert
+        self.assertEqual(ParseJobStatus.SUCCEEDED, job.status)
+        self.assertEqual(3, job.processed_messages)
+        self.assertEqual(len(self.edifact_text), job.total_bytes)
+        self.assertEqual(job.total_bytes, job.processed_bytes)
+        self.assertEqual(self.clock.now + 60, job.expires_at)
+        self.assertFalse(os.path.exists(self.service.get_upload_path(job)))
+        expected = EdifactMSCONSParser().parse(self.edifact_text).model_dump(mode="json")
+        self.assertEqual(expected, json.loads(b"".join(self.service.iter_result_json(job))))
+
+    def test_iter_result_lines(self):
+        """Test that the NDJSON result has a line for the header, per message and for the trailer."""
+        # Arrange
+        job = self.run_job(self.edifact_text.encode("utf-8"))
+
+        # Act
+        lines = [json.loads(line) for line in self.service.iter_result_lines(job)]
+
+        # Assert
+        self.assertEqual(5, len(lines))
+        self.assertEqual(["una_service_string_advice", "unb_nutzdaten_kopfsegment"], list(lines[0]))
+        self.assertEqual(["unz_nutzdaten_endsegment"], list(lines[-1]))
+        self.assertEqual(3, len({line["unh_nachrichtenkopfsegment"]["nachrichten_referenznummer"]
+                                 for line in lines[1:-1]}))
+
+    def test_get_result_page(self):
+        """Test that the pages of messages and measurements are read from the result from their cursor on."""
+        # Arrange
+        job = self.run_job(self.edifact_text.encode("utf-8"))
+        expected = EdifactMSCONSParser().parse(self.edifact_text).model_dump(mode="json")
+
+        # Act
+        first_page = self.service.get_result_page(job, PageRequest(page_size=2))
+        last_page = self.service.get_result_page(job, PageRequest(page_size=2, cursor=first_page.next_cursor))
+        measurement_page = self.service.get_result_page(
+            job, PageRequest(PAGE_BY_MEASUREMENTS, page_size=5, cursor=PageCursor(2))
+        )
+
+        # Assert
+        self.assertEqual(list(expected), list(first_page.model_dump()))
+        self.assertEqual(expected["unh_unt_nachrichten"][:2], first_page.model_dump()["unh_unt_nachrichten"])
+        self.assertEqual(expected["unz_nutzdaten_endsegment"], first_page.model_dump()["unz_nutzdaten_endsegment"])
+        self.assertEqual(PageCursor(2), first_page.next_cursor)
+        self.assertEqual(expected["unh_unt_nachrichten"][2:], last_page.items)
+        self.assertIsNone(last_page.next_cursor)
+        self.assertEqual(3, last_page.message_count)
+        self.assertEqual(5, len(measurement_page.items))
+        self.assertEqual({2}, {measurement["message_index"] for measurement in measurement_page.items})
+        self.assertEqual(PageCursor(2, 0, 0, 5), measurement_page.next_cursor)
+
+    def test_run_job_without_messages(self):
+        """Test that the JSON result of an interchange without messages has an empty list of messages."""
+        # Act
+        job = self.run_job(b"UNA:+.? 'UNB+UNOC:3+sender:500+receiver:500+250101:1200+REF1'UNZ+0+REF1'")
+
+        # Assert
+        self.assertEqual(ParseJobStatus.SUCCEEDED, job.status)
+        result = json.loads(b"".join(self.service.iter_result_json(job)))
+        self.assertEqual([], result["unh_unt_nachrichten"])
+        self.assertIsNotNone(result["unz_nutzdaten_endsegment"])
+
+    def test_run_job_streams_the_upload(self):
+        """Test that the upload is passed to the parse as decoded blocks instead of being read completely."""
+        # Arrange
+        parser_service = MagicMock(wraps=ParserService())
+        service = ParseJobService(parser_service=parser_service, spool_dir=self.spool_dir, clock=self.clock)
+
+        try:
+            # Act
+            job = self.run_job(self.edifact_text.encode("utf-8"), service)
+        finally:
+            service.shutdown()
+
+        # Assert
+        self.assertEqual(ParseJobStatus.SUCCEEDED, job.status)
+        self.assertNotIsInstance(parser_service.parse_message_incrementally.call_args.kwargs["message_content"], str)
+        self.assertEqual(job.total_bytes, job.processed_bytes)
+        expected = EdifactMSCONSParser().parse(self.edifact_text).model_dump(mode="json")
+        self.assertEqual(expected, json.loads(b"".join(service.iter_result_json(job))))
+
+    def test_run_job_with_latin_1_upload(self):
+        """Test that an upload which is not UTF-8 is decoded as ISO-8859-1."""
+        # Act
+        job = self.run_job(self.edifact_text.encode("utf-8") + "Ä".encode("iso-8859-1"))
+
+        # Assert
+        self.assertEqual(ParseJobStatus.SUCCEEDED, job.status)
+
+    def test_failed_job(self):
+        """Test that a failing parse fails the job with the error message and leaves no result."""
+        # Arrange
+        parser_service = MagicMock(spec=ParserService)
+        parser_service.parse_message_incrementally.side_effect = MSCONSParserException("Invalid interchange")
+        service = ParseJobService(parser_service=parser_service, spool_dir=self.spool_dir, clock=self.clock)
+
+        try:
+            # Act
+            job = self.run_job(b"UNB+", service)
+        finally:
+            service.shutdown()
+
+        # Assert
+        self.assertEqual(ParseJobStatus.FAILED, job.status)
+        self.assertEqual("Invalid interchange", job.error_message)
+        self.assertFalse(os.path.exists(service.get_result_path(job)))
+        self.assertFalse(os.path.exists(service.get_upload_path(job)))
+
+    def test_create_job_with_full_queue(self):
+        """Test that no job is created while the maximum number of pending jobs is reached."""
+        # Arrange
+        self.service.create_job()
+        self.service.create_job()
+
+        # Act / Assert
+        with self.assertRaises(ParseJobQueueFullException):
+            self.service.create_job()
+
+    def test_discard_job(self):
+        """Test that a discarded job is removed together with its upload."""
+        # Arrange
+        job = self.service.create_job()
+        with open(self.service.get_upload_path(job), "wb") as upload_file:
+            upload_file.write(b"UNB+")
+
+        # Act
+        self.service.discard_job(job)
+
+        # Assert
+        self.assertIsNone(self.service.get_job(job.job_id))
+        self.assertFalse(os.path.exists(self.service.get_upload_path(job)))
+
+    def test_evict_expired_jobs(self):
+        """Test that finished jobs are evicted with their result once their TTL has passed."""
+        # Arrange
+        job = self.run_job(self.edifact_text.encode("utf-8"))
+        pending_job = self.service.create_job()
+
+        # Act
+        self.clock.now += 59
+        evicted_before_ttl = self.service.evict_expired_jobs()
+        self.clock.now += 1
+        evicted_after_ttl = self.service.evict_expired_jobs()
+
+        # Assert
+        self.assertEqual(0, evicted_before_ttl)
+        self.assertEqual(1, evicted_after_ttl)
+        self.assertIsNone(self.service.get_job(job.job_id))
+        self.assertIs(pending_job, self.service.get_job(pending_job.job_id))
+        self.assertFalse(os.path.exists(self.service.get_result_path(job)))
+
+    def test_sweeper_evicts_expired_jobs(self):
+        """Test that the sweeper evicts the expired jobs without a request to the service."""
+        # Arrange
+        service = ParseJobService(spool_dir=self.spool_dir, max_workers=1, result_ttl_seconds=60, clock=self.clock,
+                                  sweep_interval_seconds=0.01)
+        try:
+            job = self.run_job(self.edifact_text.encode("utf-8"), service)
+            result_path = service.get_result_path(job)
+
+            # Act
+            self.clock.now += 60
+            deadline = time.monotonic() + 10
+            while os.path.exists(result_path) and time.monotonic() < deadline:
+                time.sleep(0.01)
+
+            # Assert
+            self.assertFalse(os.path.exists(result_path))
+        finally:
+            service.shutdown()
+
+    def test_stale_files_are_removed_at_start(self):
+        """Test that the uploads and results older than the TTL are removed when the service starts."""
+        # Arrange
+        paths = {name: os.path.join(self.spool_dir, name)
+                 for name in ("stale.edi", "stale.ndjson", "recent.ndjson", "other.txt")}
+        for name, path in paths.items():
+            with open(path, "wb") as file:
+                file.write(b"{}")
+            modified_at = self.clock.now - (30 if name.startswith("recent") else 61)
+            os.utime(path, (modified_at, modified_at))
+
+        # Act
+        service = ParseJobService(spool_dir=self.spool_dir, result_ttl_seconds=60, clock=self.clock)
+        service.shutdown()
+
+        # Assert
+        self.assertEqual(["other.txt", "recent.ndjson"], sorted(os.listdir(self.spool_dir)))
+
+    def test_as_dict(self):
+        """Test that the job is returned with its progress and ISO 8601 times."""
+        # Arrange
+        job = self.service.create_job()
+        job.total_bytes = 200
+        job.processed_bytes = 50
+
+        # Act
+        job_dict = job.as_dict()
+
+        # Assert
+        self.assertEqual("receiving", job_dict["status"])
+        self.assertEqual(0.25, job_dict["progress"])
+        self.assertEqual("2023-11-14T22:13:20+00:00", job_dict["created_at"])
+        self.assertIsNone(job_dict["finished_at"])
+
+    def test_environment_variables(self):
+        """Test that invalid environment variables fall back to the defaults."""
+        with patch.dict(os.environ, {"PARSE_JOB_WORKERS": "4", "PARSE_JOB_RESULT_TTL_SECONDS": "1.5"}):
+            self.assertEqual(4, get_parse_job_workers())
+            self.assertEqual(1.5, get_parse_job_result_ttl())
+        with patch.dict(os.environ, {"PARSE_JOB_WORKERS": "zero", "PARSE_JOB_RESULT_TTL_SECONDS": "-1"}):
+            with self.assertLogs("msconsparser.application.services.parse_job_service", level="WARNING"):
+                self.assertEqual(2, get_parse_job_workers())
+                self.assertEqual(3600.0, get_parse_job_result_ttl())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -45,7 +45,51 @@ class TestParserService(unittest.TestCase):
         self.assertEqual(result, expected_result)
         self.mock_parse_message_usecase.execute.assert_called_once_with(
             edifact_mscons_message_content=message_content,
-            max_lines_to_parse=max_lines_to_parse
+            max_lines_to_parse=max_lines_to_parse,
+            statistics=None,
+            profiler=None,
+            compact=False,
+            budget=None,
+            cancel_token=None,
+            query_index=None,
+            duplicate_check=None
+        )
+
+    def test_parse_message_incrementally(self):
+        """Test that parse_message_incrementally returns the chunks of the usecase's execute_incrementally method."""
+        # Setup
+        expected_result = iter([(10, MagicMock())])
+        self.mock_parse_message_usecase.execute_incrementally.return_value = expected_result
+
+        # Execute
+        result = self.parser_service.parse_message_incrementally(message_content="test_message_content")
+
+        # Verify
+        self.assertIs(result, expected_result)
+        self.mock_parse_message_usecase.execute_incrementally.assert_called_once_with(
+            edifact_mscons_message_content="test_message_content",
+            compact=False,
+            cancel_token=None
+        )
+
+    def test_parse_message_lazily(self):
+        """Test that parse_message_lazily returns the interchange of the usecase's execute_lazily method."""
+        # Setup
+        expected_result = MagicMock()
+        self.mock_parse_message_usecase.execute_lazily.return_value = expected_result
+
+        # Execute
+        result = self.parser_service.parse_message_lazily(message_content="test_message_content", compact=True)
+
+        # Verify
+        self.assertIs(result, expected_result)
+        self.mock_parse_message_usecase.execute_lazily.assert_called_once_with(
+            edifact_mscons_message_content="test_message_content",
+            statistics=None,
+            profiler=None,
+            compact=True,
+            budget=None,
+            cancel_token=None
         )
 
 
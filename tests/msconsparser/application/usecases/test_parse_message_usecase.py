@@ -4,6 +4,8 @@ from unittest.mock import MagicMock
 from msconsparser.application.usecases.parse_message_usecase import ParseMessageUseCase
 from msconsparser.domain.ports.inbound import MessageParserPort
 from msconsparser.libs.edifactmsconsparser.edifact_mscons_parser import EdifactMSCONSParser
+from msconsparser.libs.edifactmsconsparser.lazy_edifact_interchange import LazyEdifactInterchange
+from msconsparser.libs.edifactmsconsparser.wrappers import ParseStatistics
 
 
 class TestParseMessageUseCase(unittest.TestCase):
@@ -48,9 +50,76 @@ class TestParseMessageUseCase(unittest.TestCase):
         self.assertEqual(result, expected_result)
         self.mock_parser.parse.assert_called_once_with(
             edifact_text=message_content,
-            max_lines_to_parse=max_lines_to_parse
+            max_lines_to_parse=max_lines_to_parse,
+            statistics=None,
+            profiler=None,
+            compact=False,
+            budget=None,
+            cancel_token=None,
+            query_index=None,
+            duplicate_check=None
+        )
+
+    def test_execute_with_statistics(self):
+        """Test that execute passes the given statistics to the parser."""
+        # Setup
+        statistics = ParseStatistics()
+
+        # Execute
+        self.parse_message_usecase.execute(
+            edifact_mscons_message_content="test_message_content",
+            statistics=statistics,
+            profiler=None
+        )
+
+        # Verify
+        self.mock_parser.parse.assert_called_once_with(
+            edifact_text="test_message_content",
+            max_lines_to_parse=-1,
+            statistics=statistics,
+            profiler=None,
+            compact=False,
+            budget=None,
+            cancel_token=None,
+            query_index=None,
+            duplicate_check=None
+        )
+
+    def test_execute_incrementally(self):
+        """Test that execute_incrementally returns the chunks of the parser's iter_messages method."""
+        # Setup
+        expected_result = iter([(10, MagicMock())])
+        self.mock_parser.iter_messages.return_value = expected_result
+
+        # Execute
+        result = self.parse_message_usecase.execute_incrementally(
+            edifact_mscons_message_content="test_message_content",
+            compact=True
+        )
+
+        # Verify
+        self.assertIs(result, expected_result)
+        self.mock_parser.iter_messages.assert_called_once_with(
+            edifact_text="test_message_content",
+            compact=True,
+            cancel_token=None
         )
 
+    def test_execute_lazily(self):
+        """Test that execute_lazily parses only the envelope with the parser of the usecase."""
+        # Setup
+        parse_message_usecase = ParseMessageUseCase(EdifactMSCONSParser())
+        content = ("UNB+UNOC:3+SENDER:14+RECIPIENT:14+230101:1200+12345'"
+                   "UNH+1+MSCONS:D:04B:UN:2.4c'BGM+7+MSI1+9'UNT+3+1'UNZ+1+12345'")
+
+        # Execute
+        result = parse_message_usecase.execute_lazily(edifact_mscons_message_content=content, compact=True)
+
+        # Verify
+        self.assertIsInstance(result, LazyEdifactInterchange)
+        self.assertEqual(1, result.message_count)
+        self.assertEqual(0, result.parsed_message_count)
+
     def test_implements_message_parser_port(self):
         """Test that ParseMessageUseCase implements the MessageParserPort interface."""
         self.assertIsInstance(self.parse_message_usecase, MessageParserPort)
@@ -0,0 +1,86 @@
+import logging
+import logging.config
+import unittest
+
+from msconsparser.infrastructure.logging_handlers import QueueListenerHandler
+
+
+class RecordingHandler(logging.Handler):
+    """A handler keeping the emitted records and the name of the emitting thread."""
+
+    def __init__(self):
+        super().__init__()
+        self.records = []
+        self.thread_names = []
+
+    def emit(self, record):
+        self.records.append(record)
+        self.thread_names.append(record.threadName)
+
+
+class TestQueueListenerHandler(unittest.TestCase):
+    """Test cases for the QueueListenerHandler class."""
+
+    def setUp(self):
+        """Set up a logger writing through the queue handler."""
+        self.target = RecordingHandler()
+        self.handler = QueueListenerHandler([self.target])
+        self.logger = logging.getLogger("test_queue_listener_handler")
+        self.logger.propagate = False
+        self.logger.setLevel(logging.DEBUG)
+        self.logger.addHandler(self.handler)
+
+    def tearDown(self):
+        """Remove the queue handler and stop its listener."""
+        self.logger.removeHandler(self.handler)
+        self.handler.close()
+
+    def test_records_are_emitted_by_the_wrapped_handler(self):
+        """Test that the queued records are emitted by the wrapped handler after stopping the listener."""
+        self.logger.warning("Removing invalid prefix '%s'", "xx")
+
+        self.handler.stop()
+
+        self.assertEqual(1, len(self.target.records))
+        self.assertEqual("Removing invalid prefix 'xx'", self.target.records[0].getMessage())
+
+    def test_stop_is_idempotent(self):
+        """Test that stopping the listener twice does not fail."""
+        self.handler.stop()
+        self.handler.stop()
+
+    def test_respects_the_level_of_the_wrapped_handler(self):
+        """Test that records below the level of the wrapped handler are not emitted."""
+        self.target.setLevel(logging.WARNING)
+
+        self.logger.info("Not emitted")
+        self.logger.warning("Emitted")
+        self.handler.stop()
+
+        self.assertEqual(["Emitted"], [record.getMessage() for record in self.target.records])
+
+    def test_wrapped_handler_can_be_referenced_in_dict_config(self):
+        """Test that the wrapped handlers can be referenced via cfg:// in a dictConfig."""
+        logging.config.dictConfig({
+            "version": 1,
+            "disable_existing_loggers": False,
+            "handlers": {
+                "console": {"class": "logging.NullHandler"},
+                "queue": {"()": QueueListenerHandler, "handlers": ["cfg://handlers.console"]},
+            },
+            "loggers": {
+                "test_queue_listener_handler_config": {"level": "INFO", "handlers": ["queue"], "propagate": False},
+            },
+        })
+        config_logger = logging.getLogger("test_queue_listener_handler_config")
+        queue_handler = config_logger.handlers[0]
+        try:
+            self.assertIsInstance(queue_handler, QueueListenerHandler)
+            self.assertIsInstance(queue_handler.listener.handlers[0], logging.NullHandler)
+        finally:
+            config_logger.removeHandler(queue_handler)
+            queue_handler.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -3,7 +3,7 @@ import unittest
 from msconsparser.libs.edifactmsconsparser.converters import QTYSegmentConverter
 from msconsparser.libs.edifactmsconsparser.utils import EdifactSyntaxHelper
 from msconsparser.libs.edifactmsconsparser.wrappers import ParsingContext
-from msconsparser.libs.edifactmsconsparser.wrappers.segments.measurement import SegmentQTY
+from msconsparser.libs.edifactmsconsparser.wrappers.segments.measurement import SegmentQTY, SegmentQTYMilli
 from msconsparser.libs.edifactmsconsparser.wrappers.segments.message_structure import SegmentUNA, EdifactInterchange
 
 
@@ -36,6 +36,28 @@ class TestQTYSegmentConverter(unittest.TestCase):
         self.assertEqual(result.menge_qualifier, "220")
         self.assertEqual(result.menge, 4250.465)
         self.assertEqual(result.masseinheit_code, "D54")
+        self.assertNotIsInstance(result, SegmentQTYMilli)
+        self.assertNotIn("menge_milli", result.model_dump())
+
+    def test_convert_internal_in_milli_numeric_mode(self):
+        """Test that the quantity stays in the unit in the milli numeric mode, the thousandths are added."""
+        # Arrange
+        element_components = ["QTY", "79:-4.987:KWH"]
+        self.context.use_numeric_mode("milli")
+
+        # Act
+        result = self.converter._convert_internal(
+            element_components=element_components,
+            last_segment_type=None,
+            current_segment_group=None,
+            context=self.context
+        )
+
+        # Assert
+        self.assertIsInstance(result, SegmentQTYMilli)
+        self.assertEqual(result.menge, -4.987)
+        self.assertEqual(result.menge_milli, -4987)
+        self.assertEqual(result.masseinheit_code, "KWH")
 
     def test_convert_internal_without_masseinheit_code(self):
         """Test the _convert_internal method without masseinheit_code."""
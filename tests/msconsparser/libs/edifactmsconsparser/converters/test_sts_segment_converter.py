@@ -3,7 +3,7 @@ import unittest
 from msconsparser.libs.edifactmsconsparser.converters.sts_segment_converter import STSSegmentConverter
 from msconsparser.libs.edifactmsconsparser.utils import EdifactSyntaxHelper
 from msconsparser.libs.edifactmsconsparser.wrappers import ParsingContext
-from msconsparser.libs.edifactmsconsparser.wrappers.segments import SegmentSTS
+from msconsparser.libs.edifactmsconsparser.wrappers.segments import SegmentGroup, SegmentSTS
 
 
 class TestSTSSegmentConverter(unittest.TestCase):
@@ -179,6 +179,35 @@ class TestSTSSegmentConverter(unittest.TestCase):
         self.assertIsNone(result.status)
         self.assertIsNone(result.statusanlass)
 
+    def test_convert_internal_shares_equal_segments_in_compact_parse_tree(self):
+        """Test that equal STS segments and their status objects are shared within a compact interchange."""
+        # Arrange
+        context = ParsingContext(compact_nodes=True)
+
+        # Act
+        first = self.converter._convert_internal(["STS", "Z40", "", "Z74"], None, SegmentGroup.SG10, context)
+        second = self.converter._convert_internal(["STS", "Z40", "", "Z74"], None, SegmentGroup.SG10, context)
+        other = self.converter._convert_internal(["STS", "Z34", "", "Z74"], None, SegmentGroup.SG10, context)
+
+        # Assert
+        self.assertIs(first, second)
+        self.assertIsNot(first, other)
+        self.assertIs(first.statusanlass, other.statusanlass)
+        self.assertEqual("Grund der Ersatzwertbildung", first.bezeichner)
+        self.assertEqual("Korrekturgrund", other.bezeichner)
+
+    def test_convert_internal_does_not_share_pydantic_models(self):
+        """Test that equal STS segments of a pydantic parse tree are separate models, so that changing one
+        leaves the others unchanged."""
+        # Act
+        first = self.converter._convert_internal(["STS", "Z40", "", "Z74"], None, SegmentGroup.SG10, self.context)
+        second = self.converter._convert_internal(["STS", "Z40", "", "Z74"], None, SegmentGroup.SG10, self.context)
+        first.statusanlass.statusanlass_code = "Z75"
+
+        # Assert
+        self.assertIsNot(first, second)
+        self.assertEqual("Z74", second.statusanlass.statusanlass_code)
+
     def test_convert_with_exception(self):
         """Test the convert method with an exception."""
         # Arrange
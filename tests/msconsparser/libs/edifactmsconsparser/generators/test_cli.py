@@ -0,0 +1,36 @@
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stderr
+from io import StringIO
+
+from msconsparser.libs.edifactmsconsparser.generators.cli import main
+
+
+class TestGeneratorCli(unittest.TestCase):
+    """Test case for the command line interface of the generator."""
+
+    def test_main_writes_the_interchange(self):
+        """Test that main writes the generated interchange to the given file."""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "corpus.edi")
+
+            with redirect_stderr(StringIO()):
+                exit_code = main([path, "--messages", "2", "--intervals", "4", "--seed", "1", "--una", ":|,?'"])
+
+            self.assertEqual(0, exit_code)
+            with open(path, encoding="utf-8") as file:
+                content = file.read()
+            self.assertTrue(content.startswith("UNA:|,? '"))
+            self.assertEqual(2, content.count("UNH|"))
+
+    def test_main_rejects_invalid_una_characters(self):
+        """Test that main exits with an error for an invalid number of UNA characters."""
+        with redirect_stderr(StringIO()), self.assertRaises(SystemExit) as context:
+            main(["-", "--una", "::"])
+
+        self.assertEqual(2, context.exception.code)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,213 @@
+import io
+import os
+import re
+import tempfile
+import unittest
+
+from pydantic import ValidationError
+
+from msconsparser.libs.edifactmsconsparser.edifact_mscons_parser import EdifactMSCONSParser
+from msconsparser.libs.edifactmsconsparser.generators import MSCONSGeneratorSettings, MSCONSInterchangeGenerator
+
+
+class TestMSCONSInterchangeGenerator(unittest.TestCase):
+    """Test case for the MSCONSInterchangeGenerator class."""
+
+    def setUp(self):
+        """Set up the test case."""
+        self.parser = EdifactMSCONSParser()
+
+    @staticmethod
+    def generate(**settings) -> str:
+        return "".join(MSCONSInterchangeGenerator(MSCONSGeneratorSettings(seed=42, **settings)).iter_segments())
+
+    @staticmethod
+    def unescape(value: str, release_character: str = "?") -> str:
+        return re.sub(re.escape(release_character) + "(.)", r"\1", value)
+
+    def test_generated_interchange_has_the_configured_structure(self):
+        """Test that the parsed interchange contains the configured number of messages and segment groups."""
+        # Arrange
+        edifact_text = self.generate(messages=2, positions_per_object=2, intervals_per_position=4)
+
+        # Act
+        interchange = self.parser.parse(edifact_text)
+
+        # Assert
+        self.assertEqual(2, len(interchange.unh_unt_nachrichten))
+        self.assertEqual(2, interchange.unz_nutzdaten_endsegment.datenaustauschzaehler)
+        message = interchange.unh_unt_nachrichten[1]
+        self.assertEqual(1, len(message.sg5_liefer_bzw_bezugsorte))
+        sg6_objects = message.sg5_liefer_bzw_bezugsorte[0].sg6_wert_und_erfassungsangaben_zum_objekt
+        self.assertEqual(1, len(sg6_objects))
+        self.assertEqual(2, len(sg6_objects[0].sg9_positionsdaten))
+        self.assertEqual(4, len(sg6_objects[0].sg9_positionsdaten[0].sg10_mengen_und_statusangaben))
+
+    def test_locations_per_message(self):
+        """Test that every message contains the configured number of locations, objects and positions."""
+        edifact_text = self.generate(messages=2, locations_per_message=3, objects_per_location=2,
+                                     positions_per_object=2, intervals_per_position=1)
+
+        self.assertEqual(6, edifact_text.count("NAD+DP'"))
+        self.assertEqual(12, edifact_text.count("LOC+172+"))
+        self.assertEqual(24, edifact_text.count("LIN+"))
+
+    def test_message_trailer_counts_the_segments_of_the_message(self):
+        """Test that the UNT segment contains the number of segments from UNH to UNT."""
+        # Arrange
+        segments = self.generate(intervals_per_position=3, status_rate=0.5, line_breaks=False).split("'")
+
+        # Act
+        unh_index = next(index for index, segment in enumerate(segments) if segment.startswith("UNH"))
+        unt_index = next(index for index, segment in enumerate(segments) if segment.startswith("UNT"))
+
+        # Assert
+        self.assertEqual(f"UNT+{unt_index - unh_index + 1}+1", segments[unt_index])
+
+    def test_same_seed_generates_the_same_interchange(self):
+        """Test that the output is deterministic for a given seed."""
+        self.assertEqual(self.generate(escape_rate=0.5, dirty_prefix_rate=0.5),
+                         self.generate(escape_rate=0.5, dirty_prefix_rate=0.5))
+
+    def test_custom_una_separators(self):
+        """Test that custom separators are announced in the UNA segment and used throughout the interchange."""
+        # Arrange
+        edifact_text = self.generate(element_separator="|", decimal_mark=",", intervals_per_position=1)
+
+        # Act
+        interchange = self.parser.parse(edifact_text)
+
+        # Assert
+        self.assertTrue(edifact_text.startswith("UNA:|,? '\nUNB|UNOC:3|"))
+        self.assertIn("DTM|137:202401010000+00:303'", edifact_text)
+        sg10 = (interchange.unh_unt_nachrichten[0].sg5_liefer_bzw_bezugsorte[0]
+                .sg6_wert_und_erfassungsangaben_zum_objekt[0].sg9_positionsdaten[0].sg10_mengen_und_statusangaben[0])
+        self.assertIsInstance(sg10.qty_mengenangaben.menge, float)
+
+    def test_escape_rate_adds_escaped_separators_to_free_text(self):
+        """Test that free-text values contain released separators that are resolved by the parser."""
+        # Arrange
+        edifact_text = self.generate(escape_rate=1.0)
+
+        # Act
+        interchange = self.parser.parse(edifact_text)
+
+        # Assert
+        bgm_line = next(line for line in edifact_text.splitlines() if line.startswith("BGM"))
+        self.assertRegex(bgm_line, r"^BGM\+7\+MSI1\?[:+?]")
+        document_number = (interchange.unh_unt_nachrichten[0].bgm_beginn_der_nachricht
+                           .dokumenten_nachrichten_identifikation.dokumentennummer)
+        escaped_document_number = re.match(r"^BGM\+7\+((?:\?.|[^+?'])*)\+9'$", bgm_line).group(1)
+        self.assertEqual(self.unescape(escaped_document_number), document_number)
+
+    def test_escape_rate_adds_escaped_separators_to_location_ids(self):
+        """Test that the location IDs contain released separators, while the quantities are left as numbers."""
+        # Arrange
+        edifact_text = self.generate(escape_rate=1.0, intervals_per_position=2)
+
+        # Act
+        interchange = self.parser.parse(edifact_text)
+
+        # Assert
+        loc_lines = [line for line in edifact_text.splitlines() if line.startswith("LOC")]
+        self.assertRegex(loc_lines[0], r"^LOC\+172\+DE\d{29}\?[:+?]")
+        sg6_objects = [sg6 for message in interchange.unh_unt_nachrichten
+                       for sg5 in message.sg5_liefer_bzw_bezugsorte
+                       for sg6 in sg5.sg6_wert_und_erfassungsangaben_zum_objekt]
+        self.assertEqual(
+            [self.unescape(re.match(r"^LOC\+172\+((?:\?.|[^+?'])*)'$", line).group(1)) for line in loc_lines],
+            [sg6.loc_identifikationsangabe.ortsangabe.ortsangabe_code for sg6 in sg6_objects]
+        )
+        sg10 = sg6_objects[0].sg9_positionsdaten[0].sg10_mengen_und_statusangaben[0]
+        self.assertIsInstance(sg10.qty_mengenangaben.menge, float)
+
+    def test_custom_separators_round_trip_through_the_parser(self):
+        """Test that interchanges with every accepted custom separator set are parsed back to the generated values."""
+        separator_sets = [
+            dict(element_separator="|"),
+            dict(release_character="!"),
+            dict(segment_terminator="~"),
+            dict(element_separator="*", release_character="\\", segment_terminator="~", decimal_mark=","),
+        ]
+        for separators in separator_sets:
+            with self.subTest(**separators):
+                # Arrange
+                settings = MSCONSGeneratorSettings(seed=3, escape_rate=1.0, intervals_per_position=2, **separators)
+                edifact_text = "".join(MSCONSInterchangeGenerator(settings).iter_segments())
+                element, release = re.escape(settings.element_separator), re.escape(settings.release_character)
+                value = f"((?:{release}.|[^{element}{release}{re.escape(settings.segment_terminator)}])*)"
+
+                # Act
+                interchange = self.parser.parse(edifact_text)
+
+                # Assert
+                message = interchange.unh_unt_nachrichten[0]
+                escaped_document_number = re.search(f"BGM{element}7{element}{value}", edifact_text).group(1)
+                escaped_location_id = re.search(f"LOC{element}172{element}{value}", edifact_text).group(1)
+                self.assertEqual(self.unescape(escaped_document_number, settings.release_character),
+                                 message.bgm_beginn_der_nachricht.dokumenten_nachrichten_identifikation
+                                 .dokumentennummer)
+                sg6 = message.sg5_liefer_bzw_bezugsorte[0].sg6_wert_und_erfassungsangaben_zum_objekt[0]
+                self.assertEqual(self.unescape(escaped_location_id, settings.release_character),
+                                 sg6.loc_identifikationsangabe.ortsangabe.ortsangabe_code)
+                self.assertEqual(2, len(sg6.sg9_positionsdaten[0].sg10_mengen_und_statusangaben))
+
+    def test_dirty_prefix_rate_prefixes_segments(self):
+        """Test that dirty prefixes are added to the segments and removed by the parser."""
+        # Arrange
+        edifact_text = self.generate(dirty_prefix_rate=1.0, intervals_per_position=2)
+
+        # Act
+        interchange = self.parser.parse(edifact_text)
+
+        # Assert
+        lines = edifact_text.splitlines()
+        self.assertTrue(lines[0].startswith("UNA"))
+        for line in lines[1:]:
+            self.assertTrue(any(line.startswith(prefix) for prefix in MSCONSInterchangeGenerator.DIRTY_PREFIXES))
+        self.assertEqual(1, len(interchange.unh_unt_nachrichten))
+
+    def test_write_file_streams_the_interchange(self):
+        """Test that write_file writes the same interchange as iter_segments yields."""
+        # Arrange
+        settings = MSCONSGeneratorSettings(seed=7, messages=3)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "interchange.edi")
+
+            # Act
+            MSCONSInterchangeGenerator(settings).write_file(path)
+
+            # Assert
+            with open(path, encoding="utf-8", newline="") as file:
+                self.assertEqual("".join(MSCONSInterchangeGenerator(settings).iter_segments()), file.read())
+
+    def test_write_to_stream(self):
+        """Test that write writes the interchange to a text stream."""
+        stream = io.StringIO()
+
+        MSCONSInterchangeGenerator(MSCONSGeneratorSettings(seed=1, intervals_per_position=1)).write(stream)
+
+        self.assertTrue(stream.getvalue().startswith("UNA:+.? '"))
+        self.assertTrue(stream.getvalue().endswith("'\n"))
+
+    def test_settings_reject_ambiguous_separators(self):
+        """Test that the settings reject separators that are not distinct."""
+        with self.assertRaises(ValidationError):
+            MSCONSGeneratorSettings(element_separator=":")
+        with self.assertRaises(ValidationError):
+            MSCONSGeneratorSettings(decimal_mark="+")
+        with self.assertRaises(ValidationError):
+            MSCONSGeneratorSettings(with_una=False, element_separator="|")
+
+    def test_settings_reject_separators_the_parser_does_not_support(self):
+        """Test that the settings reject separators producing interchanges the parser cannot read."""
+        with self.assertRaises(ValidationError):
+            MSCONSGeneratorSettings(component_separator="#")
+        with self.assertRaises(ValidationError):
+            MSCONSGeneratorSettings(element_separator="A")
+        with self.assertRaises(ValidationError):
+            MSCONSGeneratorSettings(segment_terminator="0")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -4,8 +4,10 @@ from unittest.mock import MagicMock
 from msconsparser.libs.edifactmsconsparser.converters import LOCSegmentConverter
 from msconsparser.libs.edifactmsconsparser.handlers.loc_segment_handler import LOCSegmentHandler
 from msconsparser.libs.edifactmsconsparser.utils import EdifactSyntaxHelper
-from msconsparser.libs.edifactmsconsparser.wrappers import ParsingContext
-from msconsparser.libs.edifactmsconsparser.wrappers.segments import EdifactMSconsMessage, SegmentLOC
+from msconsparser.libs.edifactmsconsparser.wrappers import InterchangeQueryIndex, ParsingContext, QueryKey
+from msconsparser.libs.edifactmsconsparser.wrappers.segments import (
+    EdifactMSconsMessage, Ortsangabe, SegmentGroup, SegmentGroup5, SegmentLOC
+)
 
 
 class TestLOCSegmentHandler(unittest.TestCase):
@@ -36,6 +38,40 @@ class TestLOCSegmentHandler(unittest.TestCase):
         # This is a placeholder that should be updated for each handler
         self.assertIsNotNone(self.context.current_message)
 
+    def test_update_context_starts_a_location_object_per_loc_segment(self):
+        """Test that consecutive LOC segments of a delivery location create separate location objects."""
+        # Arrange
+        self.context.current_sg5 = SegmentGroup5()
+        first = SegmentLOC(ortsangabe=Ortsangabe(ortsangabe_code="DE001"))
+        second = SegmentLOC(ortsangabe=Ortsangabe(ortsangabe_code="DE002"))
+
+        # Act
+        self.handler._update_context(first, SegmentGroup.SG6, self.context)
+        self.handler._update_context(second, SegmentGroup.SG6, self.context)
+
+        # Assert
+        location_objects = self.context.current_sg5.sg6_wert_und_erfassungsangaben_zum_objekt
+        self.assertEqual(2, len(location_objects))
+        self.assertIs(first, location_objects[0].loc_identifikationsangabe)
+        self.assertIs(second, location_objects[1].loc_identifikationsangabe)
+
+    def test_update_context_adds_the_location_to_the_query_index(self):
+        """Test that the location ID is added to the query index of the context, if any."""
+        # Arrange
+        self.context.current_sg5 = SegmentGroup5()
+        self.context.interchange.unh_unt_nachrichten.append(self.context.current_message)
+        self.context.query_index = InterchangeQueryIndex()
+        segment = SegmentLOC(ortsangabe=Ortsangabe(ortsangabe_code="DE001"))
+
+        # Act
+        self.handler._update_context(segment, SegmentGroup.SG6, self.context)
+
+        # Assert
+        entries = self.context.query_index.find(QueryKey.LOCATION, "DE001")
+        self.assertEqual(1, len(entries))
+        self.assertEqual(0, entries[0].message_index)
+        self.assertIs(self.context.current_sg6, entries[0].location_object)
+
     def test_can_handle_returns_true_when_current_message_exists(self):
         """Test that _can_handle returns True when current_message exists."""
         # Act
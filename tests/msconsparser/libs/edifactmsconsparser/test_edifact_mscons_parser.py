@@ -1,9 +1,31 @@
+import os
+import tempfile
 import unittest
+from decimal import Decimal
 from unittest.mock import patch, MagicMock
 
 from msconsparser.libs.edifactmsconsparser.edifact_mscons_parser import EdifactMSCONSParser
-from msconsparser.libs.edifactmsconsparser.utils import EdifactSyntaxHelper
-from msconsparser.libs.edifactmsconsparser.wrappers.segments import SegmentType, SegmentGroup, EdifactInterchange
+from msconsparser.libs.edifactmsconsparser.exceptions import (
+    CONTRLException, ParseBudgetExceededException, ParseCancelledException
+)
+from msconsparser.libs.edifactmsconsparser.generators import MSCONSGeneratorSettings, MSCONSInterchangeGenerator
+from msconsparser.libs.edifactmsconsparser.utils import EdifactSyntaxHelper, SegmentIndex
+from msconsparser.libs.edifactmsconsparser.wrappers import (
+    CancelToken, InterchangeQueryIndex, NumericMode, ParseBudget, ParsePhase, ParseStatistics, QueryKey,
+    SegmentProfiler
+)
+from msconsparser.libs.edifactmsconsparser.wrappers.segments import (
+    SegmentType, SegmentGroup, EdifactInterchange, CodeListRegistry
+)
+
+CODE_LIST_MESSAGE = (
+    "UNB+UNOC:3+SENDER:14+RECIPIENT:14+230101:1200+12345'"
+    "UNH+1+MSCONS:D:04B:UN:{version}'"
+    "BGM+7+MSI5422+9'"
+    "DTM+137:202106011315?+00:303'"
+    "UNT+4+1'"
+    "UNZ+1+12345'"
+)
 
 
 class TestEdifactMSCONSParser(unittest.TestCase):
@@ -198,6 +220,668 @@ class TestEdifactMSCONSParser(unittest.TestCase):
         self.assertEqual(" ", EdifactSyntaxHelper.get_reserved_indicator(context))
         self.assertEqual("'", EdifactSyntaxHelper.get_segment_terminator(context))
 
+    def test_parse_fills_statistics(self):
+        """Test that parse records the phase durations and the counts in the given statistics."""
+        # Arrange
+        sample_data = ("UNA:+.? 'UNB+UNOC:3+SENDER:14+RECIPIENT:14+230101:1200+12345'"
+                       "UNH+1+MSCONS:D:04B:UN:2.4c'BGM+7+MSI5422+9'UNT+3+1'UNZ+1+12345'")
+        statistics = ParseStatistics()
+
+        # Act
+        self.parser.parse(sample_data, statistics=statistics)
+
+        # Assert
+        self.assertEqual(6, statistics.segment_count)
+        self.assertEqual(1, statistics.message_count)
+        self.assertEqual(len(sample_data), statistics.byte_count)
+        self.assertEqual([ParsePhase.UNA, ParsePhase.TOKENIZE, ParsePhase.CONVERT],
+                         list(statistics.phase_durations.keys()))
+
+    def test_parse_counts_recovered_prefixes(self):
+        """Test that the segments with a removed invalid prefix are counted in the statistics."""
+        # Arrange
+        sample_data = ("UNB+UNOC:3+SENDER:14+RECIPIENT:14+230101:1200+12345'"
+                       "[${test(TEST_DATA)}]:UNH+1+MSCONS:D:04B:UN:2.4c'PREFIX:BGM+7+MSI5422+9'UNT+3+1'UNZ+1+12345'")
+        statistics = ParseStatistics()
+
+        # Act
+        interchange = self.parser.parse(sample_data, statistics=statistics)
+
+        # Assert
+        self.assertEqual(2, statistics.recovered_prefix_count)
+        self.assertEqual(2, statistics.as_dict()["recovered_prefixes"])
+        bgm = interchange.unh_unt_nachrichten[0].bgm_beginn_der_nachricht
+        self.assertEqual("MSI5422", bgm.dokumenten_nachrichten_identifikation.dokumentennummer)
+
+    def test_parse_keeps_byte_count_set_by_caller(self):
+        """Test that parse does not overwrite a byte count already set by the caller."""
+        # Arrange
+        statistics = ParseStatistics()
+        statistics.byte_count = 42
+
+        # Act
+        self.parser.parse("UNB+UNOC:3+SENDER:14+RECIPIENT:14+230101:1200+12345'", statistics=statistics)
+
+        # Assert
+        self.assertEqual(42, statistics.byte_count)
+
+    def test_parse_resets_context_between_parses(self):
+        """Test that the same parser instance can be reused for several parses."""
+        # Arrange
+        sample_data = "UNB+UNOC:3+SENDER:14+RECIPIENT:14+230101:1200+12345'UNH+1+MSCONS:D:04B:UN:2.4c'"
+
+        # Act
+        self.parser.parse(sample_data)
+        result = self.parser.parse(sample_data)
+
+        # Assert
+        self.assertEqual(1, len(result.unh_unt_nachrichten))
+
+    def test_parse_records_segment_profile(self):
+        """Test that parse records the handler and converter calls per segment type in the given profiler."""
+        # Arrange
+        sample_data = ("UNB+UNOC:3+SENDER:14+RECIPIENT:14+230101:1200+12345'"
+                       "UNH+1+MSCONS:D:04B:UN:2.4c'DTM+137:202106011315?+00:303'DTM+163:202106010000?+00:303'")
+        profiler = SegmentProfiler()
+
+        # Act
+        self.parser.parse(sample_data, profiler=profiler)
+
+        # Assert
+        report = profiler.report()
+        self.assertEqual(1, report["parses"])
+        self.assertEqual({"UNB", "UNH", "DTM"}, set(report["segment_types"].keys()))
+        self.assertEqual(2, report["segment_types"]["DTM"]["handler"]["calls"])
+        self.assertEqual(2, report["segment_types"]["DTM"]["converter"]["calls"])
+
+    def test_parse_without_profiler_keeps_profiling_disabled(self):
+        """Test that parse does not set a profiler in the context if none is given."""
+        # Act
+        self.parser.parse("UNB+UNOC:3+SENDER:14+RECIPIENT:14+230101:1200+12345'")
+
+        # Assert
+        self.assertIsNone(self.parser._EdifactMSCONSParser__context.profiler)
+
+    def test_parse_logs_repeated_warnings_as_one_summary(self):
+        """Test that repeated warnings of a parse are logged as one summary record."""
+        # Arrange
+        sample_data = ("UNB+UNOC:3+SENDER:14+RECIPIENT:14+230101:1200+12345'"
+                       "UNH+1+MSCONS:D:04B:UN:2.4c'FOO+1'FOO+2'FOO+3'")
+
+        # Act
+        with self.assertLogs(level='WARNING') as cm:
+            self.parser.parse(sample_data)
+
+        # Assert
+        self.assertEqual(1, len(cm.records))
+        self.assertIn("3 warnings while parsing the interchange", cm.output[0])
+        self.assertEqual(3, cm.records[0].parse_warnings["Kein Handler für Segmenttyp '%s' definiert."]["count"])
+
+    def test_parse_with_strict_models_creates_the_same_interchange(self):
+        """Test that the strict model validation yields the same interchange as the trusted construction."""
+        # Arrange
+        with open(os.path.join(os.path.dirname(__file__), "../../../samples/mscons-message-example.txt"),
+                  encoding="utf-8") as file:
+            sample_data = file.read()
+
+        # Act
+        trusted = EdifactMSCONSParser(strict_models=False).parse(sample_data)
+        strict = EdifactMSCONSParser(strict_models=True).parse(sample_data)
+
+        # Assert
+        self.assertEqual(strict.model_dump_json(), trusted.model_dump_json())
+
+    def test_strict_models_from_environment_variable(self):
+        """Test that the strict model validation is enabled via the environment variable."""
+        # Act
+        with patch.dict(os.environ, {"STRICT_MODEL_VALIDATION": "TRUE"}):
+            parser = EdifactMSCONSParser()
+        parser.parse("UNB+UNOC:3+SENDER:14+RECIPIENT:14+230101:1200+12345'")
+
+        # Assert
+        self.assertTrue(parser._EdifactMSCONSParser__context.strict_models)
+        self.assertFalse(EdifactMSCONSParser(strict_models=False)._EdifactMSCONSParser__context.strict_models)
+
+    def test_parse_without_label_resolution(self):
+        """Test that the labels of the qualifier codes are None if the label resolution is disabled."""
+        # Act
+        interchange = EdifactMSCONSParser(resolve_labels=False).parse(CODE_LIST_MESSAGE.format(version="2.4c"))
+        with patch.dict(os.environ, {"RESOLVE_CODE_LIST_LABELS": "False"}):
+            parser = EdifactMSCONSParser()
+
+        # Assert
+        message = interchange.unh_unt_nachrichten[0]
+        self.assertIsNone(message.dtm_nachrichtendatum[0].bezeichner)
+        self.assertEqual(
+            "137", message.dtm_nachrichtendatum[0].datums_oder_uhrzeits_oder_zeitspannen_funktion_qualifier
+        )
+        self.assertIsNone(parser.parse(CODE_LIST_MESSAGE.format(version="2.4c"))
+                          .unh_unt_nachrichten[0].dtm_nachrichtendatum[0].bezeichner)
+
+    def test_parse_uses_code_lists_of_message_version(self):
+        """Test that the code lists of the MIG version given in the UNH segment are used."""
+        # Arrange
+        registry = CodeListRegistry.from_table({
+            "default_version": "2.4c",
+            "versions": {
+                "2.4c": {"DTM": [{"qualifier": "137", "label": "Nachrichtendatum"}]},
+                "2.5": {"DTM": [{"qualifier": "137", "label": "Dokumentendatum"}]},
+            },
+        })
+        parser = EdifactMSCONSParser(code_list_registry=registry)
+
+        # Act
+        labels = {
+            version: parser.parse(CODE_LIST_MESSAGE.format(version=version))
+            .unh_unt_nachrichten[0].dtm_nachrichtendatum[0].bezeichner
+            for version in ["2.4c", "2.5", "9.9"]
+        }
+        fixed_label = EdifactMSCONSParser(code_list_registry=registry, mig_version="2.5").parse(
+            CODE_LIST_MESSAGE.format(version="2.4c")
+        ).unh_unt_nachrichten[0].dtm_nachrichtendatum[0].bezeichner
+
+        # Assert
+        self.assertEqual({"2.4c": "Nachrichtendatum", "2.5": "Dokumentendatum", "9.9": "Nachrichtendatum"}, labels)
+        self.assertEqual("Dokumentendatum", fixed_label)
+
+    def test_parse_with_unknown_message_version_logs_warning(self):
+        """Test that an unknown MIG version falls back to the default version with a warning."""
+        # Act
+        with self.assertLogs("msconsparser.libs.edifactmsconsparser.edifact_mscons_parser", level="WARNING") as cm:
+            interchange = self.parser.parse(CODE_LIST_MESSAGE.format(version="9.9"))
+
+        # Assert
+        self.assertEqual("Nachrichtendatum", interchange.unh_unt_nachrichten[0].dtm_nachrichtendatum[0].bezeichner)
+        self.assertIn("9.9", cm.output[0])
+
+    def test_parse_interns_repeated_codes(self):
+        """Test that repeated codes share one string object and the tables are released after the parse."""
+        # Arrange
+        with open(os.path.join(os.path.dirname(__file__), "../../../samples/mscons-message-example.txt"),
+                  encoding="utf-8") as file:
+            sample_data = file.read()
+
+        # Act
+        interchange = self.parser.parse(sample_data)
+
+        # Assert
+        quantities = [
+            sg10.qty_mengenangaben
+            for message in interchange.unh_unt_nachrichten
+            for sg5 in message.sg5_liefer_bzw_bezugsorte
+            for sg6 in sg5.sg6_wert_und_erfassungsangaben_zum_objekt
+            for sg9 in sg6.sg9_positionsdaten
+            for sg10 in sg9.sg10_mengen_und_statusangaben
+        ]
+        self.assertGreater(len(quantities), 1)
+        self.assertEqual(1, len({id(quantity.masseinheit_code) for quantity in quantities}))
+        self.assertEqual({}, self.parser._EdifactMSCONSParser__context.interned_values)
+        self.assertEqual({}, self.parser._EdifactMSCONSParser__context.shared_nodes)
+
+    def test_parse_memoizes_duplicate_segments(self):
+        """Test that duplicate segments of the cached segment types are converted once per interchange."""
+        # Arrange
+        settings = MSCONSGeneratorSettings(seed=42, messages=3, intervals_per_position=4, status_rate=1.0)
+        edifact_text = "".join(MSCONSInterchangeGenerator(settings).iter_segments())
+        statistics = ParseStatistics()
+
+        parser = EdifactMSCONSParser(conversion_cache_size=1024)
+
+        # Act
+        cached = parser.parse(edifact_text, statistics=statistics)
+        uncached = self.parser.parse(edifact_text)
+
+        # Assert
+        def time_series_types(interchange):
+            return [
+                sg8.cci_zeitreihentyp
+                for message in interchange.unh_unt_nachrichten
+                for sg5 in message.sg5_liefer_bzw_bezugsorte
+                for sg6 in sg5.sg6_wert_und_erfassungsangaben_zum_objekt
+                for sg8 in sg6.sg8_zeitreihentypen
+            ]
+        self.assertEqual(uncached.model_dump_json(), cached.model_dump_json())
+        self.assertEqual(1, len({id(segment) for segment in time_series_types(cached)}))
+        self.assertEqual(3, len({id(segment) for segment in time_series_types(uncached)}))
+        self.assertEqual({"hits": 2, "misses": 1, "hit_rate": 0.6667}, statistics.conversion_cache["CCI"])
+        self.assertEqual(0, len(parser._EdifactMSCONSParser__context.conversion_cache))
+
+    def test_parse_does_not_share_segments_by_default(self):
+        """Test that duplicate segments are separate models by default, so that changing one leaves the others
+        unchanged."""
+        # Arrange
+        settings = MSCONSGeneratorSettings(seed=42, positions_per_object=2, intervals_per_position=1)
+        edifact_text = "".join(MSCONSInterchangeGenerator(settings).iter_segments())
+
+        # Act
+        interchange = self.parser.parse(edifact_text)
+
+        # Assert
+        first, second = [sg9.pia_produktidentifikation for sg9 in interchange.unh_unt_nachrichten[0]
+                         .sg5_liefer_bzw_bezugsorte[0].sg6_wert_und_erfassungsangaben_zum_objekt[0].sg9_positionsdaten]
+        self.assertEqual(first, second)
+        first.waren_leistungsnummer_identifikation.produkt_leistungsnummer = "X"
+        self.assertNotEqual("X", second.waren_leistungsnummer_identifikation.produkt_leistungsnummer)
+
+    def test_conversion_cache_size_from_environment_variable(self):
+        """Test that the conversion cache is enabled via the environment variable only."""
+        # Act
+        with patch.dict(os.environ, {"CONVERSION_CACHE_SIZE": "16"}):
+            cached_parser = EdifactMSCONSParser()
+        with patch.dict(os.environ, {"CONVERSION_CACHE_SIZE": "0"}):
+            disabled_parser = EdifactMSCONSParser()
+        with patch.dict(os.environ, {"CONVERSION_CACHE_SIZE": "many"}):
+            with self.assertLogs("msconsparser.libs.edifactmsconsparser.edifact_mscons_parser", level="WARNING"):
+                invalid_parser = EdifactMSCONSParser()
+        cached_parser.parse(CODE_LIST_MESSAGE.format(version="2.4c"))
+
+        # Assert
+        self.assertEqual(16, cached_parser._EdifactMSCONSParser__context.conversion_cache.max_size)
+        for parser in (self.parser, disabled_parser, invalid_parser):
+            parser.parse(CODE_LIST_MESSAGE.format(version="2.4c"))
+            self.assertIsNone(parser._EdifactMSCONSParser__context.conversion_cache)
+
+    def test_parse_with_numeric_modes(self):
+        """Test that the quantities are converted to the type of the numeric mode."""
+        # Arrange
+        with open(os.path.join(os.path.dirname(__file__), "../../../samples/mscons-message-example-una-spec.txt"),
+                  encoding="utf-8") as file:
+            sample_data = file.read()
+
+        def quantities(interchange, field="menge"):
+            return [
+                getattr(sg10.qty_mengenangaben, field)
+                for message in interchange.unh_unt_nachrichten
+                for sg5 in message.sg5_liefer_bzw_bezugsorte
+                for sg6 in sg5.sg6_wert_und_erfassungsangaben_zum_objekt
+                for sg9 in sg6.sg9_positionsdaten
+                for sg10 in sg9.sg10_mengen_und_statusangaben
+            ]
+
+        # Act
+        floats = quantities(self.parser.parse(sample_data))
+        decimals = quantities(EdifactMSCONSParser(numeric_mode="decimal").parse(sample_data))
+        milli_interchange = EdifactMSCONSParser(numeric_mode="milli").parse(sample_data, compact=True)
+        millis = quantities(milli_interchange, "menge_milli")
+        with patch.dict(os.environ, {"NUMERIC_MODE": "DECIMAL"}):
+            environment_parser = EdifactMSCONSParser()
+        environment_decimals = quantities(environment_parser.parse(sample_data))
+
+        # Assert
+        self.assertTrue(floats)
+        self.assertTrue(all(isinstance(number, Decimal) for number in decimals))
+        self.assertTrue(all(isinstance(number, int) for number in millis))
+        self.assertEqual(floats, [float(number) for number in decimals])
+        self.assertEqual([round(number * 1000) for number in decimals], millis)
+        # The quantity stays in the unit in the milli mode, the thousandths are a field of their own
+        self.assertEqual(floats, quantities(milli_interchange))
+        self.assertNotIn("menge_milli", self.parser.parse(sample_data, compact=True).model_dump_json())
+        self.assertEqual(len(floats), milli_interchange.model_dump_json().count('"menge_milli":'))
+        self.assertEqual(len(floats), EdifactMSCONSParser(numeric_mode="milli").parse(sample_data)
+                         .model_dump_json().count('"menge_milli":'))
+        self.assertEqual(decimals, environment_decimals)
+
+    def test_init_with_unknown_numeric_mode(self):
+        """Test that an unknown numeric mode is rejected, while an invalid environment variable falls back to float."""
+        # Act / Assert
+        with self.assertRaises(ValueError):
+            EdifactMSCONSParser(numeric_mode="double")
+        with patch.dict(os.environ, {"NUMERIC_MODE": "double"}):
+            with self.assertLogs("msconsparser.libs.edifactmsconsparser.edifact_mscons_parser", level="WARNING"):
+                parser = EdifactMSCONSParser()
+        parser.parse(CODE_LIST_MESSAGE.format(version="2.4c"))
+        self.assertEqual(NumericMode.FLOAT, parser._EdifactMSCONSParser__context.numeric_mode)
+
+    @patch('msconsparser.libs.edifactmsconsparser.utils.edifact_syntax_helper.EdifactSyntaxHelper.split_segments')
+    def test_parse_rejects_too_many_segments_before_splitting(self, mock_split_segments):
+        """Test that a text exceeding max_lines_to_parse is rejected without splitting it into segments."""
+        # Arrange
+        edifact_text = CODE_LIST_MESSAGE.format(version="2.4c") * 1000
+
+        # Act
+        with self.assertRaises(ParseBudgetExceededException) as context:
+            self.parser.parse(edifact_text, max_lines_to_parse=10)
+
+        # Assert
+        self.assertEqual(ParseBudget.SEGMENTS, context.exception.budget)
+        self.assertEqual(10, context.exception.limit)
+        mock_split_segments.assert_not_called()
+
+    def test_parse_within_segment_budget(self):
+        """Test that an interchange with as many segments as the budget allows is parsed."""
+        # Arrange
+        edifact_text = CODE_LIST_MESSAGE.format(version="2.4c") + "\n"
+
+        # Act
+        result = self.parser.parse(edifact_text, max_lines_to_parse=6, budget=ParseBudget(max_segments=100))
+
+        # Assert
+        self.assertEqual(1, len(result.unh_unt_nachrichten))
+        with self.assertRaises(ParseBudgetExceededException):
+            self.parser.parse(edifact_text, max_lines_to_parse=100, budget=ParseBudget(max_segments=5))
+
+    def test_parse_with_byte_budget(self):
+        """Test that the byte budget applies to the payload size of the statistics or the text length."""
+        # Arrange
+        edifact_text = CODE_LIST_MESSAGE.format(version="2.4c")
+        budget = ParseBudget(max_bytes=len(edifact_text))
+        statistics = ParseStatistics()
+        statistics.byte_count = len(edifact_text) + 1
+
+        # Act
+        self.parser.parse(edifact_text, budget=budget)
+        with self.assertRaises(ParseBudgetExceededException) as context:
+            self.parser.parse(edifact_text, statistics=statistics, budget=budget)
+
+        # Assert
+        self.assertEqual(ParseBudget.BYTES, context.exception.budget)
+
+    def test_parse_with_time_budget(self):
+        """Test that a parse exceeding the wall-clock budget is aborted while converting the segments."""
+        # Arrange
+        settings = MSCONSGeneratorSettings(seed=42, messages=2)
+        edifact_text = "".join(MSCONSInterchangeGenerator(settings).iter_segments())
+
+        # Act
+        with self.assertRaises(ParseBudgetExceededException) as context:
+            self.parser.parse(edifact_text, budget=ParseBudget(max_seconds=1e-9))
+
+        # Assert
+        self.assertEqual(ParseBudget.SECONDS, context.exception.budget)
+        self.assertEqual(256, self.parser._EdifactMSCONSParser__context.segment_count)
+
+    def test_parse_with_cancelled_token(self):
+        """Test that a parse with a tripped cancel token does not start."""
+        # Arrange
+        cancel_token = CancelToken()
+        cancel_token.cancel(CancelToken.CLIENT_DISCONNECTED)
+
+        # Act
+        with self.assertRaises(ParseCancelledException) as context:
+            self.parser.parse(CODE_LIST_MESSAGE.format(version="2.4c"), cancel_token=cancel_token)
+
+        # Assert
+        self.assertEqual(CancelToken.CLIENT_DISCONNECTED, context.exception.reason)
+        self.assertEqual(0, self.parser._EdifactMSCONSParser__context.segment_count)
+
+    def test_parse_cancelled_while_converting(self):
+        """Test that the cancel token is checked periodically and the CPU time of the cancelled parse is reported."""
+        # Arrange
+        settings = MSCONSGeneratorSettings(seed=42, messages=2)
+        edifact_text = "".join(MSCONSInterchangeGenerator(settings).iter_segments())
+        cancel_token = CancelToken()
+        checks = []
+
+        def raise_if_cancelled():
+            checks.append(self.parser._EdifactMSCONSParser__context.segment_count)
+            if len(checks) == 3:
+                cancel_token.cancel()
+            CancelToken.raise_if_cancelled(cancel_token)
+
+        cancel_token.raise_if_cancelled = raise_if_cancelled
+
+        # Act
+        with self.assertRaises(ParseCancelledException) as context:
+            self.parser.parse(edifact_text, cancel_token=cancel_token)
+
+        # Assert
+        self.assertEqual([0, 256, 512], checks)
+        self.assertEqual(CancelToken.CANCELLED, context.exception.reason)
+        self.assertGreater(context.exception.cpu_seconds, 0.0)
+
+    def test_iter_messages(self):
+        """Test that the chunks of an incremental parse contain the messages of the whole parse."""
+        # Arrange
+        settings = MSCONSGeneratorSettings(seed=42, messages=5)
+        edifact_text = "".join(MSCONSInterchangeGenerator(settings).iter_segments())
+        expected = self.parser.parse(edifact_text).model_dump(mode="json")
+
+        for chunk_size in (1, 10 ** 9):
+            with self.subTest(chunk_size=chunk_size):
+                # Act
+                chunks = list(self.parser.iter_messages(edifact_text, chunk_size=chunk_size))
+
+                # Assert
+                dumps = [chunk.model_dump(mode="json") for _, chunk in chunks]
+                self.assertEqual(5 if chunk_size == 1 else 1, len(chunks))
+                self.assertEqual(len(edifact_text), chunks[-1][0])
+                self.assertEqual(sorted(offset for offset, _ in chunks), [offset for offset, _ in chunks])
+                self.assertEqual(expected["unh_unt_nachrichten"],
+                                 [message for dump in dumps for message in dump["unh_unt_nachrichten"]])
+                for dump in dumps:
+                    self.assertEqual(expected["unb_nutzdaten_kopfsegment"], dump["unb_nutzdaten_kopfsegment"])
+                self.assertEqual(expected["unz_nutzdaten_endsegment"], dumps[-1]["unz_nutzdaten_endsegment"])
+
+    def test_iter_messages_without_messages(self):
+        """Test that an interchange without messages is parsed as a whole."""
+        # Arrange
+        edifact_text = "UNA:+.? 'UNB+UNOC:3+sender:500+receiver:500+250101:1200+REF1'UNZ+0+REF1'"
+
+        # Act
+        chunks = list(self.parser.iter_messages(edifact_text))
+
+        # Assert
+        self.assertEqual(1, len(chunks))
+        self.assertEqual(len(edifact_text), chunks[0][0])
+        self.assertEqual([], chunks[0][1].unh_unt_nachrichten)
+        self.assertIsNotNone(chunks[0][1].unz_nutzdaten_endsegment)
+
+    def test_iter_message_texts_from_parts(self):
+        """Test that the chunks of a text given in parts do not depend on the boundaries of the parts."""
+        # Arrange
+        settings = MSCONSGeneratorSettings(seed=42, messages=5)
+        edifact_text = "".join(MSCONSInterchangeGenerator(settings).iter_segments()).replace("'", "'\n")
+        expected = list(self.parser.iter_message_texts(edifact_text, chunk_size=1))
+
+        for part_size in (1, 2, 7, 1000):
+            with self.subTest(part_size=part_size):
+                parts = [edifact_text[index:index + part_size] for index in range(0, len(edifact_text), part_size)]
+
+                # Act
+                chunks = list(self.parser.iter_message_texts(iter(parts), chunk_size=1))
+
+                # Assert
+                self.assertEqual(expected, chunks)
+        self.assertEqual(5, len(expected))
+        self.assertTrue(all(chunk_text.startswith("UNA") for _, chunk_text in expected))
+
+    def test_iter_messages_from_parts(self):
+        """Test that the chunks of a text given in parts contain the messages of the whole parse."""
+        # Arrange
+        settings = MSCONSGeneratorSettings(seed=7, messages=3)
+        edifact_text = "".join(MSCONSInterchangeGenerator(settings).iter_segments())
+        parts = [edifact_text[index:index + 100] for index in range(0, len(edifact_text), 100)]
+
+        # Act
+        chunks = list(self.parser.iter_messages(parts, chunk_size=1, compact=True))
+
+        # Assert
+        expected = self.parser.parse(edifact_text).model_dump(mode="json")
+        dumps = [chunk.model_dump(mode="json") for _, chunk in chunks]
+        self.assertEqual(expected["unh_unt_nachrichten"],
+                         [message for dump in dumps for message in dump["unh_unt_nachrichten"]])
+
+    def __write_file(self, content: bytes) -> str:
+        file = tempfile.NamedTemporaryFile(suffix=".edi", delete=False)
+        with file:
+            file.write(content)
+        self.addCleanup(os.remove, file.name)
+        return file.name
+
+    def test_parse_file(self):
+        """Test that a memory-mapped file is parsed like its decoded text."""
+        samples = ("mscons-message-example.txt", "mscons-message-example-una-spec.txt")
+        for sample in samples:
+            with self.subTest(sample=sample):
+                # Arrange
+                path = os.path.join(os.path.dirname(__file__), "../../../samples", sample)
+                with open(path, encoding="utf-8") as file:
+                    expected = self.parser.parse(file.read()).model_dump(mode="json")
+                statistics = ParseStatistics()
+
+                # Act
+                result = self.parser.parse_file(path, statistics=statistics, compact=True)
+
+                # Assert
+                self.assertEqual(expected, result.model_dump(mode="json"))
+                self.assertEqual(os.path.getsize(path), statistics.byte_count)
+                self.assertEqual(len(expected["unh_unt_nachrichten"]), statistics.message_count)
+
+    def test_parse_starts_a_location_object_per_loc_segment(self):
+        """Test that every LOC segment of a delivery location starts its own location object (SG6) with its own
+        positions. Regression test: the second LOC segment overwrote the first one and both entries of the
+        delivery location referred to the same location object."""
+        # Arrange
+        edifact_text = (
+            "UNB+UNOC:3+SENDER:14+RECIPIENT:14+230101:1200+12345'"
+            "UNH+1+MSCONS:D:04B:UN:2.4c'"
+            "BGM+7+MSI5422+9'"
+            "UNS+D'"
+            "NAD+DP'"
+            "LOC+172+DE001'"
+            "LIN+1'"
+            "QTY+220:1.5:KWH'"
+            "LOC+172+DE002'"
+            "LIN+1'"
+            "QTY+220:2.5:KWH'"
+            "UNT+10+1'"
+            "UNZ+1+12345'"
+        )
+
+        # Act
+        result = self.parser.parse(edifact_text)
+
+        # Assert
+        location_objects = result.unh_unt_nachrichten[0].sg5_liefer_bzw_bezugsorte[0] \
+            .sg6_wert_und_erfassungsangaben_zum_objekt
+        self.assertEqual(2, len(location_objects))
+        self.assertIsNot(location_objects[0], location_objects[1])
+        self.assertEqual(["DE001", "DE002"],
+                         [sg6.loc_identifikationsangabe.ortsangabe.ortsangabe_code for sg6 in location_objects])
+        self.assertEqual([[1.5], [2.5]],
+                         [[sg10.qty_mengenangaben.menge for sg9 in sg6.sg9_positionsdaten
+                           for sg10 in sg9.sg10_mengen_und_statusangaben] for sg6 in location_objects])
+
+    def test_parse_with_query_index(self):
+        """Test that a parse of a text or a file fills the given query index with the nodes of its parse tree."""
+        # Arrange
+        settings = MSCONSGeneratorSettings(seed=42, messages=2, objects_per_location=2, intervals_per_position=2)
+        edifact_text = "".join(MSCONSInterchangeGenerator(settings).iter_segments())
+        path = self.__write_file(edifact_text.encode("utf-8"))
+
+        for name, parse in (("text", lambda query_index: self.parser.parse(edifact_text, query_index=query_index)),
+                            ("file", lambda query_index: self.parser.parse_file(path, query_index=query_index))):
+            with self.subTest(parse=name):
+                query_index = InterchangeQueryIndex()
+
+                # Act
+                result = parse(query_index)
+
+                # Assert
+                locations = query_index.values(QueryKey.LOCATION)
+                self.assertEqual(4, len(locations))
+                last_object = result.unh_unt_nachrichten[1].sg5_liefer_bzw_bezugsorte[0] \
+                    .sg6_wert_und_erfassungsangaben_zum_objekt[1]
+                entry, = query_index.find(QueryKey.LOCATION, locations[-1])
+                self.assertEqual(1, entry.message_index)
+                self.assertIs(last_object, entry.location_object)
+                self.assertEqual(4, len(query_index.query(obis="1-1:1.29.1", time_series_type="BI1")))
+
+    def test_parse_file_decodes_with_syntax_identifier(self):
+        """Test that the segments of a file are decoded with the encoding of its syntax identifier."""
+        # Arrange
+        edifact_text = CODE_LIST_MESSAGE.format(version="2.4c").replace("UNOC", "UNOE").replace("MSI5422", "Ж5422")
+        expected = self.parser.parse(edifact_text).model_dump(mode="json")
+
+        for encoding in ("iso-8859-5", "utf-8"):
+            with self.subTest(encoding=encoding):
+                # Act
+                result = self.parser.parse_file(self.__write_file(edifact_text.encode(encoding)))
+
+                # Assert
+                self.assertEqual(expected, result.model_dump(mode="json"))
+
+    def test_parse_empty_file(self):
+        """Test that an empty file, which cannot be mapped, is parsed like an empty string."""
+        # Act
+        result = self.parser.parse_file(self.__write_file(b""))
+
+        # Assert
+        self.assertEqual(self.parser.parse("").model_dump(mode="json"), result.model_dump(mode="json"))
+
+    def test_parse_file_with_budget(self):
+        """Test that the budget of a file applies to its size and to the segments read."""
+        # Arrange
+        content = (CODE_LIST_MESSAGE.format(version="2.4c") + "\n").encode("utf-8")
+        path = self.__write_file(content)
+
+        # Act
+        result = self.parser.parse_file(path, max_lines_to_parse=6, budget=ParseBudget(max_bytes=len(content)))
+
+        # Assert
+        self.assertEqual(1, len(result.unh_unt_nachrichten))
+        with self.assertRaises(ParseBudgetExceededException) as context:
+            self.parser.parse_file(path, max_lines_to_parse=5)
+        self.assertEqual(ParseBudget.SEGMENTS, context.exception.budget)
+        with self.assertRaises(ParseBudgetExceededException) as context:
+            self.parser.parse_file(path, budget=ParseBudget(max_bytes=len(content) - 1))
+        self.assertEqual(ParseBudget.BYTES, context.exception.budget)
+
+    def test_parse_file_locates_contrl_error(self):
+        """Test that the CONTRL error of a file carries the byte offsets of the invalid segment."""
+        # Arrange
+        content = CODE_LIST_MESSAGE.format(version="2.4c").replace("BGM+7", "QTY+220:abc").encode("utf-8")
+        start = content.index(b"QTY")
+
+        # Act
+        with self.assertRaises(CONTRLException) as context:
+            self.parser.parse_file(self.__write_file(content))
+
+        # Assert
+        self.assertEqual(3, context.exception.line_number)
+        self.assertEqual((start, content.index(b"'", start)), context.exception.byte_range)
+        self.assertIn(f"segment 3 at bytes {start}-", str(context.exception))
+
+    def test_reparse_message(self):
+        """Test that a single message of an indexed interchange is parsed like within the whole interchange."""
+        # Arrange
+        settings = MSCONSGeneratorSettings(seed=5, messages=4, escape_rate=0.2)
+        edifact_text = "".join(MSCONSInterchangeGenerator(settings).iter_segments())
+        expected = self.parser.parse(edifact_text).model_dump(mode="json")["unh_unt_nachrichten"]
+        segment_index = SegmentIndex(edifact_text.encode("utf-8"))
+
+        for message_index in (0, 3):
+            with self.subTest(message_index=message_index):
+                # Act
+                message = self.parser.reparse_message(segment_index, message_index, compact=True)
+
+                # Assert
+                self.assertEqual(expected[message_index], message.model_dump(mode="json"))
+
+    def test_reparse_message_locates_contrl_error(self):
+        """Test that the CONTRL error of a reparsed message is located within the whole interchange."""
+        # Arrange
+        message = "UNH+{0}+MSCONS:D:04B:UN:2.4c'BGM+7+MSI{0}+9'UNT+3+{0}'"
+        content = ("UNB+UNOC:3+SENDER:14+RECIPIENT:14+230101:1200+12345'"
+                   + message.format(1) + message.format(2).replace("BGM+7", "QTY+220:abc")
+                   + "UNZ+2+12345'").encode("utf-8")
+        segment_index = SegmentIndex(content)
+        start = content.index(b"QTY")
+
+        # Act
+        with self.assertRaises(CONTRLException) as context:
+            self.parser.reparse_message(segment_index, 1)
+
+        # Assert
+        self.assertEqual(6, context.exception.line_number)
+        self.assertEqual((start, content.index(b"'", start)), context.exception.byte_range)
+
+    def test_init_with_unknown_mig_version(self):
+        """Test that a fixed MIG version without code lists is rejected."""
+        # Act / Assert
+        with self.assertRaises(ValueError):
+            EdifactMSCONSParser(mig_version="9.9")
+
 
 if __name__ == '__main__':
     unittest.main()
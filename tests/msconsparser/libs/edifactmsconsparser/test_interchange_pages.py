@@ -0,0 +1,150 @@
+import unittest
+from datetime import datetime, timedelta, timezone
+
+from msconsparser.libs.edifactmsconsparser.edifact_mscons_parser import EdifactMSCONSParser
+from msconsparser.libs.edifactmsconsparser.generators import MSCONSGeneratorSettings, MSCONSInterchangeGenerator
+from msconsparser.libs.edifactmsconsparser.interchange_pages import (
+    PAGE_BY_MEASUREMENTS, PageCursor, PageRequest, get_interchange_page, parse_dtm_value
+)
+from msconsparser.libs.edifactmsconsparser.lazy_edifact_interchange import LazyEdifactInterchange
+
+
+class TestInterchangePages(unittest.TestCase):
+    """Test cases for the pages of messages and measurements of an interchange."""
+
+    def setUp(self):
+        """Set up test fixtures before each test method."""
+        self.parser = EdifactMSCONSParser()
+        settings = MSCONSGeneratorSettings(seed=3, messages=7)
+        self.edifact_text = "".join(MSCONSInterchangeGenerator(settings).iter_segments())
+        self.expected = self.parser.parse(self.edifact_text).model_dump(mode="json")
+
+    def get_all_pages(self, page_request: PageRequest) -> list:
+        pages = []
+        while True:
+            interchange = LazyEdifactInterchange(self.edifact_text, parser=self.parser, compact=True)
+            pages.append(get_interchange_page(interchange, page_request))
+            if pages[-1].next_cursor is None:
+                return pages
+            page_request.cursor = PageCursor.decode(pages[-1].next_cursor.encode())
+
+    def test_message_pages(self):
+        """Test that the message pages add up to the messages of a whole parse."""
+        # Act
+        pages = self.get_all_pages(PageRequest(page_size=3))
+
+        # Assert
+        self.assertEqual([3, 3, 1], [len(page.items) for page in pages])
+        self.assertEqual(self.expected["unh_unt_nachrichten"], [message for page in pages for message in page.items])
+        self.assertEqual(list(self.expected), list(pages[0].model_dump()))
+        self.assertEqual(self.expected["unb_nutzdaten_kopfsegment"], pages[1].model_dump()["unb_nutzdaten_kopfsegment"])
+        self.assertEqual(7, pages[0].message_count)
+
+    def test_page_parses_only_its_messages(self):
+        """Test that a page from a cursor parses neither the messages before nor after it."""
+        # Arrange
+        interchange = LazyEdifactInterchange(self.edifact_text, parser=self.parser, compact=True)
+
+        # Act
+        page = get_interchange_page(interchange, PageRequest(page_size=2, cursor=PageCursor(4)))
+
+        # Assert
+        self.assertEqual(self.expected["unh_unt_nachrichten"][4:6], page.items)
+        self.assertEqual(2, interchange.parsed_message_count)
+        self.assertEqual(PageCursor(6), page.next_cursor)
+
+    def test_measurement_pages(self):
+        """Test that the measurement pages add up to the intervals of all messages, each of them once."""
+        # Arrange
+        intervals = [interval for message in self.expected["unh_unt_nachrichten"]
+                     for delivery_location in message["sg5_liefer_bzw_bezugsorte"]
+                     for location_object in delivery_location["sg6_wert_und_erfassungsangaben_zum_objekt"]
+                     for position in location_object["sg9_positionsdaten"]
+                     for interval in position["sg10_mengen_und_statusangaben"]]
+
+        # Act
+        pages = self.get_all_pages(PageRequest(PAGE_BY_MEASUREMENTS, page_size=50))
+
+        # Assert
+        measurements = [measurement for page in pages for measurement in page.items]
+        self.assertEqual(intervals, [measurement["interval"] for measurement in measurements])
+        self.assertEqual({"measurements"}, set(pages[0].model_dump()))
+        self.assertEqual(["message_index", "message_reference", "location", "product_code", "interval"],
+                         list(measurements[0]))
+
+    def test_location_filter(self):
+        """Test that only the measurements and messages of the requested location are returned."""
+        # Arrange
+        location_object = self.expected["unh_unt_nachrichten"][3]["sg5_liefer_bzw_bezugsorte"][0][
+            "sg6_wert_und_erfassungsangaben_zum_objekt"][0]
+        location = location_object["loc_identifikationsangabe"]["ortsangabe"]["ortsangabe_code"]
+        interval_count = sum(len(position["sg10_mengen_und_statusangaben"])
+                             for position in location_object["sg9_positionsdaten"])
+
+        # Act
+        measurement_pages = self.get_all_pages(PageRequest(PAGE_BY_MEASUREMENTS, page_size=10, location=location))
+        message_pages = self.get_all_pages(PageRequest(page_size=5, location=location))
+
+        # Assert
+        measurements = [measurement for page in measurement_pages for measurement in page.items]
+        self.assertEqual(interval_count, len(measurements))
+        self.assertEqual({location}, {measurement["location"] for measurement in measurements})
+        self.assertEqual([self.expected["unh_unt_nachrichten"][3]], message_pages[0].items)
+
+    def test_time_window(self):
+        """Test that only the intervals overlapping the time window are returned."""
+        # Arrange
+        start = datetime(2024, 1, 1, 1, tzinfo=timezone.utc)
+
+        # Act
+        pages = self.get_all_pages(PageRequest(PAGE_BY_MEASUREMENTS, page_size=1000, start=start,
+                                               end=start + timedelta(hours=1)))
+
+        # Assert
+        starts = {measurement["interval"]["dtm_zeitangaben"][0]["datum_oder_uhrzeit_oder_zeitspanne_wert"]
+                  for page in pages for measurement in page.items}
+        self.assertEqual({"202401010100+00", "202401010115+00", "202401010130+00", "202401010145+00"}, starts)
+
+    def test_cursor_encoding(self):
+        """Test that a cursor survives its encoding and invalid tokens are rejected."""
+        # Arrange
+        cursor = PageCursor(12, 1, 0, 95)
+
+        # Act / Assert
+        self.assertEqual(cursor, PageCursor.decode(cursor.encode()))
+        for token in ("", "invalid", PageCursor(1).encode()[:-2]):
+            with self.subTest(token=token):
+                with self.assertRaises(ValueError):
+                    PageCursor.decode(token)
+
+    def test_from_query_params(self):
+        """Test that a page is requested by page_by, page_size or cursor and its parameters are validated."""
+        # Act
+        page_request = PageRequest.from_query_params({
+            "page_by": "measurements", "page_size": "20", "location": "DE1", "from": "2024-01-01T00:00:00Z",
+            "to": "2024-01-02T00:00:00",
+        })
+
+        # Assert
+        self.assertIsNone(PageRequest.from_query_params({"location": "DE1"}))
+        self.assertEqual((PAGE_BY_MEASUREMENTS, 20, "DE1"),
+                         (page_request.page_by, page_request.page_size, page_request.location))
+        self.assertEqual(datetime(2024, 1, 1, tzinfo=timezone.utc), page_request.start)
+        self.assertEqual(datetime(2024, 1, 2, tzinfo=timezone.utc), page_request.end)
+        for query_params in ({"page_by": "locations"}, {"page_size": "0"}, {"page_size": "-1"},
+                             {"page_size": "10", "from": "yesterday"}, {"page_size": "10", "from": "2024-01-01"}):
+            with self.subTest(query_params=query_params):
+                with self.assertRaises(ValueError):
+                    PageRequest.from_query_params(query_params)
+
+    def test_parse_dtm_value(self):
+        """Test that the DTM values are converted with their format code and UTC offset."""
+        # Act / Assert
+        self.assertEqual(datetime(2024, 1, 1, 23, tzinfo=timezone.utc), parse_dtm_value("202401020000+01", "303"))
+        self.assertEqual(datetime(2024, 1, 2, tzinfo=timezone.utc), parse_dtm_value("20240102", "102"))
+        self.assertIsNone(parse_dtm_value("2024", "303"))
+        self.assertIsNone(parse_dtm_value("202401020000", "610"))
+
+
+if __name__ == "__main__":
+    unittest.main()
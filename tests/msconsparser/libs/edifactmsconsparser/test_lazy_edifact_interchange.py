@@ -0,0 +1,138 @@
+import unittest
+from unittest.mock import patch
+
+from msconsparser.libs.edifactmsconsparser.edifact_mscons_parser import EdifactMSCONSParser
+from msconsparser.libs.edifactmsconsparser.exceptions import CONTRLException, ParseBudgetExceededException
+from msconsparser.libs.edifactmsconsparser.generators import MSCONSGeneratorSettings, MSCONSInterchangeGenerator
+from msconsparser.libs.edifactmsconsparser.lazy_edifact_interchange import LazyEdifactInterchange
+from msconsparser.libs.edifactmsconsparser.wrappers import ParseBudget, ParsePhase, ParseStatistics
+
+
+class TestLazyEdifactInterchange(unittest.TestCase):
+    """Test cases for the LazyEdifactInterchange class."""
+
+    def setUp(self):
+        """Set up test fixtures before each test method."""
+        self.parser = EdifactMSCONSParser()
+        settings = MSCONSGeneratorSettings(seed=11, messages=5, escape_rate=0.2)
+        self.edifact_text = "".join(MSCONSInterchangeGenerator(settings).iter_segments())
+        self.expected = self.parser.parse(self.edifact_text).model_dump(mode="json")
+
+    def test_dump_matches_whole_parse(self):
+        """Test that the dump of all messages equals the dump of a whole parse, with and without compact nodes."""
+        for compact in (False, True):
+            with self.subTest(compact=compact):
+                # Act
+                interchange = LazyEdifactInterchange(self.edifact_text, parser=self.parser, compact=compact)
+
+                # Assert
+                self.assertEqual(self.expected, interchange.model_dump(mode="json"))
+                self.assertEqual(self.expected, interchange.to_interchange().model_dump(mode="json"))
+
+    def test_messages_are_parsed_on_access(self):
+        """Test that only the accessed messages are parsed, and each of them once."""
+        # Arrange
+        interchange = LazyEdifactInterchange(self.edifact_text, parser=self.parser)
+
+        with patch.object(self.parser, "reparse_message", wraps=self.parser.reparse_message) as reparse_message:
+            # Act
+            content = interchange.model_dump(mode="json", offset=1, limit=2)
+            message = interchange.get_message(2)
+
+        # Assert
+        self.assertEqual(5, interchange.message_count)
+        self.assertEqual(2, interchange.parsed_message_count)
+        self.assertEqual(2, reparse_message.call_count)
+        self.assertEqual(self.expected["unh_unt_nachrichten"][1:3], content["unh_unt_nachrichten"])
+        self.assertEqual(self.expected["unb_nutzdaten_kopfsegment"], content["unb_nutzdaten_kopfsegment"])
+        self.assertEqual(self.expected["unz_nutzdaten_endsegment"], content["unz_nutzdaten_endsegment"])
+        self.assertEqual(self.expected["unh_unt_nachrichten"][2], message.model_dump(mode="json"))
+
+    def test_get_message_reference(self):
+        """Test that the reference numbers are read from the UNH segments."""
+        # Arrange
+        interchange = LazyEdifactInterchange(self.edifact_text, parser=self.parser)
+
+        # Act
+        references = [interchange.get_message_reference(i) for i in range(interchange.message_count)]
+
+        # Assert
+        self.assertEqual([message["unh_nachrichtenkopfsegment"]["nachrichten_referenznummer"]
+                          for message in self.expected["unh_unt_nachrichten"]], references)
+        self.assertEqual(0, interchange.parsed_message_count)
+
+    def test_message_contains(self):
+        """Test that a value is searched in the raw segments of a message, escaped like the message."""
+        # Arrange
+        message = "UNH+{0}+MSCONS:D:04B:UN:2.4c'BGM+7+{1}+9'UNT+3+{0}'"
+        content = ("UNB+UNOC:3+SENDER:14+RECIPIENT:14+230101:1200+12345'" + message.format(1, "MSI?+1")
+                   + message.format(2, "MSI2") + "UNZ+2+12345'")
+        interchange = LazyEdifactInterchange(content, parser=self.parser)
+
+        # Act / Assert
+        self.assertTrue(interchange.message_contains(0, "MSI+1"))
+        self.assertFalse(interchange.message_contains(1, "MSI+1"))
+        self.assertTrue(interchange.message_contains(1, "MSI2"))
+        self.assertEqual(0, interchange.parsed_message_count)
+
+    def test_get_message_out_of_range(self):
+        """Test that a missing message raises an IndexError."""
+        # Arrange
+        interchange = LazyEdifactInterchange(self.edifact_text, parser=self.parser)
+
+        # Act / Assert
+        with self.assertRaises(IndexError):
+            interchange.get_message(5)
+        self.assertEqual([], interchange.model_dump(offset=5)["unh_unt_nachrichten"])
+
+    def test_statistics(self):
+        """Test that the statistics count the whole interchange."""
+        # Arrange
+        statistics = ParseStatistics()
+
+        # Act
+        LazyEdifactInterchange(self.edifact_text, parser=self.parser, statistics=statistics)
+
+        # Assert
+        self.assertEqual(5, statistics.message_count)
+        self.assertEqual(len(self.edifact_text.encode("utf-8")), statistics.byte_count)
+        self.assertGreater(statistics.segment_count, 5)
+        self.assertIn(ParsePhase.TOKENIZE, statistics.phase_durations)
+
+    def test_budget_applies_to_parsed_segments(self):
+        """Test that the segment budget bounds the parsed segments instead of the segments of the interchange."""
+        # Arrange
+        statistics = ParseStatistics()
+        LazyEdifactInterchange(self.edifact_text, parser=self.parser, statistics=statistics)
+        budget = ParseBudget(max_segments=statistics.segment_count // 2)
+        interchange = LazyEdifactInterchange(self.edifact_text, parser=self.parser, budget=budget)
+
+        # Act
+        interchange.get_message(0)
+
+        # Assert
+        with self.assertRaises(ParseBudgetExceededException):
+            list(interchange.iter_messages())
+        with self.assertRaises(ParseBudgetExceededException):
+            LazyEdifactInterchange(self.edifact_text, parser=self.parser, budget=ParseBudget(max_bytes=10))
+
+    def test_contrl_error_of_message(self):
+        """Test that an invalid message raises its CONTRL error on access only."""
+        # Arrange
+        message = "UNH+{0}+MSCONS:D:04B:UN:2.4c'BGM+7+MSI{0}+9'UNT+3+{0}'"
+        content = ("UNB+UNOC:3+SENDER:14+RECIPIENT:14+230101:1200+12345'"
+                   + message.format(1) + message.format(2).replace("BGM+7", "QTY+220:abc")
+                   + "UNZ+2+12345'")
+        interchange = LazyEdifactInterchange(content, parser=self.parser)
+
+        # Act
+        interchange.get_message(0)
+        with self.assertRaises(CONTRLException) as context:
+            interchange.get_message(1)
+
+        # Assert
+        self.assertEqual(6, context.exception.line_number)
+
+
+if __name__ == "__main__":
+    unittest.main()
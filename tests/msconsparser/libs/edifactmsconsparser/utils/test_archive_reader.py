@@ -0,0 +1,114 @@
+import gzip
+import io
+import random
+import tarfile
+import unittest
+import zipfile
+
+from msconsparser.libs.edifactmsconsparser.exceptions import ArchiveReadException
+from msconsparser.libs.edifactmsconsparser.utils import (
+    count_archive_members, detect_archive_format, iter_archive_members
+)
+
+FILES = {"2024/a.edi": b"UNA:+.? '" * 100, "2024/b.edi": b"UNB+UNOC:3'"}
+
+
+def create_zip(files: dict) -> bytes:
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr("2024/", "")
+        for file_name, content in files.items():
+            archive.writestr(file_name, content)
+    return buffer.getvalue()
+
+
+def create_tar(files: dict, mode: str) -> bytes:
+    buffer = io.BytesIO()
+    with tarfile.open(fileobj=buffer, mode=mode) as archive:
+        for file_name, content in files.items():
+            member = tarfile.TarInfo(file_name)
+            member.size = len(content)
+            archive.addfile(member, io.BytesIO(content))
+    return buffer.getvalue()
+
+
+class UnseekableStream(io.BytesIO):
+    """A stream without random access, like the body of a request."""
+
+    def seekable(self) -> bool:
+        return False
+
+
+class TestArchiveReader(unittest.TestCase):
+    """Test cases for the reading of archives member by member."""
+
+    @staticmethod
+    def read_members(fileobj, name: str = "") -> dict:
+        return {member_name: member.read() for member_name, member in iter_archive_members(fileobj, name)}
+
+    def test_iter_archive_members(self):
+        """Test that the members of zip, tar and tar.gz archives are read, also from streams without random access."""
+        cases = {
+            "zip": create_zip(FILES),
+            "tar": create_tar(FILES, "w"),
+            "tar.gz": create_tar(FILES, "w:gz"),
+        }
+        for archive_format, content in cases.items():
+            for stream_type in (io.BytesIO, UnseekableStream):
+                with self.subTest(archive_format=archive_format, stream_type=stream_type.__name__):
+                    # Act / Assert
+                    self.assertEqual(FILES, self.read_members(stream_type(content), "archive"))
+
+    def test_iter_archive_members_of_single_files(self):
+        """Test that a gzip compressed file is decompressed and any other file is its own member."""
+        # Arrange
+        content = FILES["2024/a.edi"]
+
+        # Act / Assert
+        self.assertEqual({"a.edi": content}, self.read_members(io.BytesIO(gzip.compress(content)), "a.edi.gz"))
+        self.assertEqual({"a.edi": content}, self.read_members(UnseekableStream(content), "a.edi"))
+        self.assertEqual({"empty.edi": b""}, self.read_members(io.BytesIO(b""), "empty.edi"))
+
+    def test_iter_archive_members_of_corrupt_archives(self):
+        """Test that a corrupt zip archive is rejected and a truncated tar.gz archive ends with an error."""
+        # Arrange
+        files = dict(FILES, **{"2024/c.edi": random.Random(42).randbytes(100000), "2024/d.edi": b"UNZ'"})
+        content = create_tar(files, "w:gz")
+        results = []
+
+        # Act
+        for member_name, member in iter_archive_members(io.BytesIO(content[:len(content) // 2])):
+            try:
+                results.append((member_name, len(member.read())) if not isinstance(member, Exception) else member)
+            except EOFError as ex:
+                results.append(ex)
+
+        # Assert
+        with self.assertRaises(ArchiveReadException):
+            list(iter_archive_members(io.BytesIO(b"PK\x03\x04 corrupt")))
+        self.assertEqual([("2024/a.edi", 900), ("2024/b.edi", 11)], results[:2])
+        self.assertIsInstance(results[2], EOFError)
+        self.assertIsInstance(results[3], ArchiveReadException)
+        self.assertEqual(4, len(results))
+
+    def test_detect_and_count_archive_members(self):
+        """Test that the format is detected by the content and the files of zip archives are counted."""
+        cases = [
+            (create_zip(FILES), "zip", 2),
+            (create_tar(FILES, "w"), "tar", None),
+            (create_tar(FILES, "w:gz"), "gzip", None),
+            (b"UNA:+.? '", None, 1),
+        ]
+        for content, expected_format, expected_count in cases:
+            with self.subTest(expected_format=expected_format):
+                # Arrange
+                fileobj = io.BytesIO(content)
+
+                # Act / Assert
+                self.assertEqual(expected_format, detect_archive_format(fileobj))
+                self.assertEqual(expected_count, count_archive_members(fileobj))
+                self.assertEqual(0, fileobj.tell())
+
+
+if __name__ == "__main__":
+    unittest.main()
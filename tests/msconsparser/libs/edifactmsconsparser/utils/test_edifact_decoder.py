@@ -0,0 +1,75 @@
+import io
+import unittest
+
+from msconsparser.libs.edifactmsconsparser.exceptions import ParseBudgetExceededException
+from msconsparser.libs.edifactmsconsparser.utils import (
+    decode_edifact_bytes, get_fallback_encoding, iter_decoded_text
+)
+from msconsparser.libs.edifactmsconsparser.wrappers import ParseBudget
+
+
+class TestEdifactDecoder(unittest.TestCase):
+    """Test cases for the decoding of EDIFACT files."""
+
+    def test_decode_edifact_bytes_with_fallback_encoding(self):
+        """Test that bytes which are no valid UTF-8 are decoded with the fallback encoding."""
+        # Arrange
+        content = "FTX+AAI+++Москва'".encode("iso-8859-5")
+
+        # Act / Assert
+        self.assertEqual("FTX+AAI+++Москва'", decode_edifact_bytes(content, "iso-8859-5"))
+        self.assertEqual("FTX+AAI+++Straße'", decode_edifact_bytes("FTX+AAI+++Straße'".encode("utf-8"), "iso-8859-5"))
+
+    def test_get_fallback_encoding(self):
+        """Test that the fallback encoding is chosen by the syntax identifier of the UNB segment."""
+        cases = (
+            (b"UNA:+.? 'UNB+UNOC:3+SENDER:14'", "iso-8859-1"),
+            (b"UNB*UNOE;3*SENDER;14'", "iso-8859-5"),
+            (b"UNB+UNOW:4+SENDER:14'", "iso-8859-1"),
+            (b"UNB+UNOZ:3+SENDER:14'", "iso-8859-1"),
+            (b"UNH+1+MSCONS:D:04B:UN:2.4c'", "iso-8859-1"),
+        )
+        for content, expected in cases:
+            with self.subTest(content=content):
+                # Act / Assert
+                self.assertEqual(expected, get_fallback_encoding(content))
+
+    def test_iter_decoded_text_utf8(self):
+        """Test that UTF-8 sequences split across blocks are decoded."""
+        # Arrange
+        content = "FTX+AAI+++Straße 1 €'".encode("utf-8")
+
+        for block_size in (1, 2, 3, 1024):
+            with self.subTest(block_size=block_size):
+                # Act
+                text = "".join(iter_decoded_text(io.BytesIO(content), block_size=block_size))
+
+                # Assert
+                self.assertEqual(decode_edifact_bytes(content), text)
+
+    def test_iter_decoded_text_latin1(self):
+        """Test that a stream which is no valid UTF-8 falls back to ISO-8859-1."""
+        # Arrange
+        content = "FTX+AAI+++Straße 1'".encode("iso-8859-1")
+
+        for block_size in (1, 4, 1024):
+            with self.subTest(block_size=block_size):
+                # Act
+                text = "".join(iter_decoded_text(io.BytesIO(content), block_size=block_size))
+
+                # Assert
+                self.assertEqual(decode_edifact_bytes(content), text)
+
+    def test_iter_decoded_text_exceeding_byte_budget(self):
+        """Test that a stream exceeding the byte budget is not read beyond the block exceeding it."""
+        # Arrange
+        stream = io.BytesIO(b"UNA:+.? '" * 100)
+
+        # Act / Assert
+        with self.assertRaises(ParseBudgetExceededException):
+            list(iter_decoded_text(stream, block_size=64, budget=ParseBudget(max_bytes=100)))
+        self.assertEqual(128, stream.tell())
+
+
+if __name__ == "__main__":
+    unittest.main()
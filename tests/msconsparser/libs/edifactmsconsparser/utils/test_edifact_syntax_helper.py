@@ -1,6 +1,7 @@
 import unittest
 
 from msconsparser.libs.edifactmsconsparser.utils.edifact_syntax_helper import EdifactSyntaxHelper
+from msconsparser.libs.edifactmsconsparser.utils.segment_tag_matcher import SegmentTagMatcher
 from msconsparser.libs.edifactmsconsparser.exceptions.parser_exceptions import MSCONSParserException
 from msconsparser.libs.edifactmsconsparser.wrappers import ParsingContext
 from msconsparser.libs.edifactmsconsparser.wrappers.segments import EdifactInterchange, SegmentUNA
@@ -101,6 +102,34 @@ class TestEdifactSyntaxHelper(unittest.TestCase):
         self.assertEqual("UNH+12345+MSCONS:D:96A:UN:EAN005", result[1])
         self.assertEqual("", result[2])
 
+    def test_iter_segments(self):
+        """Test that iter_segments splits and decodes bytes like split_segments the decoded text."""
+        # Arrange
+        test_data = "UNB*UNOC;3*SENDER;ZZ'FTX*AAI***Straße'UNH*12345*MSCONS;D;96A;UN;EAN005'\n"
+
+        for encoding in ("utf-8", "iso-8859-1"):
+            with self.subTest(encoding=encoding):
+                # Act
+                result = list(self.parser.iter_segments(test_data.encode(encoding), self.context))
+
+                # Assert
+                self.assertEqual(self.parser.split_segments(test_data, self.context), result)
+
+    def test_count_segments(self):
+        """Test count_segments method with and without limit."""
+        # Arrange
+        test_data = "UNB*UNOC;3'UNH*12345'BGM*7'UNT*2*1'UNZ*1'"
+
+        # Act / Assert
+        self.assertEqual(5, self.parser.count_segments(test_data, self.context))
+        self.assertEqual(5, self.parser.count_segments(test_data + "\n", self.context))
+        self.assertEqual(6, self.parser.count_segments(test_data + "UNZ*2", self.context))
+        self.assertEqual(5, self.parser.count_segments(test_data, self.context, limit=5))
+        self.assertEqual(4, self.parser.count_segments(test_data, self.context, limit=3))
+        self.assertEqual(6, self.parser.count_segments(test_data + "UNZ*2", self.context, limit=5))
+        self.assertEqual(0, self.parser.count_segments("", self.context, limit=5))
+        self.assertEqual(1, self.parser.count_segments("UNB+UNOC:3", None))
+
     def test_split_elements(self):
         """Test split_elements method with context."""
         # Test with valid context
@@ -171,6 +200,26 @@ class TestEdifactSyntaxHelper(unittest.TestCase):
         expected = "UNB+UNOC:3+9911845000009:500+9901000000001:500+250602:2158+9QF2J8QT6RJCAO++EM'"
         self.assertEqual(expected, self.parser.remove_invalid_prefix_from_segment_data(test_data, segment_types, self.context))
 
+    def test_remove_invalid_prefix_counts_recovered_prefixes(self):
+        """Test that removing an invalid prefix is counted in the context instead of adding a warning."""
+        segment_types = self.setUp_segment_types()
+
+        self.parser.remove_invalid_prefix_from_segment_data("PREFIX:UNH+1'", segment_types, self.context)
+        self.parser.remove_invalid_prefix_from_segment_data("PREFIX:BGM+7'", segment_types, self.context)
+        self.parser.remove_invalid_prefix_from_segment_data("QTY+220:1:KWH'", segment_types, self.context)
+
+        self.assertEqual(2, self.context.recovered_prefix_count)
+        self.assertEqual(0, self.context.warnings.total)
+
+    def test_remove_invalid_prefix_with_segment_tag_matcher(self):
+        """Test remove_invalid_prefix_from_segment_data with a prebuilt matcher of the segment types."""
+        matcher = SegmentTagMatcher.default()
+
+        test_data = "[${test(TEST_DATA)}]:QTY+220:4250.465:D54'"
+        expected = "QTY+220:4250.465:D54'"
+        self.assertEqual(expected,
+                         self.parser.remove_invalid_prefix_from_segment_data(test_data, matcher, self.context))
+
     def test_remove_invalid_prefix_different_segment_type(self):
         """Test remove_invalid_prefix_from_segment_data with a prefix before a different segment type."""
         segment_types = self.setUp_segment_types()
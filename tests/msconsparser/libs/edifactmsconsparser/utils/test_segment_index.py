@@ -0,0 +1,161 @@
+import mmap
+import os
+import tempfile
+import unittest
+
+from msconsparser.libs.edifactmsconsparser.utils import SEGMENT_TAGS, EdifactSyntaxHelper, SegmentIndex
+
+EDIFACT_TEXT = (
+    "UNA:+.? '\n"
+    "UNB+UNOC:3+SENDER:14+RECIPIENT:14+230101:1200+12345'\n"
+    "UNH+1+MSCONS:D:04B:UN:2.4c'BGM+7+MSI1+9'UNT+3+1'\n"
+    "UNH+2+MSCONS:D:04B:UN:2.4c'BGM+7+MSI2+9'\n"
+    "UNH+3+MSCONS:D:04B:UN:2.4c'BGM+7+Straße+9'UNT+3+3'\n"
+    "UNZ+3+12345'\n"
+)
+
+
+class TestSegmentIndex(unittest.TestCase):
+    """Test cases for the SegmentIndex class."""
+
+    def setUp(self):
+        """Set up test fixtures before each test method."""
+        self.content = EDIFACT_TEXT.encode("utf-8")
+        self.index = SegmentIndex(self.content)
+
+    def test_segments_match_split_segments(self):
+        """Test that the indexed segments are the stripped segments of split_segments."""
+        # Arrange
+        expected = [segment.strip() for segment in EdifactSyntaxHelper.split_segments(EDIFACT_TEXT)]
+
+        # Act
+        segments = [bytes(self.index.get_segment(position)).decode("utf-8") for position in range(len(self.index))]
+
+        # Assert
+        self.assertEqual(expected, segments)
+        self.assertEqual([segment[:3] if segment[:3] in SEGMENT_TAGS else "" for segment in expected],
+                         [self.index.get_tag(position) for position in range(len(self.index))])
+
+    def test_custom_segment_terminator(self):
+        """Test that the segment terminator of the UNA segment is used."""
+        # Arrange
+        content = b"UNA:+.? !UNB+UNOC:3!UNH+1!UNT+2+1!UNZ+1!"
+
+        # Act
+        index = SegmentIndex(content)
+
+        # Assert
+        self.assertEqual(b"!", index.segment_terminator)
+        self.assertEqual(["UNA", "UNB", "UNH", "UNT", "UNZ", ""], [index.get_tag(i) for i in range(len(index))])
+
+    def test_whitespace_segment_terminator_keeps_blank_segments(self):
+        """Test that the blank segments between newline terminators are indexed like the parser splits them."""
+        # Arrange
+        edifact_text = "UNA:+.? \nUNB+UNOC:3\n\n \nUNH+1+MSCONS:D:04B:UN:2.4c\r\nUNT+2+1\n\x1c\nUNZ+1+12345\n"
+        expected = [segment.strip() for segment in edifact_text.split("\n")]
+
+        # Act
+        index = SegmentIndex(edifact_text.encode("utf-8"), b"\n")
+
+        # Assert
+        self.assertEqual(expected, [bytes(index.get_segment(i)).decode("utf-8") for i in range(len(index))])
+        self.assertEqual(["UNA", "UNB", "", "", "UNH", "UNT", "", "UNZ", ""],
+                         [index.get_tag(i) for i in range(len(index))])
+        self.assertEqual([(4, 5)], list(index.iter_message_ranges()))
+
+    def test_iter_message_ranges(self):
+        """Test that the messages end at their UNT segment, a message without UNT before the next message."""
+        # Act
+        message_ranges = list(self.index.iter_message_ranges())
+
+        # Assert
+        self.assertEqual([(2, 4), (5, 6), (7, 9)], message_ranges)
+        self.assertEqual(3, self.index.get_message_count())
+        self.assertEqual((5, 6), self.index.get_message_range(1))
+        with self.assertRaises(IndexError):
+            self.index.get_message_range(3)
+
+    def test_get_message_range_from_end(self):
+        """Test that negative message indexes count from the end."""
+        # Act / Assert
+        self.assertEqual((7, 9), self.index.get_message_range(-1))
+        self.assertEqual((2, 4), self.index.get_message_range(-3))
+        with self.assertRaises(IndexError):
+            self.index.get_message_range(-4)
+
+    def test_get_message_and_header(self):
+        """Test that the header and the messages are sliced from the input including the segment terminators."""
+        # Act
+        header = self.index.get_header()
+        message = self.index.get_message(*self.index.get_message_range(2))
+
+        # Assert
+        self.assertIsInstance(message, memoryview)
+        self.assertEqual(EDIFACT_TEXT[:EDIFACT_TEXT.index("UNH")].encode("utf-8"), bytes(header))
+        self.assertEqual("UNH+3+MSCONS:D:04B:UN:2.4c'BGM+7+Straße+9'UNT+3+3'", bytes(message).decode("utf-8"))
+
+    def test_get_trailer(self):
+        """Test that the trailer is the input after the last message, and empty without messages."""
+        # Act
+        trailer = self.index.get_trailer()
+
+        # Assert
+        self.assertEqual(b"\nUNZ+3+12345'\n", bytes(trailer))
+        self.assertEqual(b"", bytes(SegmentIndex(b"UNA:+.? 'UNB+UNOC:3'UNZ+0+1'").get_trailer()))
+
+    def test_get_offsets(self):
+        """Test that the offsets exclude the surrounding whitespace and are checked."""
+        # Act
+        start, end = self.index.get_offsets(len(self.index) - 2)
+
+        # Assert
+        self.assertEqual(b"UNZ+3+12345", self.content[start:end])
+        with self.assertRaises(IndexError):
+            self.index.get_offsets(len(self.index))
+
+    def test_find(self):
+        """Test that segments are found by their segment type."""
+        # Act / Assert
+        self.assertEqual(2, self.index.find("UNH"))
+        self.assertEqual(5, self.index.find("UNH", 3))
+        self.assertEqual(-1, self.index.find("QTY"))
+        with self.assertRaises(ValueError):
+            self.index.find("XYZ")
+
+    def test_limit(self):
+        """Test that only the given number of segments is indexed."""
+        # Act
+        index = SegmentIndex(self.content, limit=3)
+
+        # Assert
+        self.assertEqual(3, len(index))
+        self.assertEqual(self.index.get_offsets(2), index.get_offsets(2))
+
+    def test_memory_mapped_file(self):
+        """Test that a memory-mapped file is indexed like its bytes."""
+        # Arrange
+        file = tempfile.NamedTemporaryFile(delete=False)
+        with file:
+            file.write(self.content)
+        self.addCleanup(os.remove, file.name)
+
+        with open(file.name, "rb") as mapped_file, \
+                mmap.mmap(mapped_file.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            # Act
+            index = SegmentIndex(buffer)
+            segment = bytes(index.get_segment(3))
+            offsets = [index.get_offsets(position) for position in range(len(index))]
+
+        # Assert
+        self.assertEqual(b"BGM+7+MSI1+9", segment)
+        self.assertEqual([self.index.get_offsets(position) for position in range(len(self.index))], offsets)
+
+    def test_get_fallback_encoding(self):
+        """Test that the fallback encoding is chosen by the syntax identifier of the header."""
+        # Act / Assert
+        self.assertEqual("iso-8859-1", self.index.get_fallback_encoding())
+        self.assertEqual("iso-8859-5", SegmentIndex(self.content.replace(b"UNOC", b"UNOE")).get_fallback_encoding())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,59 @@
+import unittest
+
+from msconsparser.libs.edifactmsconsparser.exceptions.parser_exceptions import MSCONSParserException
+from msconsparser.libs.edifactmsconsparser.utils import SegmentTagMatcher
+from msconsparser.libs.edifactmsconsparser.wrappers.segments.constants import SegmentType
+
+
+class TestSegmentTagMatcher(unittest.TestCase):
+    """Test case for the SegmentTagMatcher class."""
+
+    def setUp(self):
+        """Set up the test case."""
+        self.matcher = SegmentTagMatcher.default()
+
+    def test_starts_with_tag(self):
+        """Test that the segments starting with a supported segment type are recognized."""
+        # Act / Assert
+        for segment_type in SegmentType:
+            with self.subTest(segment_type=segment_type):
+                self.assertTrue(self.matcher.starts_with_tag(f"{segment_type.value}+1'"))
+        self.assertFalse(self.matcher.starts_with_tag("PREFIX:UNH+1'"))
+        self.assertFalse(self.matcher.starts_with_tag("UN"))
+        self.assertFalse(self.matcher.starts_with_tag(""))
+
+    def test_find_tag_returns_first_tag(self):
+        """Test that the first segment tag of the string is found."""
+        # Act / Assert
+        self.assertEqual(7, self.matcher.find_tag("PREFIX:QTY+220:4250.465:D54'"))
+        self.assertEqual(2, self.matcher.find_tag("x:DTM+163:UNH"))
+        self.assertEqual(-1, self.matcher.find_tag("INVALID_DATA_WITHOUT_SEGMENT_TYPE"))
+
+    def test_tags_of_different_lengths(self):
+        """Test that custom tags of different lengths are recognized, the longer tag first."""
+        # Arrange
+        matcher = SegmentTagMatcher(["UNB", "CUSTOM", "CUS"])
+
+        # Act / Assert
+        self.assertTrue(matcher.starts_with_tag("CUSTOM+DATA"))
+        self.assertTrue(matcher.starts_with_tag("CUS+DATA"))
+        self.assertEqual(7, matcher.find_tag("PREFIX:CUSTOM+DATA"))
+        self.assertEqual(frozenset({"UNB", "CUSTOM", "CUS"}), matcher.segment_types)
+
+    def test_matcher_is_built_once(self):
+        """Test that the matcher of the same segment types is shared."""
+        # Act / Assert
+        self.assertIs(self.matcher, SegmentTagMatcher.default())
+        self.assertIs(SegmentTagMatcher.for_segment_types(("UNB",)), SegmentTagMatcher.for_segment_types(("UNB",)))
+
+    def test_without_segment_types(self):
+        """Test that a matcher without segment types is rejected."""
+        # Act / Assert
+        for segment_types in (None, []):
+            with self.subTest(segment_types=segment_types):
+                with self.assertRaises(MSCONSParserException):
+                    SegmentTagMatcher(segment_types)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,136 @@
+import json
+import os
+import tempfile
+import unittest
+
+from msconsparser.libs.edifactmsconsparser.wrappers.segments import (
+    CodeListRegistry, SegmentGroup, get_default_code_list_registry
+)
+
+TABLE = {
+    "default_version": "2.4c",
+    "versions": {
+        "2.4c": {
+            "DTM": [
+                {"qualifier": "137", "label": "Nachrichtendatum"},
+                {"qualifier": "163", "groups": ["SG6"], "label": "Beginn Messperiode Übertragungszeitraum"},
+                {"qualifier": "163", "groups": ["SG10"], "label": "Beginn Messperiode"},
+            ],
+        },
+        "2.5": {
+            "extends": "2.4c",
+            "DTM": [
+                {"qualifier": "163", "groups": ["SG10"], "label": "Beginn Messintervall"},
+            ],
+            "RFF": [
+                {"qualifier": "Z13", "label": "Prüfidentifikator"},
+            ],
+        },
+    },
+}
+
+
+class TestCodeListRegistry(unittest.TestCase):
+    """Test case for the CodeListRegistry class."""
+
+    def setUp(self):
+        """Set up the test case."""
+        self.registry = CodeListRegistry.from_table(TABLE)
+
+    def test_get_label_by_segment_group(self):
+        """Test that the label depends on the segment group of the segment."""
+        # Act / Assert
+        self.assertEqual("Beginn Messperiode", self.registry.get_label("DTM", "163", SegmentGroup.SG10))
+        self.assertEqual("Beginn Messperiode Übertragungszeitraum", self.registry.get_label("DTM", "163", "SG6"))
+        self.assertIsNone(self.registry.get_label("DTM", "163", SegmentGroup.SG1))
+        self.assertIsNone(self.registry.get_label("DTM", "163", None))
+
+    def test_get_label_without_groups_applies_to_all_segment_groups(self):
+        """Test that an entry without groups applies to every segment group and outside of segment groups."""
+        # Act / Assert
+        self.assertEqual("Nachrichtendatum", self.registry.get_label("DTM", "137", None))
+        for segment_group in SegmentGroup:
+            self.assertEqual("Nachrichtendatum", self.registry.get_label("DTM", "137", segment_group))
+
+    def test_get_label_of_unknown_or_missing_qualifier(self):
+        """Test that unknown and missing qualifier codes have no label."""
+        # Act / Assert
+        self.assertIsNone(self.registry.get_label("DTM", "999", None))
+        self.assertIsNone(self.registry.get_label("DTM", None, None))
+        self.assertIsNone(self.registry.get_label("XYZ", "137", None))
+
+    def test_extended_version(self):
+        """Test that a version extending another version adds and replaces entries."""
+        # Act / Assert
+        self.assertEqual(("2.4c", "2.5"), self.registry.versions)
+        self.assertEqual("Beginn Messintervall", self.registry.get_label("DTM", "163", SegmentGroup.SG10, "2.5"))
+        self.assertEqual("Nachrichtendatum", self.registry.get_label("DTM", "137", None, "2.5"))
+        self.assertEqual("Prüfidentifikator", self.registry.get_label("RFF", "Z13", SegmentGroup.SG1, "2.5"))
+        self.assertIsNone(self.registry.get_label("RFF", "Z13", SegmentGroup.SG1))
+
+    def test_code_labels_are_immutable(self):
+        """Test that the labels of a version cannot be changed."""
+        # Arrange
+        code_labels = self.registry.get_code_labels()
+
+        # Act / Assert
+        with self.assertRaises(TypeError):
+            code_labels[("DTM", "137", None)] = "Other"
+
+    def test_unknown_version(self):
+        """Test that the code labels of an unknown version are not available."""
+        # Act / Assert
+        self.assertFalse(self.registry.has_version("1.0"))
+        self.assertFalse(self.registry.has_version(None))
+        with self.assertRaises(KeyError):
+            self.registry.get_code_labels("1.0")
+
+    def test_invalid_tables(self):
+        """Test that invalid tables are rejected."""
+        # Arrange
+        invalid_tables = [
+            {"default_version": "1.0", "versions": {"2.4c": {}}},
+            {"default_version": "2.4c", "versions": {"2.4c": {"DTM": [
+                {"qualifier": "137", "groups": ["SG99"], "label": "Nachrichtendatum"}
+            ]}}},
+            {"default_version": "2.4c", "versions": {"2.4c": {"extends": "2.5"}, "2.5": {"extends": "2.4c"}}},
+            {"default_version": "2.4c", "versions": {"2.4c": {"extends": "1.0"}}},
+        ]
+
+        # Act / Assert
+        for table in invalid_tables:
+            with self.subTest(table=table):
+                with self.assertRaises(ValueError):
+                    CodeListRegistry.from_table(table)
+
+    def test_from_file(self):
+        """Test that the registry is loaded from a JSON file."""
+        # Arrange
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "code_lists.json")
+            with open(path, "w", encoding="utf-8") as file:
+                json.dump(TABLE, file)
+
+            # Act
+            registry = CodeListRegistry.from_file(path)
+
+        # Assert
+        self.assertEqual(self.registry.versions, registry.versions)
+        self.assertEqual(self.registry.get_code_labels("2.5"), registry.get_code_labels("2.5"))
+
+    def test_default_registry(self):
+        """Test that the code lists shipped with the package are loaded once."""
+        # Act
+        registry = get_default_code_list_registry()
+
+        # Assert
+        self.assertIs(registry, get_default_code_list_registry())
+        self.assertEqual("2.4c", registry.default_version)
+        self.assertEqual("MP-ID Absender", registry.get_label("NAD", "MS", SegmentGroup.SG2))
+        self.assertEqual("Ende Messperiode", registry.get_label("DTM", "164", SegmentGroup.SG10))
+        self.assertEqual("Grund der Ersatzwertbildung", registry.get_label("STS", "Z40", SegmentGroup.SG10))
+        self.assertEqual("Referenzangaben", registry.get_label("RFF", "AGI", SegmentGroup.SG1))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,119 @@
+import os
+import unittest
+from decimal import Decimal
+
+from msconsparser.libs.edifactmsconsparser.edifact_mscons_parser import EdifactMSCONSParser
+from msconsparser.libs.edifactmsconsparser.wrappers.segments import (
+    CompactNode, EdifactInterchange, SegmentDTM, SegmentGroup10, SegmentQTY, SegmentUNA, compact_node_type,
+    create_compact_node, to_model
+)
+
+SAMPLES = [
+    "mscons-message-example.txt",
+    "mscons-message-example-simple.txt",
+    "mscons-message-example-una-spec.txt",
+]
+
+
+def read_sample(file_name: str) -> str:
+    with open(os.path.join(os.path.dirname(__file__), "../../../../../samples", file_name), encoding="utf-8") as file:
+        return file.read()
+
+
+class TestCompactNodes(unittest.TestCase):
+    """Test case for the compact node types of the parse tree."""
+
+    def test_compact_node_type_is_cached_per_model_class(self):
+        """Test that the node type is created once per model class and has a slot per field."""
+        # Act
+        node_type = compact_node_type(SegmentQTY)
+
+        # Assert
+        self.assertIs(node_type, compact_node_type(SegmentQTY))
+        self.assertEqual("CompactSegmentQTY", node_type.__name__)
+        self.assertEqual(tuple(SegmentQTY.model_fields), node_type.__slots__)
+        self.assertTrue(issubclass(node_type, CompactNode))
+
+    def test_compact_node_has_no_instance_dictionary(self):
+        """Test that the node stores its fields in slots only."""
+        # Act
+        node = create_compact_node(SegmentQTY, {"menge_qualifier": "220", "menge": 1.5, "masseinheit_code": "KWH"})
+
+        # Assert
+        self.assertFalse(hasattr(node, "__dict__"))
+        with self.assertRaises(AttributeError):
+            node.unknown = "x"
+
+    def test_compact_node_fills_defaults(self):
+        """Test that missing fields get their defaults and default factories are called per node."""
+        # Act
+        first = create_compact_node(SegmentGroup10, {})
+        second = create_compact_node(SegmentGroup10, {})
+
+        # Assert
+        self.assertIsNone(first.qty_mengenangaben)
+        self.assertEqual([], first.dtm_zeitangaben)
+        self.assertIsNot(first.dtm_zeitangaben, second.dtm_zeitangaben)
+
+    def test_compact_node_without_required_field_raises(self):
+        """Test that a missing required field raises a TypeError."""
+        # Act / Assert
+        with self.assertRaises(TypeError):
+            create_compact_node(SegmentUNA, {"component_separator": ":"})
+
+    def test_compact_node_dumps_like_model(self):
+        """Test that the node is dumped and converted like the pydantic model."""
+        # Arrange
+        values = {
+            "bezeichner": "Beginn Messperiode",
+            "datums_oder_uhrzeits_oder_zeitspannen_funktion_qualifier": "163",
+            "datum_oder_uhrzeit_oder_zeitspanne_wert": "202101012300+00",
+            "datums_oder_uhrzeit_oder_zeitspannen_format_code": "303",
+        }
+
+        # Act
+        node = create_compact_node(SegmentDTM, dict(values))
+
+        # Assert
+        expected = SegmentDTM(**values)
+        self.assertEqual(expected.model_dump(), node.model_dump())
+        self.assertEqual(expected.model_dump_json(), node.model_dump_json())
+        self.assertEqual(expected, node.to_model())
+        self.assertEqual(expected, to_model(node))
+        self.assertIs(expected, to_model(expected))
+        self.assertEqual(node, create_compact_node(SegmentDTM, dict(values)))
+
+    def test_compact_node_dumps_decimal_numbers_like_model(self):
+        """Test that the Decimal quantities of the decimal numeric mode are dumped as JSON strings like pydantic."""
+        # Arrange
+        values = {"menge_qualifier": "220", "menge": Decimal("4250.465"), "masseinheit_code": "KWH"}
+
+        # Act
+        node = create_compact_node(SegmentQTY, dict(values))
+
+        # Assert
+        expected = SegmentQTY.model_construct(**values)
+        self.assertEqual(expected.model_dump(), node.model_dump())
+        self.assertEqual(expected.model_dump(mode="json"), node.model_dump(mode="json"))
+        self.assertEqual(expected.model_dump_json(), node.model_dump_json())
+        self.assertEqual("4250.465", node.model_dump(mode="json")["menge"])
+
+    def test_compact_parse_tree_equals_model_parse_tree(self):
+        """Test that the compact parse tree of the samples equals the parse tree of the pydantic models."""
+        for sample in SAMPLES:
+            with self.subTest(sample=sample):
+                # Arrange
+                sample_data = read_sample(sample)
+
+                # Act
+                interchange = EdifactMSCONSParser().parse(sample_data)
+                compact_interchange = EdifactMSCONSParser().parse(sample_data, compact=True)
+
+                # Assert
+                self.assertIsInstance(compact_interchange, compact_node_type(EdifactInterchange))
+                self.assertEqual(interchange.model_dump(), compact_interchange.model_dump())
+                self.assertEqual(interchange, compact_interchange.to_model())
+
+
+if __name__ == '__main__':
+    unittest.main()
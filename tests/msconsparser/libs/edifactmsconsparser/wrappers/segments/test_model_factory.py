@@ -0,0 +1,183 @@
+import unittest
+from unittest.mock import patch
+
+from pydantic import BaseModel, ValidationError
+
+from msconsparser.libs.edifactmsconsparser.edifact_mscons_parser import EdifactMSCONSParser
+from msconsparser.libs.edifactmsconsparser.generators import MSCONSGeneratorSettings, MSCONSInterchangeGenerator
+from msconsparser.libs.edifactmsconsparser.wrappers import segments
+from msconsparser.libs.edifactmsconsparser.wrappers.segments import model_factory
+from msconsparser.libs.edifactmsconsparser.wrappers.segments import (
+    SegmentDTM, SegmentGroup6, SegmentPIA, SegmentQTY, SegmentUNA, SegmentUNZ, WarenLeistungsnummerIdentifikation,
+    construct_model, construct_strict, construct_trusted
+)
+
+
+class TestModelFactory(unittest.TestCase):
+    """Test case for the construction of the segment models."""
+
+    def test_construct_trusted_equals_validated_model(self):
+        """Test that the trusted construction creates the same model as the validating constructor."""
+        # Arrange
+        values = {
+            "bezeichner": "Beginn Messperiode",
+            "datums_oder_uhrzeits_oder_zeitspannen_funktion_qualifier": "163",
+            "datum_oder_uhrzeit_oder_zeitspanne_wert": "202101012300+00",
+            "datums_oder_uhrzeit_oder_zeitspannen_format_code": "303",
+        }
+
+        # Act
+        segment = construct_trusted(SegmentDTM, dict(values))
+
+        # Assert
+        expected = SegmentDTM(**values)
+        self.assertEqual(expected, segment)
+        self.assertEqual(expected.model_dump_json(), segment.model_dump_json())
+        self.assertEqual(expected.model_fields_set, segment.model_fields_set)
+
+    def test_construct_trusted_fills_missing_fields_in_declaration_order(self):
+        """Test that missing fields get their defaults and the fields keep the declaration order."""
+        # Act
+        segment = construct_trusted(SegmentQTY, {"masseinheit_code": "KWH", "menge": 1.5, "unknown": "x"})
+
+        # Assert
+        self.assertEqual('{"menge_qualifier":null,"menge":1.5,"masseinheit_code":"KWH"}', segment.model_dump_json())
+        self.assertEqual({"masseinheit_code", "menge"}, segment.model_fields_set)
+
+    def test_construct_trusted_does_not_validate_values(self):
+        """Test that the trusted construction takes over the values as they are."""
+        # Act
+        segment = construct_trusted(SegmentUNZ, {"datenaustauschzaehler": "2", "datenaustauschreferenz": "ABC"})
+
+        # Assert
+        self.assertEqual("2", segment.datenaustauschzaehler)
+
+    def test_construct_trusted_with_nested_model(self):
+        """Test that nested models created on the trusted path are dumped like validated ones."""
+        # Act
+        segment = construct_trusted(SegmentPIA, {
+            "produkt_erzeugnisnummer_qualifier": "5",
+            "waren_leistungsnummer_identifikation": construct_trusted(
+                WarenLeistungsnummerIdentifikation,
+                {"produkt_leistungsnummer": "1-1:1.29.1", "art_der_produkt_leistungsnummer_code": "SRW"},
+            ),
+        })
+
+        # Assert
+        expected = SegmentPIA(
+            produkt_erzeugnisnummer_qualifier="5",
+            waren_leistungsnummer_identifikation=WarenLeistungsnummerIdentifikation(
+                produkt_leistungsnummer="1-1:1.29.1", art_der_produkt_leistungsnummer_code="SRW"
+            ),
+        )
+        self.assertEqual(expected.model_dump(), segment.model_dump())
+
+    def test_construct_trusted_raises_for_missing_required_field(self):
+        """Test that a missing required field raises a validation error."""
+        with self.assertRaises(ValidationError):
+            construct_trusted(SegmentUNA, {"component_separator": ":"})
+
+    def test_construct_trusted_with_default_factory(self):
+        """Test that models with default factories get fresh defaults per instance."""
+        # Act
+        first = construct_trusted(SegmentGroup6, {})
+        second = construct_trusted(SegmentGroup6, {})
+        first.dtm_zeitraeume.append(SegmentDTM())
+
+        # Assert
+        self.assertEqual([], second.dtm_zeitraeume)
+
+    def test_construct_trusted_copies_mutable_defaults(self):
+        """Test that mutable defaults without a default factory are not shared between instances."""
+        # Arrange
+        class Codes(BaseModel):
+            codes: list[str] = ["Z83"]
+
+        # Act
+        first = construct_trusted(Codes, {})
+        second = construct_trusted(Codes, {})
+        first.codes.append("Z84")
+
+        # Assert
+        self.assertEqual(["Z83"], second.codes)
+        self.assertEqual(["Z83"], Codes.model_fields["codes"].default)
+
+    def test_construct_trusted_equals_model_construct_for_every_model(self):
+        """Test that the trusted construction creates the same instance as model_construct for every model."""
+        # Arrange
+        model_classes = [value for value in vars(segments).values()
+                         if isinstance(value, type) and issubclass(value, BaseModel) and value is not BaseModel]
+        edifact_text = "".join(MSCONSInterchangeGenerator(MSCONSGeneratorSettings(
+            seed=1, locations_per_message=2, intervals_per_position=2, status_rate=1.0
+        )).iter_segments())
+        instances: dict[type, list[BaseModel]] = {}
+        pending = [EdifactMSCONSParser().parse(edifact_text)]
+        while pending:
+            instance = pending.pop()
+            instances.setdefault(type(instance), []).append(instance)
+            for name in type(instance).model_fields:
+                value = getattr(instance, name)
+                pending.extend(value if isinstance(value, list) else [value])
+                pending = [item for item in pending if isinstance(item, BaseModel)]
+
+        for model_class in model_classes:
+            samples = [{name: getattr(instance, name) for name in model_class.model_fields}
+                       for instance in instances.get(model_class, [])[:3]]
+            if not any(field.is_required() for field in model_class.model_fields.values()):
+                samples.append({})
+            self.assertTrue(samples, f"No sample values for {model_class.__name__}")
+            for values in samples:
+                with self.subTest(model_class=model_class.__name__, fields=sorted(values)):
+                    # Act
+                    segment = construct_trusted(model_class, dict(values))
+
+                    # Assert
+                    expected = model_class.model_construct(**values)
+                    self.assertIs(model_class, type(segment))
+                    self.assertEqual(expected.model_dump(), segment.model_dump())
+                    self.assertEqual(expected.model_fields_set, segment.model_fields_set)
+
+    def test_trusted_construction_is_checked_against_model_construct(self):
+        """Test that the instance attributes of the trusted path are checked against the installed pydantic."""
+        # Act & Assert
+        self.assertTrue(model_factory._is_trusted_construction_supported())
+        with patch.object(model_factory, "_INSTANCE_ATTRIBUTES", ("__dict__", "__pydantic_fields_set__")):
+            self.assertFalse(model_factory._is_trusted_construction_supported())
+
+    def test_construct_trusted_falls_back_to_model_construct(self):
+        """Test that model_construct is used if the trusted path does not match the installed pydantic."""
+        # Arrange
+        values = {"menge_qualifier": "220", "menge": 1.5}
+
+        # Act
+        with patch.object(model_factory, "_trusted_construction_supported", False), \
+                patch.object(model_factory, "_create_instance", side_effect=AssertionError("trusted path used")):
+            segment = construct_trusted(SegmentQTY, dict(values))
+            group = construct_trusted(SegmentGroup6, {})
+
+        # Assert
+        expected = SegmentQTY.model_construct(**values)
+        self.assertEqual(expected.model_dump_json(), segment.model_dump_json())
+        self.assertEqual(expected.model_fields_set, segment.model_fields_set)
+        self.assertEqual([], group.dtm_zeitraeume)
+
+    def test_construct_strict_rejects_values_of_the_wrong_type(self):
+        """Test that the strict construction does not coerce values."""
+        # Act & Assert
+        self.assertEqual(2, construct_strict(SegmentUNZ, {"datenaustauschzaehler": 2}).datenaustauschzaehler)
+        with self.assertRaises(ValidationError):
+            construct_strict(SegmentUNZ, {"datenaustauschzaehler": "2"})
+
+    def test_construct_model_selects_the_path(self):
+        """Test that construct_model validates only in strict mode."""
+        # Arrange
+        values = {"menge_qualifier": 220}
+
+        # Act & Assert
+        self.assertEqual(220, construct_model(SegmentQTY, dict(values)).menge_qualifier)
+        with self.assertRaises(ValidationError):
+            construct_model(SegmentQTY, dict(values), strict=True)
+
+
+if __name__ == '__main__':
+    unittest.main()
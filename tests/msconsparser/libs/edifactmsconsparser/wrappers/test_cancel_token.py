@@ -0,0 +1,54 @@
+import threading
+import time
+import unittest
+
+from msconsparser.libs.edifactmsconsparser.exceptions import ParseCancelledException
+from msconsparser.libs.edifactmsconsparser.wrappers import CancelToken
+
+
+class TestCancelToken(unittest.TestCase):
+    """Test case for the CancelToken class."""
+
+    def test_new_token_is_not_cancelled(self):
+        """Test that a new token without deadline is not cancelled."""
+        # Arrange
+        token = CancelToken()
+
+        # Act / Assert
+        self.assertFalse(token.cancelled)
+        self.assertIsNone(token.reason)
+        token.raise_if_cancelled()
+
+    def test_cancel_keeps_first_reason(self):
+        """Test that a tripped token raises with the reason of the first cancellation."""
+        # Arrange
+        token = CancelToken()
+
+        # Act
+        thread = threading.Thread(target=token.cancel, args=(CancelToken.CLIENT_DISCONNECTED,))
+        thread.start()
+        thread.join()
+        token.cancel(CancelToken.DEADLINE_EXCEEDED)
+
+        # Assert
+        self.assertTrue(token.cancelled)
+        with self.assertRaises(ParseCancelledException) as context:
+            token.raise_if_cancelled()
+        self.assertEqual(CancelToken.CLIENT_DISCONNECTED, context.exception.reason)
+        self.assertEqual("Parse cancelled (client disconnected)", str(context.exception))
+
+    def test_deadline(self):
+        """Test that a token counts as cancelled once its deadline has passed."""
+        # Arrange
+        passed = CancelToken(deadline=time.monotonic() - 1.0)
+        future = CancelToken.with_timeout(60.0)
+
+        # Act / Assert
+        self.assertTrue(passed.cancelled)
+        self.assertEqual(CancelToken.DEADLINE_EXCEEDED, passed.reason)
+        self.assertFalse(future.cancelled)
+        self.assertIsNone(CancelToken.with_timeout(None).deadline)
+
+
+if __name__ == '__main__':
+    unittest.main()
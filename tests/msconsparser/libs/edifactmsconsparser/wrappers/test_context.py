@@ -0,0 +1,140 @@
+import unittest
+from decimal import Decimal
+
+from msconsparser.libs.edifactmsconsparser.wrappers import NumericMode, ParsingContext
+from msconsparser.libs.edifactmsconsparser.wrappers.segments import CompactNode, SegmentUNA, Status, Statuskategorie
+
+
+class TestParsingContext(unittest.TestCase):
+    """Test case for the interning and sharing of values and the number conversion of the ParsingContext class."""
+
+    def setUp(self):
+        """Set up the test case."""
+        self.context = ParsingContext()
+
+    def test_intern_returns_first_equal_value(self):
+        """Test that equal values are replaced by the first instance of the interchange."""
+        # Arrange
+        first = "".join(["K", "WH"])
+        second = "".join(["KW", "H"])
+
+        # Act
+        interned_first = self.context.intern(first)
+        interned_second = self.context.intern(second)
+
+        # Assert
+        self.assertIsNot(first, second)
+        self.assertIs(first, interned_first)
+        self.assertIs(first, interned_second)
+        self.assertIsNone(self.context.intern(None))
+
+    def test_create_shared_model_by_values(self):
+        """Test that compact nodes with equal values are created once."""
+        # Arrange
+        context = ParsingContext(compact_nodes=True)
+
+        # Act
+        first = context.create_shared_model(Statuskategorie, statuskategorie_code="Z40")
+        second = context.create_shared_model(Statuskategorie, statuskategorie_code="Z40")
+        other = context.create_shared_model(Statuskategorie, statuskategorie_code="Z31")
+
+        # Assert
+        self.assertIsInstance(first, CompactNode)
+        self.assertIs(first, second)
+        self.assertIsNot(first, other)
+        self.assertEqual(Statuskategorie(statuskategorie_code="Z40"), first.to_model())
+        self.assertIsNot(first, context.create_shared_model(Status, status_code="Z40"))
+
+    def test_create_shared_model_by_key(self):
+        """Test that compact nodes are shared by the given key."""
+        # Arrange
+        context = ParsingContext(compact_nodes=True)
+
+        # Act
+        first = context.create_shared_model(Status, ("status", 1), status_code="Z74")
+        second = context.create_shared_model(Status, ("status", 1), status_code="ignored")
+
+        # Assert
+        self.assertIs(first, second)
+        self.assertEqual("Z74", second.status_code)
+
+    def test_create_shared_model_does_not_share_pydantic_models(self):
+        """Test that the pydantic models of a public parse tree are created per call."""
+        # Act
+        first = self.context.create_shared_model(Status, status_code="Z74")
+        second = self.context.create_shared_model(Status, status_code="Z74")
+
+        # Assert
+        self.assertEqual(Status(status_code="Z74"), first)
+        self.assertIsNot(first, second)
+        self.assertEqual({}, self.context.shared_nodes)
+
+    def test_release_shared_values(self):
+        """Test that the tables are released, while the values stay unchanged."""
+        # Arrange
+        context = ParsingContext(compact_nodes=True)
+        value = context.intern("220")
+        node = context.create_shared_model(Status, status_code="Z74")
+
+        # Act
+        context.release_shared_values()
+
+        # Assert
+        self.assertEqual({}, context.interned_values)
+        self.assertEqual({}, context.shared_nodes)
+        self.assertEqual("220", value)
+        self.assertEqual("Z74", node.status_code)
+        self.assertIsNot(node, context.create_shared_model(Status, status_code="Z74"))
+
+    @staticmethod
+    def create_una(decimal_mark: str) -> SegmentUNA:
+        return SegmentUNA(
+            component_separator=":", element_separator="+", decimal_mark=decimal_mark,
+            release_character="?", reserved=" ", segment_terminator="'"
+        )
+
+    def test_convert_number_follows_decimal_mark_of_una(self):
+        """Test that the number conversion is resolved again if the UNA segment changes."""
+        # Arrange
+        self.context.interchange.una_service_string_advice = self.create_una(",")
+        comma_number = self.context.convert_number("4250,465")
+
+        # Act
+        self.context.interchange.una_service_string_advice = self.create_una(".")
+        dot_number = self.context.convert_number("4250.465")
+
+        # Assert
+        self.assertEqual(4250.465, comma_number)
+        self.assertEqual(4250.465, dot_number)
+        self.assertEqual(0, self.context.warnings.total)
+
+    def test_convert_number_without_una_adds_warning(self):
+        """Test that the dot is used as decimal mark without UNA segment and a warning is added per number."""
+        # Act
+        numbers = [self.context.convert_number("1.5"), self.context.convert_number("2.5")]
+
+        # Assert
+        self.assertEqual([1.5, 2.5], numbers)
+        self.assertEqual(2, self.context.warnings.total)
+
+    def test_use_numeric_mode(self):
+        """Test that the numbers are converted to the type of the numeric mode."""
+        # Arrange
+        self.context.interchange.una_service_string_advice = self.create_una(",")
+        self.assertEqual(1.5, self.context.convert_number("1,5"))
+
+        # Act
+        self.context.use_numeric_mode("decimal")
+        decimal_number = self.context.convert_number("1,5")
+        self.context.use_numeric_mode(NumericMode.MILLI)
+        milli_number = self.context.convert_number("1,5")
+
+        # Assert
+        self.assertEqual(Decimal("1.5"), decimal_number)
+        self.assertEqual(1500, milli_number)
+        with self.assertRaises(ValueError):
+            self.context.use_numeric_mode("double")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,82 @@
+import unittest
+
+from msconsparser.libs.edifactmsconsparser.wrappers import ConversionCache
+
+
+class TestConversionCache(unittest.TestCase):
+    """Test case for the ConversionCache class."""
+
+    def setUp(self):
+        """Set up the test case."""
+        self.cache = ConversionCache(max_size=2)
+
+    def test_get_counts_hits_and_misses_per_segment_type(self):
+        """Test that the lookups are counted per segment type."""
+        # Arrange
+        segment = object()
+        self.cache.put(("STS", "Z34"), segment)
+
+        # Act
+        first = self.cache.get("STS", ("STS", "Z34"))
+        second = self.cache.get("STS", ("STS", "Z34"))
+        missing = self.cache.get("STS", ("STS", "Z40"))
+        other = self.cache.get("CCI", ("CCI", "Z23"))
+
+        # Assert
+        self.assertIs(segment, first)
+        self.assertIs(segment, second)
+        self.assertIsNone(missing)
+        self.assertIsNone(other)
+        self.assertEqual(2, self.cache.hits("STS"))
+        self.assertEqual(1, self.cache.misses("STS"))
+        self.assertAlmostEqual(2 / 3, self.cache.hit_rate("STS"))
+        self.assertEqual(0.0, self.cache.hit_rate("PIA"))
+        self.assertEqual({
+            "CCI": {"hits": 0, "misses": 1, "hit_rate": 0.0},
+            "STS": {"hits": 2, "misses": 1, "hit_rate": 0.6667},
+        }, self.cache.as_dict())
+
+    def test_put_evicts_least_recently_used_segment(self):
+        """Test that the least recently used segment is evicted if the cache is full."""
+        # Arrange
+        self.cache.put("a", "segment a")
+        self.cache.put("b", "segment b")
+        self.cache.get("STS", "a")
+
+        # Act
+        self.cache.put("c", "segment c")
+
+        # Assert
+        self.assertEqual(2, len(self.cache))
+        self.assertEqual("segment a", self.cache.get("STS", "a"))
+        self.assertIsNone(self.cache.get("STS", "b"))
+        self.assertEqual("segment c", self.cache.get("STS", "c"))
+
+    def test_clear_keeps_counts(self):
+        """Test that clearing the cache removes the segments, but keeps the hit and miss counts."""
+        # Arrange
+        self.cache.put("a", "segment a")
+        self.cache.get("STS", "a")
+
+        # Act
+        self.cache.clear()
+
+        # Assert
+        self.assertEqual(0, len(self.cache))
+        self.assertEqual(1, self.cache.hits("STS"))
+
+    def test_segment_types(self):
+        """Test the default and the configured cacheable segment types."""
+        # Act / Assert
+        self.assertEqual(frozenset({"CCI", "PIA", "STS"}), self.cache.segment_types)
+        self.assertEqual(frozenset({"QTY"}), ConversionCache(segment_types=["QTY"]).segment_types)
+
+    def test_invalid_max_size(self):
+        """Test that a cache without room for a segment is rejected."""
+        # Act / Assert
+        with self.assertRaises(ValueError):
+            ConversionCache(max_size=0)
+
+
+if __name__ == '__main__':
+    unittest.main()
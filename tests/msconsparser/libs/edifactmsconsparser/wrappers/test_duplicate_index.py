@@ -0,0 +1,261 @@
+import os
+import re
+import tempfile
+import unittest
+
+from msconsparser.libs.edifactmsconsparser.edifact_mscons_parser import EdifactMSCONSParser
+from msconsparser.libs.edifactmsconsparser.exceptions import DuplicateInterchangeException
+from msconsparser.libs.edifactmsconsparser.generators import MSCONSGeneratorSettings, MSCONSInterchangeGenerator
+from msconsparser.libs.edifactmsconsparser.wrappers import (
+    DuplicateCheck, DuplicateIndex, DuplicateKind, DuplicateMode
+)
+
+SENDER = "9900000000001"
+
+
+def create_interchange(messages: int = 3) -> str:
+    settings = MSCONSGeneratorSettings(seed=42, messages=messages, intervals_per_position=4)
+    return "".join(MSCONSInterchangeGenerator(settings).iter_segments())
+
+
+def with_interchange_reference(edifact_text: str, interchange_reference: str) -> str:
+    return re.sub(r"^(UNB\+(?:[^+']*\+){4})[^+']*", rf"\g<1>{interchange_reference}", edifact_text, flags=re.M)
+
+
+class TestDuplicateIndex(unittest.TestCase):
+    """Test cases for the DuplicateIndex."""
+
+    def test_add_returns_the_new_keys(self):
+        """Test that keys are added once."""
+        # Arrange
+        index = DuplicateIndex()
+
+        # Act
+        first = index.add([("interchange", SENDER, "REF1"), ("message", SENDER, "1", "MSI1")])
+        second = index.add([("interchange", SENDER, "REF1"), ("interchange", SENDER, "REF2")])
+
+        # Assert
+        self.assertEqual(2, len(first))
+        self.assertEqual([("interchange", SENDER, "REF2")], second)
+        self.assertEqual(3, len(index))
+        self.assertIn(("message", SENDER, "1", "MSI1"), index)
+
+    def test_keys_are_persisted(self):
+        """Test that the keys of a persisted index are loaded by a new index, invalid lines are ignored."""
+        with tempfile.TemporaryDirectory() as directory:
+            # Arrange
+            path = os.path.join(directory, "keys.jsonl")
+            DuplicateIndex(path).add([("interchange", SENDER, "REF1"), ("message", SENDER, "1", "MSI1")])
+            with open(path, "a", encoding="utf-8") as file:
+                file.write('["interchange","99000')
+
+            # Act
+            with self.assertLogs(level="WARNING"):
+                index = DuplicateIndex(path)
+
+            # Assert
+            self.assertEqual(2, len(index))
+            self.assertIn(("message", SENDER, "1", "MSI1"), index)
+
+    def test_reserved_keys_are_duplicates_until_released(self):
+        """Test that a reserved key cannot be reserved again until it is released or added."""
+        # Arrange
+        index = DuplicateIndex()
+        key = ("interchange", SENDER, "REF1")
+
+        # Act
+        reserved = index.reserve(key)
+        reserved_again = index.reserve(key)
+        index.release([key])
+        reserved_after_release = index.reserve(key)
+        index.add([key])
+
+        # Assert
+        self.assertEqual((True, False, True), (reserved, reserved_again, reserved_after_release))
+        self.assertFalse(index.reserve(key))
+        self.assertEqual(1, len(index))
+
+    def test_segment_seconds_is_the_average_of_the_recorded_parses(self):
+        """Test that the average convert time per segment is weighted by the segments."""
+        # Arrange
+        index = DuplicateIndex()
+
+        # Act
+        unknown = index.segment_seconds
+        index.record_convert_time(1.0, 100)
+        index.record_convert_time(2.0, 300)
+
+        # Assert
+        self.assertIsNone(unknown)
+        self.assertEqual(3.0 / 400, index.segment_seconds)
+
+
+class TestDuplicateCheck(unittest.TestCase):
+    """Test cases for the DuplicateCheck of a parse."""
+
+    def setUp(self):
+        """Set up an index with the keys of a parsed interchange."""
+        self.parser = EdifactMSCONSParser()
+        self.index = DuplicateIndex()
+        self.edifact_text = create_interchange()
+        check = DuplicateCheck(self.index)
+        self.interchange = self.parser.parse(self.edifact_text, compact=True, duplicate_check=check)
+        self.first_check = check
+        check.commit()
+
+    def test_keys_are_added_by_commit_only(self):
+        """Test that the keys of the interchange and its messages are added to the index on commit."""
+        # Arrange
+        index = DuplicateIndex()
+        check = DuplicateCheck(index)
+
+        # Act
+        self.parser.parse(self.edifact_text, duplicate_check=check)
+        before_commit = len(index)
+        new_keys = check.commit()
+
+        # Assert
+        self.assertEqual(0, before_commit)
+        self.assertEqual([("interchange", SENDER, "REF2867825"), ("message", SENDER, "1", "MSI1"),
+                          ("message", SENDER, "2", "MSI2"), ("message", SENDER, "3", "MSI3")], new_keys)
+        self.assertEqual([], self.first_check.duplicates)
+        self.assertEqual(3, len(self.interchange.unh_unt_nachrichten))
+
+    def test_flagged_duplicate_interchange_skips_its_messages(self):
+        """Test that the messages of a resent interchange are not converted."""
+        # Arrange
+        check = DuplicateCheck(self.index)
+
+        # Act
+        interchange = self.parser.parse(self.edifact_text, compact=True, duplicate_check=check)
+
+        # Assert
+        duplicate, = check.duplicates
+        self.assertEqual(DuplicateKind.INTERCHANGE, duplicate.kind)
+        self.assertEqual(2, duplicate.line_number)
+        self.assertEqual(self.edifact_text.count("'") - 3, duplicate.skipped_segments)
+        self.assertGreater(duplicate.seconds_saved, 0.0)
+        self.assertTrue(check.is_duplicate_interchange)
+        self.assertEqual([], interchange.unh_unt_nachrichten)
+        self.assertIsNotNone(interchange.unb_nutzdaten_kopfsegment)
+        self.assertIsNotNone(interchange.unz_nutzdaten_endsegment)
+        self.assertEqual([], check.commit())
+
+    def test_flagged_duplicate_messages_are_left_out(self):
+        """Test that the messages resent in a new interchange are skipped after their BGM segment."""
+        # Arrange
+        edifact_text = with_interchange_reference(create_interchange(messages=4), "REF9")
+        check = DuplicateCheck(self.index)
+
+        # Act
+        interchange = self.parser.parse(edifact_text, compact=True, duplicate_check=check)
+
+        # Assert
+        self.assertEqual(["1", "2", "3"], [duplicate.key[2] for duplicate in check.duplicates])
+        self.assertTrue(all(duplicate.kind == DuplicateKind.MESSAGE for duplicate in check.duplicates))
+        self.assertEqual(4, check.duplicates[0].line_number)
+        self.assertFalse(check.is_duplicate_interchange)
+        # The new message is converted as usual
+        message, = interchange.to_model().unh_unt_nachrichten
+        self.assertEqual("4", message.unh_nachrichtenkopfsegment.nachrichten_referenznummer)
+        self.assertEqual(
+            self.parser.parse(create_interchange(messages=4)).unh_unt_nachrichten[3], message
+        )
+        self.assertEqual([("interchange", SENDER, "REF9"), ("message", SENDER, "4", "MSI4")], check.commit())
+
+    def test_duplicate_message_within_the_interchange(self):
+        """Test that a message repeated within an interchange is a duplicate, too."""
+        # Arrange
+        messages = re.findall(r"UNH\+.*?UNT\+[^']*'\n?", self.edifact_text, flags=re.S)
+        edifact_text = with_interchange_reference(self.edifact_text.replace(messages[0], messages[0] * 2, 1), "REF9")
+        index = DuplicateIndex()
+        check = DuplicateCheck(index)
+
+        # Act
+        interchange = self.parser.parse(edifact_text, compact=True, duplicate_check=check)
+
+        # Assert
+        duplicate, = check.duplicates
+        self.assertEqual(("message", SENDER, "1", "MSI1"), duplicate.key)
+        self.assertEqual(3, len(interchange.unh_unt_nachrichten))
+
+    def test_rejected_duplicate_interchange(self):
+        """Test that a rejected duplicate stops the parse after the UNB segment."""
+        # Arrange
+        check = DuplicateCheck(self.index, DuplicateMode.REJECT)
+
+        # Act
+        with self.assertRaises(DuplicateInterchangeException) as context:
+            self.parser.parse(self.edifact_text, duplicate_check=check)
+
+        # Assert
+        duplicate = context.exception.duplicate
+        self.assertIs(check.duplicates[0], duplicate)
+        self.assertEqual(("interchange", SENDER, "REF2867825"), duplicate.key)
+        self.assertEqual(self.edifact_text.count("'") - 2, duplicate.skipped_segments)
+        self.assertGreater(duplicate.seconds_saved, 0.0)
+        self.assertIn("Duplicate interchange", str(context.exception))
+
+    def test_rejected_duplicate_message_of_a_file(self):
+        """Test that a resent message of a parsed file is rejected after its BGM segment."""
+        with tempfile.TemporaryDirectory() as directory:
+            # Arrange
+            path = os.path.join(directory, "resent.edi")
+            with open(path, "w", encoding="utf-8") as file:
+                file.write(with_interchange_reference(self.edifact_text, "REF9"))
+            check = DuplicateCheck(self.index, DuplicateMode.REJECT)
+
+            # Act
+            with self.assertRaises(DuplicateInterchangeException) as context:
+                self.parser.parse_file(path, duplicate_check=check)
+
+        # Assert
+        duplicate = context.exception.duplicate
+        self.assertEqual(("message", SENDER, "1", "MSI1"), duplicate.key)
+        self.assertEqual(4, duplicate.line_number)
+        self.assertEqual(self.edifact_text.count("'") - 4, duplicate.skipped_segments)
+        self.assertEqual(4, len(self.index))
+
+    def test_keys_of_a_running_parse_are_duplicates_until_rolled_back(self):
+        """Test that the keys checked by a parse are duplicates for another parse until the check is rolled back."""
+        # Arrange
+        index = DuplicateIndex()
+        running_check = DuplicateCheck(index)
+        self.parser.parse(self.edifact_text, compact=True, duplicate_check=running_check)
+        check = DuplicateCheck(index, DuplicateMode.REJECT)
+
+        # Act
+        with self.assertRaises(DuplicateInterchangeException):
+            self.parser.parse(self.edifact_text, duplicate_check=check)
+        check.rollback()
+        running_check.rollback()
+        retry_check = DuplicateCheck(index, DuplicateMode.REJECT)
+        self.parser.parse(self.edifact_text, duplicate_check=retry_check)
+
+        # Assert
+        self.assertEqual(0, len(index))
+        self.assertEqual(4, len(retry_check.commit()))
+        self.assertEqual(4, len(index))
+
+    def test_interchange_without_sender_is_not_checked(self):
+        """Test that an interchange without sender has no key."""
+        # Arrange
+        check = DuplicateCheck(self.index)
+
+        # Act
+        check.check_interchange(None, "REF2867825", 2)
+        flagged = check.check_message("1", "MSI1", 4)
+
+        # Assert
+        self.assertFalse(flagged)
+        self.assertEqual([], check.duplicates)
+        self.assertEqual([], check.commit())
+
+    def test_invalid_mode(self):
+        """Test that an unknown mode is rejected."""
+        with self.assertRaises(ValueError):
+            DuplicateCheck(self.index, "ignore")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,72 @@
+import unittest
+from decimal import Decimal
+
+from msconsparser.libs.edifactmsconsparser.wrappers import NumericMode, create_number_converter
+from msconsparser.libs.edifactmsconsparser.wrappers.numeric_mode import to_decimal, to_milli
+
+
+class TestNumericMode(unittest.TestCase):
+    """Test case for the conversion of the numbers per numeric mode."""
+
+    def test_create_number_converter(self):
+        """Test that the numbers are converted to the type of the mode with the given decimal mark."""
+        # Arrange
+        expected_numbers = {
+            NumericMode.FLOAT: 4250.465,
+            NumericMode.DECIMAL: Decimal("4250.465"),
+            NumericMode.MILLI: 4250465,
+        }
+
+        # Act / Assert
+        for mode, expected_number in expected_numbers.items():
+            with self.subTest(mode=mode):
+                dot_number = create_number_converter(mode)("4250.465")
+                comma_number = create_number_converter(mode.value, ",")("4250,465")
+                self.assertEqual(expected_number, dot_number)
+                self.assertEqual(expected_number, comma_number)
+                self.assertIs(type(expected_number), type(comma_number))
+
+    def test_create_number_converter_with_dot_returns_parser(self):
+        """Test that the numbers with a dot as decimal mark are parsed without a wrapper."""
+        # Act / Assert
+        self.assertIs(float, create_number_converter(NumericMode.FLOAT, "."))
+
+    def test_create_number_converter_with_unknown_mode(self):
+        """Test that an unknown numeric mode is rejected."""
+        # Act / Assert
+        with self.assertRaises(ValueError):
+            create_number_converter("double")
+
+    def test_invalid_numbers_raise_value_error_in_every_mode(self):
+        """Test that an invalid number raises a ValueError in every mode, also Decimal's InvalidOperation."""
+        # Act / Assert
+        for mode in NumericMode:
+            with self.subTest(mode=mode):
+                with self.assertRaises(ValueError):
+                    create_number_converter(mode, ",")("4250,46,5")
+        self.assertEqual(Decimal("-4.987"), to_decimal("-4.987"))
+
+    def test_to_milli(self):
+        """Test that the numbers are converted to thousandths without rounding."""
+        # Arrange
+        expected_millis = {
+            "4250.465": 4250465, "-4.987": -4987, ".5": 500, "-.5": -500, "5": 5000, "+1.5": 1500,
+            "1.500000": 1500, "0.000": 0,
+        }
+
+        # Act / Assert
+        for value, expected_milli in expected_millis.items():
+            with self.subTest(value=value):
+                self.assertEqual(expected_milli, to_milli(value))
+
+    def test_to_milli_with_invalid_numbers(self):
+        """Test that numbers not representable in thousandths are rejected."""
+        # Act / Assert
+        for value in ["", ".", "-", "abc", "1.2345", "1e3", "9223372036854775.808"]:
+            with self.subTest(value=value):
+                with self.assertRaises(ValueError):
+                    to_milli(value)
+
+
+if __name__ == '__main__':
+    unittest.main()
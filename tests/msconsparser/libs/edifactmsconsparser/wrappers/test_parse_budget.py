@@ -0,0 +1,118 @@
+import os
+import time
+import unittest
+from unittest.mock import patch
+
+from msconsparser.libs.edifactmsconsparser.exceptions import MSCONSParserException, ParseBudgetExceededException
+from msconsparser.libs.edifactmsconsparser.wrappers import ParseBudget
+
+
+class TestParseBudget(unittest.TestCase):
+    """Test case for the ParseBudget class."""
+
+    def test_unlimited_budget_accepts_everything(self):
+        """Test that a budget without limits never raises."""
+        # Arrange
+        budget = ParseBudget()
+
+        # Act / Assert
+        self.assertTrue(budget.is_unlimited)
+        budget.check_bytes(10 ** 12)
+        budget.check_segments(10 ** 9)
+        self.assertIsNone(budget.deadline(time.perf_counter()))
+        budget.check_deadline(None)
+
+    def test_check_bytes(self):
+        """Test that a payload exceeding the byte budget is rejected."""
+        # Arrange
+        budget = ParseBudget(max_bytes=100)
+
+        # Act
+        budget.check_bytes(100)
+        budget.check_bytes(None)
+        with self.assertRaises(ParseBudgetExceededException) as context:
+            budget.check_bytes(101)
+
+        # Assert
+        self.assertIsInstance(context.exception, MSCONSParserException)
+        self.assertEqual(ParseBudget.BYTES, context.exception.budget)
+        self.assertEqual(100, context.exception.limit)
+        self.assertEqual("Parse budget exceeded (max bytes: 100): 101 bytes", str(context.exception))
+
+    def test_check_segments(self):
+        """Test that more segments than the segment budget are rejected."""
+        # Arrange
+        budget = ParseBudget(max_segments=2)
+
+        # Act / Assert
+        budget.check_segments(2)
+        with self.assertRaises(ParseBudgetExceededException) as context:
+            budget.check_segments(3)
+        self.assertEqual(ParseBudget.SEGMENTS, context.exception.budget)
+
+    def test_check_deadline(self):
+        """Test that a passed deadline is rejected."""
+        # Arrange
+        budget = ParseBudget(max_seconds=0.5)
+        start = time.perf_counter()
+
+        # Act / Assert
+        self.assertEqual(start + 0.5, budget.deadline(start))
+        budget.check_deadline(budget.deadline(start))
+        with self.assertRaises(ParseBudgetExceededException) as context:
+            budget.check_deadline(budget.deadline(start - 1.0))
+        self.assertEqual(ParseBudget.SECONDS, context.exception.budget)
+
+    def test_limited_to(self):
+        """Test that combined budgets keep the tighter limits."""
+        # Arrange
+        budget = ParseBudget(max_segments=10, max_seconds=2.0)
+
+        # Act
+        combined = budget.limited_to(ParseBudget(max_segments=5, max_bytes=100))
+
+        # Assert
+        self.assertEqual(ParseBudget(max_segments=5, max_bytes=100, max_seconds=2.0), combined)
+        self.assertIs(budget, budget.limited_to(None))
+
+    def test_equal_budgets_have_equal_hashes(self):
+        """Test that equal budgets are interchangeable as keys of sets and dictionaries."""
+        # Arrange
+        budget = ParseBudget(max_segments=5, max_bytes=100)
+
+        # Act / Assert
+        self.assertEqual(hash(ParseBudget(max_segments=5, max_bytes=100)), hash(budget))
+        self.assertEqual({budget}, {ParseBudget(max_segments=5, max_bytes=100), budget})
+        self.assertNotIn(ParseBudget(max_segments=5), {budget})
+
+    def test_invalid_limits(self):
+        """Test that limits without room for a parse are rejected."""
+        # Act / Assert
+        with self.assertRaises(ValueError):
+            ParseBudget(max_segments=0)
+        with self.assertRaises(ValueError):
+            ParseBudget(max_seconds=-1.0)
+
+    def test_from_environment(self):
+        """Test that the budget is read from the environment variables of the prefix."""
+        # Arrange
+        environment = {
+            "PARSE_BUDGET_TEST_MAX_SEGMENTS": "100",
+            "PARSE_BUDGET_TEST_MAX_BYTES": "invalid",
+            "PARSE_BUDGET_TEST_MAX_SECONDS": "1.5",
+            "PARSE_BUDGET_OTHER_MAX_BYTES": "0",
+        }
+
+        # Act
+        with patch.dict(os.environ, environment):
+            with self.assertLogs("msconsparser.libs.edifactmsconsparser.wrappers.parse_budget", level="WARNING"):
+                budget = ParseBudget.from_environment("PARSE_BUDGET_TEST")
+            other = ParseBudget.from_environment("PARSE_BUDGET_OTHER")
+
+        # Assert
+        self.assertEqual({"segments": 100, "bytes": None, "seconds": 1.5}, budget.as_dict())
+        self.assertTrue(other.is_unlimited)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,71 @@
+import logging
+import unittest
+from unittest.mock import patch
+
+from msconsparser.libs.edifactmsconsparser.wrappers import ParseWarnings
+
+
+class TestParseWarnings(unittest.TestCase):
+    """Test case for the ParseWarnings class."""
+
+    def setUp(self):
+        """Set up the test case."""
+        self.warnings = ParseWarnings()
+        self.logger = logging.getLogger("test_parse_warnings")
+
+    def test_add_counts_occurrences_per_template(self):
+        """Test that the occurrences are counted per message template."""
+        # Act
+        self.warnings.add("Unknown segment '%s'", "FOO")
+        self.warnings.add("Unknown segment '%s'", "BAR")
+        self.warnings.add("Invalid prefix '%s'", "xx")
+
+        # Assert
+        self.assertEqual(2, self.warnings.count("Unknown segment '%s'"))
+        self.assertEqual(1, self.warnings.count("Invalid prefix '%s'"))
+        self.assertEqual(0, self.warnings.count("Other '%s'"))
+        self.assertEqual(3, self.warnings.total)
+
+    def test_as_dict_keeps_only_the_first_examples(self):
+        """Test that only the first occurrences are kept as formatted examples."""
+        # Arrange
+        for index in range(10):
+            self.warnings.add("Unknown segment '%s'", index)
+
+        # Act
+        result = self.warnings.as_dict()
+
+        # Assert
+        self.assertEqual({
+            "Unknown segment '%s'": {
+                "count": 10,
+                "examples": ["Unknown segment '0'", "Unknown segment '1'", "Unknown segment '2'"],
+            }
+        }, result)
+
+    def test_log_summary_logs_one_record(self):
+        """Test that all warnings are logged as one summary record."""
+        # Arrange
+        self.warnings.add("Unknown segment '%s'", "FOO")
+        self.warnings.add("Unknown segment '%s'", "FOO")
+
+        # Act
+        with self.assertLogs(self.logger, level='WARNING') as cm:
+            self.warnings.log_summary(self.logger)
+
+        # Assert
+        self.assertEqual(1, len(cm.records))
+        self.assertEqual("2 warnings while parsing the interchange: 2x Unknown segment 'FOO'",
+                         cm.records[0].getMessage())
+        self.assertEqual(2, cm.records[0].parse_warnings["Unknown segment '%s'"]["count"])
+
+    def test_log_summary_without_warnings_logs_nothing(self):
+        """Test that no record is logged if no warning was recorded."""
+        with patch.object(self.logger, 'warning') as mock_warning:
+            self.warnings.log_summary(self.logger)
+
+        mock_warning.assert_not_called()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,93 @@
+import unittest
+from unittest.mock import patch
+
+from msconsparser.libs.edifactmsconsparser.wrappers import SegmentProfiler
+
+
+class TestSegmentProfiler(unittest.TestCase):
+    """Test case for the SegmentProfiler class."""
+
+    def setUp(self):
+        """Set up the test case."""
+        self.profiler = SegmentProfiler(track_allocations=True)
+
+    @patch('sys.getallocatedblocks')
+    @patch('time.perf_counter')
+    def test_record_accumulates_per_segment_type_and_stage(self, mock_perf_counter, mock_allocated_blocks):
+        """Test that calls, time and allocated blocks are accumulated per segment type and stage."""
+        # Arrange
+        mock_perf_counter.side_effect = [1.0, 1.5, 2.0, 2.25]
+        mock_allocated_blocks.side_effect = [100, 110, 200, 205]
+
+        # Act
+        self.profiler.record(SegmentProfiler.CONVERTER, "QTY", self.profiler.start())
+        self.profiler.record(SegmentProfiler.CONVERTER, "QTY", self.profiler.start())
+
+        # Assert
+        entry = self.profiler.get_entry("QTY", SegmentProfiler.CONVERTER)
+        self.assertEqual(2, entry.calls)
+        self.assertAlmostEqual(0.75, entry.total_time)
+        self.assertEqual(15, entry.allocated_blocks)
+        self.assertIsNone(self.profiler.get_entry("QTY", SegmentProfiler.HANDLER))
+        self.assertIsNone(self.profiler.get_entry("DTM", SegmentProfiler.CONVERTER))
+
+    @patch('sys.getallocatedblocks')
+    def test_record_without_allocation_tracking(self, mock_allocated_blocks):
+        """Test that the allocated blocks are not counted by default."""
+        # Arrange
+        profiler = SegmentProfiler()
+
+        # Act
+        profiler.record(SegmentProfiler.CONVERTER, "QTY", profiler.start())
+
+        # Assert
+        entry = profiler.get_entry("QTY", SegmentProfiler.CONVERTER)
+        self.assertEqual(1, entry.calls)
+        self.assertEqual(0, entry.allocated_blocks)
+        mock_allocated_blocks.assert_not_called()
+
+    def test_merge_adds_the_counters_of_another_profiler(self):
+        """Test that merging adds the counters and the parse count of another profiler."""
+        # Arrange
+        other = SegmentProfiler()
+        other.count_parse()
+        other.record(SegmentProfiler.HANDLER, "STS", other.start())
+        self.profiler.record(SegmentProfiler.HANDLER, "STS", self.profiler.start())
+
+        # Act
+        self.profiler.merge(other)
+
+        # Assert
+        report = self.profiler.report()
+        self.assertEqual(1, report["parses"])
+        self.assertEqual(2, report["segment_types"]["STS"]["handler"]["calls"])
+
+    def test_report_orders_segment_types_by_handler_time(self):
+        """Test that the report lists the most expensive segment types first."""
+        # Arrange
+        self.profiler.record(SegmentProfiler.HANDLER, "DTM", (0.0, 0))
+        self.profiler.record(SegmentProfiler.CONVERTER, "QTY", (0.0, 0))
+
+        # Act
+        report = self.profiler.report()
+
+        # Assert
+        self.assertEqual(["DTM", "QTY"], list(report["segment_types"].keys()))
+        self.assertEqual({"calls", "total_ms", "avg_us", "allocated_blocks"},
+                         set(report["segment_types"]["DTM"]["handler"].keys()))
+
+    def test_reset(self):
+        """Test that reset removes all counters."""
+        # Arrange
+        self.profiler.count_parse()
+        self.profiler.record(SegmentProfiler.HANDLER, "DTM", self.profiler.start())
+
+        # Act
+        self.profiler.reset()
+
+        # Assert
+        self.assertEqual({"parses": 0, "segment_types": {}}, self.profiler.report())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,177 @@
+import unittest
+
+from msconsparser.libs.edifactmsconsparser.edifact_mscons_parser import EdifactMSCONSParser
+from msconsparser.libs.edifactmsconsparser.wrappers import InterchangeQueryIndex, QueryIndexEntry, QueryKey
+from msconsparser.libs.edifactmsconsparser.wrappers.segments import SegmentGroup6, SegmentGroup9
+
+HEADER = (
+    "UNA:+.? '"
+    "UNB+UNOC:3+9900000000001:500+9900000000002:500+240101:0000+REF1++TL'"
+)
+MESSAGE = (
+    "UNH+{reference}+MSCONS:D:04B:UN:2.4c'"
+    "BGM+7+MSI{reference}+9'"
+    "DTM+137:202401010000?+00:303'"
+    "NAD+MS+9900000000001::293'"
+    "NAD+MR+9900000000002::293'"
+    "UNS+D'"
+    "NAD+DP'"
+    "{objects}"
+    "UNT+99+{reference}'"
+)
+LOCATION_OBJECT = (
+    "LOC+172+{location}'"
+    "RFF+MG:{device_number}'"
+    "RFF+AGK:{location}'"
+    "CCI+15++{time_series_type}'"
+    "LIN+1'"
+    "PIA+5+1-1?:1.29.1:SRW'"
+    "QTY+220:1.5:KWH'"
+    "LIN+2'"
+    "PIA+5+1-1?:2.29.1:SRW'"
+    "QTY+220:2.5:KWH'"
+)
+
+
+def create_interchange() -> str:
+    first = LOCATION_OBJECT.format(location="DE001", device_number="1EMH01", time_series_type="BI1") \
+        + LOCATION_OBJECT.format(location="DE002", device_number="1EMH02", time_series_type="BI1")
+    second = LOCATION_OBJECT.format(location="DE001", device_number="1EMH03", time_series_type="BA1")
+    return (HEADER + MESSAGE.format(reference="1", objects=first) + MESSAGE.format(reference="2", objects=second)
+            + "UNZ+2+REF1'")
+
+
+class TestInterchangeQueryIndex(unittest.TestCase):
+    """Test case for the InterchangeQueryIndex filled by a parse."""
+
+    def setUp(self):
+        """Set up the test case."""
+        self.query_index = InterchangeQueryIndex()
+        self.interchange = EdifactMSCONSParser().parse(create_interchange(), query_index=self.query_index)
+
+    def test_values_are_indexed_in_the_order_of_the_interchange(self):
+        """Test that every kind of value is indexed once per distinct value."""
+        self.assertEqual(["DE001", "DE002"], self.query_index.values(QueryKey.LOCATION))
+        self.assertEqual(["1EMH01", "1EMH02", "1EMH03"], self.query_index.values(QueryKey.DEVICE_NUMBER))
+        self.assertEqual(["BI1", "BA1"], self.query_index.values(QueryKey.TIME_SERIES_TYPE))
+        self.assertEqual(["1-1:1.29.1", "1-1:2.29.1"], self.query_index.values(QueryKey.OBIS))
+
+    def test_find_returns_the_nodes_of_the_parse_tree(self):
+        """Test that the entries refer to the location objects of the parsed interchange."""
+        # Act
+        entries = self.query_index.find(QueryKey.LOCATION, "DE001")
+
+        # Assert
+        self.assertEqual([0, 1], [entry.message_index for entry in entries])
+        self.assertEqual(["1", "2"], [entry.message_reference for entry in entries])
+        sg5 = self.interchange.unh_unt_nachrichten[1].sg5_liefer_bzw_bezugsorte[0]
+        self.assertIs(sg5.sg6_wert_und_erfassungsangaben_zum_objekt[0], entries[1].location_object)
+        self.assertIsNone(entries[1].position)
+
+    def test_find_returns_an_empty_list_for_an_unknown_value(self):
+        """Test that an unknown value has no entries."""
+        self.assertEqual([], self.query_index.find(QueryKey.LOCATION, "DE999"))
+
+    def test_only_device_numbers_are_indexed_from_the_references(self):
+        """Test that the references with other qualifiers than MG are not indexed as device numbers."""
+        self.assertEqual([], self.query_index.find(QueryKey.DEVICE_NUMBER, "DE001"))
+
+    def test_query_intersects_the_location_objects(self):
+        """Test that a query returns the location objects matching all given values."""
+        # Act
+        by_location = self.query_index.query(location="DE001")
+        by_location_and_type = self.query_index.query(location="DE001", time_series_type="BI1")
+        by_type = self.query_index.query(time_series_type="BI1")
+        unmatched = self.query_index.query(location="DE002", device_number="1EMH03")
+
+        # Assert
+        self.assertEqual(2, len(by_location))
+        self.assertEqual([("DE001", "1")], [(e.location, e.message_reference) for e in by_location_and_type])
+        self.assertEqual(["DE001", "DE002"], [entry.location for entry in by_type])
+        self.assertEqual([], unmatched)
+
+    def test_query_with_obis_returns_the_positions(self):
+        """Test that a query with an OBIS code returns the positions of the matching location objects."""
+        # Act
+        positions = self.query_index.query(location="DE001", obis="1-1:2.29.1")
+        all_positions = self.query_index.query(obis="1-1:1.29.1")
+
+        # Assert
+        self.assertEqual([0, 1], [position.message_index for position in positions])
+        self.assertEqual(["2", "2"], [position.position.lin_lfd_position.positionsnummer for position in positions])
+        self.assertEqual(["DE001", "DE002", "DE001"], [position.location for position in all_positions])
+
+    def test_query_without_values_raises_value_error(self):
+        """Test that a query needs at least one value."""
+        with self.assertRaises(ValueError):
+            self.query_index.query()
+
+    def test_model_dump_of_a_location_object(self):
+        """Test that a location object is dumped with its message and location."""
+        # Act
+        content = self.query_index.query(device_number="1EMH02")[0].model_dump(mode="json")
+
+        # Assert
+        self.assertEqual(0, content["message_index"])
+        self.assertEqual("1", content["message_reference"])
+        self.assertEqual("DE002", content["location"])
+        location_object = content["sg6_wert_und_erfassungsangaben_zum_objekt"]
+        self.assertEqual(2, len(location_object["sg9_positionsdaten"]))
+        self.assertNotIn("sg9_positionsdaten", content)
+
+    def test_model_dump_of_a_position(self):
+        """Test that a position is dumped without the other positions of its location object."""
+        # Act
+        content = self.query_index.query(obis="1-1:2.29.1", device_number="1EMH03")[0].model_dump(mode="json")
+
+        # Assert
+        self.assertEqual(1, content["message_index"])
+        self.assertEqual("1-1:2.29.1",
+                         content["sg9_positionsdaten"]["pia_produktidentifikation"][
+                             "waren_leistungsnummer_identifikation"]["produkt_leistungsnummer"])
+        self.assertNotIn("sg6_wert_und_erfassungsangaben_zum_objekt", content)
+
+    def test_compact_parse_is_indexed_alike(self):
+        """Test that the compact nodes of a compact parse are indexed and dumped like the pydantic models."""
+        # Arrange
+        compact_index = InterchangeQueryIndex()
+
+        # Act
+        EdifactMSCONSParser().parse(create_interchange(), compact=True, query_index=compact_index)
+
+        # Assert
+        self.assertEqual(
+            [entry.model_dump(mode="json") for entry in self.query_index.query(location="DE001", obis="1-1:1.29.1")],
+            [entry.model_dump(mode="json") for entry in compact_index.query(location="DE001", obis="1-1:1.29.1")],
+        )
+
+    def test_add_ignores_empty_values_and_repeated_nodes(self):
+        """Test that empty values and the same node added twice under a value are not indexed."""
+        # Arrange
+        query_index = InterchangeQueryIndex()
+        location_object = SegmentGroup6()
+        position = SegmentGroup9()
+
+        # Act
+        query_index.add(QueryKey.DEVICE_NUMBER, None, QueryIndexEntry(0, None, location_object))
+        query_index.add(QueryKey.DEVICE_NUMBER, "1EMH01", QueryIndexEntry(0, None, location_object))
+        query_index.add(QueryKey.DEVICE_NUMBER, "1EMH01", QueryIndexEntry(0, None, location_object))
+        query_index.add(QueryKey.OBIS, "1-1:1.29.1", QueryIndexEntry(0, None, location_object, position))
+        query_index.add(QueryKey.OBIS, "1-1:1.29.1", QueryIndexEntry(0, None, location_object, SegmentGroup9()))
+
+        # Assert
+        self.assertEqual(["1EMH01"], query_index.values(QueryKey.DEVICE_NUMBER))
+        self.assertEqual(1, len(query_index.find(QueryKey.DEVICE_NUMBER, "1EMH01")))
+        self.assertEqual(2, len(query_index.find(QueryKey.OBIS, "1-1:1.29.1")))
+
+    def test_parse_without_query_index(self):
+        """Test that a parse without query index leaves the index of an earlier parse untouched."""
+        # Act
+        EdifactMSCONSParser().parse(create_interchange())
+
+        # Assert
+        self.assertEqual(2, len(self.query_index.find(QueryKey.LOCATION, "DE001")))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,96 @@
+import unittest
+from unittest.mock import patch
+
+from msconsparser.libs.edifactmsconsparser.wrappers import ParsePhase, ParseStatistics
+
+
+class TestParseStatistics(unittest.TestCase):
+    """Test case for the ParseStatistics class."""
+
+    def setUp(self):
+        """Set up the test case."""
+        self.statistics = ParseStatistics()
+
+    def test_record_phase_accumulates_durations(self):
+        """Test that durations of the same phase are accumulated."""
+        # Act
+        self.statistics.record_phase(ParsePhase.CONVERT, 0.5)
+        self.statistics.record_phase(ParsePhase.CONVERT, 0.25)
+
+        # Assert
+        self.assertEqual({ParsePhase.CONVERT: 0.75}, self.statistics.phase_durations)
+        self.assertEqual(0.75, self.statistics.total_duration)
+
+    @patch('time.perf_counter')
+    def test_measure_records_the_duration_of_the_block(self, mock_perf_counter):
+        """Test that measure records the duration of the enclosed block."""
+        # Arrange
+        mock_perf_counter.side_effect = [1.0, 1.5]
+
+        # Act
+        with self.statistics.measure(ParsePhase.DECODE):
+            pass
+
+        # Assert
+        self.assertEqual({ParsePhase.DECODE: 0.5}, self.statistics.phase_durations)
+
+    def test_to_server_timing(self):
+        """Test that the phase durations are formatted in milliseconds in the order of their recording."""
+        # Arrange
+        self.statistics.record_phase(ParsePhase.DECODE, 0.0012)
+        self.statistics.record_phase(ParsePhase.TOKENIZE, 0.25)
+
+        # Act
+        result = self.statistics.to_server_timing()
+
+        # Assert
+        self.assertEqual("decode;dur=1.20, tokenize;dur=250.00", result)
+
+    def test_to_stats_header(self):
+        """Test that the size figures are formatted as the X-Parse-Stats header value."""
+        # Arrange
+        self.statistics.segment_count = 66
+        self.statistics.message_count = 2
+        self.statistics.byte_count = 1622
+
+        # Act
+        result = self.statistics.to_stats_header()
+
+        # Assert
+        self.assertEqual("segments=66; messages=2; bytes=1622", result)
+
+    def test_as_dict(self):
+        """Test that the statistics are returned as a plain dictionary."""
+        # Arrange
+        self.statistics.segment_count = 3
+        self.statistics.message_count = 1
+        self.statistics.byte_count = 100
+        self.statistics.record_phase(ParsePhase.SERIALIZE, 0.002)
+
+        # Act
+        result = self.statistics.as_dict()
+
+        # Assert
+        self.assertEqual({
+            "segments": 3,
+            "messages": 1,
+            "bytes": 100,
+            "phases_ms": {"serialize": 2.0},
+            "total_ms": 2.0,
+        }, result)
+
+    def test_as_dict_with_conversion_cache(self):
+        """Test that the hits of the conversion cache are only added if the cache was used."""
+        # Arrange
+        self.statistics.conversion_cache = {"STS": {"hits": 9, "misses": 1, "hit_rate": 0.9}}
+
+        # Act
+        result = self.statistics.as_dict()
+
+        # Assert
+        self.assertEqual({"STS": {"hits": 9, "misses": 1, "hit_rate": 0.9}}, result["conversion_cache"])
+        self.assertNotIn("conversion_cache", ParseStatistics().as_dict())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,5 +1,6 @@
 import os
 import json
+from unittest.mock import patch
 
 from fastapi.testclient import TestClient
 
@@ -63,3 +64,29 @@ def test_parse_mscons_raw_format_with_specific_una(client: TestClient):
     # Check that the response matches the expected JSON
     print(response.json())
     assert response.json() == expected_response
+
+
+def test_parse_mscons_raw_format_with_chunked_body(client: TestClient):
+    """Test that a body without Content-Length is parsed, unless it exceeds the configured byte budget."""
+    mscons_file_path = "samples/mscons-message-example.txt" \
+        if os.path.exists("samples/mscons-message-example.txt") \
+        else "tests/samples/mscons-message-example.txt"
+    with open(mscons_file_path, "rb") as f:
+        mscons_data = f.read()
+
+    # A generator is sent with chunked transfer encoding, i.e. without Content-Length
+    response = client.post(
+        "/parse-raw-format",
+        content=(mscons_data[index:index + 1024] for index in range(0, len(mscons_data), 1024)),
+        headers={"Content-Type": "text/plain"}
+    )
+    with patch.dict(os.environ, {"PARSE_BUDGET_PARSE_RAW_FORMAT_MAX_BYTES": str(1024 * 1024)}):
+        oversized_response = client.post(
+            "/parse-raw-format",
+            content=(b"x" * 64 * 1024 for _ in range(32)),
+            headers={"Content-Type": "text/plain"}
+        )
+
+    assert response.status_code == 200
+    assert len(response.json()["unh_unt_nachrichten"]) > 0
+    assert oversized_response.status_code == 413